@@ -1,6 +1,8 @@
 import streamlit as st
 from components.database.migration import Migration
 from injector import get_config, get_logger
+from pages.utils.metrics import start_metrics_exporter
+from pages.utils.perf_panel import show_perf_panel, start_rerun_profiler
 from pages.utils.utils import setup_page
 
 config = get_config()
@@ -8,8 +10,13 @@ logger = get_logger()
 
 
 def main():
-    check_db()
-    home_page()
+    start_metrics_exporter()
+    profiler = start_rerun_profiler("Main")
+    with profiler.phase("check_db"):
+        check_db()
+    with profiler.phase("render"):
+        home_page()
+    show_perf_panel(profiler)
 
 
 def home_page():
@@ -16,6 +16,11 @@ revision: str = ${repr(up_revision)}
 down_revision: Union[str, None] = ${repr(down_revision)}
 branch_labels: Union[str, Sequence[str], None] = ${repr(branch_labels)}
 depends_on: Union[str, Sequence[str], None] = ${repr(depends_on)}
+# Set to True for schema changes on large tables; see
+# components.database.online_schema_change.
+online: bool = False
+# Online revisions also name the table they alter, so startup can run them
+# inline while it is small, e.g. online_table: str = "stock_price_history".
 
 
 def upgrade() -> None:
@@ -0,0 +1,69 @@
+"""Alerts
+
+Revision ID: 0b710a6f8b19
+Revises: fecc5baeffae
+Create Date: 2026-10-19 14:21:07.318442
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0b710a6f8b19"
+down_revision: Union[str, None] = "fecc5baeffae"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+# Set to True for schema changes on large tables; see
+# components.database.online_schema_change.
+online: bool = False
+
+
+def upgrade() -> None:
+    op.create_table(
+        "alert_rules",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("stock_id", sa.Integer(), nullable=False),
+        sa.Column("field", sa.String(length=50), nullable=False),
+        sa.Column("condition", sa.String(length=30), nullable=False),
+        sa.Column("threshold", sa.Numeric(precision=15, scale=4), nullable=True),
+        sa.Column("active", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["stock_id"],
+            ["stocks.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_alert_rules_active", "alert_rules", ["active", "id"], unique=False
+    )
+    op.create_table(
+        "alert_events",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("rule_id", sa.Integer(), nullable=False),
+        sa.Column("stock_id", sa.Integer(), nullable=False),
+        sa.Column("value", sa.Numeric(precision=15, scale=4), nullable=False),
+        sa.Column("reference", sa.Numeric(precision=15, scale=4), nullable=False),
+        sa.Column("date_recorded", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("triggered_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["rule_id"],
+            ["alert_rules.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["stock_id"],
+            ["stocks.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_alert_events_triggered", "alert_events", ["triggered_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("alert_events", if_exists=True)
+    op.drop_table("alert_rules", if_exists=True)
@@ -0,0 +1,32 @@
+"""Price history stock/date index
+
+Revision ID: 2b9b27c0e09f
+Revises: bbb8be49cad2
+Create Date: 2026-10-19 14:21:37.902114
+
+"""
+
+from typing import Sequence, Union
+
+from components.database.online_schema_change import online_alter
+
+# revision identifiers, used by Alembic.
+revision: str = "2b9b27c0e09f"
+down_revision: Union[str, None] = "bbb8be49cad2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+# Set to True for schema changes on large tables; see
+# components.database.online_schema_change.
+online: bool = True
+online_table: str = "stock_price_history"
+
+
+def upgrade() -> None:
+    online_alter(
+        "stock_price_history",
+        "ADD INDEX ix_price_stock_date (stock_id, date_recorded)",
+    )
+
+
+def downgrade() -> None:
+    online_alter("stock_price_history", "DROP INDEX ix_price_stock_date")
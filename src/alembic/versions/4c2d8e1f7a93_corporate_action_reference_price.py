@@ -0,0 +1,43 @@
+"""Corporate action reference price
+
+Revision ID: 4c2d8e1f7a93
+Revises: e62e571de94c
+Create Date: 2026-10-21 09:40:18.226905
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "4c2d8e1f7a93"
+down_revision: Union[str, None] = "e62e571de94c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+# Set to True for schema changes on large tables; see
+# components.database.online_schema_change.
+online: bool = False
+
+
+def upgrade() -> None:
+    op.add_column(
+        "corporate_actions",
+        sa.Column("reference_price", sa.Numeric(precision=15, scale=4), nullable=True),
+    )
+    # Dividends recorded so far get the last price before their ex-date.
+    op.execute("""
+        UPDATE corporate_actions SET reference_price = (
+            SELECT price FROM stock_price_history
+            WHERE stock_price_history.stock_id = corporate_actions.stock_id
+            AND stock_price_history.date_recorded < corporate_actions.ex_date
+            ORDER BY stock_price_history.date_recorded DESC
+            LIMIT 1
+        )
+        WHERE action_type = 'dividend'
+        """)
+
+
+def downgrade() -> None:
+    op.drop_column("corporate_actions", "reference_price")
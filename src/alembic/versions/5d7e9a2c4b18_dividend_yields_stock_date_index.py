@@ -0,0 +1,32 @@
+"""Dividend yields stock/date index
+
+Revision ID: 5d7e9a2c4b18
+Revises: 4c2d8e1f7a93
+Create Date: 2026-10-22 11:05:13.604211
+
+"""
+
+from typing import Sequence, Union
+
+from components.database.online_schema_change import online_alter
+
+# revision identifiers, used by Alembic.
+revision: str = "5d7e9a2c4b18"
+down_revision: Union[str, None] = "4c2d8e1f7a93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+# Set to True for schema changes on large tables; see
+# components.database.online_schema_change.
+online: bool = True
+online_table: str = "dividend_yields"
+
+
+def upgrade() -> None:
+    online_alter(
+        "dividend_yields",
+        "ADD INDEX ix_dividend_stock_date (stock_id, date_recorded)",
+    )
+
+
+def downgrade() -> None:
+    online_alter("dividend_yields", "DROP INDEX ix_dividend_stock_date")
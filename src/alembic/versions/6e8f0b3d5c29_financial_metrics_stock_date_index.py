@@ -0,0 +1,32 @@
+"""Financial metrics stock/date index
+
+Revision ID: 6e8f0b3d5c29
+Revises: 5d7e9a2c4b18
+Create Date: 2026-10-22 11:06:48.117530
+
+"""
+
+from typing import Sequence, Union
+
+from components.database.online_schema_change import online_alter
+
+# revision identifiers, used by Alembic.
+revision: str = "6e8f0b3d5c29"
+down_revision: Union[str, None] = "5d7e9a2c4b18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+# Set to True for schema changes on large tables; see
+# components.database.online_schema_change.
+online: bool = True
+online_table: str = "financial_metrics"
+
+
+def upgrade() -> None:
+    online_alter(
+        "financial_metrics",
+        "ADD INDEX ix_metric_stock_date (stock_id, date_recorded)",
+    )
+
+
+def downgrade() -> None:
+    online_alter("financial_metrics", "DROP INDEX ix_metric_stock_date")
@@ -0,0 +1,51 @@
+"""Corporate actions
+
+Revision ID: 790c71d3f423
+Revises: e8497ebccb76
+Create Date: 2026-10-19 19:06:33.140927
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "790c71d3f423"
+down_revision: Union[str, None] = "e8497ebccb76"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+# Set to True for schema changes on large tables; see
+# components.database.online_schema_change.
+online: bool = False
+
+
+def upgrade() -> None:
+    op.create_table(
+        "corporate_actions",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("stock_id", sa.Integer(), nullable=False),
+        sa.Column("action_type", sa.String(length=20), nullable=False),
+        sa.Column("ex_date", sa.Date(), nullable=False),
+        sa.Column("ratio", sa.Numeric(precision=15, scale=6), nullable=True),
+        sa.Column("amount", sa.Numeric(precision=15, scale=4), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.CheckConstraint("ratio > 0", name="check_ratio_positive"),
+        sa.CheckConstraint("amount >= 0", name="check_amount_non_negative"),
+        sa.ForeignKeyConstraint(
+            ["stock_id"],
+            ["stocks.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_corporate_actions_stock_date",
+        "corporate_actions",
+        ["stock_id", "ex_date"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("corporate_actions", if_exists=True)
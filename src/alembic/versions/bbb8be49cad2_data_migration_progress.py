@@ -0,0 +1,32 @@
+"""Data migration progress
+
+Revision ID: bbb8be49cad2
+Revises: bee261ae4173
+Create Date: 2026-10-19 13:52:08.114920
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "bbb8be49cad2"
+down_revision: Union[str, None] = "bee261ae4173"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "data_migration_progress",
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("last_id", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("data_migration_progress", if_exists=True)
@@ -0,0 +1,53 @@
+"""Analysis results
+
+Revision ID: bee261ae4173
+Revises: 107bf1a9e7c7
+Create Date: 2026-10-19 09:12:41.305118
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "bee261ae4173"
+down_revision: Union[str, None] = "107bf1a9e7c7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "analysis_results",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("stock_id", sa.Integer(), nullable=False),
+        sa.Column("analysis_name", sa.String(length=50), nullable=False),
+        sa.Column("run_id", sa.String(length=64), nullable=False),
+        sa.Column("date_recorded", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("data", sa.JSON(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["stock_id"],
+            ["stocks.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_analysis_name_stock_date",
+        "analysis_results",
+        ["analysis_name", "stock_id", "date_recorded"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_analysis_run",
+        "analysis_results",
+        ["run_id", "stock_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_analysis_run", table_name="analysis_results")
+    op.drop_index("ix_analysis_name_stock_date", table_name="analysis_results")
+    op.drop_table("analysis_results", if_exists=True)
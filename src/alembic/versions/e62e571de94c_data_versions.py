@@ -0,0 +1,46 @@
+"""Data versions
+
+Revision ID: e62e571de94c
+Revises: 790c71d3f423
+Create Date: 2026-10-20 10:12:41.502318
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from components.database.data_versions import (
+    VERSIONED_TABLES,
+    trigger_names,
+    trigger_statements,
+)
+
+# revision identifiers, used by Alembic.
+revision: str = "e62e571de94c"
+down_revision: Union[str, None] = "790c71d3f423"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+# Set to True for schema changes on large tables; see
+# components.database.online_schema_change.
+online: bool = False
+
+
+def upgrade() -> None:
+    op.create_table(
+        "data_versions",
+        sa.Column("table_name", sa.String(length=64), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("table_name"),
+    )
+    dialect = op.get_bind().dialect.name
+    for table_name in VERSIONED_TABLES:
+        for statement in trigger_statements(table_name, dialect):
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    for table_name in VERSIONED_TABLES:
+        for name in trigger_names(table_name):
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.drop_table("data_versions", if_exists=True)
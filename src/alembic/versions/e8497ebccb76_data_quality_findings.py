@@ -0,0 +1,49 @@
+"""Data quality findings
+
+Revision ID: e8497ebccb76
+Revises: 0b710a6f8b19
+Create Date: 2026-10-19 17:48:12.604218
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "e8497ebccb76"
+down_revision: Union[str, None] = "0b710a6f8b19"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+# Set to True for schema changes on large tables; see
+# components.database.online_schema_change.
+online: bool = False
+
+
+def upgrade() -> None:
+    op.create_table(
+        "data_quality_findings",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("stock_id", sa.Integer(), nullable=False),
+        sa.Column("check_name", sa.String(length=30), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("value", sa.Numeric(precision=20, scale=4), nullable=True),
+        sa.Column("detail", sa.JSON(), nullable=False),
+        sa.Column("found_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["stock_id"],
+            ["stocks.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_quality_check_stock_day",
+        "data_quality_findings",
+        ["check_name", "stock_id", "day"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("data_quality_findings", if_exists=True)
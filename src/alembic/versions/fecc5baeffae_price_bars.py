@@ -0,0 +1,46 @@
+"""Price bars
+
+Revision ID: fecc5baeffae
+Revises: 2b9b27c0e09f
+Create Date: 2026-10-19 16:02:41.527304
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "fecc5baeffae"
+down_revision: Union[str, None] = "2b9b27c0e09f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+# Set to True for schema changes on large tables; see
+# components.database.online_schema_change.
+online: bool = False
+
+
+def upgrade() -> None:
+    op.create_table(
+        "price_bars",
+        sa.Column("stock_id", sa.Integer(), nullable=False),
+        sa.Column("resolution", sa.String(length=5), nullable=False),
+        sa.Column("period_start", sa.Date(), nullable=False),
+        sa.Column("open", sa.Numeric(precision=15, scale=4), nullable=False),
+        sa.Column("high", sa.Numeric(precision=15, scale=4), nullable=False),
+        sa.Column("low", sa.Numeric(precision=15, scale=4), nullable=False),
+        sa.Column("close", sa.Numeric(precision=15, scale=4), nullable=False),
+        sa.Column("first_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("points", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["stock_id"],
+            ["stocks.id"],
+        ),
+        sa.PrimaryKeyConstraint("stock_id", "resolution", "period_start"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("price_bars", if_exists=True)
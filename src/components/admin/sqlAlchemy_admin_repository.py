@@ -3,6 +3,7 @@ from components.admin.interfaces.admin_repository import AdminRepository
 from logging import Logger as StandardLogger
 from components.database.interfaces.connector import Connector
 from components.database.models import Sector
+from components.database.routing_session import reads_from_replica
 from sqlalchemy.exc import IntegrityError
 
 
@@ -18,6 +19,7 @@ class SqlalchemyAdminRepository(AdminRepository):
         self.session = connector.get_session()
         self.logger = logger
 
+    @reads_from_replica
     def list_sectors(self) -> List[str]:
         try:
             return [sector.name for sector in self.session.query(Sector.name).all()]
@@ -0,0 +1,272 @@
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+import math
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from components.alerts.interfaces.alert_repository import (
+    ABOVE,
+    ABOVE_SECTOR_MEDIAN,
+    BELOW,
+    BELOW_SECTOR_MEDIAN,
+    Alert,
+    AlertRuleRecord,
+    Observation,
+)
+
+Key = Tuple[int, str]
+
+
+class ThresholdBook:
+    # Per (stock, field), the thresholds of "above" and "below" rules as
+    # sorted (threshold, rule id) lists. A move from previous to current
+    # crosses exactly the thresholds between the two, found by bisection.
+
+    def __init__(self):
+        self._above: Dict[Key, List[Tuple[float, int]]] = defaultdict(list)
+        self._below: Dict[Key, List[Tuple[float, int]]] = defaultdict(list)
+
+    def __contains__(self, key: Key) -> bool:
+        return key in self._above or key in self._below
+
+    def add(self, rule: AlertRuleRecord) -> None:
+        book = self._above if rule.condition == ABOVE else self._below
+        insort(book[(rule.stock_id, rule.field)], (rule.threshold, rule.id))
+
+    def remove(self, rule: AlertRuleRecord) -> None:
+        book = self._above if rule.condition == ABOVE else self._below
+        key = (rule.stock_id, rule.field)
+        entries = book.get(key, [])
+        position = bisect_left(entries, (rule.threshold, rule.id))
+        if position < len(entries) and entries[position][1] == rule.id:
+            entries.pop(position)
+        if not entries:
+            book.pop(key, None)
+
+    def crossed(
+        self, key: Key, previous: Optional[float], current: float
+    ) -> List[Tuple[float, int]]:
+        # "above X" fires when the value rises to X or beyond, "below X" when
+        # it falls to X or below. Without a previous value every rule whose
+        # condition already holds fires once.
+        crossed = []
+        above = self._above.get(key)
+        if above:
+            low = -math.inf if previous is None else previous
+            if current > low:
+                crossed += above[
+                    bisect_right(above, (low, math.inf)) : bisect_right(
+                        above, (current, math.inf)
+                    )
+                ]
+        below = self._below.get(key)
+        if below:
+            high = math.inf if previous is None else previous
+            if current < high:
+                crossed += below[
+                    bisect_left(below, (current, -math.inf)) : bisect_left(
+                        below, (high, -math.inf)
+                    )
+                ]
+        return crossed
+
+
+class SectorMedianBook:
+    # Per (sector, field) with at least one rule, the latest value of every
+    # stock in the sector as a sorted (value, stock id) list. The median is
+    # an index lookup, and when an update moves it only the stocks whose
+    # values lie between the old and new median can change sides.
+
+    def __init__(self, sector_of: Dict[int, str]):
+        self.sector_of = sector_of
+        self._values: Dict[Key, List[Tuple[float, int]]] = {}
+        self._latest: Dict[Key, float] = {}
+        self._rules: Dict[Key, List[AlertRuleRecord]] = defaultdict(list)
+        self._active: Dict[int, bool] = {}
+
+    def watches(self, stock_id: int, field: str) -> bool:
+        return (self.sector_of.get(stock_id), field) in self._values
+
+    def median(self, sector: str, field: str) -> Optional[float]:
+        values = self._values.get((sector, field))
+        if not values:
+            return None
+        middle = len(values) // 2
+        if len(values) % 2:
+            return values[middle][0]
+        return (values[middle - 1][0] + values[middle][0]) / 2
+
+    def value(self, stock_id: int, field: str) -> Optional[float]:
+        return self._latest.get((stock_id, field))
+
+    def _holds(self, rule: AlertRuleRecord, median: Optional[float]) -> bool:
+        value = self.value(rule.stock_id, rule.field)
+        if value is None or median is None:
+            return False
+        return (
+            value < median if rule.condition == BELOW_SECTOR_MEDIAN else value > median
+        )
+
+    def add(self, rule: AlertRuleRecord) -> None:
+        sector = self.sector_of.get(rule.stock_id)
+        if sector is None:
+            return
+        self._values.setdefault((sector, rule.field), [])
+        self._rules[(rule.stock_id, rule.field)].append(rule)
+        # A rule starts from the current state, so it only fires on a change.
+        self._active[rule.id] = self._holds(rule, self.median(sector, rule.field))
+
+    def remove(self, rule: AlertRuleRecord) -> None:
+        rules = self._rules.get((rule.stock_id, rule.field), [])
+        rules[:] = [existing for existing in rules if existing.id != rule.id]
+        self._active.pop(rule.id, None)
+
+    def seed(self, stock_id: int, field: str, value: float) -> None:
+        sector = self.sector_of.get(stock_id)
+        values = self._values.get((sector, field))
+        if values is None:
+            return
+        previous = self._latest.get((stock_id, field))
+        if previous is not None:
+            values.pop(bisect_left(values, (previous, stock_id)))
+        insort(values, (value, stock_id))
+        self._latest[(stock_id, field)] = value
+
+    def reset(self) -> None:
+        # Re-derives every rule's state after seeding, without firing.
+        for rules in self._rules.values():
+            for rule in rules:
+                median = self.median(self.sector_of[rule.stock_id], rule.field)
+                self._active[rule.id] = self._holds(rule, median)
+
+    def update(
+        self, stock_id: int, field: str, value: float
+    ) -> List[Tuple[AlertRuleRecord, float]]:
+        # Rules that start to hold after this update, with the new median.
+        sector = self.sector_of.get(stock_id)
+        values = self._values.get((sector, field))
+        if values is None:
+            return []
+        old_median = self.median(sector, field)
+        self.seed(stock_id, field, value)
+        new_median = self.median(sector, field)
+
+        candidates: Set[int] = {stock_id}
+        if old_median is not None and old_median != new_median:
+            low, high = sorted((old_median, new_median))
+            start = bisect_left(values, (low, -math.inf))
+            end = bisect_right(values, (high, math.inf))
+            candidates.update(stock for _, stock in values[start:end])
+
+        fired = []
+        for candidate in candidates:
+            for rule in self._rules.get((candidate, field), ()):
+                holds = self._holds(rule, new_median)
+                if holds and not self._active[rule.id]:
+                    fired.append((rule, new_median))
+                self._active[rule.id] = holds
+        return fired
+
+
+class AlertEngine:
+    # Rules indexed by stock and field. Each observation only touches the
+    # rules of its own stock, plus for sector rules the few stocks whose
+    # side of the median it changes, so the cost of process() follows the
+    # size of the update rather than rules x stocks.
+
+    def __init__(
+        self, sector_of: Dict[int, str], rules: Iterable[AlertRuleRecord] = ()
+    ):
+        self.thresholds = ThresholdBook()
+        self.medians = SectorMedianBook(sector_of)
+        self.rules: Dict[int, AlertRuleRecord] = {}
+        self._previous: Dict[Key, float] = {}
+        for rule in rules:
+            self.add_rule(rule)
+
+    @property
+    def fields(self) -> Set[str]:
+        return {rule.field for rule in self.rules.values()}
+
+    def add_rule(self, rule: AlertRuleRecord) -> None:
+        if rule.condition in (ABOVE, BELOW):
+            if rule.threshold is None:
+                raise ValueError(
+                    f"Rule {rule.id}: '{rule.condition}' needs a threshold."
+                )
+            self.thresholds.add(rule)
+        elif rule.condition in (ABOVE_SECTOR_MEDIAN, BELOW_SECTOR_MEDIAN):
+            self.medians.add(rule)
+        else:
+            raise ValueError(f"Rule {rule.id}: unknown condition '{rule.condition}'.")
+        self.rules[rule.id] = rule
+
+    def remove_rule(self, rule_id: int) -> None:
+        rule = self.rules.pop(rule_id, None)
+        if rule is None:
+            return
+        if rule.condition in (ABOVE, BELOW):
+            self.thresholds.remove(rule)
+        else:
+            self.medians.remove(rule)
+        # Unwatched keys are no longer advanced, so a later rule must not
+        # start from a stale value.
+        key = (rule.stock_id, rule.field)
+        if not self.watches(*key):
+            self._previous.pop(key, None)
+
+    def watches(self, stock_id: int, field: str) -> bool:
+        return (stock_id, field) in self.thresholds or self.medians.watches(
+            stock_id, field
+        )
+
+    def seed(self, observations: Iterable[Observation]) -> None:
+        # Latest known values, taken as the starting point without firing.
+        # Keys the engine already follows keep the value process() left them
+        # at: the seed may be ahead of the feed, and taking it would skip
+        # crossings still to be processed.
+        for observation in observations:
+            key = (observation.stock_id, observation.field)
+            value = self._previous.setdefault(key, observation.value)
+            self.medians.seed(*key, value)
+        self.medians.reset()
+
+    def process(self, observations: Iterable[Observation]) -> List[Alert]:
+        # Observations must arrive in the order they were recorded per stock
+        # and field; crossings are judged against the previous one.
+        alerts = []
+        for observation in observations:
+            key = (observation.stock_id, observation.field)
+            if not self.watches(*key):
+                continue
+            for threshold, rule_id in self.thresholds.crossed(
+                key, self._previous.get(key), observation.value
+            ):
+                alerts.append(self._alert(self.rules[rule_id], observation, threshold))
+            self._previous[key] = observation.value
+            for rule, median in self.medians.update(*key, observation.value):
+                alerts.append(
+                    self._alert(
+                        rule,
+                        observation,
+                        median,
+                        value=self.medians.value(rule.stock_id, rule.field),
+                    )
+                )
+        return alerts
+
+    @staticmethod
+    def _alert(
+        rule: AlertRuleRecord,
+        observation: Observation,
+        reference: float,
+        value: float = None,
+    ) -> Alert:
+        return Alert(
+            rule_id=rule.id,
+            stock_id=rule.stock_id,
+            field=rule.field,
+            condition=rule.condition,
+            value=observation.value if value is None else value,
+            reference=reference,
+            recorded_at=observation.recorded_at,
+        )
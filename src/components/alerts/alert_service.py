@@ -0,0 +1,103 @@
+from collections import defaultdict
+from logging import Logger as StandardLogger
+from typing import Dict, Iterable, List, Optional, Set
+
+from components.alerts.alert_engine import AlertEngine
+from components.alerts.interfaces.alert_repository import (
+    ABOVE,
+    BELOW,
+    Alert,
+    AlertRepository,
+    AlertRuleRecord,
+)
+from components.market_data.interfaces.stock_repository import StockRepository
+from components.metrics.metrics_registry import MetricsRegistry
+
+
+class AlertService:
+
+    def __init__(
+        self,
+        alert_repository: AlertRepository,
+        stock_repository: StockRepository,
+        batch_rows: int = 10000,
+        logger: StandardLogger = None,
+        metrics: MetricsRegistry = None,
+    ):
+        self.alert_repository = alert_repository
+        self.stock_repository = stock_repository
+        self.batch_rows = batch_rows
+        self.logger = logger
+        self.engine: Optional[AlertEngine] = None
+        self.positions: Dict[str, int] = {}
+        self._stocks_by_sector: Dict[str, List[int]] = {}
+        self._last_rule_id = 0
+        self._alerts_metric = (metrics or MetricsRegistry.default()).counter(
+            "moneymonkey_alerts",
+            "Alerts fired by condition.",
+            ("condition",),
+        )
+
+    def start(self) -> None:
+        self._stocks_by_sector = self.stock_repository.list_stock_ids_by_sector()
+        sector_of = {
+            stock_id: sector
+            for sector, stock_ids in self._stocks_by_sector.items()
+            for stock_id in stock_ids
+        }
+        # Taken before seeding: rows landing in between are replayed against
+        # a seed that already has them, which crosses nothing.
+        self.positions = self.alert_repository.feed_positions()
+        self.engine = AlertEngine(sector_of)
+        self._last_rule_id = 0
+        self._add_rules(self.alert_repository.list_rules())
+
+    def _add_rules(self, rules: Iterable[AlertRuleRecord]) -> None:
+        # Seeds the latest known values of what the new rules look at: their
+        # own stock for thresholds, the whole sector for median rules. Keys
+        # the engine already follows are left to the feed.
+        stock_ids: Set[int] = set()
+        fields: Set[str] = set()
+        for rule in rules:
+            self.engine.add_rule(rule)
+            self._last_rule_id = max(self._last_rule_id, rule.id)
+            fields.add(rule.field)
+            if rule.condition in (ABOVE, BELOW):
+                stock_ids.add(rule.stock_id)
+            else:
+                sector = self.engine.medians.sector_of.get(rule.stock_id)
+                stock_ids.update(self._stocks_by_sector.get(sector, ()))
+        if stock_ids:
+            self.engine.seed(
+                self.alert_repository.latest_observations(stock_ids, fields)
+            )
+
+    def poll(self) -> List[Alert]:
+        # Evaluates everything ingested since the last poll. Only new feed
+        # rows are read, and each only touches the rules of its stock.
+        if self.engine is None:
+            self.start()
+        else:
+            removed = set(self.engine.rules) - self.alert_repository.active_rule_ids()
+            for rule_id in removed:
+                self.engine.remove_rule(rule_id)
+            self._add_rules(self.alert_repository.list_rules(self._last_rule_id))
+        alerts: List[Alert] = []
+        while True:
+            observations, positions = self.alert_repository.load_observations(
+                self.positions, self.engine.fields, self.batch_rows
+            )
+            alerts += self.engine.process(observations)
+            drained = positions == self.positions
+            self.positions = positions
+            if drained:
+                break
+        if alerts:
+            self.alert_repository.save_alerts(alerts)
+            counts = defaultdict(int)
+            for alert in alerts:
+                counts[alert.condition] += 1
+            for condition, count in counts.items():
+                self._alerts_metric.inc(count, condition=condition)
+            self.logger.info(f"Fired {len(alerts)} alerts.")
+        return alerts
@@ -0,0 +1,91 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Fields an alert can watch: PRICE, any MetricName, or DIVIDEND_YIELD.
+PRICE = "Price"
+
+ABOVE = "above"
+BELOW = "below"
+ABOVE_SECTOR_MEDIAN = "above_sector_median"
+BELOW_SECTOR_MEDIAN = "below_sector_median"
+CONDITIONS = (ABOVE, BELOW, ABOVE_SECTOR_MEDIAN, BELOW_SECTOR_MEDIAN)
+
+
+@dataclass(frozen=True)
+class AlertRuleRecord:
+    id: int
+    stock_id: int
+    field: str
+    condition: str
+    threshold: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class Observation:
+    stock_id: int
+    field: str
+    value: float
+    recorded_at: datetime.datetime
+
+
+@dataclass(frozen=True)
+class Alert:
+    rule_id: int
+    stock_id: int
+    field: str
+    condition: str
+    value: float
+    # The threshold, or the sector median the value was compared with.
+    reference: float
+    recorded_at: datetime.datetime
+
+
+class AlertRepository(ABC):
+
+    @abstractmethod
+    def list_rules(self, after_id: int = 0) -> List[AlertRuleRecord]:
+        pass
+
+    @abstractmethod
+    def active_rule_ids(self) -> Set[int]:
+        pass
+
+    @abstractmethod
+    def add_rule(
+        self,
+        stock_id: int,
+        field: str,
+        condition: str,
+        threshold: Optional[float] = None,
+    ) -> AlertRuleRecord:
+        pass
+
+    @abstractmethod
+    def deactivate_rule(self, rule_id: int) -> None:
+        pass
+
+    @abstractmethod
+    def feed_positions(self) -> Dict[str, int]:
+        pass
+
+    @abstractmethod
+    def load_observations(
+        self, positions: Dict[str, int], fields: Set[str], limit: int
+    ) -> Tuple[List[Observation], Dict[str, int]]:
+        pass
+
+    @abstractmethod
+    def latest_observations(
+        self, stock_ids: Iterable[int], fields: Set[str]
+    ) -> List[Observation]:
+        pass
+
+    @abstractmethod
+    def save_alerts(self, alerts: List[Alert]) -> None:
+        pass
+
+    @abstractmethod
+    def list_alerts(self, limit: int = 50) -> List[Alert]:
+        pass
@@ -0,0 +1,272 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from logging import Logger as StandardLogger
+from sqlalchemy import func, insert, literal, update
+from components.alerts.interfaces.alert_repository import (
+    ABOVE,
+    BELOW,
+    CONDITIONS,
+    PRICE,
+    Alert,
+    AlertRepository,
+    AlertRuleRecord,
+    Observation,
+)
+from components.database.interfaces.connector import Connector
+from components.database.models import (
+    AlertEvent,
+    AlertRule,
+    DividendYield,
+    FinancialMetric,
+    MetricName,
+    StockPriceHistory,
+)
+from components.market_data.interfaces.fundamentals_repository import DIVIDEND_YIELD
+
+# Change feeds alerts read forward by primary key: table, value column and
+# field, where None means the field is the row's metric name.
+_FEEDS = {
+    "prices": (StockPriceHistory, StockPriceHistory.price, PRICE),
+    "metrics": (FinancialMetric, FinancialMetric.metric_value, None),
+    "dividends": (DividendYield, DividendYield.yield_value, DIVIDEND_YIELD),
+}
+
+
+def _record(rule: AlertRule) -> AlertRuleRecord:
+    return AlertRuleRecord(
+        id=rule.id,
+        stock_id=rule.stock_id,
+        field=rule.field,
+        condition=rule.condition,
+        threshold=None if rule.threshold is None else float(rule.threshold),
+    )
+
+
+class SqlalchemyAlertRepository(AlertRepository):
+    # Everything here reads from the primary: the feeds advance a position
+    # by id, and rows a lagging replica had not seen yet would be skipped.
+
+    def __init__(
+        self,
+        config=None,
+        connector: Connector = None,
+        logger: StandardLogger = None,
+    ):
+        self.config = config
+        self.session = connector.get_session()
+        self.logger = logger
+
+    def list_rules(self, after_id: int = 0) -> List[AlertRuleRecord]:
+        try:
+            rules = (
+                self.session.query(AlertRule)
+                .filter(AlertRule.active.is_(True), AlertRule.id > after_id)
+                .order_by(AlertRule.id)
+                .all()
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to list alert rules. Error: {e}")
+            raise
+        return [_record(rule) for rule in rules]
+
+    def active_rule_ids(self) -> Set[int]:
+        try:
+            rows = self.session.query(AlertRule.id).filter(AlertRule.active.is_(True))
+            return {rule_id for (rule_id,) in rows}
+        except Exception as e:
+            self.logger.error(f"Failed to list active alert rules. Error: {e}")
+            raise
+
+    def _metric_ids(self, names: Iterable[str]) -> Dict[int, str]:
+        names = set(names) - {PRICE, DIVIDEND_YIELD}
+        if not names:
+            return {}
+        return dict(
+            self.session.query(MetricName.id, MetricName.name)
+            .filter(MetricName.name.in_(names))
+            .all()
+        )
+
+    def add_rule(
+        self,
+        stock_id: int,
+        field: str,
+        condition: str,
+        threshold: Optional[float] = None,
+    ) -> AlertRuleRecord:
+        if condition not in CONDITIONS:
+            raise ValueError(
+                f"Unknown condition '{condition}'; expected one of {', '.join(CONDITIONS)}."
+            )
+        if condition in (ABOVE, BELOW) and threshold is None:
+            raise ValueError(f"Condition '{condition}' needs a threshold.")
+        if field not in (PRICE, DIVIDEND_YIELD) and not self._metric_ids([field]):
+            raise ValueError(f"Unknown field '{field}'.")
+        try:
+            rule = AlertRule(
+                stock_id=stock_id,
+                field=field,
+                condition=condition,
+                threshold=threshold,
+                active=True,
+            )
+            self.session.add(rule)
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            self.logger.error(f"Failed to add alert rule. Error: {e}")
+            raise
+        return _record(rule)
+
+    def deactivate_rule(self, rule_id: int) -> None:
+        try:
+            self.session.execute(
+                update(AlertRule).where(AlertRule.id == rule_id).values(active=False)
+            )
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            self.logger.error(f"Failed to deactivate alert rule {rule_id}. Error: {e}")
+            raise
+
+    def feed_positions(self) -> Dict[str, int]:
+        try:
+            return {
+                name: self.session.query(func.max(table.id)).scalar() or 0
+                for name, (table, _, _) in _FEEDS.items()
+            }
+        except Exception as e:
+            self.logger.error(f"Failed to read alert feed positions. Error: {e}")
+            raise
+
+    def _feed_query(self, name: str, metric_names: Dict[int, str], *columns):
+        table, value, field = _FEEDS[name]
+        metric = table.metric_name_id if field is None else literal(0)
+        query = self.session.query(
+            *columns, table.stock_id, metric, value, table.date_recorded
+        )
+        if field is None:
+            query = query.filter(table.metric_name_id.in_(metric_names))
+        return query
+
+    @staticmethod
+    def _observation(name, metric_names, stock_id, metric, value, recorded_at):
+        field = _FEEDS[name][2] or metric_names[metric]
+        return Observation(stock_id, field, float(value), recorded_at)
+
+    def load_observations(
+        self, positions: Dict[str, int], fields: Set[str], limit: int
+    ) -> Tuple[List[Observation], Dict[str, int]]:
+        # Up to `limit` rows per feed after each position, in id order, and
+        # the positions to continue from. Feeds no rule watches, and rows of
+        # metrics no rule watches, are skipped over without being read.
+        metric_names = self._metric_ids(fields)
+        observations: List[Observation] = []
+        advanced = dict(positions)
+        try:
+            for name, (table, _, field) in _FEEDS.items():
+                top = self.session.query(func.max(table.id)).scalar() or 0
+                wanted = bool(metric_names) if field is None else field in fields
+                if not wanted or top <= positions[name]:
+                    advanced[name] = max(top, positions[name])
+                    continue
+                rows = (
+                    self._feed_query(name, metric_names, table.id)
+                    .filter(table.id > positions[name], table.id <= top)
+                    .order_by(table.id)
+                    .limit(limit)
+                    .all()
+                )
+                advanced[name] = rows[-1][0] if len(rows) == limit else top
+                observations += [
+                    self._observation(name, metric_names, *row[1:]) for row in rows
+                ]
+            # Ends the read transaction; under REPEATABLE READ the next poll
+            # would otherwise keep seeing the same snapshot.
+            self.session.commit()
+        except Exception as e:
+            self.logger.error(f"Failed to load alert observations. Error: {e}")
+            raise
+        return observations, advanced
+
+    def latest_observations(
+        self, stock_ids: Iterable[int], fields: Set[str]
+    ) -> List[Observation]:
+        # The newest row per stock and field, taken as the one with the
+        # highest id.
+        stock_ids = list(stock_ids)
+        metric_names = self._metric_ids(fields)
+        observations: List[Observation] = []
+        try:
+            for name, (table, _, field) in _FEEDS.items():
+                wanted = bool(metric_names) if field is None else field in fields
+                if not wanted or not stock_ids:
+                    continue
+                latest = self.session.query(func.max(table.id)).filter(
+                    table.stock_id.in_(stock_ids)
+                )
+                if field is None:
+                    latest = latest.filter(
+                        table.metric_name_id.in_(metric_names)
+                    ).group_by(table.stock_id, table.metric_name_id)
+                else:
+                    latest = latest.group_by(table.stock_id)
+                rows = (
+                    self._feed_query(name, metric_names)
+                    .filter(table.id.in_(latest.scalar_subquery()))
+                    .all()
+                )
+                observations += [
+                    self._observation(name, metric_names, *row) for row in rows
+                ]
+        except Exception as e:
+            self.logger.error(f"Failed to load latest alert observations. Error: {e}")
+            raise
+        return observations
+
+    def save_alerts(self, alerts: List[Alert]) -> None:
+        if not alerts:
+            return
+        try:
+            self.session.execute(
+                insert(AlertEvent),
+                [
+                    {
+                        "rule_id": alert.rule_id,
+                        "stock_id": alert.stock_id,
+                        "value": round(alert.value, 4),
+                        "reference": round(alert.reference, 4),
+                        "date_recorded": alert.recorded_at,
+                    }
+                    for alert in alerts
+                ],
+            )
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            self.logger.error(f"Failed to save {len(alerts)} alerts. Error: {e}")
+            raise
+
+    def list_alerts(self, limit: int = 50) -> List[Alert]:
+        try:
+            rows = (
+                self.session.query(AlertEvent, AlertRule.field, AlertRule.condition)
+                .join(AlertRule, AlertRule.id == AlertEvent.rule_id)
+                .order_by(AlertEvent.id.desc())
+                .limit(limit)
+                .all()
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to list alerts. Error: {e}")
+            raise
+        return [
+            Alert(
+                rule_id=event.rule_id,
+                stock_id=event.stock_id,
+                field=field,
+                condition=condition,
+                value=float(event.value),
+                reference=float(event.reference),
+                recorded_at=event.date_recorded,
+            )
+            for event, field, condition in rows
+        ]
@@ -0,0 +1,175 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional, Tuple, Union
+import numpy as np
+
+from components.analytics.price_matrix import PriceMatrix
+from components.analytics.technical_analytics import log_returns
+
+
+@dataclass
+class CorrelationMatrix:
+    stock_ids: np.ndarray
+    # float32, either in memory or a read-only memmap from the cache.
+    values: np.ndarray
+    shrinkage: float
+
+    def _indices(self, stock_ids: Iterable[int]) -> np.ndarray:
+        stock_ids = np.asarray(list(stock_ids), dtype=np.int64)
+        indices = np.searchsorted(self.stock_ids, stock_ids)
+        found = (indices < len(self.stock_ids)) & (
+            self.stock_ids[np.minimum(indices, len(self.stock_ids) - 1)] == stock_ids
+        )
+        if not found.all():
+            missing = stock_ids[~found].tolist()
+            raise ValueError(f"No correlations for stock ids {missing}.")
+        return indices
+
+    def pair(self, first: int, second: int) -> float:
+        i, j = self._indices([first, second])
+        return float(self.values[i, j])
+
+    def submatrix(self, stock_ids: Iterable[int]) -> np.ndarray:
+        indices = self._indices(stock_ids)
+        return np.asarray(self.values[np.ix_(indices, indices)])
+
+    def max_abs_correlation(
+        self, held_ids: Iterable[int], candidate_ids: Iterable[int]
+    ) -> np.ndarray:
+        rows = self._indices(held_ids)
+        cols = self._indices(candidate_ids)
+        block = np.abs(np.asarray(self.values[np.ix_(rows, cols)]))
+        return np.fmax.reduce(block, axis=0, initial=-np.inf)
+
+
+class CorrelationEngine:
+
+    def __init__(
+        self,
+        block_size: int = 1024,
+        min_overlap: int = 20,
+        shrinkage: Union[float, str, None] = "ledoit_wolf",
+    ):
+        if isinstance(shrinkage, str) and shrinkage != "ledoit_wolf":
+            raise ValueError(f"Unknown shrinkage estimator: {shrinkage}")
+        self.block_size = block_size
+        self.min_overlap = min_overlap
+        self.shrinkage = shrinkage
+
+    def standardize(self, matrix: PriceMatrix) -> Tuple[np.ndarray, np.ndarray]:
+        # Each column is scaled by its own valid returns and missing returns
+        # become zero, so block products below need no NaN handling. Works
+        # through column blocks: only the float32 result and the bool mask
+        # span every stock, float64 temporaries are days x block_size.
+        days, stocks = matrix.values.shape
+        scaled = np.zeros((days, stocks), dtype=np.float32)
+        mask = np.zeros((days, stocks), dtype=bool)
+        for start in range(0, stocks, self.block_size):
+            cols = slice(start, min(start + self.block_size, stocks))
+            returns = log_returns(matrix.values[:, cols])
+            valid = ~np.isnan(returns)
+            counts = valid.sum(axis=0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                means = np.where(valid, returns, 0.0).sum(axis=0) / counts
+                centered = np.where(valid, returns - means, 0.0)
+                stds = np.sqrt((centered * centered).sum(axis=0) / (counts - 1))
+                centered /= stds
+            centered[:, ~(stds > 0)] = 0.0
+            scaled[:, cols] = centered
+            mask[:, cols] = valid
+        return scaled, mask
+
+    def shrinkage_intensity(self, scaled: np.ndarray) -> float:
+        if self.shrinkage is None:
+            return 0.0
+        if not isinstance(self.shrinkage, str):
+            return float(min(max(self.shrinkage, 0.0), 1.0))
+        # Ledoit-Wolf towards the identity. ||X'X||_F == ||XX'||_F, so the
+        # estimate only needs the small observations x observations Gram matrix.
+        observations, stocks = scaled.shape
+        if observations == 0 or stocks == 0:
+            return 0.0
+        # Accumulated in float64 over column blocks.
+        gram = np.zeros((observations, observations))
+        for start in range(0, stocks, self.block_size):
+            block = scaled[:, start : start + self.block_size].astype(np.float64)
+            gram += block @ block.T
+        sample_norm = float((gram * gram).sum()) / observations**2
+        mu = float(np.trace(gram)) / observations / stocks
+        dispersion = (
+            sample_norm - 2 * mu * np.trace(gram) / observations + mu * mu * stocks
+        )
+        row_norms = np.diag(gram)
+        spread = (
+            float((row_norms**2).sum()) - observations * sample_norm
+        ) / observations**2
+        if dispersion <= 0:
+            return 1.0
+        return float(min(max(spread, 0.0), dispersion) / dispersion)
+
+    def _correlate(
+        self,
+        left: Tuple[np.ndarray, np.ndarray],
+        right: Tuple[np.ndarray, np.ndarray],
+        shrinkage: float,
+    ) -> np.ndarray:
+        # float32 throughout; counts of overlapping days are exact in it.
+        products = left[0].T @ right[0]
+        overlap = left[1].T.astype(np.float32) @ right[1].astype(np.float32)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            block = np.clip(products / (overlap - 1), -1.0, 1.0)
+        block[overlap < self.min_overlap] = np.nan
+        block *= 1.0 - shrinkage
+        return block
+
+    def compute(
+        self, matrix: PriceMatrix, out: Optional[np.ndarray] = None
+    ) -> CorrelationMatrix:
+        scaled, mask = self.standardize(matrix)
+        shrinkage = self.shrinkage_intensity(scaled)
+        size = len(matrix.stock_ids)
+        values = out if out is not None else np.empty((size, size), dtype=np.float32)
+
+        for start in range(0, size, self.block_size):
+            rows = slice(start, min(start + self.block_size, size))
+            for other in range(start, size, self.block_size):
+                cols = slice(other, min(other + self.block_size, size))
+                block = self._correlate(
+                    (scaled[:, rows], mask[:, rows]),
+                    (scaled[:, cols], mask[:, cols]),
+                    shrinkage,
+                )
+                values[rows, cols] = block
+                values[cols, rows] = block.T
+        diagonal = np.arange(size)
+        has_data = mask.sum(axis=0) >= self.min_overlap
+        values[diagonal, diagonal] = np.where(has_data, 1.0, np.nan)
+        return CorrelationMatrix(
+            stock_ids=matrix.stock_ids, values=values, shrinkage=shrinkage
+        )
+
+    def compute_to_file(self, matrix: PriceMatrix, path: Path) -> CorrelationMatrix:
+        size = len(matrix.stock_ids)
+        out = np.lib.format.open_memmap(
+            path, mode="w+", dtype=np.float32, shape=(size, size)
+        )
+        result = self.compute(matrix, out=out)
+        out.flush()
+        return result
+
+    def cross(
+        self, matrix: PriceMatrix, row_ids: Iterable[int], col_ids: Iterable[int]
+    ) -> np.ndarray:
+        scaled, mask = self.standardize(matrix)
+        shrinkage = self.shrinkage_intensity(scaled)
+        index = CorrelationMatrix(matrix.stock_ids, np.empty((0, 0)), shrinkage)
+        rows = index._indices(row_ids)
+        cols = index._indices(col_ids)
+        result = self._correlate(
+            (scaled[:, rows], mask[:, rows]),
+            (scaled[:, cols], mask[:, cols]),
+            shrinkage,
+        )
+        same = rows[:, None] == cols[None, :]
+        result[same & (mask.sum(axis=0)[cols] >= self.min_overlap)] = 1.0
+        return result
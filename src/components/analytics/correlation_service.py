@@ -0,0 +1,168 @@
+import datetime
+import hashlib
+import json
+from logging import Logger as StandardLogger
+from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
+
+from components.analytics.correlation_engine import (
+    CorrelationEngine,
+    CorrelationMatrix,
+)
+from components.analytics.price_matrix import PriceMatrix
+from components.cache.interfaces.data_version_repository import (
+    DataVersionRepository,
+)
+from components.cache.result_cache import ResultCache
+from components.market_data.interfaces.price_history_repository import (
+    PriceHistoryRepository,
+)
+from components.market_data.interfaces.stock_repository import StockRepository
+from components.market_data.price_adjuster import PriceAdjuster
+from components.metrics.metrics_registry import MetricsRegistry
+
+# Tables the matrices are computed from, for versioning cached ones. New
+# corporate actions are covered per stock by the adjuster's version.
+SOURCE_TABLES = ("stock_price_history",)
+
+
+class CorrelationService:
+
+    def __init__(
+        self,
+        price_repository: PriceHistoryRepository,
+        stock_repository: StockRepository,
+        cache_dir: Path,
+        engine: CorrelationEngine = None,
+        adjuster: PriceAdjuster = None,
+        result_cache: ResultCache = None,
+        version_repository: DataVersionRepository = None,
+        logger: StandardLogger = None,
+        metrics: MetricsRegistry = None,
+    ):
+        self.price_repository = price_repository
+        self.stock_repository = stock_repository
+        self.cache_dir = Path(cache_dir)
+        self.engine = engine or CorrelationEngine()
+        self.adjuster = adjuster
+        # Matrices are memory-mapped files in cache_dir, too large for the
+        # result cache; its leases only keep processes asking for the same
+        # matrix at once from each computing it.
+        self.result_cache = result_cache
+        self.version_repository = version_repository
+        self.logger = logger
+        self._cache_metric = (metrics or MetricsRegistry.default()).counter(
+            "moneymonkey_cache_requests",
+            "Cache lookups by cache and result (hit, partial, miss).",
+            ("cache", "result"),
+        )
+
+    def _cache_key(
+        self,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        stock_ids: List[int],
+        adjusted_through: int = 0,
+        versions: Optional[Dict[str, str]] = None,
+    ) -> str:
+        parameters = {
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "shrinkage": self.engine.shrinkage,
+            "min_overlap": self.engine.min_overlap,
+            "stocks": hashlib.sha1(
+                np.asarray(sorted(stock_ids), dtype=np.int64).tobytes()
+            ).hexdigest(),
+        }
+        if adjusted_through:
+            # Only matrices over stocks with new corporate actions go stale.
+            parameters["adjusted_through"] = adjusted_through
+        if versions:
+            # Backfilled, corrected or deleted prices make a new matrix.
+            parameters["versions"] = versions
+        encoded = json.dumps(parameters, sort_keys=True).encode()
+        return hashlib.sha1(encoded).hexdigest()
+
+    def _load(self, key: str) -> Optional[CorrelationMatrix]:
+        values_path = self.cache_dir / f"{key}.npy"
+        meta_path = self.cache_dir / f"{key}.npz"
+        if not (values_path.exists() and meta_path.exists()):
+            return None
+        with np.load(meta_path) as meta:
+            return CorrelationMatrix(
+                stock_ids=meta["stock_ids"],
+                values=np.load(values_path, mmap_mode="r"),
+                shrinkage=float(meta["shrinkage"]),
+            )
+
+    def get_correlation(
+        self,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        stock_ids: Optional[List[int]] = None,
+        sectors: Optional[List[str]] = None,
+        industries: Optional[List[str]] = None,
+    ) -> CorrelationMatrix:
+        if stock_ids is None:
+            stock_ids = self.stock_repository.list_stock_ids(
+                sectors=sectors, industries=industries
+            )
+        adjusted_through = 0
+        if self.adjuster is not None:
+            self.adjuster.refresh()
+            adjusted_through = self.adjuster.version(stock_ids)
+        versions = None
+        if self.version_repository is not None:
+            versions = self.version_repository.data_versions(SOURCE_TABLES)
+        key = self._cache_key(start, end, stock_ids, adjusted_through, versions)
+        cached = self._load(key)
+        if cached is not None:
+            self._cache_metric.inc(cache="correlation", result="hit")
+            return cached
+        self._cache_metric.inc(cache="correlation", result="miss")
+        if self.result_cache is None:
+            return self._compute(key, start, end, stock_ids)
+
+        def compute() -> bool:
+            # Another process may have written the files meanwhile.
+            if self._load(key) is None:
+                self._compute(key, start, end, stock_ids)
+            return True
+
+        self.result_cache.get_or_compute(
+            "correlation_matrix", {"key": key}, compute, versions=versions
+        )
+        # The files may have gone since the entry was stored.
+        result = self._load(key)
+        if result is None:
+            result = self._compute(key, start, end, stock_ids)
+        return result
+
+    def _compute(
+        self,
+        key: str,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        stock_ids: List[int],
+    ) -> CorrelationMatrix:
+        points = self.price_repository.load_price_points(
+            stock_ids=stock_ids, start=start, end=end
+        )
+        matrix = PriceMatrix.from_points(points)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Blocks are written straight into a memmap, so the full N x N matrix
+        # never has to fit in memory; the rename publishes it atomically.
+        partial_path = self.cache_dir / f"{key}.partial.npy"
+        result = self.engine.compute_to_file(matrix, partial_path)
+        np.savez(
+            self.cache_dir / f"{key}.npz",
+            stock_ids=result.stock_ids,
+            shrinkage=result.shrinkage,
+        )
+        partial_path.replace(self.cache_dir / f"{key}.npy")
+        self.logger.info(
+            f"Computed correlations for {len(result.stock_ids)} stocks "
+            f"({start:%Y-%m-%d} to {end:%Y-%m-%d}, shrinkage {result.shrinkage:.3f})."
+        )
+        return self._load(key)
@@ -0,0 +1,146 @@
+from dataclasses import dataclass
+import datetime
+from logging import Logger as StandardLogger
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from components.analytics.price_bars import (
+    RESOLUTIONS,
+    PriceBars,
+    lttb,
+    period_start,
+    rollup,
+)
+from components.market_data.interfaces.price_bar_repository import (
+    PriceBarRepository,
+)
+from components.market_data.interfaces.price_history_repository import (
+    PriceHistoryRepository,
+)
+from components.market_data.interfaces.stock_repository import StockRepository
+
+
+@dataclass
+class ChartSeries:
+    resolution: str
+    period_start: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.period_start)
+
+
+class PriceBarService:
+    # Keeps day, week and month OHLC bars in price_bars up to date. A refresh
+    # only re-reads ticks from each stock's latest daily bar on, and rebuilds
+    # the weeks and months those days fall in from the stored daily bars.
+
+    def __init__(
+        self,
+        price_repository: PriceHistoryRepository,
+        bar_repository: PriceBarRepository,
+        stock_repository: StockRepository,
+        chunk_stocks: int = 500,
+        since_slack: datetime.timedelta = datetime.timedelta(days=7),
+        logger: StandardLogger = None,
+    ):
+        self.price_repository = price_repository
+        self.bar_repository = bar_repository
+        self.stock_repository = stock_repository
+        self.chunk_stocks = chunk_stocks
+        # Stocks whose latest bars lie within this of each other share one
+        # read, re-reading at most this much history for the later ones.
+        self.since_slack = since_slack
+        self.logger = logger
+
+    def refresh(self) -> Dict[str, int]:
+        written = dict.fromkeys(RESOLUTIONS, 0)
+        stock_ids = self.stock_repository.list_stock_ids()
+        for offset in range(0, len(stock_ids), self.chunk_stocks):
+            chunk = stock_ids[offset : offset + self.chunk_stocks]
+            latest = self.bar_repository.latest_periods("day", chunk)
+            for ids, since in self._groups(chunk, latest):
+                for resolution, count in self._refresh_stocks(ids, since).items():
+                    written[resolution] += count
+        return written
+
+    def _groups(
+        self, stock_ids: List[int], latest: Dict[int, datetime.date]
+    ) -> List[Tuple[List[int], Optional[datetime.date]]]:
+        # Stocks without bars are built from their full history. The rest are
+        # read from their own latest bar, so one stock that fell behind does
+        # not make the whole chunk re-read its history.
+        groups = []
+        new = [stock_id for stock_id in stock_ids if stock_id not in latest]
+        if new:
+            groups.append((new, None))
+        for stock_id, day in sorted(latest.items(), key=lambda item: item[1]):
+            if groups and groups[-1][1] is not None:
+                if day - groups[-1][1] <= self.since_slack:
+                    groups[-1][0].append(stock_id)
+                    continue
+            groups.append(([stock_id], day))
+        return groups
+
+    def _refresh_stocks(
+        self, stock_ids: List[int], since: Optional[datetime.date]
+    ) -> Dict[str, int]:
+        start = (
+            None if since is None else datetime.datetime.combine(since, datetime.time())
+        )
+        daily = PriceBars.from_points(
+            self.price_repository.load_price_points(stock_ids=stock_ids, start=start)
+        )
+        cutoffs = dict.fromkeys(RESOLUTIONS)
+        base = daily
+        if since is not None:
+            day = np.datetime64(since, "D")
+            cutoffs = {
+                resolution: period_start(day, resolution).item()
+                for resolution in RESOLUTIONS
+            }
+            # The first rebuilt week or month can start before `since`; its
+            # earlier days come from the stored daily bars.
+            older = self.bar_repository.load_bars(
+                "day", stock_ids, start=min(cutoffs.values()), end=since
+            )
+            base = older.concat(daily)
+        written = {}
+        for resolution in RESOLUTIONS:
+            bars = daily if resolution == "day" else rollup(base, resolution)
+            if cutoffs[resolution] is not None:
+                bars = bars.since(cutoffs[resolution])
+            self.bar_repository.replace_bars(
+                resolution, stock_ids, cutoffs[resolution], bars
+            )
+            written[resolution] = len(bars)
+        return written
+
+    def chart_series(
+        self,
+        stock_id: int,
+        start: Optional[datetime.date] = None,
+        end: Optional[datetime.date] = None,
+        max_points: int = 500,
+    ) -> ChartSeries:
+        # Picks the finest resolution that fits in max_points, so the rows
+        # read and drawn are bounded whatever the length of the history.
+        for resolution in RESOLUTIONS:
+            count = self.bar_repository.count_bars(resolution, stock_id, start, end)
+            if count <= max_points:
+                break
+        bars = self.bar_repository.load_chart_bars(resolution, stock_id, start, end)
+        if len(bars) > max_points:
+            bars = bars.take(lttb(bars.period_start, bars.close, max_points))
+        return ChartSeries(
+            resolution=resolution,
+            period_start=bars.period_start,
+            open=bars.open,
+            high=bars.high,
+            low=bars.low,
+            close=bars.close,
+        )
@@ -0,0 +1,147 @@
+from dataclasses import dataclass, fields
+import numpy as np
+
+from components.market_data.interfaces.price_history_repository import PricePoints
+
+RESOLUTIONS = ("day", "week", "month")
+
+
+def period_start(days: np.ndarray, resolution: str) -> np.ndarray:
+    # Periods are UTC calendar days, ISO weeks starting on Monday, and
+    # calendar months.
+    days = np.asarray(days).astype("datetime64[D]")
+    if resolution == "day":
+        return days
+    if resolution == "week":
+        # 1970-01-01 was a Thursday, so (day + 3) % 7 counts days since Monday.
+        offsets = (days.astype(np.int64) + 3) % 7
+        return days - offsets.astype("timedelta64[D]")
+    if resolution == "month":
+        return days.astype("datetime64[M]").astype("datetime64[D]")
+    raise ValueError(f"Unknown resolution '{resolution}'.")
+
+
+@dataclass
+class PriceBars:
+    # One OHLC bar per (stock, period), sorted by stock id and period start.
+    # first_at/last_at are the timestamps of the opening and closing ticks.
+    stock_ids: np.ndarray
+    period_start: np.ndarray
+    first_at: np.ndarray
+    last_at: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    points: np.ndarray
+
+    @classmethod
+    def empty(cls) -> "PriceBars":
+        return cls(
+            stock_ids=np.empty(0, dtype=np.int64),
+            period_start=np.empty(0, dtype="datetime64[D]"),
+            first_at=np.empty(0, dtype="datetime64[us]"),
+            last_at=np.empty(0, dtype="datetime64[us]"),
+            open=np.empty(0),
+            high=np.empty(0),
+            low=np.empty(0),
+            close=np.empty(0),
+            points=np.empty(0, dtype=np.int64),
+        )
+
+    @classmethod
+    def from_points(cls, points: PricePoints) -> "PriceBars":
+        # Every tick is a one-point bar; rolling them up gives daily bars.
+        recorded_at = points.recorded_at.astype("datetime64[us]")
+        ticks = cls(
+            stock_ids=points.stock_ids.astype(np.int64),
+            period_start=recorded_at.astype("datetime64[D]"),
+            first_at=recorded_at,
+            last_at=recorded_at,
+            open=points.prices,
+            high=points.prices,
+            low=points.prices,
+            close=points.prices,
+            points=np.ones(len(points), dtype=np.int64),
+        )
+        return rollup(ticks, "day")
+
+    def __len__(self) -> int:
+        return len(self.stock_ids)
+
+    def take(self, index) -> "PriceBars":
+        return PriceBars(
+            **{item.name: getattr(self, item.name)[index] for item in fields(self)}
+        )
+
+    def since(self, start: np.datetime64) -> "PriceBars":
+        return self.take(self.period_start >= np.datetime64(start, "D"))
+
+    def concat(self, other: "PriceBars") -> "PriceBars":
+        return PriceBars(
+            **{
+                item.name: np.concatenate(
+                    [getattr(self, item.name), getattr(other, item.name)]
+                )
+                for item in fields(self)
+            }
+        )
+
+
+def rollup(bars: PriceBars, resolution: str) -> PriceBars:
+    # Combines non-overlapping bars (or ticks) into bars of a coarser
+    # resolution in one sort and a handful of reduceat calls.
+    if len(bars) == 0:
+        return PriceBars.empty()
+    periods = period_start(bars.period_start, resolution)
+    order = np.lexsort((bars.first_at, periods, bars.stock_ids))
+    stock_ids = bars.stock_ids[order]
+    periods = periods[order]
+    new_group = np.empty(len(order), dtype=bool)
+    new_group[0] = True
+    new_group[1:] = (stock_ids[1:] != stock_ids[:-1]) | (periods[1:] != periods[:-1])
+    starts = np.flatnonzero(new_group)
+    ends = np.append(starts[1:], len(order)) - 1
+    return PriceBars(
+        stock_ids=stock_ids[starts],
+        period_start=periods[starts],
+        first_at=bars.first_at[order][starts],
+        last_at=np.maximum.reduceat(bars.last_at[order], starts),
+        open=bars.open[order][starts],
+        high=np.maximum.reduceat(bars.high[order], starts),
+        low=np.minimum.reduceat(bars.low[order], starts),
+        close=bars.close[order][ends],
+        points=np.add.reduceat(bars.points[order], starts),
+    )
+
+
+def lttb(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    # Largest-Triangle-Three-Buckets: keeps the first and last points and,
+    # per bucket, the point spanning the largest triangle with the previous
+    # pick and the next bucket's average. Returns indices into x and y.
+    n = len(x)
+    if max_points >= n:
+        return np.arange(n)
+    if max_points < 3:
+        raise ValueError("LTTB needs at least 3 points.")
+    x = np.asarray(x)
+    if x.dtype.kind == "M":
+        x = x.astype(np.int64)
+    x = x.astype(np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.append(np.linspace(1, n - 1, max_points - 1).astype(np.int64), n)
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(max_points - 2):
+        low, high = edges[bucket], edges[bucket + 1]
+        next_low, next_high = edges[bucket + 1], edges[bucket + 2]
+        average_x = x[next_low:next_high].mean()
+        average_y = y[next_low:next_high].mean()
+        areas = np.abs(
+            (x[previous] - average_x) * (y[low:high] - y[previous])
+            - (x[previous] - x[low:high]) * (average_y - y[previous])
+        )
+        previous = low + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    return selected
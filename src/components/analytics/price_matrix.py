@@ -0,0 +1,63 @@
+from dataclasses import dataclass
+import numpy as np
+
+from components.market_data.interfaces.price_history_repository import PricePoints
+
+
+@dataclass
+class PriceMatrix:
+    # Rows are calendar days (datetime64[D], sorted), columns are stock ids.
+    # NaN marks a day without an observation for that stock.
+    dates: np.ndarray
+    stock_ids: np.ndarray
+    values: np.ndarray
+
+    @classmethod
+    def empty(cls) -> "PriceMatrix":
+        return cls(
+            dates=np.array([], dtype="datetime64[D]"),
+            stock_ids=np.array([], dtype=np.int64),
+            values=np.empty((0, 0), dtype=np.float64),
+        )
+
+    @classmethod
+    def from_points(cls, points: PricePoints) -> "PriceMatrix":
+        if len(points) == 0:
+            return cls.empty()
+        # Stable sort on the full timestamp so the last tick of a day wins
+        # when several points collapse into the same daily cell.
+        order = np.argsort(points.recorded_at, kind="stable")
+        days = points.recorded_at[order].astype("datetime64[D]")
+        dates, rows = np.unique(days, return_inverse=True)
+        stock_ids, cols = np.unique(points.stock_ids[order], return_inverse=True)
+        values = np.full((len(dates), len(stock_ids)), np.nan)
+        values[rows, cols] = points.prices[order]
+        return cls(dates=dates, stock_ids=stock_ids.astype(np.int64), values=values)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def reindex(self, dates: np.ndarray, stock_ids: np.ndarray) -> "PriceMatrix":
+        values = np.full((len(dates), len(stock_ids)), np.nan)
+        row_mask = np.isin(dates, self.dates)
+        col_mask = np.isin(stock_ids, self.stock_ids)
+        rows = np.searchsorted(self.dates, dates[row_mask])
+        cols = np.searchsorted(self.stock_ids, stock_ids[col_mask])
+        values[np.ix_(row_mask, col_mask)] = self.values[np.ix_(rows, cols)]
+        return PriceMatrix(dates=dates, stock_ids=stock_ids, values=values)
+
+    def merge(self, newer: "PriceMatrix") -> "PriceMatrix":
+        dates = np.union1d(self.dates, newer.dates)
+        stock_ids = np.union1d(self.stock_ids, newer.stock_ids)
+        merged = self.reindex(dates, stock_ids)
+        overlay = newer.reindex(dates, stock_ids).values
+        has_value = ~np.isnan(overlay)
+        merged.values[has_value] = overlay[has_value]
+        return merged
+
+    def tail(self, rows: int) -> "PriceMatrix":
+        return PriceMatrix(
+            dates=self.dates[-rows:] if rows else self.dates[:0],
+            stock_ids=self.stock_ids,
+            values=self.values[-rows:] if rows else self.values[:0],
+        )
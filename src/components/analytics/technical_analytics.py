@@ -0,0 +1,269 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import numpy as np
+
+from components.analytics.price_matrix import PriceMatrix
+
+
+def forward_fill(values: np.ndarray, limit: Optional[int] = None) -> np.ndarray:
+    rows = np.arange(values.shape[0])[:, None]
+    last = np.where(~np.isnan(values), rows, -1)
+    np.maximum.accumulate(last, axis=0, out=last)
+    filled = values[np.maximum(last, 0), np.arange(values.shape[1])[None, :]]
+    stale = last < 0
+    if limit is not None:
+        stale |= rows - last > limit
+    filled[stale] = np.nan
+    return filled
+
+
+def shift(values: np.ndarray, periods: int) -> np.ndarray:
+    shifted = np.full_like(values, np.nan)
+    if periods < len(values):
+        shifted[periods:] = values[: len(values) - periods]
+    return shifted
+
+
+def log_returns(values: np.ndarray) -> np.ndarray:
+    # Each observation is compared with the previous observation of the same
+    # stock, however many empty days lie in between.
+    previous = shift(forward_fill(values), 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.log(values / previous)
+    returns[~np.isfinite(returns)] = np.nan
+    return returns
+
+
+def _rolling_sum_count(
+    values: np.ndarray, window: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    valid = ~np.isnan(values)
+    zero_row = np.zeros((1, values.shape[1]))
+    sums = np.vstack([zero_row, np.cumsum(np.where(valid, values, 0.0), axis=0)])
+    counts = np.vstack([zero_row, np.cumsum(valid, axis=0)])
+    ends = np.arange(1, len(values) + 1)
+    starts = np.maximum(ends - window, 0)
+    return sums[ends] - sums[starts], counts[ends] - counts[starts]
+
+
+def rolling_mean(
+    values: np.ndarray, window: int, min_periods: Optional[int] = None
+) -> np.ndarray:
+    min_periods = window if min_periods is None else min_periods
+    sums, counts = _rolling_sum_count(values, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = sums / counts
+    means[counts < max(min_periods, 1)] = np.nan
+    return means
+
+
+def rolling_std(
+    values: np.ndarray, window: int, min_periods: Optional[int] = None
+) -> np.ndarray:
+    min_periods = window if min_periods is None else min_periods
+    sums, counts = _rolling_sum_count(values, window)
+    squares, _ = _rolling_sum_count(values * values, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variance = (squares - sums * sums / counts) / (counts - 1)
+    std = np.sqrt(np.clip(variance, 0.0, None))
+    std[counts < max(min_periods, 2)] = np.nan
+    return std
+
+
+def drawdown(values: np.ndarray, peak: Optional[np.ndarray] = None) -> np.ndarray:
+    filled = forward_fill(values)
+    running_peak = np.fmax.accumulate(filled, axis=0)
+    if peak is not None:
+        running_peak = np.fmax(running_peak, peak[None, :])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return filled / running_peak - 1.0
+
+
+def momentum(filled: np.ndarray, lookback: int, skip: int = 0) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return shift(filled, skip) / shift(filled, lookback) - 1.0
+
+
+@dataclass(frozen=True)
+class AnalyticsSettings:
+    sma_windows: Tuple[int, ...] = (20, 50, 200)
+    volatility_window: int = 20
+    momentum_lookback: int = 252
+    momentum_skip: int = 21
+    fill_limit: int = 5
+    trading_days_per_year: int = 252
+
+    @property
+    def lookback(self) -> int:
+        longest = max(
+            self.sma_windows + (self.volatility_window + 1, self.momentum_lookback)
+        )
+        return longest + self.fill_limit + 1
+
+
+@dataclass
+class AnalyticsResult:
+    dates: np.ndarray
+    stock_ids: np.ndarray
+    metrics: Dict[str, np.ndarray]
+    # State carried forward so new prices can be appended without a rerun.
+    tail: PriceMatrix
+    peak: np.ndarray
+    # Id of the last corporate action reflected in the prices behind this.
+    adjusted_through: int = 0
+
+    def latest(self) -> Dict[str, np.ndarray]:
+        return {name: values[-1] for name, values in self.metrics.items()}
+
+    def column(self, stock_id: int) -> Dict[str, np.ndarray]:
+        index = int(np.searchsorted(self.stock_ids, stock_id))
+        if index >= len(self.stock_ids) or self.stock_ids[index] != stock_id:
+            raise ValueError(f"No analytics for stock id {stock_id}.")
+        return {name: values[:, index] for name, values in self.metrics.items()}
+
+    def replace_columns(self, other: "AnalyticsResult") -> None:
+        # Overwrites the columns of other's stocks, which must cover the same
+        # dates; used to recompute single stocks after their history changed.
+        columns = np.searchsorted(self.stock_ids, other.stock_ids)
+        for name, values in self.metrics.items():
+            values[:, columns] = other.metrics[name]
+        self.tail.values[:, columns] = other.tail.values
+        self.peak[columns] = other.peak
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays = {f"metric_{name}": values for name, values in self.metrics.items()}
+        temporary = path.with_name(path.name + ".tmp.npz")
+        np.savez(
+            temporary,
+            dates=self.dates,
+            stock_ids=self.stock_ids,
+            tail_dates=self.tail.dates,
+            tail_values=self.tail.values,
+            peak=self.peak,
+            adjusted_through=self.adjusted_through,
+            **arrays,
+        )
+        temporary.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "AnalyticsResult":
+        with np.load(path) as stored:
+            stock_ids = stored["stock_ids"]
+            return cls(
+                dates=stored["dates"],
+                stock_ids=stock_ids,
+                metrics={
+                    name[len("metric_") :]: stored[name]
+                    for name in stored.files
+                    if name.startswith("metric_")
+                },
+                tail=PriceMatrix(
+                    dates=stored["tail_dates"],
+                    stock_ids=stock_ids,
+                    values=stored["tail_values"],
+                ),
+                peak=stored["peak"],
+                adjusted_through=(
+                    int(stored["adjusted_through"])
+                    if "adjusted_through" in stored.files
+                    else 0
+                ),
+            )
+
+
+def _reindex_columns(
+    values: np.ndarray, stock_ids: np.ndarray, target_ids: np.ndarray
+) -> np.ndarray:
+    reindexed = np.full((values.shape[0], len(target_ids)), np.nan)
+    reindexed[:, np.searchsorted(target_ids, stock_ids)] = values
+    return reindexed
+
+
+def _column_max(values: np.ndarray) -> np.ndarray:
+    peak = np.fmax.reduce(values, axis=0, initial=-np.inf)
+    return np.where(np.isinf(peak), np.nan, peak)
+
+
+def _running_worst(drawdowns: np.ndarray, seed: Optional[np.ndarray]) -> np.ndarray:
+    worst = np.fmin.accumulate(drawdowns, axis=0)
+    if seed is not None:
+        worst = np.fmin(worst, seed[None, :])
+    return worst
+
+
+class TechnicalAnalytics:
+
+    def __init__(self, settings: AnalyticsSettings = None):
+        self.settings = settings or AnalyticsSettings()
+
+    def _metrics(
+        self, matrix: PriceMatrix, peak: Optional[np.ndarray]
+    ) -> Dict[str, np.ndarray]:
+        settings = self.settings
+        filled = forward_fill(matrix.values, settings.fill_limit)
+        returns = log_returns(matrix.values)
+
+        metrics = {"return_1d": np.expm1(returns)}
+        for window in settings.sma_windows:
+            metrics[f"sma_{window}"] = rolling_mean(filled, window)
+        metrics[f"volatility_{settings.volatility_window}"] = rolling_std(
+            returns, settings.volatility_window
+        ) * np.sqrt(settings.trading_days_per_year)
+        metrics["drawdown"] = drawdown(matrix.values, peak)
+        metrics[f"momentum_{settings.momentum_lookback}"] = momentum(
+            filled, settings.momentum_lookback, settings.momentum_skip
+        )
+        return metrics
+
+    def compute(self, matrix: PriceMatrix) -> AnalyticsResult:
+        metrics = self._metrics(matrix, None)
+        metrics["max_drawdown"] = _running_worst(metrics["drawdown"], None)
+        return AnalyticsResult(
+            dates=matrix.dates,
+            stock_ids=matrix.stock_ids,
+            metrics=metrics,
+            tail=matrix.tail(self.settings.lookback),
+            peak=_column_max(matrix.values),
+        )
+
+    def extend(self, previous: AnalyticsResult, newer: PriceMatrix) -> AnalyticsResult:
+        if len(newer) == 0:
+            return previous
+        stock_ids = np.union1d(previous.stock_ids, newer.stock_ids)
+        combined = previous.tail.merge(newer)
+
+        def carried(values: np.ndarray) -> np.ndarray:
+            return _reindex_columns(values, previous.stock_ids, stock_ids)
+
+        # Everything from the first new day onwards is (re)computed; the tail
+        # rows before it only warm up the rolling windows.
+        first_new = newer.dates[0]
+        kept = int(np.searchsorted(previous.dates, first_new))
+        start = int(np.searchsorted(combined.dates, first_new))
+
+        peak = carried(previous.peak[None, :])[0]
+        fresh = self._metrics(combined, peak)
+        seed = (
+            carried(previous.metrics["max_drawdown"][kept - 1 : kept])[0]
+            if kept
+            else None
+        )
+        fresh["max_drawdown"] = _running_worst(fresh["drawdown"][start:], seed)
+
+        metrics = {}
+        for name, values in fresh.items():
+            new_rows = values if name == "max_drawdown" else values[start:]
+            metrics[name] = np.vstack(
+                [carried(previous.metrics[name][:kept]), new_rows]
+            )
+        return AnalyticsResult(
+            dates=np.concatenate([previous.dates[:kept], combined.dates[start:]]),
+            stock_ids=stock_ids,
+            metrics=metrics,
+            tail=combined.tail(self.settings.lookback),
+            peak=np.fmax(peak, _column_max(combined.values)),
+            adjusted_through=previous.adjusted_through,
+        )
@@ -0,0 +1,139 @@
+import datetime
+from logging import Logger as StandardLogger
+from pathlib import Path
+from typing import Optional
+import numpy as np
+
+from components.analytics.price_matrix import PriceMatrix
+from components.analytics.technical_analytics import (
+    AnalyticsResult,
+    TechnicalAnalytics,
+)
+from components.cache.interfaces.data_version_repository import (
+    DataVersionRepository,
+)
+from components.cache.result_cache import ResultCache
+from components.market_data.interfaces.price_history_repository import (
+    PriceHistoryRepository,
+)
+from components.market_data.price_adjuster import PriceAdjuster
+from components.metrics.metrics_registry import MetricsRegistry
+
+# Tables the analytics are computed from, for versioning shared refreshes.
+SOURCE_TABLES = ("stock_price_history", "corporate_actions")
+
+
+class TechnicalAnalyticsService:
+
+    def __init__(
+        self,
+        repository: PriceHistoryRepository,
+        cache_path: Path,
+        analytics: TechnicalAnalytics = None,
+        adjuster: PriceAdjuster = None,
+        result_cache: ResultCache = None,
+        version_repository: DataVersionRepository = None,
+        logger: StandardLogger = None,
+        metrics: MetricsRegistry = None,
+    ):
+        self.repository = repository
+        self.cache_path = Path(cache_path)
+        self.analytics = analytics or TechnicalAnalytics()
+        # The adjuster behind an adjusted repository; with it, stocks that got
+        # new corporate actions are recomputed instead of the whole cache.
+        self.adjuster = adjuster
+        # The analytics are far larger than anything the result cache should
+        # hold, so they stay in cache_path; the result cache only makes sure
+        # one process refreshes that file per version of the source tables.
+        self.result_cache = result_cache
+        self.version_repository = version_repository
+        self.logger = logger
+        self._result: Optional[AnalyticsResult] = None
+        self._loaded_mtime: Optional[int] = None
+        self._cache_metric = (metrics or MetricsRegistry.default()).counter(
+            "moneymonkey_cache_requests",
+            "Cache lookups by cache and result (hit, partial, miss).",
+            ("cache", "result"),
+        )
+
+    def _load_cached(self) -> Optional[AnalyticsResult]:
+        # Reloads when another process has replaced the file.
+        try:
+            mtime = self.cache_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return self._result
+        if self._result is not None and mtime == self._loaded_mtime:
+            return self._result
+        try:
+            self._result = AnalyticsResult.load(self.cache_path)
+            self._loaded_mtime = mtime
+        except Exception as e:
+            self.logger.warning(
+                f"Ignoring unreadable analytics cache '{self.cache_path}'. Error: {e}"
+            )
+        return self._result
+
+    def _readjust(self, cached: AnalyticsResult) -> bool:
+        # Recomputes the columns of stocks whose adjusted history changed
+        # since the cache was built; returns whether any did.
+        self.adjuster.refresh()
+        if cached.adjusted_through >= self.adjuster.last_action_id:
+            return False
+        stock_ids = np.intersect1d(
+            self.adjuster.changed_since(cached.adjusted_through), cached.stock_ids
+        )
+        cached.adjusted_through = self.adjuster.last_action_id
+        if len(stock_ids) == 0:
+            return True
+        points = self.repository.load_price_points(stock_ids=stock_ids.tolist())
+        matrix = PriceMatrix.from_points(points).reindex(cached.dates, stock_ids)
+        cached.replace_columns(self.analytics.compute(matrix))
+        self.logger.info(
+            f"Recomputed technical analytics of {len(stock_ids)} stocks "
+            "after corporate actions."
+        )
+        return True
+
+    def get_analytics(self) -> AnalyticsResult:
+        if self.result_cache is None:
+            return self._refresh()
+        versions = self.version_repository.data_versions(SOURCE_TABLES)
+        self.result_cache.get_or_compute(
+            "technical_refresh",
+            {"path": str(self.cache_path)},
+            lambda: str(self._refresh().dates[-1:]),
+            versions=versions,
+        )
+        # The file may have gone since the entry was stored.
+        result = self._load_cached()
+        return result if result is not None else self._refresh()
+
+    def _refresh(self) -> AnalyticsResult:
+        cached = self._load_cached()
+        if cached is None or len(cached.dates) == 0:
+            self._cache_metric.inc(cache="technical", result="miss")
+            points = self.repository.load_price_points()
+            result = self.analytics.compute(PriceMatrix.from_points(points))
+            if self.adjuster is not None:
+                result.adjusted_through = self.adjuster.last_action_id
+        else:
+            readjusted = self.adjuster is not None and self._readjust(cached)
+            # Re-read the last cached day as well, late ticks may have arrived.
+            since = cached.dates[-1].astype(datetime.datetime)
+            since = datetime.datetime.combine(since, datetime.time())
+            points = self.repository.load_price_points(start=since)
+            if len(points) == 0 and not readjusted:
+                self._cache_metric.inc(cache="technical", result="hit")
+                return cached
+            self._cache_metric.inc(cache="technical", result="partial")
+            result = self.analytics.extend(cached, PriceMatrix.from_points(points))
+
+        result.save(self.cache_path)
+        self._result = result
+        self._loaded_mtime = self.cache_path.stat().st_mtime_ns
+        return result
+
+    def invalidate(self) -> None:
+        self._result = None
+        self._loaded_mtime = None
+        self.cache_path.unlink(missing_ok=True)
@@ -0,0 +1,134 @@
+from dataclasses import dataclass
+import datetime
+import json
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from components.analytics.price_matrix import PriceMatrix
+from components.analytics.technical_analytics import forward_fill
+from components.market_data.interfaces.fundamentals_repository import (
+    FundamentalsRepository,
+    MetricPoints,
+)
+from components.market_data.interfaces.price_history_repository import (
+    PriceHistoryRepository,
+)
+
+# Tables BacktestData.from_repositories reads, for versioning cached copies.
+SOURCE_TABLES = (
+    "stock_price_history",
+    "financial_metrics",
+    "dividend_yields",
+    "metric_names",
+    "corporate_actions",
+)
+
+_ARRAYS = (
+    "dates",
+    "stock_ids",
+    "returns",
+    "tradable",
+    "point_columns",
+    "point_metrics",
+    "point_days",
+    "point_values",
+)
+
+
+@dataclass
+class BacktestData:
+    # Everything a backtest reads, as plain arrays:
+    # - dates (D, datetime64[D]) and stock_ids (N) span the price grid;
+    # - returns (D x N) are close-to-close returns, 0 where a stock has no
+    #   price, and tradable (D x N) marks stocks with a recent price;
+    # - point_* hold every metric and dividend observation, one per row, with
+    #   point_columns indexing stock_ids and point_days the day it was recorded.
+    dates: np.ndarray
+    stock_ids: np.ndarray
+    returns: np.ndarray
+    tradable: np.ndarray
+    point_columns: np.ndarray
+    point_metrics: np.ndarray
+    point_days: np.ndarray
+    point_values: np.ndarray
+    metric_names: Dict[int, str]
+
+    @classmethod
+    def from_points(
+        cls, prices: PriceMatrix, metrics: MetricPoints, stale_price_days: int = 5
+    ) -> "BacktestData":
+        filled = forward_fill(prices.values, limit=stale_price_days)
+        tradable = ~np.isnan(filled)
+        returns = np.zeros_like(filled)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns[1:] = filled[1:] / filled[:-1] - 1.0
+        returns[~np.isfinite(returns)] = 0.0
+        returns[~tradable] = 0.0
+
+        known = np.isin(metrics.stock_ids, prices.stock_ids)
+        return cls(
+            dates=prices.dates,
+            stock_ids=prices.stock_ids,
+            returns=returns,
+            tradable=tradable,
+            point_columns=np.searchsorted(prices.stock_ids, metrics.stock_ids[known]),
+            point_metrics=metrics.metric_ids[known],
+            point_days=metrics.recorded_at[known].astype("datetime64[D]"),
+            point_values=metrics.values[known],
+            metric_names=dict(metrics.metric_names),
+        )
+
+    @classmethod
+    def from_repositories(
+        cls,
+        price_repository: PriceHistoryRepository,
+        fundamentals_repository: FundamentalsRepository,
+        start: Optional[datetime.datetime] = None,
+        end: Optional[datetime.datetime] = None,
+    ) -> "BacktestData":
+        prices = PriceMatrix.from_points(
+            price_repository.load_price_points(start=start, end=end)
+        )
+        metrics = fundamentals_repository.load_metric_points(end=end)
+        dividends = fundamentals_repository.load_dividend_points(end=end)
+        # Fundamentals from before the first price still count as the latest
+        # known value, so they are loaded without a start date.
+        combined = MetricPoints(
+            stock_ids=np.concatenate([metrics.stock_ids, dividends.stock_ids]),
+            metric_ids=np.concatenate([metrics.metric_ids, dividends.metric_ids]),
+            recorded_at=np.concatenate([metrics.recorded_at, dividends.recorded_at]),
+            values=np.concatenate([metrics.values, dividends.values]),
+            metric_names={**metrics.metric_names, **dividends.metric_names},
+        )
+        return cls.from_points(prices, combined)
+
+    def metric_id(self, name: str) -> Optional[int]:
+        for metric_id, metric_name in self.metric_names.items():
+            if metric_name == name:
+                return metric_id
+        return None
+
+    def save(self, directory: Path) -> None:
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in _ARRAYS:
+            np.save(directory / f"{name}.npy", getattr(self, name))
+        (directory / "metric_names.json").write_text(
+            json.dumps({str(key): value for key, value in self.metric_names.items()})
+        )
+
+    @classmethod
+    def load(cls, directory: Path, mmap: bool = True) -> "BacktestData":
+        # Memory-mapped, so sweep workers share the page cache instead of
+        # each holding a copy of the return matrix.
+        directory = Path(directory)
+        arrays = {
+            name: np.load(directory / f"{name}.npy", mmap_mode="r" if mmap else None)
+            for name in _ARRAYS
+        }
+        names = json.loads((directory / "metric_names.json").read_text())
+        return cls(
+            **arrays, metric_names={int(key): value for key, value in names.items()}
+        )
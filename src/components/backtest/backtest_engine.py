@@ -0,0 +1,219 @@
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+import numpy as np
+
+from components.analytics.technical_analytics import drawdown, forward_fill
+from components.backtest.backtest_data import BacktestData
+from components.market_data.interfaces.fundamentals_repository import DIVIDEND_YIELD
+
+TRADING_DAYS_PER_YEAR = 252
+
+# Positive weights favour high values, negative weights favour low values.
+DEFAULT_WEIGHTS = {
+    "PE Ratio": -1.0,
+    "EPS": 0.5,
+    "Debt to Equity": -0.5,
+    "Current Ratio": 0.25,
+    "Return on Equity": 1.0,
+    "Return on Assets": 0.5,
+    DIVIDEND_YIELD: 0.5,
+}
+
+
+@dataclass
+class ScoringRules:
+    # A stock's score is the weighted mean of its cross-sectional percentile
+    # per metric. Stocks scoring in the top (1 - buy_quantile) are bought,
+    # held ones stay until they drop below sell_quantile.
+    weights: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_WEIGHTS))
+    buy_quantile: float = 0.8
+    sell_quantile: float = 0.5
+    max_staleness_days: int = 200
+
+
+@dataclass
+class BacktestSettings:
+    rules: ScoringRules = field(default_factory=ScoringRules)
+    rebalance_every: int = 21
+    # Trading days between the rebalance date whose data is used and the
+    # close at which the trades are filled.
+    execution_lag: int = 1
+    cost_bps: float = 10.0
+    max_positions: Optional[int] = None
+
+
+@dataclass
+class BacktestReport:
+    settings: BacktestSettings
+    dates: np.ndarray
+    daily_returns: np.ndarray
+    rebalance_dates: np.ndarray
+    turnover: np.ndarray
+    positions: np.ndarray
+
+    @property
+    def equity(self) -> np.ndarray:
+        return np.cumprod(1.0 + self.daily_returns)
+
+    def summary(self) -> Dict[str, float]:
+        equity = self.equity
+        years = len(self.daily_returns) / TRADING_DAYS_PER_YEAR
+        volatility = float(np.std(self.daily_returns) * np.sqrt(TRADING_DAYS_PER_YEAR))
+        cagr = float(equity[-1] ** (1 / years) - 1) if len(equity) and years else 0.0
+        return {
+            "total_return": float(equity[-1] - 1) if len(equity) else 0.0,
+            "cagr": cagr,
+            "annual_volatility": volatility,
+            "sharpe": cagr / volatility if volatility else 0.0,
+            "max_drawdown": (
+                float(drawdown(equity[:, None]).min()) if len(equity) else 0.0
+            ),
+            "average_turnover": (
+                float(self.turnover.mean()) if len(self.turnover) else 0.0
+            ),
+            "average_positions": (
+                float(self.positions.mean()) if len(self.positions) else 0.0
+            ),
+        }
+
+
+def percentile_ranks(values: np.ndarray) -> np.ndarray:
+    # Row-wise rank scaled to [0, 1]; NaN stays NaN and does not count.
+    valid = ~np.isnan(values)
+    order = np.argsort(np.where(valid, values, np.inf), axis=1, kind="stable")
+    ranks = np.empty(values.shape)
+    np.put_along_axis(
+        ranks, order, np.broadcast_to(np.arange(values.shape[1]), values.shape), axis=1
+    )
+    counts = valid.sum(axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scaled = np.where(counts > 1, ranks / (counts - 1), 0.5)
+    scaled[~valid] = np.nan
+    return scaled
+
+
+def as_of_panel(
+    data: BacktestData,
+    metric_id: int,
+    rebalance_days: np.ndarray,
+    max_staleness_days: int,
+) -> np.ndarray:
+    # Latest value per stock known on each rebalance day: a value recorded on
+    # day d is first visible at the first rebalance on or after d, and values
+    # older than max_staleness_days are dropped.
+    selected = data.point_metrics == metric_id
+    days = data.point_days[selected]
+    columns = data.point_columns[selected]
+    values = data.point_values[selected]
+    rows = np.searchsorted(rebalance_days, days, side="left")
+    inside = rows < len(rebalance_days)
+    rows, columns, days, values = (
+        rows[inside],
+        columns[inside],
+        days[inside],
+        values[inside],
+    )
+    shape = (len(rebalance_days), len(data.stock_ids))
+    panel = np.full(shape, np.nan)
+    recorded = np.full(shape, np.nan)
+    if len(rows):
+        # Several values can land in one cell; the latest recorded one wins.
+        cells = rows * shape[1] + columns
+        order = np.lexsort((days, cells))
+        last = np.append(cells[order][1:] != cells[order][:-1], True)
+        keep = order[last]
+        panel[rows[keep], columns[keep]] = values[keep]
+        recorded[rows[keep], columns[keep]] = days[keep].astype(np.int64)
+    panel = forward_fill(panel)
+    recorded = forward_fill(recorded)
+    age = rebalance_days.astype(np.int64)[:, None] - recorded
+    panel[~(age <= max_staleness_days)] = np.nan
+    return panel
+
+
+def score(data: BacktestData, rules: ScoringRules, rebalance_rows: np.ndarray):
+    rebalance_days = data.dates[rebalance_rows]
+    tradable = data.tradable[rebalance_rows]
+    total = np.zeros((len(rebalance_rows), len(data.stock_ids)))
+    weight = np.zeros_like(total)
+    for name, metric_weight in rules.weights.items():
+        metric_id = data.metric_id(name)
+        if metric_id is None or metric_weight == 0:
+            continue
+        panel = as_of_panel(data, metric_id, rebalance_days, rules.max_staleness_days)
+        panel[~tradable] = np.nan
+        ranks = percentile_ranks(panel)
+        if metric_weight < 0:
+            ranks = 1.0 - ranks
+        available = ~np.isnan(ranks)
+        total[available] += abs(metric_weight) * ranks[available]
+        weight[available] += abs(metric_weight)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = np.where(weight > 0, total / weight, np.nan)
+    scores[~tradable] = np.nan
+    return scores
+
+
+def target_weights(scores: np.ndarray, settings: BacktestSettings) -> np.ndarray:
+    rules = settings.rules
+    signal = percentile_ranks(scores)
+    targets = np.zeros_like(scores)
+    held = np.zeros(scores.shape[1], dtype=bool)
+    # Holding depends on the previous rebalance, so this walks the dates; each
+    # step is vectorized over all stocks.
+    for row in range(len(scores)):
+        buy = signal[row] >= rules.buy_quantile
+        keep = signal[row] >= rules.sell_quantile
+        held = (held & keep) | buy
+        if settings.max_positions and held.sum() > settings.max_positions:
+            ranked = np.where(held, signal[row], -np.inf)
+            top = np.argpartition(-ranked, settings.max_positions)
+            held = np.zeros_like(held)
+            held[top[: settings.max_positions]] = True
+        if held.any():
+            targets[row] = held / held.sum()
+    return targets
+
+
+class BacktestEngine:
+
+    def __init__(self, data: BacktestData):
+        self.data = data
+
+    def run(self, settings: BacktestSettings = None) -> BacktestReport:
+        settings = settings or BacktestSettings()
+        data = self.data
+        days = len(data.dates)
+        rebalance_rows = np.arange(0, days, settings.rebalance_every)
+        rebalance_rows = rebalance_rows[rebalance_rows + settings.execution_lag < days]
+        targets = target_weights(score(data, settings.rules, rebalance_rows), settings)
+        executions = np.append(rebalance_rows + settings.execution_lag, days - 1)
+
+        daily_returns = np.zeros(days)
+        turnover = np.zeros(len(rebalance_rows))
+        weights = np.zeros(len(data.stock_ids))
+        for index, target in enumerate(targets):
+            first, last = executions[index] + 1, executions[index + 1] + 1
+            traded = np.abs(target - weights).sum()
+            turnover[index] = traded / 2
+            cost = traded * settings.cost_bps / 10000
+            # Positions drift with their own returns until the next rebalance;
+            # whatever is not invested stays in cash at 0%.
+            growth = np.cumprod(1.0 + np.asarray(data.returns[first:last]), axis=0)
+            values = growth @ target + (1.0 - target.sum())
+            if len(values):
+                daily_returns[first:last] = values / np.append(1.0, values[:-1]) - 1
+                daily_returns[first] = (1.0 - cost) * values[0] - 1.0
+                weights = growth[-1] * target / values[-1]
+            else:
+                weights = target
+        start = executions[0] + 1 if len(rebalance_rows) else days
+        return BacktestReport(
+            settings=settings,
+            dates=data.dates[start:],
+            daily_returns=daily_returns[start:],
+            rebalance_dates=data.dates[rebalance_rows],
+            turnover=turnover,
+            positions=(targets > 0).sum(axis=1),
+        )
@@ -0,0 +1,69 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+import itertools
+import multiprocessing
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from components.backtest.backtest_data import BacktestData
+from components.backtest.backtest_engine import (
+    BacktestEngine,
+    BacktestSettings,
+    ScoringRules,
+)
+
+# Per-process engine, set up once by the pool initializer over memory-mapped
+# arrays, so a sweep pays for loading the data once per worker, not per run.
+_worker: Dict[str, BacktestEngine] = {}
+
+
+def _initialize_worker(data_dir: Path) -> None:
+    _worker["engine"] = BacktestEngine(BacktestData.load(data_dir))
+
+
+def _run(settings: BacktestSettings) -> Dict[str, float]:
+    return _worker["engine"].run(settings).summary()
+
+
+def settings_grid(
+    base: BacktestSettings = None, **values: Sequence
+) -> List[BacktestSettings]:
+    # Every combination of the given values, e.g.
+    # settings_grid(rebalance_every=[5, 21], buy_quantile=[0.7, 0.8]).
+    # Names of ScoringRules fields apply to the rules.
+    base = base or BacktestSettings()
+    rule_fields = set(ScoringRules.__dataclass_fields__)
+    names = list(values)
+    grid = []
+    for combination in itertools.product(*(values[name] for name in names)):
+        chosen = dict(zip(names, combination))
+        rules = {k: v for k, v in chosen.items() if k in rule_fields}
+        others = {k: v for k, v in chosen.items() if k not in rule_fields}
+        grid.append(replace(base, rules=replace(base.rules, **rules), **others))
+    return grid
+
+
+class ParameterSweep:
+
+    def __init__(
+        self,
+        data_dir: Path,
+        max_workers: Optional[int] = None,
+        start_method: str = "spawn",
+    ):
+        self.data_dir = Path(data_dir)
+        self.max_workers = max_workers
+        self.start_method = start_method
+
+    def run(
+        self, settings: Iterable[BacktestSettings]
+    ) -> List[Tuple[BacktestSettings, Dict[str, float]]]:
+        settings = list(settings)
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context(self.start_method),
+            initializer=_initialize_worker,
+            initargs=(self.data_dir,),
+        ) as executor:
+            summaries = list(executor.map(_run, settings))
+        return list(zip(settings, summaries))
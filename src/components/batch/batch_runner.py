@@ -0,0 +1,141 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+import json
+from logging import Logger as StandardLogger
+import multiprocessing
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from components.batch.interfaces.stock_analysis import StockAnalysis
+from components.batch.shard_planner import Shard
+from components.batch.sqlAlchemy_analysis_result_repository import (
+    SqlalchemyAnalysisResultRepository,
+)
+from components.database.interfaces.connector import Connector
+from components.database.mysql_connector import MySQLConnector
+from components.logger.native_logger import NativeLogger
+
+# Per-process state, set up once by the pool initializer so every worker owns
+# its own engine and connection pool instead of inheriting the parent's.
+_worker: Dict[str, object] = {}
+
+
+def _initialize_worker(
+    connector_factory: Callable[[], Connector],
+    analysis: StockAnalysis,
+    logger_factory: Callable[[], StandardLogger],
+) -> None:
+    connector = connector_factory()
+    _worker["connector"] = connector
+    _worker["analysis"] = analysis
+    _worker["results"] = SqlalchemyAnalysisResultRepository(
+        connector=connector, logger=logger_factory()
+    )
+
+
+def _run_shard(shard: Shard, run_id: str) -> int:
+    analysis: StockAnalysis = _worker["analysis"]
+    results = analysis.analyze(list(shard.stock_ids), _worker["connector"])
+    return _worker["results"].replace_results(analysis.name, run_id, results)
+
+
+class BatchCheckpoint:
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.completed: Dict[str, int] = {}
+        if self.path.exists():
+            self.completed = json.loads(self.path.read_text())["completed"]
+
+    def is_done(self, shard: Shard) -> bool:
+        return shard.key in self.completed
+
+    def mark_done(self, shard: Shard, results: int) -> None:
+        self.completed[shard.key] = results
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_name(self.path.name + ".tmp")
+        temporary.write_text(json.dumps({"completed": self.completed}))
+        temporary.replace(self.path)
+
+
+@dataclass
+class BatchReport:
+    run_id: str
+    shards_total: int
+    shards_skipped: int = 0
+    shards_done: int = 0
+    results_written: int = 0
+    failed: List[str] = field(default_factory=list)
+
+
+class BatchRunner:
+
+    def __init__(
+        self,
+        analysis: StockAnalysis,
+        checkpoint_dir: Path,
+        connector_factory: Callable[[], Connector] = MySQLConnector,
+        logger_factory: Callable[[], StandardLogger] = NativeLogger.get_logger,
+        max_workers: Optional[int] = None,
+        start_method: str = "spawn",
+        logger: StandardLogger = None,
+        progress: Callable[[BatchReport], None] = None,
+    ):
+        self.analysis = analysis
+        self.checkpoint_dir = Path(checkpoint_dir)
+        self.connector_factory = connector_factory
+        self.logger_factory = logger_factory
+        self.max_workers = max_workers
+        self.start_method = start_method
+        self.logger = logger
+        self.progress = progress
+
+    def checkpoint_for(self, run_id: str) -> BatchCheckpoint:
+        return BatchCheckpoint(
+            self.checkpoint_dir / f"{self.analysis.name}-{run_id}.json"
+        )
+
+    def run(self, shards: List[Shard], run_id: str) -> BatchReport:
+        checkpoint = self.checkpoint_for(run_id)
+        pending = [shard for shard in shards if not checkpoint.is_done(shard)]
+        report = BatchReport(
+            run_id=run_id,
+            shards_total=len(shards),
+            shards_skipped=len(shards) - len(pending),
+        )
+        if report.shards_skipped:
+            self.logger.info(
+                f"Resuming run '{run_id}': {report.shards_skipped} of {len(shards)} shards already done."
+            )
+        if not pending:
+            return report
+
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context(self.start_method),
+            initializer=_initialize_worker,
+            initargs=(self.connector_factory, self.analysis, self.logger_factory),
+        ) as executor:
+            futures = {
+                executor.submit(_run_shard, shard, run_id): shard for shard in pending
+            }
+            for future in as_completed(futures):
+                self._collect(future, futures[future], checkpoint, report)
+        return report
+
+    def _collect(self, future, shard: Shard, checkpoint, report: BatchReport) -> None:
+        try:
+            written = future.result()
+        except Exception as e:
+            report.failed.append(shard.key)
+            self.logger.error(f"Shard '{shard.key}' failed. Error: {e}")
+        else:
+            checkpoint.mark_done(shard, written)
+            report.shards_done += 1
+            report.results_written += written
+            finished = report.shards_done + report.shards_skipped
+            self.logger.info(
+                f"Shard '{shard.key}' done: {written} results ({finished}/{report.shards_total})."
+            )
+        if self.progress:
+            self.progress(report)
@@ -0,0 +1,11 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict
+
+
+class AnalysisResultRepository(ABC):
+
+    @abstractmethod
+    def replace_results(
+        self, analysis_name: str, run_id: str, results: Dict[int, Dict[str, Any]]
+    ) -> int:
+        pass
@@ -0,0 +1,17 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List
+from components.database.interfaces.connector import Connector
+
+
+class StockAnalysis(ABC):
+
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        pass
+
+    @abstractmethod
+    def analyze(
+        self, stock_ids: List[int], connector: Connector
+    ) -> Dict[int, Dict[str, Any]]:
+        pass
@@ -0,0 +1,43 @@
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+
+from components.market_data.interfaces.stock_repository import StockRepository
+
+
+@dataclass(frozen=True)
+class Shard:
+    key: str
+    stock_ids: Tuple[int, ...]
+
+
+def _chunks(stock_ids: Sequence[int], size: int) -> List[Tuple[int, ...]]:
+    return [
+        tuple(stock_ids[start : start + size])
+        for start in range(0, len(stock_ids), size)
+    ]
+
+
+class ShardPlanner:
+
+    def __init__(self, stock_repository: StockRepository, shard_size: int = 250):
+        if shard_size < 1:
+            raise ValueError(f"Shard size must be positive: {shard_size}")
+        self.stock_repository = stock_repository
+        self.shard_size = shard_size
+
+    def by_id_range(self) -> List[Shard]:
+        stock_ids = self.stock_repository.list_stock_ids()
+        return [
+            Shard(key=f"ids:{chunk[0]}-{chunk[-1]}", stock_ids=chunk)
+            for chunk in _chunks(stock_ids, self.shard_size)
+        ]
+
+    def by_sector(self) -> List[Shard]:
+        shards = []
+        by_sector = self.stock_repository.list_stock_ids_by_sector()
+        for sector_name, stock_ids in by_sector.items():
+            for part, chunk in enumerate(_chunks(stock_ids, self.shard_size)):
+                shards.append(
+                    Shard(key=f"sector:{sector_name}:{part}", stock_ids=chunk)
+                )
+        return shards
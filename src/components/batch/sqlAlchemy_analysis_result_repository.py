@@ -0,0 +1,57 @@
+import datetime
+from typing import Any, Dict
+from logging import Logger as StandardLogger
+from sqlalchemy import delete, insert
+from components.batch.interfaces.analysis_result_repository import (
+    AnalysisResultRepository,
+)
+from components.database.interfaces.connector import Connector
+from components.database.models import AnalysisResult
+
+
+class SqlalchemyAnalysisResultRepository(AnalysisResultRepository):
+
+    def __init__(
+        self,
+        config=None,
+        connector: Connector = None,
+        logger: StandardLogger = None,
+    ):
+        self.config = config
+        self.session = connector.get_session()
+        self.logger = logger
+
+    def replace_results(
+        self, analysis_name: str, run_id: str, results: Dict[int, Dict[str, Any]]
+    ) -> int:
+        if not results:
+            return 0
+        recorded_at = datetime.datetime.now(datetime.timezone.utc)
+        rows = [
+            {
+                "stock_id": stock_id,
+                "analysis_name": analysis_name,
+                "run_id": run_id,
+                "date_recorded": recorded_at,
+                "data": data,
+            }
+            for stock_id, data in results.items()
+        ]
+        try:
+            # Deleting first makes a re-run of the same shard idempotent.
+            self.session.execute(
+                delete(AnalysisResult).where(
+                    AnalysisResult.run_id == run_id,
+                    AnalysisResult.analysis_name == analysis_name,
+                    AnalysisResult.stock_id.in_(list(results)),
+                )
+            )
+            self.session.execute(insert(AnalysisResult), rows)
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            self.logger.error(
+                f"Failed to write {len(rows)} '{analysis_name}' results. Error: {e}"
+            )
+            raise
+        return len(rows)
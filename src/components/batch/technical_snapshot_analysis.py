@@ -0,0 +1,60 @@
+import datetime
+from typing import Any, Dict, List
+import numpy as np
+
+from components.analytics.price_matrix import PriceMatrix
+from components.analytics.technical_analytics import (
+    AnalyticsSettings,
+    TechnicalAnalytics,
+)
+from components.batch.interfaces.stock_analysis import StockAnalysis
+from components.database.interfaces.connector import Connector
+from components.logger.native_logger import NativeLogger
+from components.market_data.adjusted_price_history_repository import (
+    AdjustedPriceHistoryRepository,
+)
+from components.market_data.price_adjuster import PriceAdjuster
+from components.market_data.sqlAlchemy_corporate_action_repository import (
+    SqlalchemyCorporateActionRepository,
+)
+from components.market_data.sqlAlchemy_price_history_repository import (
+    SqlalchemyPriceHistoryRepository,
+)
+
+
+class TechnicalSnapshotAnalysis(StockAnalysis):
+    name = "technical_snapshot"
+
+    def __init__(self, settings: AnalyticsSettings = None):
+        self.settings = settings or AnalyticsSettings()
+
+    def analyze(
+        self, stock_ids: List[int], connector: Connector
+    ) -> Dict[int, Dict[str, Any]]:
+        logger = NativeLogger.get_logger()
+        repository = AdjustedPriceHistoryRepository(
+            SqlalchemyPriceHistoryRepository(connector=connector, logger=logger),
+            PriceAdjuster(
+                SqlalchemyCorporateActionRepository(connector=connector, logger=logger),
+                stock_ids=stock_ids,
+            ),
+        )
+        # Calendar days covering the longest window with room for weekends.
+        history = datetime.timedelta(days=self.settings.lookback * 7 // 5 + 14)
+        start = datetime.datetime.now(datetime.timezone.utc) - history
+        points = repository.load_price_points(stock_ids=stock_ids, start=start)
+        matrix = PriceMatrix.from_points(points)
+        if len(matrix) == 0:
+            return {}
+
+        result = TechnicalAnalytics(self.settings).compute(matrix)
+        latest = result.latest()
+        snapshot = {}
+        for index, stock_id in enumerate(result.stock_ids):
+            values = {
+                name: (None if np.isnan(column[index]) else float(column[index]))
+                for name, column in latest.items()
+            }
+            values["as_of"] = str(result.dates[-1])
+            snapshot[int(stock_id)] = values
+        return snapshot
@@ -0,0 +1,36 @@
+import time
+from typing import Callable, Dict
+import numpy as np
+
+from components.analytics.correlation_engine import CorrelationEngine
+from components.analytics.price_matrix import PriceMatrix
+from components.analytics.technical_analytics import TechnicalAnalytics
+
+
+def random_walk_matrix(stocks: int, days: int, seed: int = 42) -> PriceMatrix:
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0002, 0.015, (days, stocks))
+    values = 100 * np.exp(np.cumsum(returns, axis=0))
+    values[rng.random((days, stocks)) < 0.01] = np.nan
+    return PriceMatrix(
+        dates=np.datetime64("2000-01-03") + np.arange(days),
+        stock_ids=np.arange(1, stocks + 1, dtype=np.int64),
+        values=values,
+    )
+
+
+def _timed(action: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    action()
+    return time.perf_counter() - started
+
+
+def run_kernel_benchmark(stocks: int, days: int, seed: int = 42) -> Dict[str, float]:
+    matrix = random_walk_matrix(stocks, days, seed)
+    analytics = TechnicalAnalytics()
+    # One year of returns, as used for diversification checks.
+    window = PriceMatrix(matrix.dates[-252:], matrix.stock_ids, matrix.values[-252:])
+    return {
+        "technical_analytics": _timed(lambda: analytics.compute(matrix)),
+        "correlation": _timed(lambda: CorrelationEngine().compute(window)),
+    }
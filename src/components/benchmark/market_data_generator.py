@@ -0,0 +1,296 @@
+from dataclasses import dataclass
+import datetime
+from logging import Logger as StandardLogger
+from typing import Dict, Iterable, List
+import numpy as np
+from sqlalchemy import bindparam, func, insert, select, text, update
+
+from components.database.batch_validation import validate_rows
+from components.database.interfaces.connector import Connector
+from components.database.models import (
+    DataSource,
+    DividendYield,
+    FinancialMetric,
+    Industry,
+    MetricName,
+    Stock,
+    StockData,
+    StockPriceHistory,
+)
+
+CLOSE_TIME = datetime.time(21, 0)
+QUARTER_DAYS = 63
+
+# Log-normal (median, sigma) per seeded metric; other names get the default.
+METRIC_PROFILES = {
+    "PE Ratio": (18.0, 0.5),
+    "EPS": (3.0, 0.8),
+    "Debt to Equity": (0.8, 0.7),
+    "Current Ratio": (1.5, 0.4),
+    "Return on Equity": (14.0, 0.6),
+    "Return on Assets": (6.0, 0.6),
+}
+DEFAULT_METRIC_PROFILE = (10.0, 0.6)
+
+
+@dataclass(frozen=True)
+class GeneratorSettings:
+    stocks: int = 5000
+    days: int = 2520
+    start: datetime.date = datetime.date(2015, 1, 5)
+    dividend_payer_share: float = 0.6
+    stock_data_every_days: int = 5
+    chunk_rows: int = 50000
+
+
+class MarketDataGenerator:
+
+    def __init__(
+        self,
+        connector: Connector,
+        settings: GeneratorSettings = None,
+        seed: int = 42,
+        logger: StandardLogger = None,
+    ):
+        self.connector = connector
+        self._connection = None
+        self.settings = settings or GeneratorSettings()
+        self.logger = logger
+        # Independent streams per table: changing one table's shape does not
+        # change the values generated for another.
+        streams = np.random.SeedSequence(seed).spawn(5)
+        (
+            self._stock_rng,
+            self._price_rng,
+            self._dividend_rng,
+            self._metric_rng,
+            self._source_rng,
+        ) = (np.random.default_rng(stream) for stream in streams)
+
+    def trading_days(self) -> np.ndarray:
+        start = np.datetime64(self.settings.start, "D")
+        return np.busday_offset(start, np.arange(self.settings.days), roll="forward")
+
+    @staticmethod
+    def _timestamps(days: np.ndarray) -> List[datetime.datetime]:
+        return [datetime.datetime.combine(day, CLOSE_TIME) for day in days.tolist()]
+
+    def _insert(self, model, rows: Iterable[dict]) -> int:
+        chunk, written = [], 0
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= self.settings.chunk_rows:
+                written += self._flush(model, chunk)
+                chunk = []
+        if chunk:
+            written += self._flush(model, chunk)
+        return written
+
+    def _flush(self, model, rows: List[dict]) -> int:
+        # Core executemany: no ORM identity map or validators; the driver sends
+        # multi-row INSERT statements.
+        self._connection.execute(insert(model), validate_rows(model, rows))
+        self._connection.commit()
+        return len(rows)
+
+    def _scalars(self, statement) -> list:
+        return list(self._connection.execute(statement).scalars())
+
+    def _relax_constraints(self, relaxed: bool) -> None:
+        # Session variables, so everything runs on one dedicated connection.
+        if self._connection.dialect.name != "mysql":
+            return
+        value = 0 if relaxed else 1
+        self._connection.execute(
+            text(f"SET SESSION unique_checks={value}, foreign_key_checks={value}")
+        )
+
+    def generate(self) -> Dict[str, int]:
+        with self.connector.get_write_engine().connect() as connection:
+            self._connection = connection
+            try:
+                return self._generate()
+            finally:
+                self._connection = None
+
+    def _generate(self) -> Dict[str, int]:
+        industry_ids = self._scalars(select(Industry.id))
+        if not industry_ids:
+            raise ValueError(
+                "No industries found; run the migrations before generating data."
+            )
+        self._relax_constraints(True)
+        try:
+            counts = {}
+            stock_ids, start_prices = self._create_stocks(industry_ids)
+            counts["stocks"] = len(stock_ids)
+            counts["stock_price_history"], counts["stock_data"] = self._prices(
+                stock_ids, start_prices
+            )
+            counts["dividend_yields"] = self._dividend_yields(stock_ids)
+            counts["financial_metrics"] = self._financial_metrics(stock_ids)
+        except Exception as e:
+            self._connection.rollback()
+            self.logger.error(f"Failed to generate market data. Error: {e}")
+            raise
+        finally:
+            self._relax_constraints(False)
+        self.logger.info(f"Generated synthetic market data: {counts}.")
+        return counts
+
+    def _create_stocks(self, industry_ids: List[int]):
+        rng = self._stock_rng
+        count = self.settings.stocks
+        first_id = (self._scalars(select(func.max(Stock.id)))[0] or 0) + 1
+        stock_ids = np.arange(first_id, first_id + count)
+        industries = rng.choice(industry_ids, size=count)
+        start_prices = np.round(rng.lognormal(np.log(40), 0.8, count), 4)
+        market_caps = np.round(rng.lognormal(np.log(5e9), 1.5, count), 2)
+        created = datetime.datetime.combine(self.settings.start, CLOSE_TIME)
+        self._insert(
+            Stock,
+            (
+                {
+                    "id": stock_id,
+                    "ticker": f"S{stock_id:07d}",
+                    "company_name": f"Synthetic Company {stock_id}",
+                    "industry_id": industry,
+                    "market_cap": market_cap,
+                    "price": price,
+                    "created_at": created,
+                    "updated_at": created,
+                }
+                for stock_id, industry, market_cap, price in zip(
+                    stock_ids.tolist(),
+                    industries.tolist(),
+                    market_caps.tolist(),
+                    start_prices.tolist(),
+                )
+            ),
+        )
+        self.logger.info(f"Created {count} synthetic stocks.")
+        return stock_ids, start_prices
+
+    def _prices(self, stock_ids: np.ndarray, start_prices: np.ndarray):
+        rng = self._price_rng
+        count = len(stock_ids)
+        drift = rng.normal(0.0003, 0.0003, count)
+        volatility = rng.uniform(0.008, 0.03, count)
+        sources = self._data_source_ids()
+        # Each source reports the price with a small, source-specific bias.
+        source_bias = 1 + self._source_rng.normal(0, 0.002, (len(sources), count))
+        ids = stock_ids.tolist()
+        days = self.trading_days()
+        chunk_days = max(self.settings.chunk_rows // max(count, 1), 1)
+        last = start_prices.astype(np.float64)
+        history_rows = data_rows = 0
+        for start in range(0, len(days), chunk_days):
+            block = days[start : start + chunk_days]
+            returns = drift + volatility * rng.standard_normal((len(block), count))
+            prices = last * np.exp(np.cumsum(returns, axis=0))
+            last = prices[-1]
+            stamps = self._timestamps(block)
+            rounded = np.round(prices, 4).tolist()
+            history_rows += self._insert(
+                StockPriceHistory,
+                (
+                    {"stock_id": stock_id, "price": price, "date_recorded": stamp}
+                    for stamp, day_prices in zip(stamps, rounded)
+                    for stock_id, price in zip(ids, day_prices)
+                ),
+            )
+            data_rows += self._stock_data(
+                ids, start, stamps, prices, sources, source_bias
+            )
+            self.logger.info(
+                f"Generated prices up to {block[-1]} ({history_rows} rows)."
+            )
+        self._connection.execute(
+            update(Stock.__table__)
+            .where(Stock.__table__.c.id == bindparam("stock_id"))
+            .values(price=bindparam("last_price")),
+            [
+                {"stock_id": stock_id, "last_price": price}
+                for stock_id, price in zip(ids, np.round(last, 4).tolist())
+            ],
+        )
+        self._connection.commit()
+        return history_rows, data_rows
+
+    def _data_source_ids(self) -> List[int]:
+        sources = self._scalars(select(DataSource.id))
+        if sources:
+            return sources
+        self._insert(DataSource, [{"name": "Synthetic"}])
+        return self._scalars(select(DataSource.id))
+
+    def _stock_data(self, ids, offset, stamps, prices, sources, source_bias) -> int:
+        every = self.settings.stock_data_every_days
+        sampled = [
+            index
+            for index in range(len(stamps))
+            if every > 0 and (offset + index) % every == 0
+        ]
+        if not sampled:
+            return 0
+        volumes = self._source_rng.lognormal(13, 1, (len(sampled), len(ids)))
+        rows = []
+        for position, index in enumerate(sampled):
+            for source_index, source_id in enumerate(sources):
+                quoted = np.round(prices[index] * source_bias[source_index], 4)
+                rows.extend(
+                    {
+                        "stock_id": stock_id,
+                        "source_id": source_id,
+                        "date_recorded": stamps[index],
+                        "data": {"price": price, "volume": int(volume)},
+                    }
+                    for stock_id, price, volume in zip(
+                        ids, quoted.tolist(), volumes[position].tolist()
+                    )
+                )
+        return self._insert(StockData, rows)
+
+    def _dividend_yields(self, stock_ids: np.ndarray) -> int:
+        rng = self._dividend_rng
+        payers = stock_ids[
+            rng.random(len(stock_ids)) < self.settings.dividend_payer_share
+        ]
+        stamps = self._timestamps(self.trading_days()[::QUARTER_DAYS])
+        base = rng.lognormal(np.log(2.5), 0.5, len(payers))
+        noise = rng.lognormal(0, 0.1, (len(stamps), len(payers)))
+        yields = np.round(base * noise, 4)
+        return self._insert(
+            DividendYield,
+            (
+                {"stock_id": stock_id, "yield_value": value, "date_recorded": stamp}
+                for stamp, day_yields in zip(stamps, yields.tolist())
+                for stock_id, value in zip(payers.tolist(), day_yields)
+            ),
+        )
+
+    def _financial_metrics(self, stock_ids: np.ndarray) -> int:
+        rng = self._metric_rng
+        metrics = self._connection.execute(select(MetricName.id, MetricName.name)).all()
+        stamps = self._timestamps(self.trading_days()[::QUARTER_DAYS])
+        ids = stock_ids.tolist()
+        written = 0
+        for metric_id, name in metrics:
+            median, sigma = METRIC_PROFILES.get(name, DEFAULT_METRIC_PROFILE)
+            level = np.log(median) + sigma * rng.standard_normal(len(ids))
+            steps = 0.1 * rng.standard_normal((len(stamps), len(ids)))
+            values = np.round(np.exp(level + np.cumsum(steps, axis=0)), 2)
+            written += self._insert(
+                FinancialMetric,
+                (
+                    {
+                        "stock_id": stock_id,
+                        "metric_name_id": metric_id,
+                        "metric_value": value,
+                        "date_recorded": stamp,
+                    }
+                    for stamp, quarter in zip(stamps, values.tolist())
+                    for stock_id, value in zip(ids, quarter)
+                ),
+            )
+        return written
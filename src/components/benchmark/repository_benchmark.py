@@ -0,0 +1,291 @@
+from dataclasses import asdict, dataclass
+import datetime
+import json
+from logging import Logger as StandardLogger
+from pathlib import Path
+import time
+from typing import Callable, Dict, List, Optional
+import numpy as np
+from sqlalchemy import insert, make_url
+
+from components.admin.sqlAlchemy_admin_repository import SqlalchemyAdminRepository
+from components.batch.sqlAlchemy_analysis_result_repository import (
+    SqlalchemyAnalysisResultRepository,
+)
+from components.database.models import (
+    Base,
+    DataSource,
+    Industry,
+    Sector,
+    Stock,
+    StockPriceHistory,
+)
+from components.database.query_profiler import QueryProfiler
+from components.database.url_connector import UrlConnector
+from components.market_data.sqlAlchemy_price_history_repository import (
+    SqlalchemyPriceHistoryRepository,
+)
+from components.market_data.sqlAlchemy_stock_repository import (
+    SqlalchemyStockRepository,
+)
+
+FIRST_DAY = datetime.datetime(2015, 1, 5, 21, 0)
+
+
+@dataclass(frozen=True)
+class DatasetScale:
+    name: str
+    sectors: int
+    industries_per_sector: int
+    stocks: int
+    days: int
+
+
+SCALES = {
+    scale.name: scale
+    for scale in (
+        DatasetScale("small", sectors=5, industries_per_sector=4, stocks=100, days=250),
+        DatasetScale(
+            "medium", sectors=11, industries_per_sector=6, stocks=1000, days=500
+        ),
+        DatasetScale(
+            "large", sectors=11, industries_per_sector=12, stocks=5000, days=1000
+        ),
+    )
+}
+
+
+@dataclass
+class BenchmarkResult:
+    backend: str
+    scale: str
+    case: str
+    operations: int
+    seconds: float
+    queries: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.backend}/{self.scale}/{self.case}"
+
+    @property
+    def ops_per_sec(self) -> float:
+        return self.operations / self.seconds if self.seconds > 0 else float("inf")
+
+    @property
+    def queries_per_op(self) -> float:
+        return self.queries / self.operations if self.operations else 0.0
+
+
+class BenchmarkContext:
+
+    def __init__(
+        self, connector: UrlConnector, scale: DatasetScale, logger: StandardLogger
+    ):
+        self.scale = scale
+        self.admin = SqlalchemyAdminRepository(connector=connector, logger=logger)
+        self.stocks = SqlalchemyStockRepository(connector=connector, logger=logger)
+        self.prices = SqlalchemyPriceHistoryRepository(
+            connector=connector, logger=logger
+        )
+        self.results = SqlalchemyAnalysisResultRepository(
+            connector=connector, logger=logger
+        )
+        self.stock_ids = self.stocks.list_stock_ids()
+        self.first_sector = self.admin.list_sectors()[0]
+        self.last_day = FIRST_DAY + datetime.timedelta(days=scale.days - 1)
+
+
+BenchmarkCase = Callable[[BenchmarkContext, int], object]
+
+# Ordered: creating sectors first would change what the list case measures.
+CASES: Dict[str, BenchmarkCase] = {
+    "list_sectors": lambda context, i: context.admin.list_sectors(),
+    "list_stock_ids_by_sector": lambda context, i: context.stocks.list_stock_ids(
+        sectors=[context.first_sector]
+    ),
+    "create_sector": lambda context, i: context.admin.create_sector(
+        f"Benchmark Sector {i}"
+    ),
+    "bulk_replace_results": lambda context, i: context.results.replace_results(
+        "benchmark", "benchmark", {stock_id: {"i": i} for stock_id in context.stock_ids}
+    ),
+    "price_history_one_stock": lambda context, i: context.prices.load_price_points(
+        stock_ids=[context.stock_ids[i % len(context.stock_ids)]]
+    ),
+    "price_history_window": lambda context, i: context.prices.load_price_points(
+        stock_ids=context.stock_ids[:50],
+        start=context.last_day - datetime.timedelta(days=60),
+    ),
+}
+
+
+def seed_dataset(connector: UrlConnector, scale: DatasetScale, seed: int = 42) -> None:
+    engine = connector.engine
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    rng = np.random.default_rng(seed)
+    created = datetime.datetime(2015, 1, 1, tzinfo=datetime.timezone.utc)
+    industries = scale.sectors * scale.industries_per_sector
+    prices = 100 * np.exp(
+        np.cumsum(rng.normal(0.0002, 0.015, (scale.days, scale.stocks)), axis=0)
+    )
+    with engine.begin() as connection:
+        connection.execute(
+            insert(Sector),
+            [{"id": i + 1, "name": f"Sector {i + 1}"} for i in range(scale.sectors)],
+        )
+        connection.execute(
+            insert(Industry),
+            [
+                {
+                    "id": i + 1,
+                    "name": f"Industry {i + 1}",
+                    "sector_id": i // scale.industries_per_sector + 1,
+                }
+                for i in range(industries)
+            ],
+        )
+        connection.execute(
+            insert(Stock),
+            [
+                {
+                    "id": i + 1,
+                    "ticker": f"T{i + 1:05d}",
+                    "company_name": f"Company {i + 1}",
+                    "industry_id": i % industries + 1,
+                    "price": round(float(prices[-1, i]), 4),
+                    "created_at": created,
+                    "updated_at": created,
+                }
+                for i in range(scale.stocks)
+            ],
+        )
+        connection.execute(insert(DataSource), [{"id": 1, "name": "Benchmark"}])
+        for day in range(scale.days):
+            recorded_at = FIRST_DAY + datetime.timedelta(days=day)
+            connection.execute(
+                insert(StockPriceHistory),
+                [
+                    {
+                        "stock_id": i + 1,
+                        "price": round(float(prices[day, i]), 4),
+                        "date_recorded": recorded_at,
+                    }
+                    for i in range(scale.stocks)
+                ],
+            )
+
+
+def run_case(
+    case: BenchmarkCase,
+    context: BenchmarkContext,
+    profiler: QueryProfiler,
+    min_seconds: float = 1.0,
+    max_operations: int = 10000,
+    rounds: int = 3,
+):
+    # One warm-up call fills SQLAlchemy's statement caches; of the timed rounds
+    # the fastest is kept, which filters out scheduler noise on shared hosts.
+    case(context, 0)
+    operations = 1
+    best = None
+    queries = 0
+    for _ in range(rounds):
+        queries_before = profiler.thread_totals()[0]
+        done = 0
+        started = time.perf_counter()
+        elapsed = 0.0
+        while done < max_operations and (done == 0 or elapsed < min_seconds / rounds):
+            case(context, operations + done)
+            done += 1
+            elapsed = time.perf_counter() - started
+        operations += done
+        queries = profiler.thread_totals()[0] - queries_before
+        if best is None or done / elapsed > best[0] / best[1]:
+            best = (done, elapsed, queries)
+    return best
+
+
+def run_repository_benchmark(
+    database_url: str,
+    scales: List[str],
+    logger: StandardLogger,
+    allow_reset: bool = False,
+    min_seconds: float = 1.0,
+    seed: int = 42,
+) -> List[BenchmarkResult]:
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend != "sqlite" and not allow_reset:
+        raise ValueError(
+            f"The benchmark drops and recreates every table in '{url.database}'; "
+            "pass allow_reset to confirm it is a throwaway database."
+        )
+    results = []
+    for scale_name in scales:
+        scale = SCALES[scale_name]
+        connector = UrlConnector(database_url)
+        try:
+            seed_dataset(connector, scale, seed=seed)
+            profiler = QueryProfiler(capture_caller=False)
+            profiler.attach(connector.engine)
+            context = BenchmarkContext(connector, scale, logger)
+            for case_name, case in CASES.items():
+                operations, seconds, queries = run_case(
+                    case, context, profiler, min_seconds=min_seconds
+                )
+                results.append(
+                    BenchmarkResult(
+                        backend, scale.name, case_name, operations, seconds, queries
+                    )
+                )
+        finally:
+            connector.dispose()
+    return results
+
+
+class BenchmarkBaseline:
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def load(self) -> Dict[str, dict]:
+        if not self.path.exists():
+            return {}
+        return json.loads(self.path.read_text())
+
+    def save(self, results: List[BenchmarkResult]) -> None:
+        baseline = self.load()
+        for result in results:
+            baseline[result.key] = {
+                "ops_per_sec": result.ops_per_sec,
+                "queries_per_op": result.queries_per_op,
+                "recorded": asdict(result),
+            }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+
+    def regressions(
+        self, results: List[BenchmarkResult], threshold: float = 0.25
+    ) -> List[str]:
+        # Throughput is noisy, so it gets a tolerance; query counts are
+        # deterministic and any increase is reported.
+        baseline = self.load()
+        problems = []
+        for result in results:
+            expected: Optional[dict] = baseline.get(result.key)
+            if expected is None:
+                continue
+            floor = expected["ops_per_sec"] * (1 - threshold)
+            if result.ops_per_sec < floor:
+                problems.append(
+                    f"{result.key}: {result.ops_per_sec:.1f} ops/s, "
+                    f"baseline {expected['ops_per_sec']:.1f} ops/s"
+                )
+            if result.queries_per_op > expected["queries_per_op"] + 1e-9:
+                problems.append(
+                    f"{result.key}: {result.queries_per_op:.2f} queries/op, "
+                    f"baseline {expected['queries_per_op']:.2f}"
+                )
+        return problems
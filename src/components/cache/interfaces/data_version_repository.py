@@ -0,0 +1,11 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable
+
+
+class DataVersionRepository(ABC):
+
+    @abstractmethod
+    def data_versions(self, tables: Iterable[str]) -> Dict[str, str]:
+        # A stamp per table that changes whenever rows are added or updated,
+        # for keying cached results derived from those tables.
+        pass
@@ -0,0 +1,266 @@
+import hashlib
+import json
+from logging import Logger as StandardLogger
+import os
+from pathlib import Path
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+import uuid
+
+from components.metrics.metrics_registry import MetricsRegistry
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS entries ("
+    " key TEXT PRIMARY KEY, name TEXT NOT NULL, value BLOB NOT NULL,"
+    " size INTEGER NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS ix_entries_accessed ON entries (accessed_at)",
+    "CREATE TABLE IF NOT EXISTS leases ("
+    " key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)",
+)
+
+_MISSING = object()
+
+
+def cache_key(
+    name: str, parameters: Dict[str, Any], versions: Optional[Dict[str, str]] = None
+) -> str:
+    # Dates and other non-JSON parameters are keyed by their str().
+    encoded = json.dumps(
+        {"name": name, "parameters": parameters, "versions": versions or {}},
+        sort_keys=True,
+        default=str,
+    ).encode()
+    return hashlib.sha1(encoded).hexdigest()
+
+
+class ResultCache:
+    # Pickled results in one SQLite file shared by every process on the host.
+    # Each write is a single transaction, so readers see a whole entry or
+    # none, and WAL mode lets them keep reading while another process writes.
+    # A computation in progress holds a lease on its key; other processes
+    # asking for the same key wait for its result instead of recomputing it.
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = 1 << 30,
+        lease_seconds: float = 600.0,
+        poll_seconds: float = 0.1,
+        touch_seconds: float = 60.0,
+        clock: Callable[[], float] = time.time,
+        logger: StandardLogger = None,
+        metrics: MetricsRegistry = None,
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        # Hits only rewrite accessed_at once it is this old, so reads of a
+        # hot entry do not all queue for the write lock.
+        self.touch_seconds = touch_seconds
+        self.logger = logger
+        self._clock = clock
+        self._owner = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid = None
+        metrics = metrics or MetricsRegistry.default()
+        self._cache_metric = metrics.counter(
+            "moneymonkey_cache_requests",
+            "Cache lookups by cache and result (hit, partial, miss).",
+            ("cache", "result"),
+        )
+        self._evictions_metric = metrics.counter(
+            "moneymonkey_cache_evictions",
+            "Entries evicted from the shared result cache.",
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        # A forked child must not reuse its parent's connection.
+        if self._connection is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(
+                self.path, timeout=30.0, isolation_level=None, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            for statement in _SCHEMA:
+                connection.execute(statement)
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def _write(self, work: Callable[[sqlite3.Connection], Any]) -> Any:
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            result = work(connection)
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+        return result
+
+    def _read(self, key: str) -> Any:
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT value, accessed_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return _MISSING
+            blob, accessed_at = row
+            now = self._clock()
+            if now - accessed_at >= self.touch_seconds:
+                connection.execute(
+                    "UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+        try:
+            return pickle.loads(blob)
+        except Exception as e:
+            self.logger.warning(f"Dropping unreadable cache entry {key}. Error: {e}")
+            with self._lock:
+                self._connect().execute("DELETE FROM entries WHERE key = ?", (key,))
+            return _MISSING
+
+    def _evict(self, connection: sqlite3.Connection) -> int:
+        total = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+        evicted = []
+        for key, size in connection.execute(
+            "SELECT key, size FROM entries ORDER BY accessed_at"
+        ):
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        connection.executemany("DELETE FROM entries WHERE key = ?", evicted)
+        return len(evicted)
+
+    def _store(self, key: str, name: str, value: Any) -> None:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            self.logger.warning(
+                f"Not caching '{name}': {len(blob)} bytes exceed the cache size."
+            )
+            with self._lock:
+                self._release(key)
+            return
+        now = self._clock()
+
+        def store(connection: sqlite3.Connection) -> int:
+            connection.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                (key, name, blob, len(blob), now, now),
+            )
+            connection.execute("DELETE FROM leases WHERE key = ?", (key,))
+            return self._evict(connection)
+
+        with self._lock:
+            evicted = self._write(store)
+        if evicted:
+            self._evictions_metric.inc(evicted)
+
+    def _acquire(self, key: str) -> bool:
+        # True once this cache holds the lease. False while another process
+        # holds an unexpired one, or when the entry has appeared meanwhile.
+        now = self._clock()
+
+        def acquire(connection: sqlite3.Connection) -> bool:
+            if connection.execute(
+                "SELECT 1 FROM entries WHERE key = ?", (key,)
+            ).fetchone():
+                return False
+            lease = connection.execute(
+                "SELECT owner, expires_at FROM leases WHERE key = ?", (key,)
+            ).fetchone()
+            if lease is not None and lease[1] > now:
+                return False
+            connection.execute(
+                "INSERT OR REPLACE INTO leases VALUES (?, ?, ?)",
+                (key, self._owner, now + self.lease_seconds),
+            )
+            return True
+
+        with self._lock:
+            return self._write(acquire)
+
+    def _release(self, key: str) -> None:
+        self._connect().execute(
+            "DELETE FROM leases WHERE key = ? AND owner = ?", (key, self._owner)
+        )
+
+    def get(
+        self,
+        name: str,
+        parameters: Dict[str, Any],
+        versions: Optional[Dict[str, str]] = None,
+        default: Any = None,
+    ) -> Any:
+        value = self._read(cache_key(name, parameters, versions))
+        self._cache_metric.inc(
+            cache=name, result="miss" if value is _MISSING else "hit"
+        )
+        return default if value is _MISSING else value
+
+    def put(
+        self,
+        name: str,
+        parameters: Dict[str, Any],
+        value: Any,
+        versions: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self._store(cache_key(name, parameters, versions), name, value)
+
+    def get_or_compute(
+        self,
+        name: str,
+        parameters: Dict[str, Any],
+        compute: Callable[[], Any],
+        versions: Optional[Dict[str, str]] = None,
+    ) -> Any:
+        # Runs compute() at most once per key across all processes sharing
+        # the file, unless the process holding the lease dies; its lease then
+        # expires after lease_seconds and a waiting process takes over.
+        key = cache_key(name, parameters, versions)
+        while True:
+            value = self._read(key)
+            if value is not _MISSING:
+                self._cache_metric.inc(cache=name, result="hit")
+                return value
+            if self._acquire(key):
+                break
+            time.sleep(self.poll_seconds)
+        self._cache_metric.inc(cache=name, result="miss")
+        try:
+            value = compute()
+        except BaseException:
+            with self._lock:
+                self._release(key)
+            raise
+        self._store(key, name, value)
+        return value
+
+    def stats(self) -> Tuple[int, int]:
+        with self._lock:
+            return (
+                self._connect()
+                .execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries")
+                .fetchone()
+            )
+
+    def clear(self) -> int:
+        with self._lock:
+            return self._write(
+                lambda connection: connection.execute("DELETE FROM entries").rowcount
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
@@ -0,0 +1,61 @@
+from typing import Dict, Iterable
+from logging import Logger as StandardLogger
+from sqlalchemy import func, select
+from components.cache.interfaces.data_version_repository import (
+    DataVersionRepository,
+)
+from components.database.interfaces.connector import Connector
+from components.database.data_versions import VERSIONED_TABLES
+from components.database.models import Base, DataVersion
+
+
+class SqlalchemyDataVersionRepository(DataVersionRepository):
+
+    def __init__(
+        self,
+        config=None,
+        connector: Connector = None,
+        logger: StandardLogger = None,
+    ):
+        self.config = config
+        self.session = connector.get_session()
+        self.logger = logger
+
+    def data_versions(self, tables: Iterable[str]) -> Dict[str, str]:
+        # The highest id, plus the newest updated_at where a table has one;
+        # both are index lookups. Tables in VERSIONED_TABLES add the counter
+        # their triggers bump on every update and delete. Read from the
+        # primary, so a stamp is never older than the data a result is
+        # computed from; a result computed from a lagging replica is replaced
+        # once the tables change again.
+        columns = {}
+        for name in tables:
+            table = Base.metadata.tables.get(name)
+            if table is None or "id" not in table.c:
+                raise ValueError(f"Table '{name}' has no id column to version by.")
+            columns[name] = [func.max(table.c.id)]
+            if "updated_at" in table.c:
+                columns[name].append(func.max(table.c.updated_at))
+            if name in VERSIONED_TABLES:
+                counter = (
+                    select(DataVersion.version)
+                    .where(DataVersion.table_name == name)
+                    .scalar_subquery()
+                )
+                columns[name].append(func.coalesce(counter, 0))
+        try:
+            versions = {
+                name: ":".join(
+                    "" if value is None else str(value)
+                    for value in self.session.query(*aggregates).one()
+                )
+                for name, aggregates in columns.items()
+            }
+            # Ends the read transaction, or REPEATABLE READ would keep
+            # returning the same stamps.
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            self.logger.error(f"Failed to read data versions. Error: {e}")
+            raise
+        return versions
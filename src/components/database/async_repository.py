@@ -0,0 +1,144 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import functools
+from logging import Logger as StandardLogger
+import threading
+from typing import Any, Callable, Generic, List, Optional, TypeVar
+import weakref
+
+from sqlalchemy.engine import Engine
+
+from components.database.interfaces.connector import Connector
+
+Repository = TypeVar("Repository")
+
+_UNSET = object()
+
+
+def pool_capacity(engine: Engine, default: int = 5) -> int:
+    # QueuePool allows size + max_overflow connections; pools without a limit
+    # (NullPool, SQLite's pools) fall back to a default.
+    pool = engine.pool
+    max_overflow = getattr(pool, "_max_overflow", None)
+    if not hasattr(pool, "size") or max_overflow is None or max_overflow < 0:
+        return default
+    return pool.size() + max_overflow
+
+
+class AsyncRepository(Generic[Repository]):
+    # Runs a synchronous repository on a bounded thread pool. Sessions are not
+    # thread-safe, so each worker thread builds its own repository over the
+    # shared connector, and the number of workers matches the connections the
+    # engine can hand out: a call waits for a free slot instead of blocking
+    # a worker on pool checkout.
+
+    def __init__(
+        self,
+        connector: Connector,
+        factory: Callable[[Connector], Repository],
+        max_concurrency: int = None,
+        timeout: Optional[float] = None,
+        logger: StandardLogger = None,
+    ):
+        self.connector = connector
+        self.factory = factory
+        self.max_concurrency = max_concurrency or pool_capacity(
+            connector.get_write_engine()
+        )
+        self.timeout = timeout
+        self.logger = logger
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="async-repository"
+        )
+        self._local = threading.local()
+        self._repositories: List[Repository] = []
+        self._repositories_lock = threading.Lock()
+        # asyncio primitives belong to the loop they were first used on, so
+        # each event loop (say, one per asyncio.run) gets its own semaphore.
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        async def method(*args, **kwargs):
+            return await self.call(name, *args, **kwargs)
+
+        method.__name__ = name
+        return method
+
+    async def call(self, method: str, *args, timeout: Any = _UNSET, **kwargs) -> Any:
+        # The timeout covers waiting for a slot as well as running the call.
+        timeout = self.timeout if timeout is _UNSET else timeout
+        try:
+            return await asyncio.wait_for(self._offload(method, args, kwargs), timeout)
+        except asyncio.TimeoutError:
+            if self.logger:
+                self.logger.warning(f"{method} timed out after {timeout} seconds")
+            raise TimeoutError(f"{method} timed out after {timeout} seconds")
+
+    def _semaphore(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    async def _offload(self, method: str, args, kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphore(loop)
+        await semaphore.acquire()
+        abandoned = threading.Event()
+        try:
+            future = loop.run_in_executor(
+                self._executor,
+                functools.partial(self._run, method, args, kwargs, abandoned),
+            )
+        except BaseException:
+            semaphore.release()
+            raise
+        # The slot is freed when the thread is done, not when the caller stops
+        # waiting, so abandoned calls still count against the pool.
+        future.add_done_callback(lambda _: semaphore.release())
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            abandoned.set()
+            raise
+
+    def _repository(self) -> Repository:
+        repository = getattr(self._local, "repository", None)
+        if repository is None:
+            repository = self._local.repository = self.factory(self.connector)
+            with self._repositories_lock:
+                self._repositories.append(repository)
+        return repository
+
+    def _run(self, method: str, args, kwargs, abandoned: threading.Event) -> Any:
+        if abandoned.is_set():
+            # Cancelled while queued on the executor; never touch the database.
+            return None
+        repository = self._repository()
+        try:
+            return getattr(repository, method)(*args, **kwargs)
+        finally:
+            # Nobody will see the result, so discard whatever the call left
+            # uncommitted instead of leaking it into the thread's next call.
+            if abandoned.is_set():
+                session = getattr(repository, "session", None)
+                if session is not None:
+                    session.rollback()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        with self._repositories_lock:
+            repositories, self._repositories = self._repositories, []
+        for repository in repositories:
+            session = getattr(repository, "session", None)
+            if session is not None:
+                session.close()
+
+    async def __aenter__(self) -> "AsyncRepository[Repository]":
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
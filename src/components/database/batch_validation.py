@@ -0,0 +1,170 @@
+from dataclasses import dataclass
+import decimal
+from typing import Any, Dict, List, Sequence, Tuple, Type
+import numpy as np
+
+from components.database.models import FinancialMetric, Validatable
+
+# Column-wise versions of the ORM @validates rules, for Core bulk inserts that
+# never build model instances. Messages match the per-object validators.
+
+MAX_REPORTED_ISSUES = 10
+
+
+@dataclass(frozen=True)
+class ValidationIssue:
+    row: int
+    column: str
+    value: Any
+    message: str
+
+
+class BatchValidationError(ValueError):
+
+    def __init__(self, issues: List[ValidationIssue]):
+        self.issues = issues
+        shown = "; ".join(
+            f"row {issue.row} {issue.column}: {issue.message}"
+            for issue in issues[:MAX_REPORTED_ISSUES]
+        )
+        more = len(issues) - MAX_REPORTED_ISSUES
+        suffix = f" (and {more} more)" if more > 0 else ""
+        super().__init__(f"{len(issues)} invalid values in batch: {shown}{suffix}")
+
+
+def _allowed_ascii(model: Type[Validatable]) -> np.ndarray:
+    # The character class of NAME_REGEX as a lookup table, derived from the
+    # regex itself so both paths always agree.
+    # The last entry stands for every non-ASCII character, none of which match.
+    return np.array(
+        [bool(model.NAME_REGEX.match(chr(code))) for code in range(128)] + [False]
+    )
+
+
+def validate_names(
+    names: Sequence[str], model: Type[Validatable] = Validatable, column: str = "name"
+) -> List[ValidationIssue]:
+    count = len(names)
+    try:
+        joined = "".join(names)
+        typed = np.ones(count, dtype=bool)
+        present = names
+    except TypeError:
+        # Only a batch with missing names pays for the per-row type check.
+        typed = np.fromiter(
+            (isinstance(name, str) for name in names), dtype=bool, count=count
+        )
+        present = [name if isinstance(name, str) else "" for name in names]
+        joined = "".join(present)
+    issues = [
+        ValidationIssue(int(row), column, names[row], "Name is required.")
+        for row in np.flatnonzero(~typed)
+    ]
+    lengths = np.fromiter(map(len, present), dtype=np.int64, count=count)
+    # All names as one array of code points, checked against the allowed set
+    # in one lookup; the few offending positions are mapped back to their row.
+    codes = np.frombuffer(joined.encode("utf-32-le"), dtype=np.uint32)
+    allowed = _allowed_ascii(model)
+    bad_positions = np.flatnonzero(~allowed[np.minimum(codes, len(allowed) - 1)])
+    bad_rows = np.searchsorted(np.cumsum(lengths), bad_positions, side="right")
+    bad_characters = np.bincount(bad_rows, minlength=count)
+
+    too_long = typed & (lengths > model.MAX_NAME_LENGTH)
+    too_short = typed & (lengths < model.MIN_NAME_LENGTH)
+    invalid = typed & ~too_long & ~too_short & (bad_characters > 0)
+    for row in np.flatnonzero(too_long):
+        issues.append(
+            ValidationIssue(
+                int(row),
+                column,
+                names[row],
+                f"Name exceeds maximum length of {model.MAX_NAME_LENGTH} characters: {names[row]}",
+            )
+        )
+    for row in np.flatnonzero(too_short):
+        issues.append(
+            ValidationIssue(
+                int(row),
+                column,
+                names[row],
+                f"Name must be have a minimal length of {model.MIN_NAME_LENGTH} characters: {names[row]}",
+            )
+        )
+    for row in np.flatnonzero(invalid):
+        issues.append(
+            ValidationIssue(
+                int(row),
+                column,
+                names[row],
+                "Invalid name. Allowed characters include letters, digits, and most special characters found on a standard US keyboard. Received: "
+                + names[row],
+            )
+        )
+    return sorted(issues, key=lambda issue: issue.row)
+
+
+def _to_float64(values: Sequence) -> Tuple[np.ndarray, np.ndarray]:
+    try:
+        array = np.asarray(values, dtype=np.float64)
+        return array, np.isfinite(array)
+    except (TypeError, ValueError):
+        pass
+    # Only a batch with unparseable values takes the per-value path.
+    array = np.full(len(values), np.nan)
+    for row, value in enumerate(values):
+        try:
+            array[row] = float(decimal.Decimal(value))
+        except (decimal.InvalidOperation, TypeError, ValueError):
+            pass
+    return array, np.isfinite(array)
+
+
+def validate_metric_values(
+    values: Sequence, column: str = "metric_value"
+) -> Tuple[np.ndarray, List[ValidationIssue]]:
+    array, valid = _to_float64(values)
+    scaled = array * 100
+    rounded = np.round(scaled) / 100
+    # Values within float noise of a half cent are re-rounded with Decimal,
+    # so ties resolve exactly like FinancialMetric.validate_metric_value.
+    near_tie = valid & (np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6)
+    for row in np.flatnonzero(near_tie):
+        rounded[row] = float(round(decimal.Decimal(values[row]), 2))
+    issues = [
+        ValidationIssue(
+            row, column, values[row], f"Invalid metric value: {values[row]}"
+        )
+        for row in np.flatnonzero(~valid)
+    ]
+    issues += [
+        ValidationIssue(
+            row,
+            column,
+            values[row],
+            f"Metric value must be non-negative: {values[row]}",
+        )
+        for row in np.flatnonzero(valid & (rounded < 0))
+    ]
+    return rounded, sorted(issues, key=lambda issue: issue.row)
+
+
+def validate_rows(model, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # Applies every batch rule that `model` has an ORM validator for. Raises
+    # one BatchValidationError listing all problems, or returns the rows with
+    # normalized values (metric values rounded to cents).
+    issues: List[ValidationIssue] = []
+    if isinstance(model, type) and issubclass(model, Validatable):
+        issues += validate_names([row.get("name") for row in rows], model)
+    if model is FinancialMetric:
+        rounded, metric_issues = validate_metric_values(
+            [row.get("metric_value") for row in rows]
+        )
+        issues += metric_issues
+        if not metric_issues:
+            rows = [
+                {**row, "metric_value": value}
+                for row, value in zip(rows, rounded.tolist())
+            ]
+    if issues:
+        raise BatchValidationError(sorted(issues, key=lambda issue: issue.row))
+    return rows
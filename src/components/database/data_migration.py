@@ -0,0 +1,128 @@
+import datetime
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from alembic import op
+import sqlalchemy as sa
+
+# Helpers for data migrations on large tables. Rows go in through
+# op.bulk_insert in chunks, and backfills update one primary-key range per
+# statement in autocommit mode. Locks are then held for a single chunk,
+# never for the whole run.
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+progress_table = sa.table(
+    "data_migration_progress",
+    sa.column("name", sa.String),
+    sa.column("last_id", sa.BigInteger),
+    sa.column("updated_at", sa.DateTime),
+)
+
+
+def bulk_seed(
+    table: sa.TableClause, rows: Iterable[Dict[str, Any]], chunk_size: int = 1000
+) -> int:
+    chunk: List[Dict[str, Any]] = []
+    written = 0
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            op.bulk_insert(table, chunk, multiinsert=True)
+            written += len(chunk)
+            chunk = []
+    if chunk:
+        op.bulk_insert(table, chunk, multiinsert=True)
+        written += len(chunk)
+    return written
+
+
+def name_to_id(table: sa.TableClause, names: Iterable[str]) -> Dict[str, int]:
+    rows = op.get_bind().execute(
+        sa.select(table.c.name, table.c.id).where(table.c.name.in_(list(names)))
+    )
+    return {name: row_id for name, row_id in rows}
+
+
+def _load_progress(bind, name: str) -> Optional[int]:
+    return bind.execute(
+        sa.select(progress_table.c.last_id).where(progress_table.c.name == name)
+    ).scalar()
+
+
+def _save_progress(bind, name: str, last_id: int, resumed: bool) -> None:
+    values = {
+        "last_id": last_id,
+        "updated_at": datetime.datetime.now(datetime.timezone.utc),
+    }
+    if resumed:
+        bind.execute(
+            sa.update(progress_table)
+            .where(progress_table.c.name == name)
+            .values(**values)
+        )
+    else:
+        bind.execute(sa.insert(progress_table).values(name=name, **values))
+
+
+def _clear_progress(bind, name: str) -> None:
+    bind.execute(sa.delete(progress_table).where(progress_table.c.name == name))
+
+
+def batched_update(
+    name: str,
+    table: sa.TableClause,
+    values: Dict[str, Any],
+    where: Optional[sa.ColumnElement] = None,
+    batch_size: int = 10000,
+    id_column: str = "id",
+    pause_seconds: float = 0.0,
+) -> int:
+    # `name` identifies the backfill in data_migration_progress; a run that
+    # fails halfway continues after the last committed chunk when the
+    # migration is retried. The checkpoint is removed once the run completes.
+    key = table.c[id_column]
+
+    def statement(low, high):
+        update = sa.update(table).values(**values)
+        if low is not None:
+            update = update.where(key.between(low, high))
+        return update.where(where) if where is not None else update
+
+    if op.get_context().as_sql:
+        op.execute(statement(None, None))
+        return 0
+
+    bind = op.get_bind()
+    with op.get_context().autocommit_block():
+        lowest, highest = bind.execute(
+            sa.select(sa.func.min(key), sa.func.max(key))
+        ).one()
+        if lowest is None:
+            return 0
+        checkpoint = _load_progress(bind, name)
+        resumed = checkpoint is not None
+        low = checkpoint + 1 if resumed else lowest
+        if resumed:
+            logger.info(
+                f"Resuming '{name}' after {table.name}.{id_column} {checkpoint}."
+            )
+        updated = 0
+        started = time.monotonic()
+        while low <= highest:
+            high = low + batch_size - 1
+            updated += bind.execute(statement(low, high)).rowcount
+            _save_progress(bind, name, high, resumed)
+            resumed = True
+            done = (min(high, highest) - lowest + 1) / (highest - lowest + 1)
+            rate = updated / max(time.monotonic() - started, 1e-9)
+            logger.info(
+                f"'{name}': {done:.1%} of {table.name} ({updated} rows, {rate:.0f} rows/s)."
+            )
+            low = high + 1
+            if pause_seconds:
+                # Gives replicas and concurrent writers room between chunks.
+                time.sleep(pause_seconds)
+        _clear_progress(bind, name)
+    return updated
@@ -0,0 +1,35 @@
+from typing import List
+
+# Tables whose rows are corrected in place. Inserts already move max(id), so
+# only updates and deletes bump the counter in data_versions, through
+# triggers; the per-row cost falls on corrections rather than on ingestion.
+VERSIONED_TABLES = (
+    "stock_price_history",
+    "financial_metrics",
+    "dividend_yields",
+    "metric_names",
+    "corporate_actions",
+)
+
+
+def trigger_names(table_name: str) -> List[str]:
+    return [f"dv_{table_name}_{event}"[:64] for event in ("update", "delete")]
+
+
+def trigger_statements(table_name: str, dialect: str) -> List[str]:
+    insert = (
+        f"INSERT INTO data_versions (table_name, version) VALUES ('{table_name}', 1)"
+    )
+    if dialect == "mysql":
+        bump = f"{insert} ON DUPLICATE KEY UPDATE version = version + 1"
+    elif dialect == "sqlite":
+        bump = (
+            f"BEGIN {insert} "
+            "ON CONFLICT (table_name) DO UPDATE SET version = version + 1; END"
+        )
+    else:
+        return []
+    return [
+        f"CREATE TRIGGER {name} AFTER {event} ON {table_name} FOR EACH ROW {bump}"
+        for name, event in zip(trigger_names(table_name), ("UPDATE", "DELETE"))
+    ]
@@ -0,0 +1,70 @@
+from typing import List, Sequence
+import numpy as np
+from sqlalchemy import BigInteger, Float, literal_column, type_coerce
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import ColumnElement, FunctionElement
+
+# Bulk numeric reads for analytics. Numeric columns are turned into DOUBLE and
+# DATETIME columns into epoch microseconds inside the query, so the driver
+# parses plain floats and ints; no Decimal or datetime objects are created.
+# Decimal stays the type of the ORM models and thus of every write.
+
+
+class epoch_microseconds(FunctionElement):
+    type = BigInteger()
+    inherit_cache = True
+    name = "epoch_microseconds"
+
+
+@compiles(epoch_microseconds)
+def _epoch_microseconds_default(element, compiler, **kw):
+    return f"CAST(EXTRACT(EPOCH FROM {compiler.process(element.clauses, **kw)}) * 1000000 AS BIGINT)"
+
+
+@compiles(epoch_microseconds, "mysql")
+def _epoch_microseconds_mysql(element, compiler, **kw):
+    # DATETIME values are stored as naive UTC.
+    return f"TIMESTAMPDIFF(MICROSECOND, '1970-01-01 00:00:00', {compiler.process(element.clauses, **kw)})"
+
+
+@compiles(epoch_microseconds, "sqlite")
+def _epoch_microseconds_sqlite(element, compiler, **kw):
+    # SQLAlchemy stores 'YYYY-MM-DD HH:MM:SS.ffffff'; julianday() would lose
+    # the microseconds, so the fraction is read from the text directly.
+    column = compiler.process(element.clauses, **kw)
+    return (
+        f"(CAST(strftime('%s', {column}) AS INTEGER) * 1000000"
+        f" + CAST(substr({column}, 21, 6) AS INTEGER))"
+    )
+
+
+def as_float64(column) -> ColumnElement:
+    # Adding a double literal makes the database return DOUBLE instead of
+    # DECIMAL, and Float(asdecimal=False) keeps SQLAlchemy from converting back.
+    return type_coerce(column + literal_column("0E0"), Float(asdecimal=False))
+
+
+def fetch_columns(session: Session, statement, dtypes: Sequence) -> List[np.ndarray]:
+    # Passing the statement lets a routing session pick a replica for it.
+    connection = session.connection(bind_arguments={"clause": statement})
+    result = connection.execute(statement)
+    try:
+        # The DBAPI cursor yields plain tuples; skipping Row construction is
+        # most of the win on large result sets.
+        rows = result.cursor.fetchall()
+    finally:
+        result.close()
+    if not rows:
+        return [np.empty(0, dtype=dtype) for dtype in dtypes]
+    # Integers, epoch microseconds and prices are all exact in float64 (below
+    # 2**53); NULLs become NaN.
+    matrix = np.array(rows, dtype=np.float64)
+    columns = []
+    for index, dtype in enumerate(dtypes):
+        dtype = np.dtype(dtype)
+        column = matrix[:, index]
+        if dtype.kind in "iuM":
+            column = np.rint(column).astype(np.int64)
+        columns.append(column.astype(dtype))
+    return columns
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from pymysql.connections import Connection
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
 
@@ -12,3 +13,10 @@ class Connector(ABC):
     @abstractmethod
     def get_session(self) -> Session:
         pass
+
+    @abstractmethod
+    def get_write_engine(self) -> Engine:
+        pass
+
+    def get_read_engine(self) -> Engine:
+        return self.get_write_engine()
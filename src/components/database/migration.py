@@ -1,5 +1,8 @@
 from alembic.config import Config as AlembicConfig
 from alembic import command
+from alembic.script import Script, ScriptDirectory
+from pymysql.constants import ER
+from sqlalchemy.exc import NoSuchTableError
 
 from config import Config
 from components.database.mysql_connector import MySQLConnector
@@ -7,8 +10,21 @@ from components.logger.native_logger import NativeLogger
 from injector import get_config, get_connector, get_logger
 
 
+def _is_missing_table(error: Exception) -> bool:
+    return isinstance(error, NoSuchTableError) or (
+        getattr(error, "args", ())[:1] == (ER.NO_SUCH_TABLE,)
+    )
+
+
 class Migration:
     logger = get_logger()
+    # Online revisions whose table holds fewer rows than this are cheap
+    # enough to apply at startup like any other revision.
+    inline_online_max_rows = 100_000
+    # Per process, so Streamlit reruns do not re-read the script directory
+    # once the schema is known to be current. A blocked schema is checked
+    # again on every call: the online revisions may be applied meanwhile.
+    _up_to_date = False
 
     def __init__(self, config=None, connection=None):
         self.config = config or get_config()
@@ -37,20 +53,84 @@ class Migration:
             return False
         return current_version == self.config.latest_migration_version
 
-    def check_and_apply_migrations(self):
+    def alembic_config(self):
         alembic_cfg = AlembicConfig(
             self.config.project_root / "src/alembic/alembic.ini"
         )
+        alembic_cfg.set_main_option(
+            "script_location", str(self.config.project_root / "src/alembic")
+        )
+        return alembic_cfg
 
-        if not self.has_latest_migration_run():
-            self.logger.warning(
-                "Data model not up to date. Applying database migrations."
-            )
-            try:
-                command.upgrade(alembic_cfg, "head")
-                self.logger.info("Database migrations applied successfully!")
-            except Exception as e:
-                self.logger.error(
-                    f"Failed to automatically apply migrations. Please review manually. Error: {e}"
+    def pending_revisions(self, alembic_cfg):
+        script = ScriptDirectory.from_config(alembic_cfg)
+        current = self.get_current_migration_version()
+        pending = [
+            revision
+            for revision in script.iterate_revisions("heads", current)
+            if revision.revision != current
+        ]
+        return list(reversed(pending))
+
+    @staticmethod
+    def is_online(revision: Script) -> bool:
+        return bool(getattr(revision.module, "online", False))
+
+    def is_small_online(self, revision: Script) -> bool:
+        # Revisions name the table they alter in `online_table`. A table
+        # that does not exist yet is created empty by an earlier revision.
+        table = getattr(revision.module, "online_table", None)
+        if table is None:
+            return False
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT 1 FROM {table} LIMIT 1 OFFSET {self.inline_online_max_rows}"
                 )
+                return cursor.fetchone() is None
+        except Exception as e:
+            # Anything else (a lost connection, missing privileges) says
+            # nothing about the table's size; guessing small would run a
+            # large-table ALTER inline.
+            if not _is_missing_table(e):
                 raise
+            self.logger.info(f"Treating missing table {table} as empty: {e}")
+            return True
+
+    def check_and_apply_migrations(self, include_online=False):
+        # Revisions marked `online = True` rebuild or alter large tables. At
+        # app startup they run inline while their table is still small;
+        # otherwise startup refuses to migrate at all, rather than leave
+        # every later revision unapplied behind them, until they are run
+        # with `moneymonkey migrate --online`.
+        if not include_online and Migration._up_to_date:
+            return
+        if self.has_latest_migration_run():
+            Migration._up_to_date = True
+            return
+        alembic_cfg = self.alembic_config()
+        if not include_online:
+            large = [
+                revision
+                for revision in self.pending_revisions(alembic_cfg)
+                if self.is_online(revision) and not self.is_small_online(revision)
+            ]
+            if large:
+                revisions = ", ".join(revision.revision for revision in large)
+                message = (
+                    f"Online migrations pending ({revisions}); run "
+                    "'moneymonkey migrate --online' before starting the app."
+                )
+                self.logger.error(message)
+                raise RuntimeError(message)
+
+        self.logger.warning("Data model not up to date. Applying database migrations.")
+        try:
+            command.upgrade(alembic_cfg, "head")
+            self.logger.info("Database migrations applied successfully!")
+        except Exception as e:
+            self.logger.error(
+                f"Failed to automatically apply migrations. Please review manually. Error: {e}"
+            )
+            raise
+        Migration._up_to_date = True
@@ -1,7 +1,11 @@
 import datetime
 import decimal
 from sqlalchemy import (
+    DDL,
+    BigInteger,
+    Boolean,
     Column,
+    Date,
     DateTime,
     Integer,
     String,
@@ -11,9 +15,11 @@ from sqlalchemy import (
     CheckConstraint,
     Numeric,
     JSON,
+    event,
 )
 from sqlalchemy.orm import declarative_base, relationship, validates
 import re
+from components.database.data_versions import VERSIONED_TABLES, trigger_statements
 
 Base = declarative_base()
 
@@ -89,6 +95,7 @@ class Stock(Base):
     dividend_yields = relationship("DividendYield", back_populates="stock")
     price_history = relationship("StockPriceHistory", back_populates="stock")
     industry = relationship("Industry", back_populates="stocks")
+    analysis_results = relationship("AnalysisResult", back_populates="stock")
 
     __table_args__ = (
         Index("ix_ticker", "ticker", unique=True),
@@ -113,6 +120,7 @@ class FinancialMetric(Base):
     metric_name = relationship("MetricName", back_populates="financial_metrics")
 
     __table_args__ = (
+        Index("ix_metric_stock_date", "stock_id", "date_recorded"),
         CheckConstraint("metric_value >= 0", name="check_metric_value_non_negative"),
     )
 
@@ -140,6 +148,7 @@ class DividendYield(Base):
     stock = relationship("Stock", back_populates="dividend_yields")
 
     __table_args__ = (
+        Index("ix_dividend_stock_date", "stock_id", "date_recorded"),
         CheckConstraint("yield_value >= 0", name="check_yield_value_non_negative"),
     )
 
@@ -156,6 +165,8 @@ class StockPriceHistory(Base):
     )
     stock = relationship("Stock", back_populates="price_history")
 
+    __table_args__ = (Index("ix_price_stock_date", "stock_id", "date_recorded"),)
+
 
 class DataSource(Base, Validatable):
     __tablename__ = "data_sources"
@@ -180,3 +191,145 @@ class StockData(Base):
     __table_args__ = (
         Index("ix_stock_source_date", "stock_id", "source_id", "date_recorded"),
     )
+
+
+class AnalysisResult(Base):
+    __tablename__ = "analysis_results"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    stock_id = Column(Integer, ForeignKey("stocks.id"), nullable=False)
+    analysis_name = Column(String(50), nullable=False)
+    run_id = Column(String(64), nullable=False)
+    date_recorded = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.datetime.now(datetime.timezone.utc),
+        nullable=False,
+    )
+    data = Column(JSON, nullable=False)
+    stock = relationship("Stock", back_populates="analysis_results")
+
+    __table_args__ = (
+        Index(
+            "ix_analysis_name_stock_date", "analysis_name", "stock_id", "date_recorded"
+        ),
+        Index("ix_analysis_run", "run_id", "stock_id"),
+    )
+
+
+class DataMigrationProgress(Base):
+    __tablename__ = "data_migration_progress"
+    name = Column(String(100), primary_key=True)
+    last_id = Column(BigInteger, nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.datetime.now(datetime.timezone.utc),
+        nullable=False,
+    )
+
+
+class DataVersion(Base):
+    # Bumped by triggers on VERSIONED_TABLES when rows change in place.
+    __tablename__ = "data_versions"
+    table_name = Column(String(64), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
+
+class PriceBar(Base):
+    __tablename__ = "price_bars"
+    stock_id = Column(Integer, ForeignKey("stocks.id"), primary_key=True)
+    resolution = Column(String(5), primary_key=True)
+    period_start = Column(Date, primary_key=True)
+    open = Column(Numeric(precision=15, scale=4), nullable=False)
+    high = Column(Numeric(precision=15, scale=4), nullable=False)
+    low = Column(Numeric(precision=15, scale=4), nullable=False)
+    close = Column(Numeric(precision=15, scale=4), nullable=False)
+    first_at = Column(DateTime(timezone=True), nullable=False)
+    last_at = Column(DateTime(timezone=True), nullable=False)
+    points = Column(Integer, nullable=False)
+
+
+class AlertRule(Base):
+    __tablename__ = "alert_rules"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    stock_id = Column(Integer, ForeignKey("stocks.id"), nullable=False)
+    # "Price", a metric name or "Dividend Yield".
+    field = Column(String(50), nullable=False)
+    condition = Column(String(30), nullable=False)
+    threshold = Column(Numeric(precision=15, scale=4), nullable=True)
+    active = Column(Boolean, nullable=False, default=True)
+    created_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.datetime.now(datetime.timezone.utc),
+        nullable=False,
+    )
+
+    __table_args__ = (Index("ix_alert_rules_active", "active", "id"),)
+
+
+class AlertEvent(Base):
+    __tablename__ = "alert_events"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    rule_id = Column(Integer, ForeignKey("alert_rules.id"), nullable=False)
+    stock_id = Column(Integer, ForeignKey("stocks.id"), nullable=False)
+    value = Column(Numeric(precision=15, scale=4), nullable=False)
+    reference = Column(Numeric(precision=15, scale=4), nullable=False)
+    date_recorded = Column(DateTime(timezone=True), nullable=False)
+    triggered_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.datetime.now(datetime.timezone.utc),
+        nullable=False,
+    )
+
+    __table_args__ = (Index("ix_alert_events_triggered", "triggered_at"),)
+
+
+class CorporateAction(Base):
+    __tablename__ = "corporate_actions"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    stock_id = Column(Integer, ForeignKey("stocks.id"), nullable=False)
+    action_type = Column(String(20), nullable=False)
+    ex_date = Column(Date, nullable=False)
+    ratio = Column(Numeric(precision=15, scale=6), nullable=True)
+    amount = Column(Numeric(precision=15, scale=4), nullable=True)
+    # Dividends only: the last price before ex_date, fixed when the action is
+    # added so every reader derives the same adjustment factor.
+    reference_price = Column(Numeric(precision=15, scale=4), nullable=True)
+    created_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.datetime.now(datetime.timezone.utc),
+        nullable=False,
+    )
+
+    __table_args__ = (
+        Index("ix_corporate_actions_stock_date", "stock_id", "ex_date"),
+        CheckConstraint("ratio > 0", name="check_ratio_positive"),
+        CheckConstraint("amount >= 0", name="check_amount_non_negative"),
+    )
+
+
+class DataQualityFinding(Base):
+    __tablename__ = "data_quality_findings"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    stock_id = Column(Integer, ForeignKey("stocks.id"), nullable=False)
+    check_name = Column(String(30), nullable=False)
+    day = Column(Date, nullable=False)
+    value = Column(Numeric(precision=20, scale=4), nullable=True)
+    detail = Column(JSON, nullable=False)
+    found_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.datetime.now(datetime.timezone.utc),
+        nullable=False,
+    )
+
+    __table_args__ = (
+        Index("ix_quality_check_stock_day", "check_name", "stock_id", "day"),
+    )
+
+
+for _table_name in VERSIONED_TABLES:
+    for _dialect in ("mysql", "sqlite"):
+        for _statement in trigger_statements(_table_name, _dialect):
+            event.listen(
+                Base.metadata.tables[_table_name],
+                "after_create",
+                DDL(_statement).execute_if(dialect=_dialect),
+            )
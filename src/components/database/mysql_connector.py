@@ -1,9 +1,17 @@
+import itertools
 import os
 from dotenv import load_dotenv
 import pymysql
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from .interfaces.connector import Connector
+from .query_profiler import QueryProfiler
+from .routing_session import RoutingSession
+from components.metrics.database_metrics import (
+    collect_query_latency,
+    instrument_engine,
+)
+from components.metrics.metrics_registry import MetricsRegistry
 from components.logger.native_logger import NativeLogger
 from config import Config
 
@@ -20,8 +28,16 @@ class MySQLConnector(Connector):
         self._db_password = os.getenv("DB_PASSWORD")
         self._db_name = os.getenv("DB_DATABASE")
         self._db_port = os.getenv("DB_PORT", "3306")
+        self._replica_hosts = [
+            host.strip()
+            for host in os.getenv("DB_REPLICA_HOSTS", "").split(",")
+            if host.strip()
+        ]
+        self._sticky_seconds = float(os.getenv("DB_REPLICA_STICKY_SECONDS", "5"))
+        self._profile_queries = os.getenv("DB_QUERY_PROFILING", "true") == "true"
         self.logger = NativeLogger.get_logger()
         self._engine = None
+        self._replica_engines = None
         self._session_factory = None
 
     def get_connection(self):
@@ -39,11 +55,40 @@ class MySQLConnector(Connector):
             raise
 
     def get_session(self):
-        if not self._engine:
-            self._engine = create_engine(self._database_uri())
         if not self._session_factory:
-            self._session_factory = sessionmaker(bind=self._engine)
+            self._session_factory = sessionmaker(
+                class_=RoutingSession,
+                write_engine=self.get_write_engine(),
+                read_engine=self.get_read_engine,
+                sticky_seconds=self._sticky_seconds,
+            )
         return self._session_factory()
 
-    def _database_uri(self):
-        return f"mysql+pymysql://{self._db_user}:{self._db_password}@{self._db_host}:{self._db_port}/{self._db_name}"
+    def get_write_engine(self):
+        if not self._engine:
+            self._engine = self._create_engine(self._db_host, self._db_port)
+        return self._engine
+
+    def get_read_engine(self):
+        if not self._replica_hosts:
+            return self.get_write_engine()
+        if self._replica_engines is None:
+            self._replica_engines = itertools.cycle(
+                [self._create_engine(*self._split_host(h)) for h in self._replica_hosts]
+            )
+        return next(self._replica_engines)
+
+    def _split_host(self, host):
+        name, _, port = host.partition(":")
+        return name, port or self._db_port
+
+    def _create_engine(self, host, port):
+        engine = create_engine(self._database_uri(host, port))
+        if self._profile_queries:
+            QueryProfiler.default().attach(engine)
+            MetricsRegistry.default().register_collector(collect_query_latency)
+        instrument_engine(engine)
+        return engine
+
+    def _database_uri(self, host, port):
+        return f"mysql+pymysql://{self._db_user}:{self._db_password}@{host}:{port}/{self._db_name}"
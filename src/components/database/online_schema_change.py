@@ -0,0 +1,197 @@
+import logging
+import time
+from typing import List
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.engine import Connection
+from components.database.data_versions import VERSIONED_TABLES, trigger_statements
+
+# Schema changes for large tables, for use in revisions marked `online = True`.
+# MySQL is asked for an INSTANT change first, then INPLACE with LOCK=NONE, and
+# only when it supports neither is the table rebuilt through a shadow copy
+# that triggers keep in sync while the rows are copied in chunks.
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+# ER_ALTER_OPERATION_NOT_SUPPORTED(_REASON), and the parse error raised by
+# servers that do not know ALGORITHM=INSTANT at all.
+UNSUPPORTED_ALGORITHM_ERRORS = {1845, 1846, 1064}
+
+
+def _error_code(error: sa.exc.DBAPIError):
+    args = getattr(error.orig, "args", ())
+    return args[0] if args else None
+
+
+def online_alter(
+    table_name: str,
+    alter_clause: str,
+    batch_size: int = 10000,
+    pause_seconds: float = 0.0,
+) -> str:
+    bind = op.get_bind()
+    if bind.dialect.name != "mysql":
+        op.execute(f"ALTER TABLE {table_name} {alter_clause}")
+        return "direct"
+    for algorithm, options in (
+        ("instant", "ALGORITHM=INSTANT"),
+        ("inplace", "ALGORITHM=INPLACE, LOCK=NONE"),
+    ):
+        try:
+            op.execute(f"ALTER TABLE {table_name} {alter_clause}, {options}")
+            logger.info(f"Altered {table_name} with {options}.")
+            return algorithm
+        except sa.exc.DBAPIError as e:
+            if _error_code(e) not in UNSUPPORTED_ALGORITHM_ERRORS:
+                raise
+    logger.info(f"No online ALTER for {table_name}; rebuilding through a shadow table.")
+    ShadowTableCopy(bind, table_name, alter_clause, batch_size, pause_seconds).run()
+    return "copy"
+
+
+class ShadowTableCopy:
+
+    def __init__(
+        self,
+        bind: Connection,
+        table_name: str,
+        alter_clause: str,
+        batch_size: int = 10000,
+        pause_seconds: float = 0.0,
+        id_column: str = "id",
+    ):
+        self.bind = bind
+        self.table = table_name
+        self.alter_clause = alter_clause
+        self.batch_size = batch_size
+        self.pause_seconds = pause_seconds
+        self.id_column = id_column
+        self.shadow = f"_{table_name}_new"
+        self.old = f"_{table_name}_old"
+        self.triggers = {
+            event: f"osc_{table_name}_{event.lower()}"[:64]
+            for event in ("INSERT", "UPDATE", "DELETE")
+        }
+
+    def _execute(self, statement: str, **parameters):
+        return self.bind.execute(sa.text(statement), parameters)
+
+    def _foreign_keys(self) -> List[dict]:
+        return sa.inspect(self.bind).get_foreign_keys(self.table)
+
+    def _referencing_tables(self) -> List[str]:
+        inspector = sa.inspect(self.bind)
+        return [
+            name
+            for name in inspector.get_table_names()
+            if any(
+                fk["referred_table"] == self.table
+                for fk in inspector.get_foreign_keys(name)
+            )
+        ]
+
+    @staticmethod
+    def foreign_key_clause(fk: dict, name: str) -> str:
+        return (
+            f"CONSTRAINT {name} FOREIGN KEY ({', '.join(fk['constrained_columns'])}) "
+            f"REFERENCES {fk['referred_table']} ({', '.join(fk['referred_columns'])})"
+        )
+
+    def trigger_statements(self, columns: List[str]) -> List[str]:
+        names = ", ".join(columns)
+        new_values = ", ".join(f"NEW.{column}" for column in columns)
+        mirror = f"REPLACE INTO {self.shadow} ({names}) VALUES ({new_values})"
+        return [
+            f"CREATE TRIGGER {self.triggers['INSERT']} AFTER INSERT ON {self.table} "
+            f"FOR EACH ROW {mirror}",
+            f"CREATE TRIGGER {self.triggers['UPDATE']} AFTER UPDATE ON {self.table} "
+            f"FOR EACH ROW {mirror}",
+            f"CREATE TRIGGER {self.triggers['DELETE']} AFTER DELETE ON {self.table} "
+            f"FOR EACH ROW DELETE FROM {self.shadow} "
+            f"WHERE {self.id_column} = OLD.{self.id_column}",
+        ]
+
+    def copy_statement(self, columns: List[str]) -> str:
+        names = ", ".join(columns)
+        return (
+            f"INSERT IGNORE INTO {self.shadow} ({names}) SELECT {names} "
+            f"FROM {self.table} WHERE {self.id_column} BETWEEN :low AND :high"
+        )
+
+    def _columns(self, table: str) -> List[str]:
+        return [column["name"] for column in sa.inspect(self.bind).get_columns(table)]
+
+    def _drop_triggers(self) -> None:
+        for trigger in self.triggers.values():
+            self._execute(f"DROP TRIGGER IF EXISTS {trigger}")
+
+    def run(self) -> None:
+        referencing = self._referencing_tables()
+        if referencing:
+            raise ValueError(
+                f"Cannot rebuild '{self.table}' through a shadow table; it is "
+                f"referenced by foreign keys from {referencing}."
+            )
+        foreign_keys = self._foreign_keys()
+        with op.get_context().autocommit_block():
+            self._execute(f"DROP TABLE IF EXISTS {self.shadow}")
+            self._execute(f"CREATE TABLE {self.shadow} LIKE {self.table}")
+            try:
+                self._execute(f"ALTER TABLE {self.shadow} {self.alter_clause}")
+                # CREATE TABLE ... LIKE skips foreign keys; the originals keep
+                # their names, so the copies get a suffix until the swap.
+                for fk in foreign_keys:
+                    clause = self.foreign_key_clause(fk, f"{fk['name']}_osc")
+                    self._execute(f"ALTER TABLE {self.shadow} ADD {clause}")
+                shadow_columns = set(self._columns(self.shadow))
+                columns = [c for c in self._columns(self.table) if c in shadow_columns]
+                for statement in self.trigger_statements(columns):
+                    self._execute(statement)
+                self._copy(columns)
+                self._execute(
+                    f"RENAME TABLE {self.table} TO {self.old}, {self.shadow} TO {self.table}"
+                )
+            except Exception:
+                self._drop_triggers()
+                self._execute(f"DROP TABLE IF EXISTS {self.shadow}")
+                raise
+            self._drop_triggers()
+            self._execute(f"DROP TABLE {self.old}")
+            # Data-version triggers stayed with the old table.
+            if self.table in VERSIONED_TABLES:
+                for statement in trigger_statements(self.table, "mysql"):
+                    self._execute(statement)
+            self._restore_foreign_key_names(foreign_keys)
+
+    def _copy(self, columns: List[str]) -> None:
+        lowest, highest = self._execute(
+            f"SELECT MIN({self.id_column}), MAX({self.id_column}) FROM {self.table}"
+        ).one()
+        if lowest is None:
+            return
+        statement = self.copy_statement(columns)
+        for low in range(lowest, highest + 1, self.batch_size):
+            high = low + self.batch_size - 1
+            self._execute(statement, low=low, high=high)
+            done = (min(high, highest) - lowest + 1) / (highest - lowest + 1)
+            logger.info(f"Copied {done:.1%} of {self.table} into {self.shadow}.")
+            if self.pause_seconds:
+                time.sleep(self.pause_seconds)
+
+    def _restore_foreign_key_names(self, foreign_keys: List[dict]) -> None:
+        if not foreign_keys:
+            return
+        # Without foreign key checks MySQL swaps the constraints in place.
+        changes = []
+        for fk in foreign_keys:
+            changes.append(f"DROP FOREIGN KEY {fk['name']}_osc")
+            changes.append(f"ADD {self.foreign_key_clause(fk, fk['name'])}")
+        self._execute("SET SESSION foreign_key_checks = 0")
+        try:
+            self._execute(
+                f"ALTER TABLE {self.table} {', '.join(changes)}, "
+                "ALGORITHM=INPLACE, LOCK=NONE"
+            )
+        finally:
+            self._execute("SET SESSION foreign_key_checks = 1")
@@ -0,0 +1,174 @@
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from logging import Logger as StandardLogger
+import os
+import re
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from components.logger.native_logger import NativeLogger
+
+# Upper bounds in milliseconds; the last bucket catches everything slower.
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Helpers that run statements for a repository are skipped too, so queries
+# are attributed to the repository method that asked for them.
+_LIBRARY_PREFIXES = (
+    "sqlalchemy",
+    "pymysql",
+    "components.database.query_profiler",
+    "components.database.fast_reads",
+)
+_WHITESPACE = re.compile(r"\s+")
+# Expanded IN lists differ per call; collapse them so the statement groups.
+_IN_LIST = re.compile(r"IN \((?:[^()]*)\)", re.IGNORECASE)
+
+
+def normalize_statement(statement: str, max_length: int = 300) -> str:
+    collapsed = _WHITESPACE.sub(" ", statement).strip()
+    return _IN_LIST.sub("IN (...)", collapsed)[:max_length]
+
+
+def calling_method() -> str:
+    frame = sys._getframe(1)
+    fallback = None
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if not module.startswith(_LIBRARY_PREFIXES):
+            owner = frame.f_locals.get("self")
+            name = frame.f_code.co_name
+            label = f"{type(owner).__name__}.{name}" if owner is not None else name
+            if module.startswith("components."):
+                return label
+            fallback = fallback or f"{module}.{name}"
+        frame = frame.f_back
+    return fallback or "unknown"
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    rows: int = 0
+    buckets: List[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1)
+    )
+
+    def record(self, elapsed_ms: float, rows: int) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.rows += max(rows, 0)
+        self.buckets[bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+
+class QueryProfiler:
+    _default: Optional["QueryProfiler"] = None
+
+    def __init__(
+        self,
+        slow_query_ms: float = 200.0,
+        logger: StandardLogger = None,
+        capture_caller: bool = True,
+    ):
+        self.slow_query_ms = slow_query_ms
+        self.logger = logger
+        self.capture_caller = capture_caller
+        self._stats: Dict[Tuple[str, str], QueryStats] = {}
+        self._lock = threading.Lock()
+        self._thread = threading.local()
+
+    @classmethod
+    def default(cls) -> "QueryProfiler":
+        # One profiler per process so statistics from all connectors add up.
+        if cls._default is None:
+            cls._default = cls(
+                slow_query_ms=float(os.getenv("DB_SLOW_QUERY_MS", "200")),
+                logger=NativeLogger.get_logger("moneymonkey.slow_query"),
+            )
+        return cls._default
+
+    def attach(self, engine: Engine) -> None:
+        if event.contains(engine, "before_cursor_execute", self._before):
+            return
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+        event.listen(engine, "handle_error", self._error)
+
+    def detach(self, engine: Engine) -> None:
+        if event.contains(engine, "before_cursor_execute", self._before):
+            event.remove(engine, "before_cursor_execute", self._before)
+            event.remove(engine, "after_cursor_execute", self._after)
+            event.remove(engine, "handle_error", self._error)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+        rows = cursor.rowcount if cursor is not None else -1
+        caller = calling_method() if self.capture_caller else "unknown"
+        self.record(caller, statement, elapsed_ms, rows)
+        if elapsed_ms >= self.slow_query_ms and self.logger is not None:
+            self.logger.warning(
+                f"Slow query ({elapsed_ms:.1f} ms, {rows} rows) in {caller}: "
+                f"{normalize_statement(statement, max_length=1000)}"
+            )
+
+    def _error(self, context):
+        # A failed statement never reaches after_cursor_execute; drop its
+        # start so the stack of a pooled connection does not grow.
+        if context.connection is None or context.statement is None:
+            return
+        starts = context.connection.info.get("query_start")
+        if starts:
+            starts.pop()
+
+    def record(self, caller: str, statement: str, elapsed_ms: float, rows: int) -> None:
+        key = (caller, normalize_statement(statement))
+        self._thread.count = getattr(self._thread, "count", 0) + 1
+        self._thread.total_ms = getattr(self._thread, "total_ms", 0.0) + elapsed_ms
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = QueryStats()
+            stats.record(elapsed_ms, rows)
+
+    def thread_totals(self) -> Tuple[int, float]:
+        # Queries issued by the current thread only; a Streamlit session runs
+        # its script on its own thread, so this isolates one rerun.
+        return getattr(self._thread, "count", 0), getattr(self._thread, "total_ms", 0.0)
+
+    def snapshot(self) -> Dict[Tuple[str, str], QueryStats]:
+        with self._lock:
+            return {
+                key: QueryStats(
+                    stats.count,
+                    stats.total_ms,
+                    stats.max_ms,
+                    stats.rows,
+                    list(stats.buckets),
+                )
+                for key, stats in self._stats.items()
+            }
+
+    def top(
+        self, limit: int = 10, by: str = "total_ms"
+    ) -> List[Tuple[Tuple[str, str], QueryStats]]:
+        return sorted(
+            self.snapshot().items(), key=lambda item: getattr(item[1], by), reverse=True
+        )[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
@@ -0,0 +1,86 @@
+from contextlib import contextmanager
+import functools
+import time
+from typing import Callable, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+
+class RoutingSession(Session):
+    # Sends statements to the primary unless the caller opted into replica
+    # reads with use_replica(). Once the session has written, reads stay on the
+    # primary until sticky_seconds after the commit so that a caller always
+    # sees its own writes, whatever the replication lag.
+
+    def __init__(
+        self,
+        write_engine: Engine,
+        read_engine: Callable[[], Engine],
+        sticky_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+        **kwargs,
+    ):
+        super().__init__(bind=write_engine, **kwargs)
+        self.write_engine = write_engine
+        self._next_read_engine = read_engine
+        self.sticky_seconds = sticky_seconds
+        self._clock = clock
+        self._replica_depth = 0
+        self._replica = None
+        self._has_writes = False
+        self._sticky_until = 0.0
+        event.listen(self, "after_flush", self._on_flush)
+        event.listen(self, "after_commit", self._on_commit)
+        event.listen(self, "after_rollback", self._on_rollback)
+
+    @contextmanager
+    def use_replica(self) -> Iterator[None]:
+        self._replica_depth += 1
+        try:
+            yield
+        finally:
+            self._replica_depth -= 1
+
+    @property
+    def pinned_to_primary(self) -> bool:
+        return self._has_writes or self._clock() < self._sticky_until
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if getattr(clause, "is_dml", False) or getattr(clause, "is_ddl", False):
+            self._has_writes = True
+            return self.write_engine
+        if self._flushing or not self._replica_depth or self.pinned_to_primary:
+            return self.write_engine
+        # One replica per transaction, so consecutive reads share a snapshot.
+        if self._replica is None:
+            self._replica = self._next_read_engine()
+        return self._replica
+
+    def _on_flush(self, session, flush_context):
+        self._has_writes = True
+
+    def _on_commit(self, session):
+        if self._has_writes:
+            self._sticky_until = self._clock() + self.sticky_seconds
+        self._has_writes = False
+        self._replica = None
+
+    def _on_rollback(self, session):
+        self._has_writes = False
+        self._replica = None
+
+
+def reads_from_replica(method):
+    # Marks a repository method as read-only; sessions without routing, such
+    # as plain SQLite sessions in tests and benchmarks, are left untouched.
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        use_replica = getattr(self.session, "use_replica", None)
+        if use_replica is None:
+            return method(self, *args, **kwargs)
+        with use_replica():
+            return method(self, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,44 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from .interfaces.connector import Connector
+
+
+class UrlConnector(Connector):
+    # Connects to any SQLAlchemy URL, e.g. a SQLite file for benchmarks or a
+    # throwaway MySQL container. The engine is created lazily so the connector
+    # can be pickled into worker processes.
+
+    def __init__(self, url: str, **engine_options):
+        self.url = url
+        self.engine_options = engine_options
+        self._engine = None
+        self._session_factory = None
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            self._engine = create_engine(self.url, **self.engine_options)
+        return self._engine
+
+    def get_write_engine(self):
+        return self.engine
+
+    def get_connection(self):
+        return self.engine.raw_connection()
+
+    def get_session(self):
+        if self._session_factory is None:
+            self._session_factory = sessionmaker(bind=self.engine)
+        return self._session_factory()
+
+    def dispose(self) -> None:
+        if self._engine is not None:
+            self._engine.dispose()
+        self._engine = None
+        self._session_factory = None
+
+    def __getstate__(self):
+        return {"url": self.url, "engine_options": self.engine_options}
+
+    def __setstate__(self, state):
+        self.__init__(state["url"], **state["engine_options"])
@@ -0,0 +1,287 @@
+import csv
+from dataclasses import dataclass, field
+import datetime
+import io
+import json
+from logging import Logger as StandardLogger
+import os
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, select
+
+from components.database.fast_reads import as_float64
+from components.database.interfaces.connector import Connector
+from components.database.models import (
+    DividendYield,
+    FinancialMetric,
+    Industry,
+    MetricName,
+    Sector,
+    Stock,
+    StockPriceHistory,
+)
+
+FORMATS = ("csv", "jsonl", "arrow")
+_EXTENSIONS = {"csv": ".csv", "jsonl": ".jsonl", "arrow": ".arrow"}
+
+
+@dataclass(frozen=True)
+class ExportFilter:
+    tickers: Optional[Sequence[str]] = None
+    sectors: Optional[Sequence[str]] = None
+    start: Optional[datetime.datetime] = None
+    end: Optional[datetime.datetime] = None
+
+
+@dataclass(frozen=True)
+class Dataset:
+    name: str
+    table: type
+    # (column name, kind) with kind one of "string", "timestamp", "float".
+    columns: Tuple[Tuple[str, str], ...]
+    select_columns: Callable[[], tuple]
+    joins: Tuple[Tuple[type, object], ...] = field(default_factory=tuple)
+
+
+DATASETS: Dict[str, Dataset] = {
+    dataset.name: dataset
+    for dataset in (
+        Dataset(
+            "prices",
+            StockPriceHistory,
+            (("ticker", "string"), ("date_recorded", "timestamp"), ("price", "float")),
+            lambda: (
+                Stock.ticker,
+                StockPriceHistory.date_recorded,
+                as_float64(StockPriceHistory.price),
+            ),
+        ),
+        Dataset(
+            "dividends",
+            DividendYield,
+            (
+                ("ticker", "string"),
+                ("date_recorded", "timestamp"),
+                ("yield_value", "float"),
+            ),
+            lambda: (
+                Stock.ticker,
+                DividendYield.date_recorded,
+                as_float64(DividendYield.yield_value),
+            ),
+        ),
+        Dataset(
+            "metrics",
+            FinancialMetric,
+            (
+                ("ticker", "string"),
+                ("metric", "string"),
+                ("date_recorded", "timestamp"),
+                ("metric_value", "float"),
+            ),
+            lambda: (
+                Stock.ticker,
+                MetricName.name,
+                FinancialMetric.date_recorded,
+                as_float64(FinancialMetric.metric_value),
+            ),
+            ((MetricName, FinancialMetric.metric_name_id == MetricName.id),),
+        ),
+    )
+}
+
+
+def build_statement(dataset: Dataset, filters: ExportFilter) -> Select:
+    table = dataset.table
+    statement = select(*dataset.select_columns()).join_from(
+        table, Stock, table.stock_id == Stock.id
+    )
+    for target, on in dataset.joins:
+        statement = statement.join(target, on)
+    if filters.sectors is not None:
+        statement = (
+            statement.join(Industry, Stock.industry_id == Industry.id)
+            .join(Sector, Industry.sector_id == Sector.id)
+            .where(Sector.name.in_(filters.sectors))
+        )
+    if filters.tickers is not None:
+        statement = statement.where(Stock.ticker.in_(filters.tickers))
+    if filters.start is not None:
+        statement = statement.where(table.date_recorded >= filters.start)
+    if filters.end is not None:
+        statement = statement.where(table.date_recorded < filters.end)
+    # Every exported table has a (stock_id, date_recorded) index, so the
+    # server streams rows in index order instead of sorting the whole result
+    # first.
+    return statement.order_by(table.stock_id, table.date_recorded)
+
+
+def _json_default(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+class CsvWriter:
+    def __init__(self, stream: BinaryIO, dataset: Dataset):
+        self._text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+        self._writer = csv.writer(self._text)
+        self._writer.writerow([name for name, _ in dataset.columns])
+
+    def write(self, rows: List[tuple]) -> None:
+        self._writer.writerows(rows)
+
+    def close(self) -> None:
+        self._text.flush()
+        self._text.detach()
+
+
+class JsonlWriter:
+    def __init__(self, stream: BinaryIO, dataset: Dataset):
+        self._stream = stream
+        self._names = [name for name, _ in dataset.columns]
+
+    def write(self, rows: List[tuple]) -> None:
+        lines = [
+            json.dumps(dict(zip(self._names, row)), default=_json_default)
+            for row in rows
+        ]
+        lines.append("")
+        self._stream.write("\n".join(lines).encode("utf-8"))
+
+    def close(self) -> None:
+        self._stream.flush()
+
+
+class ArrowWriter:
+    def __init__(self, stream: BinaryIO, dataset: Dataset):
+        try:
+            import pyarrow
+            import pyarrow.ipc
+        except ImportError as e:
+            raise ValueError(
+                "Arrow export needs pyarrow; install it with 'pip install pyarrow'."
+            ) from e
+        self._pa = pyarrow
+        types = {
+            "string": pyarrow.string(),
+            "timestamp": pyarrow.timestamp("us"),
+            "float": pyarrow.float64(),
+        }
+        self._schema = pyarrow.schema(
+            [(name, types[kind]) for name, kind in dataset.columns]
+        )
+        self._writer = pyarrow.ipc.new_stream(stream, self._schema)
+
+    def write(self, rows: List[tuple]) -> None:
+        columns = list(zip(*rows))
+        self._writer.write_batch(
+            self._pa.record_batch(
+                [
+                    self._pa.array(column, type=schema_field.type)
+                    for column, schema_field in zip(columns, self._schema)
+                ],
+                schema=self._schema,
+            )
+        )
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+WRITERS = {"csv": CsvWriter, "jsonl": JsonlWriter, "arrow": ArrowWriter}
+
+
+@dataclass
+class ExportSummary:
+    dataset: str
+    file_format: str
+    rows: int
+    path: Optional[Path] = None
+
+
+class TableExporter:
+    # Streams a query through a server-side cursor and writes each chunk
+    # before fetching the next, so memory stays at one chunk whatever the
+    # size of the result.
+
+    def __init__(
+        self,
+        connector: Connector,
+        export_dir: Path,
+        chunk_rows: int = 10000,
+        logger: StandardLogger = None,
+    ):
+        self.connector = connector
+        self.export_dir = Path(export_dir)
+        self.chunk_rows = chunk_rows
+        self.logger = logger
+
+    def _dataset(self, name: str) -> Dataset:
+        if name not in DATASETS:
+            raise ValueError(
+                f"Unknown dataset '{name}'. Choose from {', '.join(DATASETS)}."
+            )
+        return DATASETS[name]
+
+    def iter_chunks(
+        self, dataset: str, filters: ExportFilter = ExportFilter()
+    ) -> Iterator[List[tuple]]:
+        statement = build_statement(self._dataset(dataset), filters)
+        # Exports are read-only and long-running, so they go to a replica.
+        with self.connector.get_read_engine().connect() as connection:
+            result = connection.execution_options(
+                stream_results=True, yield_per=self.chunk_rows
+            ).execute(statement)
+            for partition in result.partitions():
+                yield [tuple(row) for row in partition]
+
+    def write(
+        self,
+        stream: BinaryIO,
+        dataset: str,
+        file_format: str,
+        filters: ExportFilter = ExportFilter(),
+    ) -> ExportSummary:
+        if file_format not in WRITERS:
+            raise ValueError(
+                f"Unknown format '{file_format}'. Choose from {', '.join(FORMATS)}."
+            )
+        writer = WRITERS[file_format](stream, self._dataset(dataset))
+        rows = 0
+        try:
+            for chunk in self.iter_chunks(dataset, filters):
+                writer.write(chunk)
+                rows += len(chunk)
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"Failed to export {dataset}. Error: {e}")
+            raise
+        finally:
+            writer.close()
+        return ExportSummary(dataset=dataset, file_format=file_format, rows=rows)
+
+    def default_path(self, dataset: str, file_format: str) -> Path:
+        stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        return self.export_dir / f"{dataset}-{stamp}{_EXTENSIONS.get(file_format, '')}"
+
+    def export(
+        self,
+        dataset: str,
+        file_format: str,
+        filters: ExportFilter = ExportFilter(),
+        path: Optional[Path] = None,
+    ) -> ExportSummary:
+        path = Path(path) if path else self.default_path(dataset, file_format)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(path.name + ".part")
+        try:
+            with open(partial, "wb") as stream:
+                summary = self.write(stream, dataset, file_format, filters)
+            os.replace(partial, path)
+        except BaseException:
+            partial.unlink(missing_ok=True)
+            raise
+        summary.path = path
+        return summary
@@ -1,10 +1,20 @@
+import atexit
 from configparser import ConfigParser
 from io import StringIO
 from logging import Logger
 import logging.config
+from logging.handlers import QueueHandler
+import os
 from pathlib import Path
+import queue
 from shutil import copyfile
 import re
+from dotenv import load_dotenv
+
+from components.logger.queue_logging import (
+    BatchedRotatingFileHandler,
+    BatchingQueueListener,
+)
 
 
 class NativeLogger(Logger):
@@ -12,6 +22,7 @@ class NativeLogger(Logger):
     _example_config_file = Path(__file__).resolve().parent / "logging.example.ini"
     _root_dir = Path(__file__).resolve().parents[3]
     _config_file = _root_dir / "logging.ini"
+    _listeners = []
 
     @classmethod
     def _prepare_config_file(cls):
@@ -40,6 +51,77 @@ class NativeLogger(Logger):
         config_stream = StringIO(adjusted_config_str)
         logging.config.fileConfig(config_stream, disable_existing_loggers=False)
 
+        load_dotenv(cls._root_dir / ".env")
+        if os.getenv("LOG_QUEUE", "false") == "true":
+            for logger in cls._configured_loggers():
+                cls.enable_queue_mode(
+                    logger,
+                    batch_size=int(os.getenv("LOG_BATCH_SIZE", "100")),
+                    max_bytes=int(os.getenv("LOG_MAX_BYTES", "0")),
+                    backup_count=int(os.getenv("LOG_BACKUP_COUNT", "5")),
+                )
+
+    @classmethod
+    def _configured_loggers(cls):
+        loggers = [logging.getLogger()]
+        for logger in logging.Logger.manager.loggerDict.values():
+            if isinstance(logger, logging.Logger) and logger.handlers:
+                loggers.append(logger)
+        return loggers
+
+    @staticmethod
+    def _batched_file_handler(handler, max_bytes, backup_count):
+        batched = BatchedRotatingFileHandler(
+            handler.baseFilename,
+            mode=handler.mode,
+            maxBytes=max_bytes,
+            backupCount=backup_count,
+            encoding=handler.encoding,
+            delay=True,
+        )
+        batched.setLevel(handler.level)
+        batched.setFormatter(handler.formatter)
+        for log_filter in handler.filters:
+            batched.addFilter(log_filter)
+        handler.close()
+        return batched
+
+    @classmethod
+    def enable_queue_mode(
+        cls,
+        logger: logging.Logger,
+        batch_size: int = 100,
+        max_bytes: int = 0,
+        backup_count: int = 5,
+    ) -> None:
+        # The calling thread only puts the record on an in-memory queue; a
+        # background listener thread formats it and does the file I/O.
+        if not logger.handlers:
+            return
+        handlers = [
+            (
+                cls._batched_file_handler(handler, max_bytes, backup_count)
+                if isinstance(handler, logging.FileHandler)
+                else handler
+            )
+            for handler in logger.handlers
+        ]
+        log_queue = queue.Queue(-1)
+        listener = BatchingQueueListener(log_queue, *handlers, batch_size=batch_size)
+        logger.handlers = [QueueHandler(log_queue)]
+        listener.start()
+        if not cls._listeners:
+            atexit.register(cls.shutdown)
+        cls._listeners.append(listener)
+
+    @classmethod
+    def shutdown(cls) -> None:
+        while cls._listeners:
+            listener = cls._listeners.pop()
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+
     @classmethod
     def _ensure_configured(cls):
         if cls._logger is None:
@@ -0,0 +1,59 @@
+import logging
+from logging.handlers import QueueListener, RotatingFileHandler
+import queue
+
+
+class BatchedRotatingFileHandler(RotatingFileHandler):
+    # StreamHandler.emit flushes after every record; here the flush is left to
+    # the listener, which calls flush() once per batch.
+
+    def __init__(self, *args, **kwargs):
+        self._in_emit = False
+        super().__init__(*args, **kwargs)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self._in_emit = True
+        try:
+            super().emit(record)
+        finally:
+            self._in_emit = False
+
+    def flush(self) -> None:
+        if not self._in_emit:
+            super().flush()
+
+
+class BatchingQueueListener(QueueListener):
+
+    def __init__(self, log_queue: queue.Queue, *handlers, batch_size: int = 100):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.batch_size = max(batch_size, 1)
+
+    def _drain(self) -> list:
+        batch = [self.queue.get()]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _monitor(self) -> None:
+        # Takes whatever is already queued (up to batch_size) in one go: a quiet
+        # logger still writes every record immediately, a burst costs one flush
+        # per batch instead of one per record.
+        while True:
+            batch = self._drain()
+            stopping = False
+            for record in batch:
+                if record is self._sentinel:
+                    stopping = True
+                else:
+                    self.handle(record)
+            for handler in self.handlers:
+                handler.flush()
+            if hasattr(self.queue, "task_done"):
+                for _ in batch:
+                    self.queue.task_done()
+            if stopping:
+                return
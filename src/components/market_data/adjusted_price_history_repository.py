@@ -0,0 +1,28 @@
+import datetime
+from typing import List, Optional
+
+from components.market_data.interfaces.price_history_repository import (
+    PriceHistoryRepository,
+    PricePoints,
+)
+from components.market_data.price_adjuster import PriceAdjuster
+
+
+class AdjustedPriceHistoryRepository(PriceHistoryRepository):
+    # Serves split and dividend adjusted prices: raw points from the wrapped
+    # repository times the adjuster's cached factors.
+
+    def __init__(self, repository: PriceHistoryRepository, adjuster: PriceAdjuster):
+        self.repository = repository
+        self.adjuster = adjuster
+
+    def load_price_points(
+        self,
+        stock_ids: Optional[List[int]] = None,
+        start: Optional[datetime.datetime] = None,
+        end: Optional[datetime.datetime] = None,
+    ) -> PricePoints:
+        self.adjuster.refresh()
+        return self.adjuster.adjust(
+            self.repository.load_price_points(stock_ids=stock_ids, start=start, end=end)
+        )
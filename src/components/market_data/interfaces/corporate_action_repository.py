@@ -0,0 +1,42 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+import datetime
+from typing import List, Optional
+
+SPLIT = "split"
+DIVIDEND = "dividend"
+ACTION_TYPES = (SPLIT, DIVIDEND)
+
+
+@dataclass(frozen=True)
+class CorporateActionRecord:
+    id: int
+    stock_id: int
+    action_type: str
+    ex_date: datetime.date
+    # New shares per old share for splits, e.g. 4.0 for a 4-for-1 split.
+    ratio: Optional[float] = None
+    # Cash per share for dividends.
+    amount: Optional[float] = None
+    # The last raw price before ex_date, which dividends are measured against.
+    reference_price: Optional[float] = None
+
+
+class CorporateActionRepository(ABC):
+
+    @abstractmethod
+    def add_action(
+        self,
+        stock_id: int,
+        action_type: str,
+        ex_date: datetime.date,
+        ratio: Optional[float] = None,
+        amount: Optional[float] = None,
+    ) -> CorporateActionRecord:
+        pass
+
+    @abstractmethod
+    def load_actions(
+        self, stock_ids: Optional[List[int]] = None, after_id: int = 0
+    ) -> List[CorporateActionRecord]:
+        pass
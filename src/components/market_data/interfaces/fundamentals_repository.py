@@ -0,0 +1,39 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+import datetime
+from typing import Dict, Optional
+import numpy as np
+
+DIVIDEND_YIELD = "Dividend Yield"
+
+
+@dataclass
+class MetricPoints:
+    # One row per recorded value; metric_ids index into metric_names.
+    stock_ids: np.ndarray
+    metric_ids: np.ndarray
+    recorded_at: np.ndarray
+    values: np.ndarray
+    metric_names: Dict[int, str]
+
+    def __len__(self) -> int:
+        return len(self.stock_ids)
+
+
+class FundamentalsRepository(ABC):
+
+    @abstractmethod
+    def load_metric_points(
+        self,
+        start: Optional[datetime.datetime] = None,
+        end: Optional[datetime.datetime] = None,
+    ) -> MetricPoints:
+        pass
+
+    @abstractmethod
+    def load_dividend_points(
+        self,
+        start: Optional[datetime.datetime] = None,
+        end: Optional[datetime.datetime] = None,
+    ) -> MetricPoints:
+        pass
@@ -0,0 +1,54 @@
+from abc import ABC, abstractmethod
+import datetime
+from typing import Dict, List, Optional
+
+from components.analytics.price_bars import PriceBars
+
+
+class PriceBarRepository(ABC):
+
+    @abstractmethod
+    def latest_periods(
+        self, resolution: str, stock_ids: List[int]
+    ) -> Dict[int, datetime.date]:
+        pass
+
+    @abstractmethod
+    def load_bars(
+        self,
+        resolution: str,
+        stock_ids: Optional[List[int]] = None,
+        start: Optional[datetime.date] = None,
+        end: Optional[datetime.date] = None,
+    ) -> PriceBars:
+        pass
+
+    @abstractmethod
+    def load_chart_bars(
+        self,
+        resolution: str,
+        stock_id: int,
+        start: Optional[datetime.date] = None,
+        end: Optional[datetime.date] = None,
+    ) -> PriceBars:
+        pass
+
+    @abstractmethod
+    def count_bars(
+        self,
+        resolution: str,
+        stock_id: int,
+        start: Optional[datetime.date] = None,
+        end: Optional[datetime.date] = None,
+    ) -> int:
+        pass
+
+    @abstractmethod
+    def replace_bars(
+        self,
+        resolution: str,
+        stock_ids: List[int],
+        since: Optional[datetime.date],
+        bars: PriceBars,
+    ) -> None:
+        pass
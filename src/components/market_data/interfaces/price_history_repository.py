@@ -0,0 +1,27 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+import datetime
+from typing import List, Optional
+import numpy as np
+
+
+@dataclass
+class PricePoints:
+    stock_ids: np.ndarray
+    recorded_at: np.ndarray
+    prices: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.stock_ids)
+
+
+class PriceHistoryRepository(ABC):
+
+    @abstractmethod
+    def load_price_points(
+        self,
+        stock_ids: Optional[List[int]] = None,
+        start: Optional[datetime.datetime] = None,
+        end: Optional[datetime.datetime] = None,
+    ) -> PricePoints:
+        pass
@@ -0,0 +1,39 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+import datetime
+from typing import Dict, List, Optional
+
+
+@dataclass
+class StockName:
+    id: int
+    ticker: str
+    company_name: str
+    updated_at: Optional[datetime.datetime] = None
+
+
+class StockRepository(ABC):
+
+    @abstractmethod
+    def list_stock_ids(
+        self,
+        sectors: Optional[List[str]] = None,
+        industries: Optional[List[str]] = None,
+    ) -> List[int]:
+        pass
+
+    @abstractmethod
+    def list_stock_ids_by_sector(self) -> Dict[str, List[int]]:
+        pass
+
+    @abstractmethod
+    def list_stock_names(
+        self,
+        updated_since: Optional[datetime.datetime] = None,
+        after_id: Optional[int] = None,
+    ) -> List[StockName]:
+        pass
+
+    @abstractmethod
+    def count_stocks(self) -> int:
+        pass
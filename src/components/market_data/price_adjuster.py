@@ -0,0 +1,139 @@
+from logging import Logger as StandardLogger
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+from components.market_data.interfaces.corporate_action_repository import (
+    SPLIT,
+    CorporateActionRecord,
+    CorporateActionRepository,
+)
+from components.market_data.interfaces.price_history_repository import PricePoints
+
+# Lookup keys pack a stock id and a day number into one int64, so one sorted
+# array and one searchsorted serve every stock at once.
+_DAY_BITS = 21
+_DAY_OFFSET = 1 << (_DAY_BITS - 1)
+
+
+def _keys(stock_ids: np.ndarray, days: np.ndarray) -> np.ndarray:
+    return (stock_ids.astype(np.int64) << _DAY_BITS) | (
+        days.astype("datetime64[D]").astype(np.int64) + _DAY_OFFSET
+    )
+
+
+def action_factor(action: CorporateActionRecord) -> float:
+    # What prices before the ex-date are multiplied by to be comparable with
+    # prices on and after it.
+    if action.action_type == SPLIT:
+        return 1.0 / action.ratio
+    price = action.reference_price
+    if price is None or not 0 < action.amount < price:
+        return 1.0
+    return 1.0 - action.amount / price
+
+
+class PriceAdjuster:
+    # Back-adjusts raw prices for splits and dividends. Each stock's actions
+    # become a vector of ex-dates and cumulative factors, kept in memory and
+    # rebuilt only for stocks that got new actions; refresh() finds those by
+    # reading actions past the last id seen.
+
+    def __init__(
+        self,
+        repository: CorporateActionRepository,
+        stock_ids: Optional[List[int]] = None,
+        logger: StandardLogger = None,
+    ):
+        self.repository = repository
+        self.stock_ids = stock_ids
+        self.logger = logger
+        self.last_action_id = 0
+        self._actions: Dict[int, List[CorporateActionRecord]] = {}
+        self._latest_id: Dict[int, int] = {}
+        # Per stock: ex-dates and, for each, the product of its own and all
+        # later factors.
+        self._vectors: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self._table: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    def refresh(self) -> List[int]:
+        # Returns the stocks whose factors changed.
+        actions = self.repository.load_actions(
+            stock_ids=self.stock_ids, after_id=self.last_action_id
+        )
+        changed = set()
+        for action in actions:
+            self._actions.setdefault(action.stock_id, []).append(action)
+            self._latest_id[action.stock_id] = action.id
+            self.last_action_id = max(self.last_action_id, action.id)
+            changed.add(action.stock_id)
+        for stock_id in changed:
+            stock_actions = sorted(
+                self._actions[stock_id], key=lambda action: action.ex_date
+            )
+            factors = np.array([action_factor(action) for action in stock_actions])
+            self._vectors[stock_id] = (
+                np.array([action.ex_date for action in stock_actions], "datetime64[D]"),
+                np.cumprod(factors[::-1])[::-1],
+            )
+        if changed:
+            self._table = None
+            if self.logger is not None:
+                self.logger.info(
+                    f"Updated adjustment factors of {len(changed)} stocks."
+                )
+        return sorted(changed)
+
+    def changed_since(self, action_id: int) -> List[int]:
+        return sorted(
+            stock_id
+            for stock_id, latest in self._latest_id.items()
+            if latest > action_id
+        )
+
+    def version(self, stock_ids: List[int]) -> int:
+        # Action ids only grow, so this changes exactly when one of these
+        # stocks gets a new action.
+        return max(
+            (self._latest_id.get(stock_id, 0) for stock_id in stock_ids), default=0
+        )
+
+    def _lookup_table(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._table is None:
+            stock_ids = sorted(self._vectors)
+            days = [self._vectors[stock_id][0] for stock_id in stock_ids]
+            self._table = (
+                np.concatenate(
+                    [_keys(np.full(len(d), s), d) for s, d in zip(stock_ids, days)]
+                    or [np.array([], dtype=np.int64)]
+                ),
+                np.concatenate(
+                    [self._vectors[stock_id][1] for stock_id in stock_ids]
+                    or [np.array([])]
+                ),
+            )
+        return self._table
+
+    def factors(self, stock_ids: np.ndarray, days: np.ndarray) -> np.ndarray:
+        # The cumulative factor of every (stock, day) pair: the product over
+        # the stock's actions with an ex-date after the day.
+        keys, cumulative = self._lookup_table()
+        result = np.ones(len(stock_ids))
+        if len(keys) == 0 or len(stock_ids) == 0:
+            return result
+        # The first action strictly after the day; it only counts if it
+        # belongs to the same stock.
+        positions = np.searchsorted(keys, _keys(stock_ids, days), side="right")
+        inside = positions < len(keys)
+        same_stock = np.zeros(len(stock_ids), dtype=bool)
+        same_stock[inside] = (keys[positions[inside]] >> _DAY_BITS) == stock_ids[inside]
+        result[same_stock] = cumulative[positions[same_stock]]
+        return result
+
+    def adjust(self, points: PricePoints) -> PricePoints:
+        if not self._vectors or len(points) == 0:
+            return points
+        return PricePoints(
+            stock_ids=points.stock_ids,
+            recorded_at=points.recorded_at,
+            prices=points.prices * self.factors(points.stock_ids, points.recorded_at),
+        )
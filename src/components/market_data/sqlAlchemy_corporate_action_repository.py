@@ -0,0 +1,141 @@
+import datetime
+from typing import List, Optional
+from logging import Logger as StandardLogger
+from sqlalchemy import select
+from components.database.interfaces.connector import Connector
+from components.database.models import CorporateAction, StockPriceHistory
+from components.database.routing_session import reads_from_replica
+from components.market_data.interfaces.corporate_action_repository import (
+    ACTION_TYPES,
+    DIVIDEND,
+    SPLIT,
+    CorporateActionRecord,
+    CorporateActionRepository,
+)
+
+
+class SqlalchemyCorporateActionRepository(CorporateActionRepository):
+
+    def __init__(
+        self,
+        config=None,
+        connector: Connector = None,
+        logger: StandardLogger = None,
+    ):
+        self.config = config
+        self.session = connector.get_session()
+        self.logger = logger
+
+    def add_action(
+        self,
+        stock_id: int,
+        action_type: str,
+        ex_date: datetime.date,
+        ratio: Optional[float] = None,
+        amount: Optional[float] = None,
+    ) -> CorporateActionRecord:
+        if action_type not in ACTION_TYPES:
+            raise ValueError(
+                f"Unknown corporate action type '{action_type}'. "
+                f"Choose one of: {', '.join(ACTION_TYPES)}."
+            )
+        if action_type == SPLIT and not (ratio and ratio > 0):
+            raise ValueError("A split needs a positive ratio.")
+        if action_type == DIVIDEND and not (amount and amount > 0):
+            raise ValueError("A dividend needs a positive amount.")
+        # Adjustment factors only ever cover days before an ex-date, so an
+        # action is recorded once it is in effect; a future one would change
+        # adjusted history before its time.
+        if ex_date > datetime.datetime.now(datetime.timezone.utc).date():
+            raise ValueError(f"Ex-date {ex_date} is in the future.")
+        reference_price = None
+        if action_type == DIVIDEND:
+            # Stored with the action: re-reading it later would let prices
+            # backfilled afterwards change factors that caches keyed on the
+            # action id already used.
+            reference_price = self._reference_price(stock_id, ex_date)
+            if reference_price is None:
+                raise ValueError(
+                    f"Stock id {stock_id} has no price before {ex_date} to "
+                    "measure the dividend against."
+                )
+        action = CorporateAction(
+            stock_id=stock_id,
+            action_type=action_type,
+            ex_date=ex_date,
+            ratio=ratio if action_type == SPLIT else None,
+            amount=amount if action_type == DIVIDEND else None,
+            reference_price=reference_price,
+        )
+        try:
+            self.session.add(action)
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            self.logger.error(
+                f"Failed to add {action_type} for stock id {stock_id}. Error: {e}"
+            )
+            raise
+        return CorporateActionRecord(
+            id=action.id,
+            stock_id=stock_id,
+            action_type=action_type,
+            ex_date=ex_date,
+            ratio=action.ratio,
+            amount=action.amount,
+            reference_price=reference_price,
+        )
+
+    def _reference_price(
+        self, stock_id: int, ex_date: datetime.date
+    ) -> Optional[float]:
+        statement = (
+            select(StockPriceHistory.price)
+            .where(
+                StockPriceHistory.stock_id == stock_id,
+                StockPriceHistory.date_recorded < ex_date,
+            )
+            .order_by(StockPriceHistory.date_recorded.desc())
+            .limit(1)
+        )
+        try:
+            price = self.session.execute(statement).scalar()
+        except Exception as e:
+            self.logger.error(
+                f"Failed to read the price of stock id {stock_id} before {ex_date}. Error: {e}"
+            )
+            raise
+        return None if price is None else float(price)
+
+    @reads_from_replica
+    def load_actions(
+        self, stock_ids: Optional[List[int]] = None, after_id: int = 0
+    ) -> List[CorporateActionRecord]:
+        statement = (
+            select(CorporateAction)
+            .where(CorporateAction.id > after_id)
+            .order_by(CorporateAction.id)
+        )
+        if stock_ids is not None:
+            statement = statement.where(CorporateAction.stock_id.in_(stock_ids))
+        try:
+            actions = self.session.execute(statement).scalars().all()
+        except Exception as e:
+            self.logger.error(f"Failed to load corporate actions. Error: {e}")
+            raise
+        return [
+            CorporateActionRecord(
+                id=action.id,
+                stock_id=action.stock_id,
+                action_type=action.action_type,
+                ex_date=action.ex_date,
+                ratio=None if action.ratio is None else float(action.ratio),
+                amount=None if action.amount is None else float(action.amount),
+                reference_price=(
+                    None
+                    if action.reference_price is None
+                    else float(action.reference_price)
+                ),
+            )
+            for action in actions
+        ]
@@ -0,0 +1,100 @@
+import datetime
+from typing import Optional
+from logging import Logger as StandardLogger
+import numpy as np
+from sqlalchemy import literal, select
+from components.database.fast_reads import (
+    as_float64,
+    epoch_microseconds,
+    fetch_columns,
+)
+from components.database.interfaces.connector import Connector
+from components.database.models import DividendYield, FinancialMetric, MetricName
+from components.database.routing_session import reads_from_replica
+from components.market_data.interfaces.fundamentals_repository import (
+    DIVIDEND_YIELD,
+    FundamentalsRepository,
+    MetricPoints,
+)
+
+# Dividend yields are returned as one more metric under this id, so callers
+# can treat them like any FinancialMetric.
+_DIVIDEND_METRIC_ID = -1
+
+
+class SqlalchemyFundamentalsRepository(FundamentalsRepository):
+
+    def __init__(
+        self,
+        config=None,
+        connector: Connector = None,
+        logger: StandardLogger = None,
+    ):
+        self.config = config
+        self.session = connector.get_session()
+        self.logger = logger
+
+    def _load(self, table, metric_id, value, start, end, metric_names) -> MetricPoints:
+        statement = select(
+            table.stock_id,
+            metric_id,
+            epoch_microseconds(table.date_recorded),
+            as_float64(value),
+        )
+        if start is not None:
+            statement = statement.where(table.date_recorded >= start)
+        if end is not None:
+            statement = statement.where(table.date_recorded < end)
+        stock_ids, metric_ids, recorded_at, values = fetch_columns(
+            self.session,
+            statement,
+            (np.int64, np.int64, "datetime64[us]", np.float64),
+        )
+        return MetricPoints(
+            stock_ids=stock_ids,
+            metric_ids=metric_ids,
+            recorded_at=recorded_at,
+            values=values,
+            metric_names=metric_names,
+        )
+
+    @reads_from_replica
+    def load_metric_points(
+        self,
+        start: Optional[datetime.datetime] = None,
+        end: Optional[datetime.datetime] = None,
+    ) -> MetricPoints:
+        try:
+            metric_names = dict(
+                self.session.query(MetricName.id, MetricName.name).all()
+            )
+            return self._load(
+                FinancialMetric,
+                FinancialMetric.metric_name_id,
+                FinancialMetric.metric_value,
+                start,
+                end,
+                metric_names,
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to load financial metrics. Error: {e}")
+            raise
+
+    @reads_from_replica
+    def load_dividend_points(
+        self,
+        start: Optional[datetime.datetime] = None,
+        end: Optional[datetime.datetime] = None,
+    ) -> MetricPoints:
+        try:
+            return self._load(
+                DividendYield,
+                literal(_DIVIDEND_METRIC_ID),
+                DividendYield.yield_value,
+                start,
+                end,
+                {_DIVIDEND_METRIC_ID: DIVIDEND_YIELD},
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to load dividend yields. Error: {e}")
+            raise
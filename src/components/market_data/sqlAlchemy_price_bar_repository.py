@@ -0,0 +1,179 @@
+import datetime
+from typing import Dict, List, Optional
+from logging import Logger as StandardLogger
+import numpy as np
+from sqlalchemy import delete, func, insert, select
+from components.analytics.price_bars import PriceBars
+from components.database.fast_reads import (
+    as_float64,
+    epoch_microseconds,
+    fetch_columns,
+)
+from components.database.interfaces.connector import Connector
+from components.database.models import PriceBar
+from components.database.routing_session import reads_from_replica
+from components.market_data.interfaces.price_bar_repository import (
+    PriceBarRepository,
+)
+
+
+class SqlalchemyPriceBarRepository(PriceBarRepository):
+
+    def __init__(
+        self,
+        config=None,
+        connector: Connector = None,
+        logger: StandardLogger = None,
+    ):
+        self.config = config
+        self.session = connector.get_session()
+        self.logger = logger
+
+    def latest_periods(
+        self, resolution: str, stock_ids: List[int]
+    ) -> Dict[int, datetime.date]:
+        try:
+            rows = (
+                self.session.query(PriceBar.stock_id, func.max(PriceBar.period_start))
+                .filter(
+                    PriceBar.resolution == resolution,
+                    PriceBar.stock_id.in_(stock_ids),
+                )
+                .group_by(PriceBar.stock_id)
+                .all()
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to read latest {resolution} bars. Error: {e}")
+            raise
+        return {stock_id: latest for stock_id, latest in rows}
+
+    def _where(self, statement, resolution, stock_ids, start, end):
+        statement = statement.where(PriceBar.resolution == resolution)
+        if stock_ids is not None:
+            statement = statement.where(PriceBar.stock_id.in_(stock_ids))
+        if start is not None:
+            statement = statement.where(PriceBar.period_start >= start)
+        if end is not None:
+            statement = statement.where(PriceBar.period_start < end)
+        return statement
+
+    def load_bars(
+        self,
+        resolution: str,
+        stock_ids: Optional[List[int]] = None,
+        start: Optional[datetime.date] = None,
+        end: Optional[datetime.date] = None,
+    ) -> PriceBars:
+        # Refreshes build on these bars, so they are read from the primary.
+        statement = self._where(
+            select(
+                PriceBar.stock_id,
+                epoch_microseconds(PriceBar.period_start),
+                epoch_microseconds(PriceBar.first_at),
+                epoch_microseconds(PriceBar.last_at),
+                as_float64(PriceBar.open),
+                as_float64(PriceBar.high),
+                as_float64(PriceBar.low),
+                as_float64(PriceBar.close),
+                PriceBar.points,
+            ),
+            resolution,
+            stock_ids,
+            start,
+            end,
+        ).order_by(PriceBar.stock_id, PriceBar.period_start)
+        try:
+            columns = fetch_columns(
+                self.session,
+                statement,
+                (np.int64,) + ("datetime64[us]",) * 3 + (np.float64,) * 4 + (np.int64,),
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to load {resolution} bars. Error: {e}")
+            raise
+        stock_ids, period_start, first_at, last_at, open_, high, low, close, points = (
+            columns
+        )
+        return PriceBars(
+            stock_ids=stock_ids,
+            period_start=period_start.astype("datetime64[D]"),
+            first_at=first_at,
+            last_at=last_at,
+            open=open_,
+            high=high,
+            low=low,
+            close=close,
+            points=points,
+        )
+
+    @reads_from_replica
+    def load_chart_bars(
+        self,
+        resolution: str,
+        stock_id: int,
+        start: Optional[datetime.date] = None,
+        end: Optional[datetime.date] = None,
+    ) -> PriceBars:
+        return self.load_bars(resolution, [stock_id], start, end)
+
+    @reads_from_replica
+    def count_bars(
+        self,
+        resolution: str,
+        stock_id: int,
+        start: Optional[datetime.date] = None,
+        end: Optional[datetime.date] = None,
+    ) -> int:
+        statement = self._where(
+            select(func.count()).select_from(PriceBar),
+            resolution,
+            [stock_id],
+            start,
+            end,
+        )
+        try:
+            return self.session.execute(statement).scalar_one()
+        except Exception as e:
+            self.logger.error(f"Failed to count {resolution} bars. Error: {e}")
+            raise
+
+    def replace_bars(
+        self,
+        resolution: str,
+        stock_ids: List[int],
+        since: Optional[datetime.date],
+        bars: PriceBars,
+    ) -> None:
+        columns = {
+            "stock_id": bars.stock_ids.tolist(),
+            "period_start": bars.period_start.tolist(),
+            "open": np.round(bars.open, 4).tolist(),
+            "high": np.round(bars.high, 4).tolist(),
+            "low": np.round(bars.low, 4).tolist(),
+            "close": np.round(bars.close, 4).tolist(),
+            "first_at": bars.first_at.astype("datetime64[us]").tolist(),
+            "last_at": bars.last_at.astype("datetime64[us]").tolist(),
+            "points": bars.points.tolist(),
+        }
+        rows = [
+            dict(zip(columns, values), resolution=resolution)
+            for values in zip(*columns.values())
+        ]
+        statement = delete(PriceBar).where(
+            PriceBar.resolution == resolution, PriceBar.stock_id.in_(stock_ids)
+        )
+        if since is not None:
+            statement = statement.where(PriceBar.period_start >= since)
+        try:
+            # Bars from `since` on are rebuilt from scratch, so re-running a
+            # refresh over the same window is idempotent.
+            self.session.execute(statement)
+            if rows:
+                self.session.execute(insert(PriceBar), rows)
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            self.logger.error(
+                f"Failed to write {len(rows)} {resolution} bars. Error: {e}"
+            )
+            raise
@@ -0,0 +1,67 @@
+import datetime
+from typing import List, Optional
+from logging import Logger as StandardLogger
+import numpy as np
+from components.database.fast_reads import (
+    as_float64,
+    epoch_microseconds,
+    fetch_columns,
+)
+from components.database.interfaces.connector import Connector
+from components.database.models import StockPriceHistory
+from components.database.routing_session import reads_from_replica
+from components.market_data.interfaces.price_history_repository import (
+    PriceHistoryRepository,
+    PricePoints,
+)
+
+
+class SqlalchemyPriceHistoryRepository(PriceHistoryRepository):
+
+    def __init__(
+        self,
+        config=None,
+        connector: Connector = None,
+        logger: StandardLogger = None,
+    ):
+        self.config = config
+        self.session = connector.get_session()
+        self.logger = logger
+
+    def _price_query(self, columns, stock_ids, start, end):
+        query = self.session.query(*columns)
+        if stock_ids is not None:
+            query = query.filter(StockPriceHistory.stock_id.in_(stock_ids))
+        if start is not None:
+            query = query.filter(StockPriceHistory.date_recorded >= start)
+        if end is not None:
+            query = query.filter(StockPriceHistory.date_recorded < end)
+        return query
+
+    @reads_from_replica
+    def load_price_points(
+        self,
+        stock_ids: Optional[List[int]] = None,
+        start: Optional[datetime.datetime] = None,
+        end: Optional[datetime.datetime] = None,
+    ) -> PricePoints:
+        query = self._price_query(
+            (
+                StockPriceHistory.stock_id,
+                epoch_microseconds(StockPriceHistory.date_recorded),
+                as_float64(StockPriceHistory.price),
+            ),
+            stock_ids,
+            start,
+            end,
+        )
+        try:
+            stock_ids, recorded_at, prices = fetch_columns(
+                self.session,
+                query.statement,
+                (np.int64, "datetime64[us]", np.float64),
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to load price history. Error: {e}")
+            raise
+        return PricePoints(stock_ids=stock_ids, recorded_at=recorded_at, prices=prices)
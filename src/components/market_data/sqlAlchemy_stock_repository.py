@@ -0,0 +1,95 @@
+import datetime
+from typing import Dict, List, Optional
+from logging import Logger as StandardLogger
+from sqlalchemy import func, or_
+from components.database.interfaces.connector import Connector
+from components.database.models import Industry, Sector, Stock
+from components.database.routing_session import reads_from_replica
+from components.market_data.interfaces.stock_repository import (
+    StockName,
+    StockRepository,
+)
+
+
+class SqlalchemyStockRepository(StockRepository):
+
+    def __init__(
+        self,
+        config=None,
+        connector: Connector = None,
+        logger: StandardLogger = None,
+    ):
+        self.config = config
+        self.session = connector.get_session()
+        self.logger = logger
+
+    @reads_from_replica
+    def list_stock_ids(
+        self,
+        sectors: Optional[List[str]] = None,
+        industries: Optional[List[str]] = None,
+    ) -> List[int]:
+        query = self.session.query(Stock.id)
+        if sectors is not None or industries is not None:
+            query = query.join(Industry, Stock.industry_id == Industry.id)
+        if sectors is not None:
+            query = query.join(Sector, Industry.sector_id == Sector.id).filter(
+                Sector.name.in_(sectors)
+            )
+        if industries is not None:
+            query = query.filter(Industry.name.in_(industries))
+        try:
+            return [row.id for row in query.order_by(Stock.id).all()]
+        except Exception as e:
+            self.logger.error(f"Failed to list stock ids. Error: {e}")
+            raise
+
+    @reads_from_replica
+    def list_stock_ids_by_sector(self) -> Dict[str, List[int]]:
+        try:
+            rows = (
+                self.session.query(Sector.name, Stock.id)
+                .join(Industry, Industry.sector_id == Sector.id)
+                .join(Stock, Stock.industry_id == Industry.id)
+                .order_by(Sector.name, Stock.id)
+                .all()
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to list stock ids by sector. Error: {e}")
+            raise
+        by_sector: Dict[str, List[int]] = {}
+        for sector_name, stock_id in rows:
+            by_sector.setdefault(sector_name, []).append(stock_id)
+        return by_sector
+
+    def list_stock_names(
+        self,
+        updated_since: Optional[datetime.datetime] = None,
+        after_id: Optional[int] = None,
+    ) -> List[StockName]:
+        # Stocks changed since updated_since or added after after_id. Search
+        # indexes track their position with these, so this reads from the
+        # primary: a lagging replica would make them skip changes for good.
+        query = self.session.query(
+            Stock.id, Stock.ticker, Stock.company_name, Stock.updated_at
+        )
+        conditions = []
+        if updated_since is not None:
+            conditions.append(Stock.updated_at >= updated_since)
+        if after_id is not None:
+            conditions.append(Stock.id > after_id)
+        if conditions:
+            query = query.filter(or_(*conditions))
+        try:
+            rows = query.order_by(Stock.id).all()
+        except Exception as e:
+            self.logger.error(f"Failed to list stock names. Error: {e}")
+            raise
+        return [StockName(*row) for row in rows]
+
+    def count_stocks(self) -> int:
+        try:
+            return self.session.query(func.count(Stock.id)).scalar()
+        except Exception as e:
+            self.logger.error(f"Failed to count stocks. Error: {e}")
+            raise
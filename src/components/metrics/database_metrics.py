@@ -0,0 +1,101 @@
+from collections import defaultdict
+import threading
+import weakref
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from components.database.query_profiler import LATENCY_BUCKETS_MS, QueryProfiler
+from components.metrics.metrics_registry import MetricsRegistry
+
+_engines: "weakref.WeakSet[Engine]" = weakref.WeakSet()
+_engines_lock = threading.Lock()
+
+
+def _pool_label(engine: Engine) -> str:
+    return engine.url.database or engine.url.get_backend_name()
+
+
+def instrument_engine(engine: Engine, registry: MetricsRegistry = None) -> None:
+    registry = registry or MetricsRegistry.default()
+    checkouts = registry.counter(
+        "moneymonkey_db_pool_checkouts",
+        "Connections checked out of the pool.",
+        ("pool",),
+    )
+    label = _pool_label(engine)
+
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        checkouts.inc(pool=label)
+
+    with _engines_lock:
+        if engine in _engines:
+            return
+        _engines.add(engine)
+    event.listen(engine, "checkout", on_checkout)
+    registry.register_collector(collect_pool_state)
+
+
+def collect_pool_state(registry: MetricsRegistry) -> None:
+    # Each connector owns an engine, so a process can hold several pools for
+    # the same database. Usage is summed, saturation is the worst single pool.
+    checked_out = registry.gauge(
+        "moneymonkey_db_pool_checked_out",
+        "Connections currently checked out.",
+        ("pool",),
+    )
+    overflow = registry.gauge(
+        "moneymonkey_db_pool_overflow",
+        "Connections open beyond the configured pool size.",
+        ("pool",),
+    )
+    capacity = registry.gauge(
+        "moneymonkey_db_pool_capacity",
+        "Pool size plus max overflow; 0 when unbounded.",
+        ("pool",),
+    )
+    saturation = registry.gauge(
+        "moneymonkey_db_pool_saturation",
+        "Highest checked-out / capacity ratio over the pools.",
+        ("pool",),
+    )
+    totals = defaultdict(lambda: [0, 0, 0, 0.0])
+    with _engines_lock:
+        engines = list(_engines)
+    for engine in engines:
+        pool = engine.pool
+        if not hasattr(pool, "checkedout"):
+            continue
+        in_use = pool.checkedout()
+        extra = max(pool.overflow(), 0)
+        max_overflow = getattr(pool, "_max_overflow", 0)
+        limit = pool.size() + max_overflow if max_overflow >= 0 else 0
+        total = totals[_pool_label(engine)]
+        total[0] += in_use
+        total[1] += extra
+        total[2] += limit
+        if limit:
+            total[3] = max(total[3], in_use / limit)
+    for label, (in_use, extra, limit, ratio) in totals.items():
+        checked_out.set(in_use, pool=label)
+        overflow.set(extra, pool=label)
+        capacity.set(limit, pool=label)
+        saturation.set(ratio, pool=label)
+
+
+def collect_query_latency(registry: MetricsRegistry) -> None:
+    histogram = registry.histogram(
+        "moneymonkey_db_query_duration_seconds",
+        "Query latency per calling repository method.",
+        ("caller",),
+        buckets=tuple(bound / 1000 for bound in LATENCY_BUCKETS_MS),
+    )
+    per_caller = {}
+    for (caller, _), stats in QueryProfiler.default().snapshot().items():
+        counts, total = per_caller.get(caller, ([0] * len(stats.buckets), 0.0))
+        per_caller[caller] = (
+            [left + right for left, right in zip(counts, stats.buckets)],
+            total + stats.total_ms / 1000,
+        )
+    for caller, (counts, total) in per_caller.items():
+        histogram.load(counts, total, caller=caller)
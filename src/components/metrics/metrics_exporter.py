@@ -0,0 +1,122 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging import Logger as StandardLogger
+import os
+from pathlib import Path
+import threading
+from typing import Optional
+
+from components.metrics.metrics_registry import MetricsRegistry
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _handler_for(registry: MetricsRegistry):
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return MetricsHandler
+
+
+class MetricsExporter:
+
+    def __init__(
+        self,
+        registry: MetricsRegistry = None,
+        http_host: str = "127.0.0.1",
+        http_port: Optional[int] = None,
+        textfile: Optional[Path] = None,
+        textfile_interval: float = 15.0,
+        logger: StandardLogger = None,
+    ):
+        self.registry = registry or MetricsRegistry.default()
+        self.http_host = http_host
+        self.http_port = http_port
+        self.textfile = Path(textfile) if textfile else None
+        self.textfile_interval = textfile_interval
+        self.logger = logger
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._writer: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, logger: StandardLogger = None) -> "MetricsExporter":
+        port = os.getenv("METRICS_HTTP_PORT", "")
+        textfile = os.getenv("METRICS_TEXTFILE", "")
+        return cls(
+            http_host=os.getenv("METRICS_HTTP_HOST", "127.0.0.1"),
+            http_port=int(port) if port else None,
+            textfile=Path(textfile) if textfile else None,
+            textfile_interval=float(os.getenv("METRICS_TEXTFILE_INTERVAL", "15")),
+            logger=logger,
+        )
+
+    @property
+    def address(self):
+        return self._server.server_address if self._server else None
+
+    def start(self) -> None:
+        with self._lock:
+            if self.http_port is not None and self._server is None:
+                self._start_server()
+            if self.textfile is not None and self._writer is None:
+                self._stopping.clear()
+                self._writer = threading.Thread(
+                    target=self._write_periodically,
+                    name="metrics-textfile",
+                    daemon=True,
+                )
+                self._writer.start()
+
+    def _start_server(self) -> None:
+        try:
+            self._server = ThreadingHTTPServer(
+                (self.http_host, self.http_port), _handler_for(self.registry)
+            )
+        except OSError as e:
+            # Another process on this host may own the port; keep running.
+            self.logger.error(
+                f"Failed to serve metrics on {self.http_host}:{self.http_port}. Error: {e}"
+            )
+            return
+        self._server.daemon_threads = True
+        threading.Thread(
+            target=self._server.serve_forever, name="metrics-http", daemon=True
+        ).start()
+
+    def _write_periodically(self) -> None:
+        while not self._stopping.wait(self.textfile_interval):
+            self.write_textfile()
+
+    def write_textfile(self) -> None:
+        try:
+            self.registry.write_textfile(self.textfile)
+        except OSError as e:
+            self.logger.error(
+                f"Failed to write metrics textfile '{self.textfile}'. Error: {e}"
+            )
+
+    def stop(self) -> None:
+        with self._lock:
+            if self._server is not None:
+                self._server.shutdown()
+                self._server.server_close()
+                self._server = None
+            if self._writer is not None:
+                self._stopping.set()
+                self._writer.join()
+                self._writer = None
+                self.write_textfile()
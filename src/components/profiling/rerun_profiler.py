@@ -0,0 +1,114 @@
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import statistics
+import threading
+import time
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from components.database.query_profiler import QueryProfiler
+
+
+@dataclass
+class PhaseTiming:
+    name: str
+    wall_ms: float
+    query_count: int
+    query_ms: float
+
+    @property
+    def other_ms(self) -> float:
+        return max(self.wall_ms - self.query_ms, 0.0)
+
+
+@dataclass
+class RerunReport:
+    page: str
+    total_ms: float
+    query_count: int
+    query_ms: float
+    phases: List[PhaseTiming] = field(default_factory=list)
+    baseline_ms: Optional[float] = None
+    regression: bool = False
+
+
+class RollingBaseline:
+
+    def __init__(self, window: int = 20, min_samples: int = 5, tolerance: float = 1.5):
+        self.min_samples = min_samples
+        self.tolerance = tolerance
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def add(self, value: float) -> None:
+        self._samples.append(value)
+
+    def median(self) -> Optional[float]:
+        if len(self._samples) < self.min_samples:
+            return None
+        return statistics.median(self._samples)
+
+    def is_regression(self, value: float) -> bool:
+        median = self.median()
+        return median is not None and value > median * self.tolerance
+
+
+class RerunProfiler:
+    # Baselines live for the whole server process and are shared by sessions.
+    _baselines: Dict[str, RollingBaseline] = {}
+    _baselines_lock = threading.Lock()
+
+    def __init__(
+        self,
+        page: str,
+        query_profiler: QueryProfiler = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        self.page = page
+        self.query_profiler = query_profiler or QueryProfiler.default()
+        self.clock = clock
+        self.phases: List[PhaseTiming] = []
+        self._started = clock()
+        self._queries_at_start = self._query_totals()
+
+    def _query_totals(self) -> Tuple[int, float]:
+        return self.query_profiler.thread_totals()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = self.clock()
+        count_before, ms_before = self._query_totals()
+        try:
+            yield
+        finally:
+            count_after, ms_after = self._query_totals()
+            self.phases.append(
+                PhaseTiming(
+                    name=name,
+                    wall_ms=(self.clock() - started) * 1000,
+                    query_count=count_after - count_before,
+                    query_ms=ms_after - ms_before,
+                )
+            )
+
+    @classmethod
+    def baseline_for(cls, page: str) -> RollingBaseline:
+        with cls._baselines_lock:
+            if page not in cls._baselines:
+                cls._baselines[page] = RollingBaseline()
+            return cls._baselines[page]
+
+    def finish(self) -> RerunReport:
+        total_ms = (self.clock() - self._started) * 1000
+        count, query_ms = self._query_totals()
+        baseline = self.baseline_for(self.page)
+        report = RerunReport(
+            page=self.page,
+            total_ms=total_ms,
+            query_count=count - self._queries_at_start[0],
+            query_ms=query_ms - self._queries_at_start[1],
+            phases=list(self.phases),
+            baseline_ms=baseline.median(),
+            regression=baseline.is_regression(total_ms),
+        )
+        baseline.add(total_ms)
+        return report
@@ -0,0 +1,151 @@
+from collections import Counter
+import datetime
+from logging import Logger as StandardLogger
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from components.analytics.price_matrix import PriceMatrix
+from components.market_data.interfaces.fundamentals_repository import (
+    FundamentalsRepository,
+    MetricPoints,
+)
+from components.market_data.interfaces.price_history_repository import (
+    PriceHistoryRepository,
+)
+from components.market_data.interfaces.stock_repository import StockRepository
+from components.metrics.metrics_registry import MetricsRegistry
+from components.quality.interfaces.data_quality_repository import (
+    CHECKS,
+    DISAGREEMENT,
+    GAP,
+    METRIC_OUTLIER,
+    OUTLIER,
+    STALE,
+    DataQualityRepository,
+    Finding,
+)
+from components.quality.quality_checks import (
+    QualitySettings,
+    disagreement_findings,
+    metric_findings,
+    price_findings,
+    trading_days,
+)
+from components.scheduler.market_hours import MarketHours
+
+PRICE_CHECKS = (GAP, OUTLIER, STALE, DISAGREEMENT)
+
+
+def _midnight(day: datetime.date) -> datetime.datetime:
+    return datetime.datetime.combine(day, datetime.time())
+
+
+class DataQualityService:
+    # Runs the checks in quality_checks over chunks of stocks and stores what
+    # they find in data_quality_findings. check_stocks() is cheap enough to
+    # run after every ingested batch; run() covers the whole universe.
+
+    def __init__(
+        self,
+        price_repository: PriceHistoryRepository,
+        fundamentals_repository: FundamentalsRepository,
+        quality_repository: DataQualityRepository,
+        stock_repository: StockRepository,
+        market_hours: MarketHours = None,
+        settings: QualitySettings = None,
+        chunk_stocks: int = 500,
+        logger: StandardLogger = None,
+        metrics: MetricsRegistry = None,
+    ):
+        self.price_repository = price_repository
+        self.fundamentals_repository = fundamentals_repository
+        self.quality_repository = quality_repository
+        self.stock_repository = stock_repository
+        self.market_hours = market_hours or MarketHours()
+        self.settings = settings or QualitySettings()
+        self.chunk_stocks = chunk_stocks
+        self.logger = logger
+        self._findings_metric = (metrics or MetricsRegistry.default()).counter(
+            "moneymonkey_quality_findings",
+            "Data quality findings stored by check.",
+            ("check",),
+        )
+
+    def _store(
+        self,
+        checks,
+        stock_ids: Optional[List[int]],
+        since: Optional[datetime.date],
+        findings: List[Finding],
+    ) -> Dict[str, int]:
+        self.quality_repository.replace_findings(checks, stock_ids, since, findings)
+        counts = Counter(finding.check for finding in findings)
+        for check, count in counts.items():
+            self._findings_metric.inc(count, check=check)
+        return {check: counts[check] for check in checks}
+
+    def check_stocks(
+        self,
+        stock_ids: List[int],
+        since: Optional[datetime.date] = None,
+        as_of: Optional[datetime.date] = None,
+    ) -> Dict[str, int]:
+        # Replaces the price findings of these stocks from `since` on, which
+        # defaults to recheck_days before `as_of`.
+        as_of = as_of or datetime.datetime.now(datetime.timezone.utc).date()
+        since = since or as_of - datetime.timedelta(days=self.settings.recheck_days)
+        start = since - datetime.timedelta(days=self.settings.lookback_days)
+        stock_ids = sorted(set(stock_ids))
+        points = self.price_repository.load_price_points(
+            stock_ids=stock_ids,
+            start=_midnight(start),
+            end=_midnight(as_of + datetime.timedelta(days=1)),
+        )
+        findings = price_findings(
+            PriceMatrix.from_points(points),
+            trading_days(self.market_hours, start, as_of),
+            np.asarray(stock_ids, dtype=np.int64),
+            since,
+            self.settings,
+        )
+        quotes = self.quality_repository.load_source_quotes(
+            stock_ids, start=_midnight(since)
+        )
+        findings += disagreement_findings(quotes, since, self.settings)
+        return self._store(PRICE_CHECKS, stock_ids, since, findings)
+
+    def check_metrics(self, as_of: Optional[datetime.date] = None) -> Dict[str, int]:
+        # Cross-sectional, so always over the whole universe: each stock's
+        # latest value of every metric within lookback_days of `as_of`.
+        as_of = as_of or datetime.datetime.now(datetime.timezone.utc).date()
+        start = _midnight(as_of - datetime.timedelta(days=self.settings.lookback_days))
+        end = _midnight(as_of + datetime.timedelta(days=1))
+        metrics = self.fundamentals_repository.load_metric_points(start=start, end=end)
+        dividends = self.fundamentals_repository.load_dividend_points(
+            start=start, end=end
+        )
+        points = MetricPoints(
+            stock_ids=np.concatenate([metrics.stock_ids, dividends.stock_ids]),
+            metric_ids=np.concatenate([metrics.metric_ids, dividends.metric_ids]),
+            recorded_at=np.concatenate([metrics.recorded_at, dividends.recorded_at]),
+            values=np.concatenate([metrics.values, dividends.values]),
+            metric_names={**metrics.metric_names, **dividends.metric_names},
+        )
+        findings = metric_findings(points, self.settings)
+        return self._store((METRIC_OUTLIER,), None, None, findings)
+
+    def run(
+        self,
+        since: Optional[datetime.date] = None,
+        as_of: Optional[datetime.date] = None,
+    ) -> Dict[str, int]:
+        counts = dict.fromkeys(CHECKS, 0)
+        stock_ids = self.stock_repository.list_stock_ids()
+        for offset in range(0, len(stock_ids), self.chunk_stocks):
+            chunk = stock_ids[offset : offset + self.chunk_stocks]
+            for check, count in self.check_stocks(chunk, since, as_of).items():
+                counts[check] += count
+        counts.update(self.check_metrics(as_of))
+        self.logger.info(f"Data quality findings: {counts}.")
+        return counts
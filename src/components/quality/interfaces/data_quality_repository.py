@@ -0,0 +1,59 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+import datetime
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
+
+GAP = "gap"
+OUTLIER = "outlier"
+STALE = "stale"
+DISAGREEMENT = "disagreement"
+METRIC_OUTLIER = "metric_outlier"
+CHECKS = (GAP, OUTLIER, STALE, DISAGREEMENT, METRIC_OUTLIER)
+
+
+@dataclass(frozen=True)
+class Finding:
+    stock_id: int
+    check: str
+    day: datetime.date
+    # What the check measured: missing days, a robust z-score, a spread.
+    value: Optional[float] = None
+    detail: Dict[str, Any] = field(default_factory=dict, compare=False)
+
+
+@dataclass
+class SourceQuotes:
+    # Prices quoted by each source in stock_data, one row per snapshot.
+    stock_ids: np.ndarray
+    source_ids: np.ndarray
+    recorded_at: np.ndarray
+    prices: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.stock_ids)
+
+
+class DataQualityRepository(ABC):
+
+    @abstractmethod
+    def load_source_quotes(
+        self, stock_ids: List[int], start: Optional[datetime.datetime] = None
+    ) -> SourceQuotes:
+        pass
+
+    @abstractmethod
+    def replace_findings(
+        self,
+        checks: Iterable[str],
+        stock_ids: Optional[List[int]],
+        since: Optional[datetime.date],
+        findings: List[Finding],
+    ) -> None:
+        pass
+
+    @abstractmethod
+    def list_findings(
+        self, check: Optional[str] = None, limit: int = 50
+    ) -> List[Finding]:
+        pass
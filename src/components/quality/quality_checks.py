@@ -0,0 +1,241 @@
+from dataclasses import dataclass
+import datetime
+from typing import List, Tuple
+import warnings
+import numpy as np
+
+from components.analytics.price_matrix import PriceMatrix
+from components.analytics.technical_analytics import forward_fill, log_returns
+from components.market_data.interfaces.fundamentals_repository import MetricPoints
+from components.quality.interfaces.data_quality_repository import (
+    DISAGREEMENT,
+    GAP,
+    METRIC_OUTLIER,
+    OUTLIER,
+    STALE,
+    Finding,
+    SourceQuotes,
+)
+from components.scheduler.market_hours import MarketHours
+
+# Scales the median absolute deviation to a standard deviation for normally
+# distributed data, so robust z-scores read like ordinary ones.
+_MAD_SCALE = 0.6745
+
+
+@dataclass(frozen=True)
+class QualitySettings:
+    # History read before the checked period, for medians and long runs.
+    lookback_days: int = 365
+    # How far back a check after an ingested batch re-examines findings.
+    recheck_days: int = 7
+    min_gap_days: int = 3
+    outlier_z: float = 10.0
+    min_samples: int = 20
+    stale_days: int = 5
+    flat_days: int = 10
+    max_spread: float = 0.02
+    metric_z: float = 8.0
+
+
+def trading_days(
+    hours: MarketHours, start: datetime.date, end: datetime.date
+) -> np.ndarray:
+    days = np.arange(np.datetime64(start, "D"), np.datetime64(end, "D") + 1)
+    weekmask = [day in hours.trading_days for day in range(7)]
+    if not any(weekmask) or len(days) == 0:
+        return days[:0]
+    holidays = np.array(sorted(hours.holidays), dtype="datetime64[D]")
+    return days[np.is_busday(days, weekmask=weekmask, holidays=holidays)]
+
+
+def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Maximal runs of True down each column, as (column, first row, length),
+    # ordered by column and then row.
+    padded = np.zeros((mask.shape[0] + 2, mask.shape[1]), dtype=np.int8)
+    padded[1:-1] = mask
+    edges = np.diff(padded, axis=0).T
+    columns, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+    return columns, starts, ends - starts
+
+
+def _robust_z(values: np.ndarray, min_samples: int) -> np.ndarray:
+    # Per column; NaN where a column has too few values or no spread.
+    with warnings.catch_warnings():
+        # Columns without any value are expected and come out as NaN.
+        warnings.simplefilter("ignore", RuntimeWarning)
+        median = np.nanmedian(values, axis=0)
+        mad = np.nanmedian(np.abs(values - median), axis=0)
+    usable = (np.sum(~np.isnan(values), axis=0) >= min_samples) & (mad > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = _MAD_SCALE * (values - median) / mad
+    z[..., ~usable] = np.nan
+    return z
+
+
+def _day(value: np.datetime64) -> datetime.date:
+    return value.astype("datetime64[D]").astype(datetime.date)
+
+
+def price_findings(
+    matrix: PriceMatrix,
+    days: np.ndarray,
+    stock_ids: np.ndarray,
+    since: datetime.date,
+    settings: QualitySettings,
+) -> List[Finding]:
+    # Gaps, bad ticks and stale series of each stock, from `since` on. The
+    # price grid is laid over the trading calendar `days`, whose last day is
+    # the day checked for; observations on other days are ignored.
+    if len(days) == 0 or len(stock_ids) == 0:
+        return []
+    values = matrix.reindex(days, stock_ids).values
+    present = ~np.isnan(values)
+    seen_before = np.logical_or.accumulate(present, axis=0)
+    seen_after = np.logical_or.accumulate(present[::-1], axis=0)[::-1]
+    since = np.datetime64(since, "D")
+    findings: List[Finding] = []
+
+    # A gap is reported on the observation that ends it, so a later check
+    # finds it again only while that observation is inside its window.
+    columns, starts, lengths = _runs(seen_before & seen_after & ~present)
+    ends = starts + lengths
+    keep = (lengths >= settings.min_gap_days) & (days[ends] >= since)
+    for column, start, end, length in zip(
+        columns[keep], starts[keep], ends[keep], lengths[keep]
+    ):
+        findings.append(
+            Finding(
+                int(stock_ids[column]),
+                GAP,
+                _day(days[end]),
+                float(length),
+                {"from": _day(days[start]).isoformat()},
+            )
+        )
+
+    z = _robust_z(log_returns(values), settings.min_samples)
+    with np.errstate(invalid="ignore"):
+        flagged = np.abs(z) > settings.outlier_z
+    flagged[days < since] = False
+    for row, column in zip(*np.nonzero(flagged)):
+        findings.append(
+            Finding(
+                int(stock_ids[column]),
+                OUTLIER,
+                _day(days[row]),
+                round(float(z[row, column]), 2),
+                {"price": float(values[row, column])},
+            )
+        )
+
+    # Stale: an unchanged price over flat_days observed trading days, or no
+    # observation at all in the last stale_days.
+    filled = forward_fill(values)
+    same = np.zeros_like(present)
+    same[1:] = (filled[1:] == filled[:-1]) & seen_after[1:]
+    columns, starts, lengths = _runs(same)
+    ends = starts + lengths - 1
+    keep = (lengths + 1 >= settings.flat_days) & (days[ends] >= since)
+    for column, start, end, length in zip(
+        columns[keep], starts[keep], ends[keep], lengths[keep]
+    ):
+        findings.append(
+            Finding(
+                int(stock_ids[column]),
+                STALE,
+                _day(days[end]),
+                float(length + 1),
+                {"kind": "flat", "from": _day(days[start - 1]).isoformat()},
+            )
+        )
+    silent = len(days) - np.sum(seen_after, axis=0)
+    for column in np.flatnonzero(seen_before[-1] & (silent >= settings.stale_days)):
+        findings.append(
+            Finding(
+                int(stock_ids[column]),
+                STALE,
+                _day(days[-1]),
+                float(silent[column]),
+                {"kind": "no_update"},
+            )
+        )
+    return findings
+
+
+def disagreement_findings(
+    quotes: SourceQuotes, since: datetime.date, settings: QualitySettings
+) -> List[Finding]:
+    # Stock days on which the sources in stock_data quote prices further
+    # apart than max_spread of their median.
+    days = quotes.recorded_at.astype("datetime64[D]")
+    keep = (days >= np.datetime64(since, "D")) & ~np.isnan(quotes.prices)
+    stock_ids, source_ids = quotes.stock_ids[keep], quotes.source_ids[keep]
+    days, prices = days[keep], quotes.prices[keep]
+    if len(prices) == 0:
+        return []
+    order = np.lexsort((prices, days, stock_ids))
+    stock_ids, source_ids = stock_ids[order], source_ids[order]
+    days, prices = days[order], prices[order]
+    starts = np.flatnonzero(
+        np.r_[True, (stock_ids[1:] != stock_ids[:-1]) | (days[1:] != days[:-1])]
+    )
+    counts = np.diff(np.r_[starts, len(prices)])
+    lasts = starts + counts - 1
+    median = (prices[starts + (counts - 1) // 2] + prices[starts + counts // 2]) / 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        spread = (prices[lasts] - prices[starts]) / median
+    flagged = np.flatnonzero((median > 0) & (spread > settings.max_spread))
+    return [
+        Finding(
+            int(stock_ids[starts[group]]),
+            DISAGREEMENT,
+            _day(days[starts[group]]),
+            round(float(spread[group]), 4),
+            {
+                "low": float(prices[starts[group]]),
+                "low_source_id": int(source_ids[starts[group]]),
+                "high": float(prices[lasts[group]]),
+                "high_source_id": int(source_ids[lasts[group]]),
+            },
+        )
+        for group in flagged
+    ]
+
+
+def metric_findings(points: MetricPoints, settings: QualitySettings) -> List[Finding]:
+    # Latest values that are far from the rest of the universe for the same
+    # metric. Compared on a log scale, so a value off by a factor of 100 or
+    # 1000 stands out however skewed the metric is.
+    if len(points) == 0:
+        return []
+    order = np.lexsort((points.recorded_at, points.metric_ids, points.stock_ids))
+    stock_ids, metric_ids = points.stock_ids[order], points.metric_ids[order]
+    latest = np.r_[
+        (stock_ids[1:] != stock_ids[:-1]) | (metric_ids[1:] != metric_ids[:-1]), True
+    ]
+    stock_ids, metric_ids = stock_ids[latest], metric_ids[latest]
+    recorded_at = points.recorded_at[order][latest]
+    values = points.values[order][latest]
+    findings: List[Finding] = []
+    for metric_id in np.unique(metric_ids):
+        rows = np.flatnonzero(metric_ids == metric_id)
+        z = _robust_z(np.log1p(np.maximum(values[rows], 0.0)), settings.min_samples)
+        with np.errstate(invalid="ignore"):
+            flagged = rows[np.abs(z) > settings.metric_z]
+        z = dict(zip(rows.tolist(), z.tolist()))
+        for row in flagged:
+            findings.append(
+                Finding(
+                    int(stock_ids[row]),
+                    METRIC_OUTLIER,
+                    _day(recorded_at[row]),
+                    round(z[row], 2),
+                    {
+                        "metric": points.metric_names.get(int(metric_id)),
+                        "value": float(values[row]),
+                    },
+                )
+            )
+    return findings
@@ -0,0 +1,117 @@
+import datetime
+from typing import Iterable, List, Optional
+from logging import Logger as StandardLogger
+import numpy as np
+from sqlalchemy import delete, insert, select
+from components.database.fast_reads import epoch_microseconds, fetch_columns
+from components.database.interfaces.connector import Connector
+from components.database.models import DataQualityFinding, StockData
+from components.database.routing_session import reads_from_replica
+from components.quality.interfaces.data_quality_repository import (
+    DataQualityRepository,
+    Finding,
+    SourceQuotes,
+)
+
+
+class SqlalchemyDataQualityRepository(DataQualityRepository):
+
+    def __init__(
+        self,
+        config=None,
+        connector: Connector = None,
+        logger: StandardLogger = None,
+    ):
+        self.config = config
+        self.session = connector.get_session()
+        self.logger = logger
+
+    @reads_from_replica
+    def load_source_quotes(
+        self, stock_ids: List[int], start: Optional[datetime.datetime] = None
+    ) -> SourceQuotes:
+        price = StockData.data["price"].as_float()
+        statement = select(
+            StockData.stock_id,
+            StockData.source_id,
+            epoch_microseconds(StockData.date_recorded),
+            price,
+        ).where(StockData.stock_id.in_(stock_ids), price.is_not(None))
+        if start is not None:
+            statement = statement.where(StockData.date_recorded >= start)
+        try:
+            stock_ids, source_ids, recorded_at, prices = fetch_columns(
+                self.session,
+                statement,
+                (np.int64, np.int64, "datetime64[us]", np.float64),
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to load source quotes. Error: {e}")
+            raise
+        return SourceQuotes(
+            stock_ids=stock_ids,
+            source_ids=source_ids,
+            recorded_at=recorded_at,
+            prices=prices,
+        )
+
+    def replace_findings(
+        self,
+        checks: Iterable[str],
+        stock_ids: Optional[List[int]],
+        since: Optional[datetime.date],
+        findings: List[Finding],
+    ) -> None:
+        # Findings of these checks and stocks from `since` on are rebuilt from
+        # scratch, so re-checking the same window is idempotent.
+        statement = delete(DataQualityFinding).where(
+            DataQualityFinding.check_name.in_(list(checks))
+        )
+        if stock_ids is not None:
+            statement = statement.where(DataQualityFinding.stock_id.in_(stock_ids))
+        if since is not None:
+            statement = statement.where(DataQualityFinding.day >= since)
+        rows = [
+            {
+                "stock_id": finding.stock_id,
+                "check_name": finding.check,
+                "day": finding.day,
+                "value": None if finding.value is None else round(finding.value, 4),
+                "detail": finding.detail,
+            }
+            for finding in findings
+        ]
+        try:
+            self.session.execute(statement)
+            if rows:
+                self.session.execute(insert(DataQualityFinding), rows)
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            self.logger.error(
+                f"Failed to write {len(rows)} data quality findings. Error: {e}"
+            )
+            raise
+
+    @reads_from_replica
+    def list_findings(
+        self, check: Optional[str] = None, limit: int = 50
+    ) -> List[Finding]:
+        query = self.session.query(DataQualityFinding)
+        if check is not None:
+            query = query.filter(DataQualityFinding.check_name == check)
+        try:
+            rows = query.order_by(DataQualityFinding.id.desc()).limit(limit).all()
+        except Exception as e:
+            self.logger.error(f"Failed to list data quality findings. Error: {e}")
+            raise
+        return [
+            Finding(
+                stock_id=row.stock_id,
+                check=row.check_name,
+                day=row.day,
+                value=None if row.value is None else float(row.value),
+                detail=row.detail,
+            )
+            for row in rows
+        ]
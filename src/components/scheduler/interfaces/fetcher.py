@@ -0,0 +1,14 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+
+class Fetcher(ABC):
+
+    @property
+    @abstractmethod
+    def source_name(self) -> str:
+        pass
+
+    @abstractmethod
+    def fetch(self, stock_ids: List[int]) -> int:
+        pass
@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+import datetime
+from typing import List, Optional
+
+
+@dataclass(frozen=True)
+class StalenessRecord:
+    stock_id: int
+    source_id: int
+    source_name: str
+    last_refreshed: Optional[datetime.datetime]
+
+
+class RefreshRepository(ABC):
+
+    @abstractmethod
+    def list_staleness(self) -> List[StalenessRecord]:
+        pass
@@ -0,0 +1,39 @@
+from dataclasses import dataclass, field
+import datetime
+from typing import FrozenSet, Optional
+from zoneinfo import ZoneInfo
+
+
+@dataclass(frozen=True)
+class MarketHours:
+    timezone: str = "America/New_York"
+    open_time: datetime.time = datetime.time(9, 30)
+    close_time: datetime.time = datetime.time(16, 0)
+    trading_days: FrozenSet[int] = frozenset(range(5))
+    holidays: FrozenSet[datetime.date] = field(default_factory=frozenset)
+
+    @property
+    def zone(self) -> ZoneInfo:
+        return ZoneInfo(self.timezone)
+
+    def is_trading_day(self, day: datetime.date) -> bool:
+        return day.weekday() in self.trading_days and day not in self.holidays
+
+    def is_open(self, moment: datetime.datetime) -> bool:
+        local = moment.astimezone(self.zone)
+        if not self.is_trading_day(local.date()):
+            return False
+        return self.open_time <= local.time() < self.close_time
+
+    def last_close(
+        self, moment: datetime.datetime, max_days_back: int = 14
+    ) -> Optional[datetime.datetime]:
+        local = moment.astimezone(self.zone)
+        for days_back in range(max_days_back + 1):
+            day = local.date() - datetime.timedelta(days=days_back)
+            if not self.is_trading_day(day):
+                continue
+            close = datetime.datetime.combine(day, self.close_time, tzinfo=self.zone)
+            if close <= local:
+                return close.astimezone(datetime.timezone.utc)
+        return None
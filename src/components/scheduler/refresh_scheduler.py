@@ -0,0 +1,233 @@
+from collections import defaultdict, deque
+from dataclasses import dataclass
+import datetime
+import heapq
+from logging import Logger as StandardLogger
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from components.metrics.metrics_registry import MetricsRegistry
+from components.scheduler.interfaces.fetcher import Fetcher
+from components.scheduler.interfaces.refresh_repository import (
+    RefreshRepository,
+    StalenessRecord,
+)
+from components.scheduler.market_hours import MarketHours
+
+
+@dataclass(frozen=True)
+class SourcePolicy:
+    max_age: datetime.timedelta = datetime.timedelta(minutes=15)
+    # None means: outside market hours only refresh once after the close.
+    closed_max_age: Optional[datetime.timedelta] = None
+    quota: int = 500
+    quota_window: datetime.timedelta = datetime.timedelta(hours=1)
+    batch_size: int = 50
+
+
+@dataclass(frozen=True)
+class RefreshBatch:
+    source_name: str
+    stock_ids: Tuple[int, ...]
+
+
+class SourceQuota:
+
+    def __init__(self, limit: int, window: datetime.timedelta):
+        self.limit = limit
+        self.window = window
+        self._spent: Deque[Tuple[datetime.datetime, int]] = deque()
+        self._total = 0
+
+    def _expire(self, now: datetime.datetime) -> None:
+        while self._spent and self._spent[0][0] <= now - self.window:
+            _, count = self._spent.popleft()
+            self._total -= count
+
+    def available(self, now: datetime.datetime) -> int:
+        self._expire(now)
+        return max(self.limit - self._total, 0)
+
+    def consume(self, now: datetime.datetime, count: int) -> None:
+        self._spent.append((now, count))
+        self._total += count
+
+
+def _as_utc(moment: Optional[datetime.datetime]) -> Optional[datetime.datetime]:
+    if moment is None or moment.tzinfo is not None:
+        return moment
+    # MySQL DATETIME columns come back naive; they are stored in UTC.
+    return moment.replace(tzinfo=datetime.timezone.utc)
+
+
+class RefreshScheduler:
+
+    def __init__(
+        self,
+        repository: RefreshRepository,
+        fetchers: List[Fetcher],
+        policies: Dict[str, SourcePolicy] = None,
+        default_policy: SourcePolicy = None,
+        market_hours: MarketHours = None,
+        logger: StandardLogger = None,
+        metrics: MetricsRegistry = None,
+        listeners: List[Callable[[RefreshBatch], None]] = None,
+    ):
+        self.repository = repository
+        self.fetchers = {fetcher.source_name: fetcher for fetcher in fetchers}
+        self.policies = policies or {}
+        self.default_policy = default_policy or SourcePolicy()
+        self.market_hours = market_hours or MarketHours()
+        self.logger = logger
+        # Called after each batch is stored, e.g. to evaluate alerts on it.
+        self.listeners = list(listeners or [])
+        self._quotas: Dict[str, SourceQuota] = {}
+        self._dispatched: Dict[Tuple[int, str], datetime.datetime] = {}
+        self._weights: Dict[int, float] = {}
+        metrics = metrics or MetricsRegistry.default()
+        self._rows_metric = metrics.counter(
+            "moneymonkey_ingest_rows",
+            "Rows stored by fetchers.",
+            ("source",),
+        )
+        self._stocks_metric = metrics.counter(
+            "moneymonkey_ingest_stocks",
+            "Stock refreshes dispatched to fetchers.",
+            ("source", "outcome"),
+        )
+        self._lag_metric = metrics.gauge(
+            "moneymonkey_ingest_lag_seconds",
+            "Age of the stalest stock per source at the last planning round.",
+            ("source",),
+        )
+
+    def set_stock_weights(self, weights: Dict[int, float]) -> None:
+        self._weights = dict(weights)
+
+    def policy_for(self, source_name: str) -> SourcePolicy:
+        return self.policies.get(source_name, self.default_policy)
+
+    def quota_for(self, source_name: str) -> SourceQuota:
+        if source_name not in self._quotas:
+            policy = self.policy_for(source_name)
+            self._quotas[source_name] = SourceQuota(policy.quota, policy.quota_window)
+        return self._quotas[source_name]
+
+    def _last_refreshed(self, record: StalenessRecord) -> Optional[datetime.datetime]:
+        last = _as_utc(record.last_refreshed)
+        dispatched = self._dispatched.get((record.stock_id, record.source_name))
+        if dispatched is not None and (last is None or dispatched > last):
+            return dispatched
+        return last
+
+    def priority(
+        self,
+        record: StalenessRecord,
+        now: datetime.datetime,
+        market_open: bool,
+        last_close: Optional[datetime.datetime],
+    ) -> Optional[float]:
+        weight = self._weights.get(record.stock_id, 1.0)
+        if weight <= 0:
+            return None
+        last = self._last_refreshed(record)
+        if last is None:
+            return float("inf")
+
+        policy = self.policy_for(record.source_name)
+        age = (now - last).total_seconds()
+        if market_open:
+            return self._due_ratio(age, policy.max_age, weight)
+
+        missed_close = last_close is not None and last < last_close
+        if missed_close:
+            return max(age / policy.max_age.total_seconds(), 1.0) * weight
+        if policy.closed_max_age is None:
+            return None
+        return self._due_ratio(age, policy.closed_max_age, weight)
+
+    @staticmethod
+    def _due_ratio(
+        age: float, max_age: datetime.timedelta, weight: float
+    ) -> Optional[float]:
+        ratio = age / max_age.total_seconds()
+        return ratio * weight if ratio >= 1 else None
+
+    def build_queue(self, now: datetime.datetime) -> List[Tuple[float, int, str]]:
+        market_open = self.market_hours.is_open(now)
+        last_close = self.market_hours.last_close(now)
+        queue = []
+        lag = {name: 0.0 for name in self.fetchers}
+        for record in self.repository.list_staleness():
+            if record.source_name not in self.fetchers:
+                continue
+            last = self._last_refreshed(record)
+            if last is not None:
+                age = (now - last).total_seconds()
+                lag[record.source_name] = max(lag[record.source_name], age)
+            priority = self.priority(record, now, market_open, last_close)
+            if priority is not None:
+                queue.append((-priority, record.stock_id, record.source_name))
+        heapq.heapify(queue)
+        for source_name, seconds in lag.items():
+            self._lag_metric.set(seconds, source=source_name)
+        return queue
+
+    def plan(self, now: datetime.datetime = None) -> List[RefreshBatch]:
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        queue = self.build_queue(now)
+        remaining = {
+            name: self.quota_for(name).available(now) for name in self.fetchers
+        }
+        open_sources = sum(1 for left in remaining.values() if left > 0)
+
+        selected = defaultdict(list)
+        while queue and open_sources:
+            _, stock_id, source_name = heapq.heappop(queue)
+            if remaining[source_name] <= 0:
+                continue
+            selected[source_name].append(stock_id)
+            remaining[source_name] -= 1
+            if remaining[source_name] == 0:
+                open_sources -= 1
+
+        batches = []
+        for source_name, stock_ids in selected.items():
+            size = max(self.policy_for(source_name).batch_size, 1)
+            for start in range(0, len(stock_ids), size):
+                batches.append(
+                    RefreshBatch(source_name, tuple(stock_ids[start : start + size]))
+                )
+        return batches
+
+    def run_once(self, now: datetime.datetime = None) -> int:
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        dispatched = 0
+        for batch in self.plan(now):
+            self.quota_for(batch.source_name).consume(now, len(batch.stock_ids))
+            try:
+                rows = self.fetchers[batch.source_name].fetch(list(batch.stock_ids))
+                # Only stored batches count as refreshed; failed ones stay
+                # stale and are retried on the next run.
+                for stock_id in batch.stock_ids:
+                    self._dispatched[(stock_id, batch.source_name)] = now
+                dispatched += len(batch.stock_ids)
+                self._rows_metric.inc(rows or 0, source=batch.source_name)
+                self._stocks_metric.inc(
+                    len(batch.stock_ids), source=batch.source_name, outcome="ok"
+                )
+            except Exception as e:
+                self._stocks_metric.inc(
+                    len(batch.stock_ids), source=batch.source_name, outcome="error"
+                )
+                self.logger.error(
+                    f"Failed to refresh {len(batch.stock_ids)} stocks from '{batch.source_name}'. Error: {e}"
+                )
+                continue
+            for listener in self.listeners:
+                try:
+                    listener(batch)
+                except Exception as e:
+                    self.logger.error(
+                        f"Listener failed after a batch from '{batch.source_name}'. Error: {e}"
+                    )
+        return dispatched
@@ -0,0 +1,67 @@
+from typing import List
+from logging import Logger as StandardLogger
+from sqlalchemy import and_, func, true
+from components.database.interfaces.connector import Connector
+from components.database.models import DataSource, Stock, StockData
+from components.scheduler.interfaces.refresh_repository import (
+    RefreshRepository,
+    StalenessRecord,
+)
+
+
+class SqlalchemyRefreshRepository(RefreshRepository):
+
+    def __init__(
+        self,
+        config=None,
+        connector: Connector = None,
+        logger: StandardLogger = None,
+    ):
+        self.config = config
+        self.session = connector.get_session()
+        self.logger = logger
+
+    def list_staleness(self) -> List[StalenessRecord]:
+        # One aggregate over ix_stock_source_date instead of a query per pair;
+        # pairs that were never fetched fall back to Stock.updated_at.
+        latest = (
+            self.session.query(
+                StockData.stock_id,
+                StockData.source_id,
+                func.max(StockData.date_recorded).label("last_recorded"),
+            )
+            .group_by(StockData.stock_id, StockData.source_id)
+            .subquery()
+        )
+        try:
+            rows = (
+                self.session.query(
+                    Stock.id,
+                    DataSource.id,
+                    DataSource.name,
+                    Stock.updated_at,
+                    latest.c.last_recorded,
+                )
+                .select_from(Stock)
+                .join(DataSource, true())
+                .outerjoin(
+                    latest,
+                    and_(
+                        latest.c.stock_id == Stock.id,
+                        latest.c.source_id == DataSource.id,
+                    ),
+                )
+                .all()
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to list staleness. Error: {e}")
+            raise
+        return [
+            StalenessRecord(
+                stock_id=stock_id,
+                source_id=source_id,
+                source_name=source_name,
+                last_refreshed=last_recorded or updated_at,
+            )
+            for stock_id, source_id, source_name, updated_at, last_recorded in rows
+        ]
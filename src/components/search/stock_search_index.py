@@ -0,0 +1,363 @@
+from dataclasses import dataclass
+import itertools
+import json
+from pathlib import Path
+import re
+import shutil
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from components.market_data.interfaces.stock_repository import StockName
+
+# Tickers are short, so they are matched on character bigrams; company names
+# on trigrams. Indexed strings are padded with a space on both sides so word
+# starts and ends count as grams of their own; queries only get the leading
+# one, since their last word may still be half typed.
+TICKER_GRAM = 2
+NAME_GRAM = 3
+_BITS = 21  # Enough for any Unicode code point.
+# Grams listed for more rows than this (or a 32nd of a large segment) only
+# add to the counts of rows found through rarer grams.
+COMMON_GRAM_ROWS = 1024
+
+_ARRAYS = (
+    "ids",
+    "tickers",
+    "name_bytes",
+    "name_offsets",
+    "prefix_keys",
+    "prefix_rows",
+    "ticker_gram_keys",
+    "ticker_gram_offsets",
+    "ticker_postings",
+    "ticker_gram_counts",
+    "name_gram_keys",
+    "name_gram_offsets",
+    "name_postings",
+    "name_gram_counts",
+)
+
+
+@dataclass
+class SearchMatch:
+    stock_id: int
+    ticker: str
+    company_name: str
+    score: float
+
+
+def normalize(text: str) -> str:
+    return " ".join(re.findall(r"[^\W_]+", text.lower()))
+
+
+def gram_keys(text: str, n: int, pad_end: bool = True) -> np.ndarray:
+    # Unique n-grams of the normalized text, each packed into one int64.
+    padded = f" {text} " if pad_end else f" {text}"
+    if len(padded) < n:
+        return np.empty(0, dtype=np.int64)
+    codes = np.fromiter(map(ord, padded), dtype=np.int64, count=len(padded))
+    keys = np.zeros(len(padded) - n + 1, dtype=np.int64)
+    for i in range(n):
+        keys |= codes[i : len(codes) - n + 1 + i] << (_BITS * (n - 1 - i))
+    return np.unique(keys)
+
+
+def _postings(key_lists: List[np.ndarray]) -> Tuple[np.ndarray, ...]:
+    # Inverted lists in CSR form: the rows containing keys[k] are
+    # postings[offsets[k]:offsets[k + 1]].
+    counts = np.array([len(keys) for keys in key_lists], dtype=np.int64)
+    if not counts.sum():
+        empty = np.empty(0, dtype=np.int64)
+        return empty, np.zeros(1, dtype=np.int64), empty, counts
+    keys = np.concatenate(key_lists)
+    rows = np.repeat(np.arange(len(key_lists), dtype=np.int64), counts)
+    order = np.argsort(keys, kind="stable")
+    unique, starts = np.unique(keys[order], return_index=True)
+    offsets = np.append(starts, len(keys)).astype(np.int64)
+    return unique, offsets, rows[order], counts
+
+
+class _Segment:
+    # An immutable slice of the index. Its arrays are plain NumPy arrays, so
+    # a saved segment can be memory-mapped straight back in.
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        for name in _ARRAYS:
+            setattr(self, name, arrays[name])
+        self._marks: Dict[Tuple[str, int], np.ndarray] = {}
+
+    @classmethod
+    def build(cls, entries: List[StockName]) -> "_Segment":
+        tickers = [normalize(entry.ticker) for entry in entries]
+        names = [normalize(entry.company_name) for entry in entries]
+        encoded = [entry.company_name.encode() for entry in entries]
+        ticker_gram_keys, ticker_gram_offsets, ticker_postings, ticker_gram_counts = (
+            _postings([gram_keys(ticker, TICKER_GRAM) for ticker in tickers])
+        )
+        name_gram_keys, name_gram_offsets, name_postings, name_gram_counts = _postings(
+            [gram_keys(name, NAME_GRAM) for name in names]
+        )
+        prefix_keys = np.array(tickers, dtype=str)
+        prefix_rows = np.argsort(prefix_keys, kind="stable")
+        return cls(
+            {
+                "ids": np.array([entry.id for entry in entries], dtype=np.int64),
+                "tickers": np.array([entry.ticker for entry in entries], dtype=str),
+                "name_bytes": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+                "name_offsets": np.cumsum(
+                    [0] + [len(name) for name in encoded], dtype=np.int64
+                ),
+                "prefix_keys": prefix_keys[prefix_rows],
+                "prefix_rows": prefix_rows,
+                "ticker_gram_keys": ticker_gram_keys,
+                "ticker_gram_offsets": ticker_gram_offsets,
+                "ticker_postings": ticker_postings,
+                "ticker_gram_counts": ticker_gram_counts,
+                "name_gram_keys": name_gram_keys,
+                "name_gram_offsets": name_gram_offsets,
+                "name_postings": name_postings,
+                "name_gram_counts": name_gram_counts,
+            }
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def company_name(self, row: int) -> str:
+        start, end = self.name_offsets[row], self.name_offsets[row + 1]
+        return bytes(self.name_bytes[start:end]).decode()
+
+    def entry(self, row: int) -> StockName:
+        return StockName(
+            id=int(self.ids[row]),
+            ticker=str(self.tickers[row]),
+            company_name=self.company_name(row),
+        )
+
+    def _marked(self, kind: str, position: int) -> np.ndarray:
+        # Bitmap of the rows listed for one gram, built on first use. The
+        # segment never changes, so it is kept for later queries.
+        key = (kind, position)
+        if key not in self._marks:
+            offsets = getattr(self, f"{kind}_gram_offsets")
+            rows = getattr(self, f"{kind}_postings")[
+                offsets[position] : offsets[position + 1]
+            ]
+            marks = np.zeros(len(self), dtype=bool)
+            marks[rows] = True
+            self._marks[key] = np.packbits(marks)
+        return self._marks[key]
+
+    def _shared(self, kind: str, query: np.ndarray):
+        # Rows sharing at least one gram with the query, and how many.
+        keys = getattr(self, f"{kind}_gram_keys")
+        offsets = getattr(self, f"{kind}_gram_offsets")
+        postings = getattr(self, f"{kind}_postings")
+        positions = np.searchsorted(keys, query)
+        inside = positions < len(keys)
+        positions = positions[inside][keys[positions[inside]] == query[inside]]
+        if not len(positions):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        # Common grams ("inc", "cor") are listed for a large share of rows and
+        # would make every query scan most of the segment. Only the rarer
+        # grams pick the candidate rows; the common ones are then looked up
+        # for those candidates in a bitmap. A query made only of common grams
+        # takes a capped slice of the rows listed for its rarest gram.
+        cutoff = max(COMMON_GRAM_ROWS, len(self) // 32)
+        sizes = offsets[positions + 1] - offsets[positions]
+        common = sizes > cutoff
+        if common.all():
+            rarest = positions[np.argmin(sizes)]
+            rows = np.asarray(postings[offsets[rarest] : offsets[rarest] + cutoff])
+            counts = np.zeros(len(rows), dtype=np.int64)
+        else:
+            rows = np.concatenate(
+                [postings[offsets[p] : offsets[p + 1]] for p in positions[~common]]
+            )
+            if len(rows) * 8 < len(self):
+                rows, counts = np.unique(rows, return_counts=True)
+            else:
+                counts = np.bincount(rows, minlength=len(self))
+                rows = np.flatnonzero(counts)
+                counts = counts[rows]
+        for position in positions[common].tolist():
+            marks = self._marked(kind, position)
+            counts += (marks[rows >> 3] >> (7 - (rows & 7))) & 1
+        return rows, counts
+
+    def scores(self, query: str, min_score: float) -> Tuple[np.ndarray, np.ndarray]:
+        # Rows scoring at least min_score and their best score over the three
+        # ways to match. Only rows sharing a gram or a prefix are scored.
+        ticker_query = gram_keys(query, TICKER_GRAM, pad_end=False)
+        ticker_rows, shared = self._shared("ticker", ticker_query)
+        # Dice similarity: tickers are compared whole.
+        ticker_scores = (
+            2 * shared / (len(ticker_query) + self.ticker_gram_counts[ticker_rows])
+        )
+
+        name_query = gram_keys(query, NAME_GRAM, pad_end=False)
+        name_rows, shared = self._shared("name", name_query)
+        # Names mostly match on how much of the query they contain, so a
+        # partly typed word still finds long names; Dice breaks ties.
+        contained = shared / max(len(name_query), 1)
+        dice = 2 * shared / (len(name_query) + self.name_gram_counts[name_rows])
+        name_scores = 0.75 * contained + 0.25 * dice
+
+        # Sorted tickers work as a flat trie: all tickers starting with the
+        # query sit in one searchsorted range. Queries longer than the widest
+        # ticker cannot be a prefix and would make searchsorted widen the
+        # whole array, so they skip this.
+        prefix_rows, prefix_scores = np.empty(0, dtype=np.int64), np.empty(0)
+        if len(query) <= self.prefix_keys.dtype.itemsize // 4:
+            bounds = np.array(
+                [query, query[:-1] + chr(ord(query[-1]) + 1)],
+                dtype=self.prefix_keys.dtype,
+            )
+            low, high = np.searchsorted(self.prefix_keys, bounds)
+            prefix_rows = self.prefix_rows[low:high]
+            lengths = np.char.str_len(self.prefix_keys[low:high])
+            prefix_scores = 0.9 + 0.1 * len(query) / np.maximum(lengths, 1)
+
+        best = np.zeros(len(self))
+        best[ticker_rows] = ticker_scores
+        best[name_rows] = np.maximum(best[name_rows], name_scores)
+        best[prefix_rows] = np.maximum(best[prefix_rows], prefix_scores)
+        rows = np.flatnonzero(best >= min_score)
+        return rows, best[rows]
+
+    def save(self, directory: Path) -> None:
+        for name in _ARRAYS:
+            np.save(directory / f"{name}.npy", getattr(self, name))
+
+    @classmethod
+    def load(cls, directory: Path, mmap: bool = True) -> "_Segment":
+        mode = "r" if mmap else None
+        return cls(
+            {
+                name: np.load(directory / f"{name}.npy", mmap_mode=mode)
+                for name in _ARRAYS
+            }
+        )
+
+
+class StockSearchIndex:
+    # Segments plus a map from stock id to its live row. Updates append a
+    # small segment and retire the rows they replace, so the large base
+    # segment is only rebuilt once there are more than max_segments.
+
+    def __init__(
+        self,
+        segments: Iterable[_Segment] = (),
+        meta: Optional[dict] = None,
+        max_segments: int = 8,
+    ):
+        self.segments: List[_Segment] = []
+        self.live: List[np.ndarray] = []
+        self.rows: Dict[int, Tuple[int, int]] = {}
+        self.meta = dict(meta or {})
+        self.max_segments = max_segments
+        for segment in segments:
+            self._append(segment)
+
+    @classmethod
+    def build(cls, entries: Iterable[StockName], **kwargs) -> "StockSearchIndex":
+        return cls([_Segment.build(list(entries))], **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _append(self, segment: _Segment) -> None:
+        index = len(self.segments)
+        self.segments.append(segment)
+        self.live.append(np.ones(len(segment), dtype=bool))
+        for row, stock_id in enumerate(segment.ids.tolist()):
+            self._retire(stock_id)
+            self.rows[stock_id] = (index, row)
+
+    def _retire(self, stock_id: int) -> None:
+        location = self.rows.pop(stock_id, None)
+        if location is not None:
+            self.live[location[0]][location[1]] = False
+
+    def _indexed(self, entry: StockName) -> bool:
+        location = self.rows.get(entry.id)
+        if location is None:
+            return False
+        segment, row = self.segments[location[0]], location[1]
+        return (
+            segment.tickers[row] == entry.ticker
+            and segment.company_name(row) == entry.company_name
+        )
+
+    def upsert(self, entries: Iterable[StockName]) -> int:
+        # Entries already indexed under the same ticker and name are skipped,
+        # so feeding back unchanged rows does not grow the index.
+        changed = [entry for entry in entries if not self._indexed(entry)]
+        if changed:
+            self._append(_Segment.build(changed))
+            if len(self.segments) > self.max_segments:
+                self.compact()
+        return len(changed)
+
+    def remove(self, stock_ids: Iterable[int]) -> None:
+        for stock_id in stock_ids:
+            self._retire(stock_id)
+
+    def entries(self) -> List[StockName]:
+        return sorted(
+            (self.segments[index].entry(row) for index, row in self.rows.values()),
+            key=lambda entry: entry.id,
+        )
+
+    def compact(self) -> None:
+        entries = self.entries()
+        self.segments, self.live, self.rows = [], [], {}
+        self._append(_Segment.build(entries))
+
+    def search(
+        self, query: str, limit: int = 10, min_score: float = 0.4
+    ) -> List[SearchMatch]:
+        query = normalize(query)
+        if not query or limit <= 0:
+            return []
+        found = []
+        for index, segment in enumerate(self.segments):
+            rows, scores = segment.scores(query, min_score)
+            live = self.live[index][rows]
+            rows, scores = rows[live], scores[live]
+            if len(rows) > limit:
+                top = np.argpartition(-scores, limit - 1)[:limit]
+                rows, scores = rows[top], scores[top]
+            found.extend(zip(scores.tolist(), itertools.repeat(index), rows.tolist()))
+        matches = []
+        for score, index, row in found:
+            entry = self.segments[index].entry(row)
+            matches.append(
+                SearchMatch(entry.id, entry.ticker, entry.company_name, score)
+            )
+        matches.sort(key=lambda match: (-match.score, match.ticker))
+        return matches[:limit]
+
+    def save(self, directory: Path) -> None:
+        # Written next to the target and swapped in, so a reader never maps a
+        # half-written index.
+        directory = Path(directory)
+        self.compact()
+        staging = directory.with_name(directory.name + ".part")
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        self.segments[0].save(staging)
+        (staging / "meta.json").write_text(json.dumps(self.meta))
+        retired = directory.with_name(directory.name + ".old")
+        shutil.rmtree(retired, ignore_errors=True)
+        if directory.exists():
+            directory.rename(retired)
+        staging.rename(directory)
+        shutil.rmtree(retired, ignore_errors=True)
+
+    @classmethod
+    def load(cls, directory: Path, mmap: bool = True, **kwargs) -> "StockSearchIndex":
+        directory = Path(directory)
+        meta = json.loads((directory / "meta.json").read_text())
+        return cls([_Segment.load(directory, mmap)], meta=meta, **kwargs)
@@ -0,0 +1,85 @@
+import datetime
+from logging import Logger as StandardLogger
+from pathlib import Path
+from typing import List, Optional
+
+from components.market_data.interfaces.stock_repository import (
+    StockName,
+    StockRepository,
+)
+from components.search.stock_search_index import SearchMatch, StockSearchIndex
+
+
+class StockSearchService:
+
+    def __init__(
+        self,
+        stock_repository: StockRepository,
+        index_dir: Path,
+        max_segments: int = 8,
+        logger: StandardLogger = None,
+    ):
+        self.stock_repository = stock_repository
+        self.index_dir = Path(index_dir)
+        self.max_segments = max_segments
+        self.logger = logger
+        self._index: Optional[StockSearchIndex] = None
+
+    @property
+    def index(self) -> StockSearchIndex:
+        # The saved index is memory-mapped, so startup does not depend on the
+        # number of stocks; changes made since it was saved are applied on top.
+        if self._index is None:
+            if (self.index_dir / "meta.json").exists():
+                self._index = StockSearchIndex.load(
+                    self.index_dir, max_segments=self.max_segments
+                )
+                self.refresh()
+            else:
+                self.rebuild()
+        return self._index
+
+    def _advance(self, index: StockSearchIndex, entries: List[StockName]) -> None:
+        # The watermark is the newest updated_at and the highest id seen.
+        # Rows are re-read from that updated_at inclusive, so changes sharing
+        # its timestamp are not lost; upserting them again is harmless.
+        meta = index.meta
+        for entry in entries:
+            if entry.updated_at is not None:
+                updated_at = entry.updated_at.isoformat()
+                if updated_at > meta.get("updated_at", ""):
+                    meta["updated_at"] = updated_at
+            meta["max_id"] = max(meta.get("max_id", 0), entry.id)
+
+    def rebuild(self) -> StockSearchIndex:
+        entries = self.stock_repository.list_stock_names()
+        index = StockSearchIndex.build(entries, max_segments=self.max_segments)
+        self._advance(index, entries)
+        index.save(self.index_dir)
+        self._index = index
+        self.logger.info(f"Built the stock search index over {len(index)} stocks.")
+        return index
+
+    def refresh(self) -> int:
+        # Applies stocks added or renamed since the last refresh and returns
+        # how many changed in the index. A stock count that no longer matches
+        # means stocks were deleted, which only a rebuild picks up.
+        index = self._index if self._index is not None else self.index
+        updated_at = index.meta.get("updated_at")
+        entries = self.stock_repository.list_stock_names(
+            updated_since=(
+                datetime.datetime.fromisoformat(updated_at) if updated_at else None
+            ),
+            after_id=index.meta.get("max_id", 0),
+        )
+        changed = index.upsert(entries)
+        self._advance(index, entries)
+        if self.stock_repository.count_stocks() != len(index):
+            self.rebuild()
+        elif changed and len(index.segments) == 1:
+            # Just compacted: persist so the next start maps the merged index.
+            index.save(self.index_dir)
+        return changed
+
+    def search(self, query: str, limit: int = 10) -> List[SearchMatch]:
+        return self.index.search(query, limit=limit)
@@ -28,4 +28,12 @@ class Config:
 
     @property
     def latest_migration_version(self):
-        return "107bf1a9e7c7"
+        return "6e8f0b3d5c29"
+
+    @property
+    def result_cache_max_bytes(self):
+        return int(os.getenv("RESULT_CACHE_MB", "1024")) * 2**20
+
+    @property
+    def perf_panel_enabled(self):
+        return os.getenv("PERF_PANEL", "false").lower() == "true"
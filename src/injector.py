@@ -1,10 +1,61 @@
-from components.admin.interfaces.admin_repository import AdminRepository
-from components.admin.sqlAlchemy_admin_repository import SqlalchemyAdminRepository
-from components.database.interfaces.connector import Connector
-from components.database.mysql_connector import MySQLConnector
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, List
 from config import Config
 from components.logger.native_logger import NativeLogger
 
+# Component modules pull in SQLAlchemy, PyMySQL and NumPy. They are imported
+# inside the factories below so that short-lived CLI and worker processes
+# only load what the objects they actually build need.
+if TYPE_CHECKING:
+    from components.admin.interfaces.admin_repository import AdminRepository
+    from components.alerts.alert_service import AlertService
+    from components.alerts.interfaces.alert_repository import AlertRepository
+    from components.analytics.correlation_service import CorrelationService
+    from components.analytics.price_bar_service import PriceBarService
+    from components.analytics.technical_analytics_service import (
+        TechnicalAnalyticsService,
+    )
+    from components.backtest.parameter_sweep import ParameterSweep
+    from components.batch.batch_runner import BatchRunner
+    from components.batch.interfaces.stock_analysis import StockAnalysis
+    from components.batch.shard_planner import ShardPlanner
+    from components.cache.interfaces.data_version_repository import (
+        DataVersionRepository,
+    )
+    from components.cache.result_cache import ResultCache
+    from components.database.async_repository import AsyncRepository
+    from components.database.interfaces.connector import Connector
+    from components.export.table_export import TableExporter
+    from components.market_data.interfaces.corporate_action_repository import (
+        CorporateActionRepository,
+    )
+    from components.market_data.interfaces.fundamentals_repository import (
+        FundamentalsRepository,
+    )
+    from components.market_data.interfaces.price_bar_repository import (
+        PriceBarRepository,
+    )
+    from components.market_data.interfaces.price_history_repository import (
+        PriceHistoryRepository,
+    )
+    from components.market_data.interfaces.stock_repository import StockRepository
+    from components.market_data.price_adjuster import PriceAdjuster
+    from components.metrics.metrics_exporter import MetricsExporter
+    from components.quality.data_quality_service import DataQualityService
+    from components.quality.interfaces.data_quality_repository import (
+        DataQualityRepository,
+    )
+    from components.scheduler.interfaces.fetcher import Fetcher
+    from components.scheduler.interfaces.refresh_repository import (
+        RefreshRepository,
+    )
+    from components.scheduler.refresh_scheduler import (
+        RefreshBatch,
+        RefreshScheduler,
+    )
+    from components.search.stock_search_service import StockSearchService
+
 
 def get_config() -> Config:
     return Config()
@@ -15,11 +66,298 @@ def get_logger(name: str = "moneymonkey"):
 
 
 def get_connector() -> Connector:
+    from components.database.mysql_connector import MySQLConnector
+
     return MySQLConnector()
 
 
 def get_admin_repository() -> AdminRepository:
+    from components.admin.sqlAlchemy_admin_repository import (
+        SqlalchemyAdminRepository,
+    )
+
     return SqlalchemyAdminRepository(
-        connector=MySQLConnector(),
+        connector=get_connector(),
+        logger=NativeLogger.get_logger(),
+    )
+
+
+def get_async_admin_repository(
+    timeout: float = None,
+) -> AsyncRepository[AdminRepository]:
+    from components.admin.sqlAlchemy_admin_repository import (
+        SqlalchemyAdminRepository,
+    )
+    from components.database.async_repository import AsyncRepository
+
+    logger = NativeLogger.get_logger()
+    return AsyncRepository(
+        connector=get_connector(),
+        factory=lambda connector: SqlalchemyAdminRepository(
+            connector=connector, logger=logger
+        ),
+        timeout=timeout,
+        logger=logger,
+    )
+
+
+def get_refresh_repository() -> RefreshRepository:
+    from components.scheduler.sqlAlchemy_refresh_repository import (
+        SqlalchemyRefreshRepository,
+    )
+
+    return SqlalchemyRefreshRepository(
+        connector=get_connector(),
+        logger=NativeLogger.get_logger(),
+    )
+
+
+def get_refresh_scheduler(
+    fetchers: List[Fetcher],
+    listeners: List[Callable[[RefreshBatch], None]] = None,
+) -> RefreshScheduler:
+    from components.scheduler.refresh_scheduler import RefreshScheduler
+
+    return RefreshScheduler(
+        repository=get_refresh_repository(),
+        fetchers=fetchers,
+        logger=NativeLogger.get_logger(),
+        listeners=listeners,
+    )
+
+
+def get_alert_repository() -> AlertRepository:
+    from components.alerts.sqlAlchemy_alert_repository import (
+        SqlalchemyAlertRepository,
+    )
+
+    return SqlalchemyAlertRepository(
+        connector=get_connector(),
+        logger=NativeLogger.get_logger(),
+    )
+
+
+def get_alert_service() -> AlertService:
+    from components.alerts.alert_service import AlertService
+
+    return AlertService(
+        alert_repository=get_alert_repository(),
+        stock_repository=get_stock_repository(),
+        logger=NativeLogger.get_logger(),
+    )
+
+
+def get_data_quality_repository() -> DataQualityRepository:
+    from components.quality.sqlAlchemy_data_quality_repository import (
+        SqlalchemyDataQualityRepository,
+    )
+
+    return SqlalchemyDataQualityRepository(
+        connector=get_connector(),
+        logger=NativeLogger.get_logger(),
+    )
+
+
+def get_data_quality_service() -> DataQualityService:
+    from components.quality.data_quality_service import DataQualityService
+
+    return DataQualityService(
+        price_repository=get_price_history_repository(),
+        fundamentals_repository=get_fundamentals_repository(),
+        quality_repository=get_data_quality_repository(),
+        stock_repository=get_stock_repository(),
+        logger=NativeLogger.get_logger(),
+    )
+
+
+def get_raw_price_history_repository() -> PriceHistoryRepository:
+    from components.market_data.sqlAlchemy_price_history_repository import (
+        SqlalchemyPriceHistoryRepository,
+    )
+
+    return SqlalchemyPriceHistoryRepository(
+        connector=get_connector(),
+        logger=NativeLogger.get_logger(),
+    )
+
+
+def get_price_history_repository(
+    adjuster: PriceAdjuster = None,
+) -> PriceHistoryRepository:
+    from components.market_data.adjusted_price_history_repository import (
+        AdjustedPriceHistoryRepository,
+    )
+
+    return AdjustedPriceHistoryRepository(
+        repository=get_raw_price_history_repository(),
+        adjuster=adjuster or get_price_adjuster(),
+    )
+
+
+def get_corporate_action_repository() -> CorporateActionRepository:
+    from components.market_data.sqlAlchemy_corporate_action_repository import (
+        SqlalchemyCorporateActionRepository,
+    )
+
+    return SqlalchemyCorporateActionRepository(
+        connector=get_connector(),
+        logger=NativeLogger.get_logger(),
+    )
+
+
+def get_price_adjuster() -> PriceAdjuster:
+    from components.market_data.price_adjuster import PriceAdjuster
+
+    return PriceAdjuster(
+        repository=get_corporate_action_repository(),
+        logger=NativeLogger.get_logger(),
+    )
+
+
+def get_technical_analytics_service() -> TechnicalAnalyticsService:
+    from components.analytics.technical_analytics_service import (
+        TechnicalAnalyticsService,
+    )
+
+    adjuster = get_price_adjuster()
+    return TechnicalAnalyticsService(
+        repository=get_price_history_repository(adjuster),
+        cache_path=get_config().data_dir / "analytics" / "technical.npz",
+        adjuster=adjuster,
+        result_cache=get_result_cache(),
+        version_repository=get_data_version_repository(),
+        logger=NativeLogger.get_logger(),
+    )
+
+
+def get_stock_repository() -> StockRepository:
+    from components.market_data.sqlAlchemy_stock_repository import (
+        SqlalchemyStockRepository,
+    )
+
+    return SqlalchemyStockRepository(
+        connector=get_connector(),
+        logger=NativeLogger.get_logger(),
+    )
+
+
+def get_correlation_service() -> CorrelationService:
+    from components.analytics.correlation_service import CorrelationService
+
+    adjuster = get_price_adjuster()
+    return CorrelationService(
+        price_repository=get_price_history_repository(adjuster),
+        stock_repository=get_stock_repository(),
+        cache_dir=get_config().data_dir / "analytics" / "correlation",
+        adjuster=adjuster,
+        result_cache=get_result_cache(),
+        version_repository=get_data_version_repository(),
+        logger=NativeLogger.get_logger(),
+    )
+
+
+def get_stock_search_service() -> StockSearchService:
+    from components.search.stock_search_service import StockSearchService
+
+    return StockSearchService(
+        stock_repository=get_stock_repository(),
+        index_dir=get_config().data_dir / "search",
+        logger=NativeLogger.get_logger(),
+    )
+
+
+def get_price_bar_repository() -> PriceBarRepository:
+    from components.market_data.sqlAlchemy_price_bar_repository import (
+        SqlalchemyPriceBarRepository,
+    )
+
+    return SqlalchemyPriceBarRepository(
+        connector=get_connector(),
+        logger=NativeLogger.get_logger(),
+    )
+
+
+def get_price_bar_service() -> PriceBarService:
+    from components.analytics.price_bar_service import PriceBarService
+
+    # Bars are persisted and extended incrementally, so they stay raw.
+    return PriceBarService(
+        price_repository=get_raw_price_history_repository(),
+        bar_repository=get_price_bar_repository(),
+        stock_repository=get_stock_repository(),
+        logger=NativeLogger.get_logger(),
+    )
+
+
+def get_fundamentals_repository() -> FundamentalsRepository:
+    from components.market_data.sqlAlchemy_fundamentals_repository import (
+        SqlalchemyFundamentalsRepository,
+    )
+
+    return SqlalchemyFundamentalsRepository(
+        connector=get_connector(),
+        logger=NativeLogger.get_logger(),
+    )
+
+
+def get_parameter_sweep(max_workers: int = None) -> ParameterSweep:
+    from components.backtest.parameter_sweep import ParameterSweep
+
+    return ParameterSweep(
+        data_dir=get_config().data_dir / "backtest", max_workers=max_workers
+    )
+
+
+def get_result_cache() -> ResultCache:
+    from components.cache.result_cache import ResultCache
+
+    config = get_config()
+    return ResultCache(
+        path=config.data_dir / "cache" / "results.sqlite3",
+        max_bytes=config.result_cache_max_bytes,
+        logger=NativeLogger.get_logger(),
+    )
+
+
+def get_data_version_repository() -> DataVersionRepository:
+    from components.cache.sqlAlchemy_data_version_repository import (
+        SqlalchemyDataVersionRepository,
+    )
+
+    return SqlalchemyDataVersionRepository(
+        connector=get_connector(),
+        logger=NativeLogger.get_logger(),
+    )
+
+
+def get_shard_planner(shard_size: int = 250) -> ShardPlanner:
+    from components.batch.shard_planner import ShardPlanner
+
+    return ShardPlanner(get_stock_repository(), shard_size=shard_size)
+
+
+def get_batch_runner(analysis: StockAnalysis, max_workers: int = None) -> BatchRunner:
+    from components.batch.batch_runner import BatchRunner
+
+    return BatchRunner(
+        analysis=analysis,
+        checkpoint_dir=get_config().data_dir / "batch",
+        max_workers=max_workers,
         logger=NativeLogger.get_logger(),
     )
+
+
+def get_table_exporter() -> TableExporter:
+    from components.export.table_export import TableExporter
+
+    return TableExporter(
+        connector=get_connector(),
+        export_dir=get_config().data_dir / "exports",
+        logger=NativeLogger.get_logger(),
+    )
+
+
+def get_metrics_exporter() -> MetricsExporter:
+    from components.metrics.metrics_exporter import MetricsExporter
+
+    return MetricsExporter.from_env(logger=NativeLogger.get_logger())
@@ -0,0 +1,5 @@
+import sys
+
+from moneymonkey.cli import main
+
+sys.exit(main())
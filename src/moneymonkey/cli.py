@@ -0,0 +1,626 @@
+import argparse
+import datetime
+import importlib
+from pathlib import Path
+import sys
+import time
+from typing import List, Optional
+
+# Only argparse and the standard library are imported at module level. Every
+# subcommand imports its own dependencies, so `migrate` never loads NumPy and
+# no command ever loads Streamlit or PIL.
+
+
+def load_class(path: str):
+    module_name, _, class_name = path.partition(":")
+    if not class_name:
+        raise ValueError(f"Expected 'package.module:ClassName', got '{path}'.")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def _migrate(args: argparse.Namespace) -> int:
+    from components.database.migration import Migration
+
+    Migration().check_and_apply_migrations(include_online=args.online)
+    return 0
+
+
+def _ingest(args: argparse.Namespace) -> int:
+    from injector import (
+        get_alert_service,
+        get_data_quality_service,
+        get_refresh_scheduler,
+    )
+
+    fetchers = [load_class(path)() for path in args.fetcher]
+    listeners = []
+    if args.alerts:
+        alerts = get_alert_service()
+        alerts.start()
+        listeners.append(lambda batch: alerts.poll())
+    if args.quality:
+        quality = get_data_quality_service()
+        listeners.append(lambda batch: quality.check_stocks(list(batch.stock_ids)))
+    scheduler = get_refresh_scheduler(fetchers, listeners=listeners)
+    while True:
+        dispatched = scheduler.run_once()
+        print(f"Dispatched {dispatched} stock refreshes.")
+        if not args.loop:
+            return 0
+        time.sleep(args.interval)
+
+
+def _score(args: argparse.Namespace) -> int:
+    from injector import get_batch_runner, get_shard_planner
+
+    analysis = load_class(args.analysis)()
+    planner = get_shard_planner(shard_size=args.shard_size)
+    shards = planner.by_sector() if args.shard_by == "sector" else planner.by_id_range()
+    report = get_batch_runner(analysis, max_workers=args.workers).run(
+        shards, args.run_id
+    )
+    print(
+        f"Run '{report.run_id}': {report.shards_done} shards done, "
+        f"{report.shards_skipped} skipped, {len(report.failed)} failed, "
+        f"{report.results_written} results written."
+    )
+    return 1 if report.failed else 0
+
+
+def _benchmark(args: argparse.Namespace) -> int:
+    if args.suite == "repositories":
+        return _benchmark_repositories(args)
+
+    from components.benchmark.kernel_benchmark import run_kernel_benchmark
+
+    timings = run_kernel_benchmark(args.stocks, args.days, seed=args.seed)
+    for name, seconds in timings.items():
+        print(f"{name:<24} {seconds:8.3f}s")
+    return 0
+
+
+def _benchmark_repositories(args: argparse.Namespace) -> int:
+    import tempfile
+
+    from components.benchmark.repository_benchmark import (
+        BenchmarkBaseline,
+        run_repository_benchmark,
+    )
+    from injector import get_config, get_logger
+
+    baseline = BenchmarkBaseline(
+        args.baseline
+        or get_config().data_dir / "benchmark" / "repository_baseline.json"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = args.database_url or f"sqlite:///{directory}/benchmark.db"
+        results = run_repository_benchmark(
+            database_url,
+            args.scale or ["small", "medium"],
+            get_logger(),
+            allow_reset=args.allow_reset,
+            min_seconds=args.min_seconds,
+            seed=args.seed,
+        )
+    for result in results:
+        print(
+            f"{result.key:<48} {result.ops_per_sec:10.1f} ops/s "
+            f"{result.queries_per_op:6.2f} queries/op"
+        )
+    if args.save_baseline:
+        baseline.save(results)
+        print(f"Baseline saved to {baseline.path}.")
+        return 0
+    regressions = baseline.regressions(results, threshold=args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+def _generate(args: argparse.Namespace) -> int:
+    from components.benchmark.market_data_generator import (
+        GeneratorSettings,
+        MarketDataGenerator,
+    )
+    from components.database.url_connector import UrlConnector
+    from injector import get_connector, get_logger
+
+    connector = (
+        UrlConnector(args.database_url) if args.database_url else get_connector()
+    )
+    settings = GeneratorSettings(
+        stocks=args.stocks,
+        days=args.days,
+        stock_data_every_days=args.stock_data_every,
+        chunk_rows=args.chunk_rows,
+    )
+    counts = MarketDataGenerator(
+        connector, settings, seed=args.seed, logger=get_logger()
+    ).generate()
+    for table, rows in counts.items():
+        print(f"{table:<24} {rows:>12,} rows")
+    return 0
+
+
+def _bars(args: argparse.Namespace) -> int:
+    from injector import get_price_bar_service
+
+    written = get_price_bar_service().refresh()
+    for resolution, bars in written.items():
+        print(f"{resolution:<6} {bars:>10,} bars rebuilt")
+    return 0
+
+
+def _search(args: argparse.Namespace) -> int:
+    from injector import get_stock_search_service
+
+    service = get_stock_search_service()
+    if args.rebuild:
+        service.rebuild()
+    for match in service.search(args.query, limit=args.limit):
+        print(f"{match.ticker:<10} {match.score:5.2f}  {match.company_name}")
+    return 0
+
+
+def _alerts(args: argparse.Namespace) -> int:
+    from injector import get_alert_repository, get_stock_search_service
+
+    repository = get_alert_repository()
+    if args.action == "add":
+        matches = get_stock_search_service().search(args.ticker, limit=1)
+        if not matches or matches[0].ticker.upper() != args.ticker.upper():
+            raise ValueError(f"Unknown ticker '{args.ticker}'.")
+        rule = repository.add_rule(
+            matches[0].stock_id, args.field, args.condition, args.threshold
+        )
+        print(f"Added alert rule {rule.id}.")
+    elif args.action == "remove":
+        repository.deactivate_rule(args.rule_id)
+        print(f"Deactivated alert rule {args.rule_id}.")
+    else:
+        for alert in repository.list_alerts(limit=args.limit):
+            print(
+                f"{alert.recorded_at:%Y-%m-%d %H:%M}  stock {alert.stock_id:<6} "
+                f"{alert.field} {alert.value:,.4f} {alert.condition} "
+                f"{alert.reference:,.4f} (rule {alert.rule_id})"
+            )
+    return 0
+
+
+def _cache(args: argparse.Namespace) -> int:
+    from injector import get_result_cache
+
+    cache = get_result_cache()
+    if args.action == "clear":
+        print(f"Removed {cache.clear()} cached results.")
+    else:
+        entries, size = cache.stats()
+        print(f"{entries} cached results, {size / 2**20:,.1f} MiB in {cache.path}.")
+    return 0
+
+
+def _corporate_actions(args: argparse.Namespace) -> int:
+    from injector import get_corporate_action_repository, get_stock_search_service
+
+    stock_ids = None
+    if args.ticker:
+        matches = get_stock_search_service().search(args.ticker, limit=1)
+        if not matches or matches[0].ticker.upper() != args.ticker.upper():
+            raise ValueError(f"Unknown ticker '{args.ticker}'.")
+        stock_ids = [matches[0].stock_id]
+    repository = get_corporate_action_repository()
+    if args.action == "add":
+        action = repository.add_action(
+            stock_ids[0], args.type, args.ex_date, args.ratio, args.amount
+        )
+        print(f"Added {action.action_type} {action.id}.")
+        return 0
+    for action in repository.load_actions(stock_ids=stock_ids):
+        size = (
+            f"ratio {action.ratio:g}"
+            if action.ratio is not None
+            else f"amount {action.amount:,.4f}"
+        )
+        print(
+            f"{action.ex_date:%Y-%m-%d}  stock {action.stock_id:<6} "
+            f"{action.action_type:<8} {size}"
+        )
+    return 0
+
+
+def _quality(args: argparse.Namespace) -> int:
+    from injector import get_data_quality_service, get_data_quality_repository
+
+    if args.action == "run":
+        counts = get_data_quality_service().run(since=args.since)
+        for check, count in counts.items():
+            print(f"{check:<16} {count:>8,} findings")
+        return 0
+    for finding in get_data_quality_repository().list_findings(
+        check=args.check, limit=args.limit
+    ):
+        value = "" if finding.value is None else f"{finding.value:,.4f}"
+        print(
+            f"{finding.day:%Y-%m-%d}  stock {finding.stock_id:<6} "
+            f"{finding.check:<16} {value:>12}  {finding.detail}"
+        )
+    return 0
+
+
+def _parse_date(value: str) -> datetime.datetime:
+    return datetime.datetime.fromisoformat(value)
+
+
+def _export(args: argparse.Namespace) -> int:
+    from components.export.table_export import ExportFilter
+    from injector import get_table_exporter
+
+    filters = ExportFilter(
+        tickers=args.ticker, sectors=args.sector, start=args.start, end=args.end
+    )
+    summary = get_table_exporter().export(
+        args.dataset, args.format, filters, path=args.output
+    )
+    print(f"Exported {summary.rows:,} {summary.dataset} rows to {summary.path}.")
+    return 0
+
+
+def _backtest(args: argparse.Namespace) -> int:
+    import dataclasses
+
+    from components.backtest.backtest_data import SOURCE_TABLES, BacktestData
+    from components.backtest.backtest_engine import BacktestEngine, BacktestSettings
+    from components.backtest.parameter_sweep import settings_grid
+    from injector import (
+        get_data_version_repository,
+        get_fundamentals_repository,
+        get_parameter_sweep,
+        get_price_history_repository,
+        get_result_cache,
+    )
+
+    # Data and summaries are shared through the result cache, so reruns and
+    # other processes only compute what changed since the data last did.
+    cache = get_result_cache()
+    versions = get_data_version_repository().data_versions(SOURCE_TABLES)
+    period = {"start": args.start, "end": args.end}
+    data = cache.get_or_compute(
+        "backtest_data",
+        period,
+        lambda: BacktestData.from_repositories(
+            get_price_history_repository(),
+            get_fundamentals_repository(),
+            start=args.start,
+            end=args.end,
+        ),
+        versions=versions,
+    )
+    grid = settings_grid(
+        BacktestSettings(
+            execution_lag=args.execution_lag, max_positions=args.max_positions
+        ),
+        rebalance_every=args.rebalance_every or [21],
+        buy_quantile=args.buy_quantile or [0.8],
+        sell_quantile=args.sell_quantile or [0.5],
+        cost_bps=args.cost_bps or [10.0],
+    )
+
+    def parameters(settings: BacktestSettings) -> dict:
+        return {**period, "settings": dataclasses.asdict(settings)}
+
+    summaries = [
+        cache.get("backtest_summary", parameters(settings), versions)
+        for settings in grid
+    ]
+    missing = [settings for settings, summary in zip(grid, summaries) if not summary]
+    if len(missing) == 1:
+        computed = [(missing[0], BacktestEngine(data).run(missing[0]).summary())]
+    elif missing:
+        sweep = get_parameter_sweep(max_workers=args.workers)
+        data.save(sweep.data_dir)
+        computed = sweep.run(missing)
+    else:
+        computed = []
+    for settings, summary in computed:
+        cache.put("backtest_summary", parameters(settings), summary, versions)
+        summaries[grid.index(settings)] = summary
+    results = list(zip(grid, summaries))
+
+    print(
+        f"{'rebalance':>9} {'buy':>5} {'sell':>5} {'cost':>6} "
+        f"{'return':>8} {'cagr':>7} {'sharpe':>7} {'max dd':>7} {'turnover':>8}"
+    )
+    for settings, summary in results:
+        print(
+            f"{settings.rebalance_every:>9} {settings.rules.buy_quantile:>5.2f} "
+            f"{settings.rules.sell_quantile:>5.2f} {settings.cost_bps:>6.1f} "
+            f"{summary['total_return']:>8.2%} {summary['cagr']:>7.2%} "
+            f"{summary['sharpe']:>7.2f} {summary['max_drawdown']:>7.2%} "
+            f"{summary['average_turnover']:>8.2%}"
+        )
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="moneymonkey", description="MoneyMonkey batch and maintenance jobs."
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Serve Prometheus metrics on this port (overrides METRICS_HTTP_PORT).",
+    )
+    parser.add_argument(
+        "--metrics-textfile",
+        default=None,
+        help="Write Prometheus metrics to this file for node_exporter "
+        "(overrides METRICS_TEXTFILE).",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate = commands.add_parser("migrate", help="Apply pending database migrations.")
+    migrate.add_argument(
+        "--online",
+        action="store_true",
+        help="Also apply migrations marked online (large-table schema changes).",
+    )
+    migrate.set_defaults(handler=_migrate)
+
+    ingest = commands.add_parser("ingest", help="Refresh stale stock data.")
+    ingest.add_argument(
+        "--fetcher",
+        action="append",
+        required=True,
+        help="Fetcher class as 'package.module:ClassName'; repeatable.",
+    )
+    ingest.add_argument("--loop", action="store_true", help="Keep refreshing.")
+    ingest.add_argument(
+        "--interval", type=float, default=60.0, help="Seconds between rounds."
+    )
+    ingest.add_argument(
+        "--alerts",
+        action="store_true",
+        help="Evaluate alert rules on the rows stored by each batch.",
+    )
+    ingest.add_argument(
+        "--quality",
+        action="store_true",
+        help="Re-run the price data quality checks on the stocks of each batch.",
+    )
+    ingest.set_defaults(handler=_ingest)
+
+    score = commands.add_parser("score", help="Run an analysis over all stocks.")
+    score.add_argument(
+        "--analysis",
+        default="components.batch.technical_snapshot_analysis:TechnicalSnapshotAnalysis",
+        help="Analysis class as 'package.module:ClassName'.",
+    )
+    score.add_argument("--shard-by", choices=("id", "sector"), default="id")
+    score.add_argument("--shard-size", type=int, default=250)
+    score.add_argument("--workers", type=int, default=None)
+    score.add_argument(
+        "--run-id",
+        default=datetime.date.today().isoformat(),
+        help="Reuse a run id to resume an interrupted run.",
+    )
+    score.set_defaults(handler=_score)
+
+    generate = commands.add_parser(
+        "generate", help="Fill the database with seeded synthetic market data."
+    )
+    generate.add_argument("--stocks", type=int, default=5000)
+    generate.add_argument("--days", type=int, default=2520)
+    generate.add_argument("--seed", type=int, default=42)
+    generate.add_argument(
+        "--stock-data-every",
+        type=int,
+        default=5,
+        help="Write stock_data snapshots every N trading days; 0 disables them.",
+    )
+    generate.add_argument("--chunk-rows", type=int, default=50000)
+    generate.add_argument(
+        "--database-url",
+        default=None,
+        help="SQLAlchemy URL; defaults to the MySQL database from .env.",
+    )
+    generate.set_defaults(handler=_generate)
+
+    bars = commands.add_parser(
+        "bars", help="Bring the daily, weekly and monthly OHLC chart bars up to date."
+    )
+    bars.set_defaults(handler=_bars)
+
+    search = commands.add_parser(
+        "search", help="Find stocks by ticker or company name, tolerating typos."
+    )
+    search.add_argument("query")
+    search.add_argument("--limit", type=int, default=10)
+    search.add_argument(
+        "--rebuild", action="store_true", help="Rebuild the index from scratch."
+    )
+    search.set_defaults(handler=_search)
+
+    alerts = commands.add_parser("alerts", help="Manage and list alerts.")
+    actions = alerts.add_subparsers(dest="action", required=True)
+    add = actions.add_parser("add", help="Add an alert rule.")
+    add.add_argument("--ticker", required=True)
+    add.add_argument(
+        "--field", default="Price", help="'Price', a metric name or 'Dividend Yield'."
+    )
+    add.add_argument(
+        "--condition",
+        required=True,
+        choices=(
+            "above",
+            "below",
+            "above_sector_median",
+            "below_sector_median",
+        ),
+    )
+    add.add_argument("--threshold", type=float, default=None)
+    remove = actions.add_parser(
+        "remove",
+        help="Deactivate an alert rule; a running ingest drops it on its next poll.",
+    )
+    remove.add_argument("rule_id", type=int)
+    listing = actions.add_parser("list", help="Show the latest alerts.")
+    listing.add_argument("--limit", type=int, default=50)
+    alerts.set_defaults(handler=_alerts)
+
+    corporate_actions = commands.add_parser(
+        "corporate-actions",
+        help="Record splits and dividends that adjusted prices account for.",
+    )
+    action_commands = corporate_actions.add_subparsers(dest="action", required=True)
+    record = action_commands.add_parser("add", help="Record an action in effect.")
+    record.add_argument("--ticker", required=True)
+    record.add_argument("--type", required=True, choices=("split", "dividend"))
+    record.add_argument(
+        "--ex-date", required=True, type=lambda value: _parse_date(value).date()
+    )
+    record.add_argument(
+        "--ratio", type=float, default=None, help="New shares per old share."
+    )
+    record.add_argument(
+        "--amount", type=float, default=None, help="Dividend cash per share."
+    )
+    recorded = action_commands.add_parser("list", help="Show recorded actions.")
+    recorded.add_argument("--ticker", default=None)
+    corporate_actions.set_defaults(handler=_corporate_actions)
+
+    quality = commands.add_parser(
+        "quality", help="Check price and metric history for bad data."
+    )
+    quality_actions = quality.add_subparsers(dest="action", required=True)
+    run = quality_actions.add_parser(
+        "run", help="Check every stock and store the findings."
+    )
+    run.add_argument(
+        "--since",
+        type=lambda value: _parse_date(value).date(),
+        default=None,
+        help="Re-check findings from this date on; defaults to the last week.",
+    )
+    findings = quality_actions.add_parser("list", help="Show the latest findings.")
+    findings.add_argument(
+        "--check",
+        choices=("gap", "outlier", "stale", "disagreement", "metric_outlier"),
+        default=None,
+    )
+    findings.add_argument("--limit", type=int, default=50)
+    quality.set_defaults(handler=_quality)
+
+    export = commands.add_parser(
+        "export", help="Stream a table to CSV, JSONL or Arrow IPC for research."
+    )
+    export.add_argument(
+        "--dataset", choices=("prices", "dividends", "metrics"), default="prices"
+    )
+    export.add_argument("--format", choices=("csv", "jsonl", "arrow"), default="csv")
+    export.add_argument("--ticker", action="append", help="Ticker; repeatable.")
+    export.add_argument("--sector", action="append", help="Sector name; repeatable.")
+    export.add_argument(
+        "--start", type=_parse_date, default=None, help="First date, inclusive."
+    )
+    export.add_argument(
+        "--end", type=_parse_date, default=None, help="Last date, exclusive."
+    )
+    export.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Output file; defaults to a timestamped file in DATA_DIR/exports.",
+    )
+    export.set_defaults(handler=_export)
+
+    backtest = commands.add_parser(
+        "backtest",
+        help="Replay the fundamental scoring rules over history; repeat an "
+        "option to sweep a grid of values in parallel.",
+    )
+    backtest.add_argument("--rebalance-every", type=int, action="append")
+    backtest.add_argument("--buy-quantile", type=float, action="append")
+    backtest.add_argument("--sell-quantile", type=float, action="append")
+    backtest.add_argument("--cost-bps", type=float, action="append")
+    backtest.add_argument("--execution-lag", type=int, default=1)
+    backtest.add_argument("--max-positions", type=int, default=None)
+    backtest.add_argument(
+        "--start", type=_parse_date, default=None, help="First date, inclusive."
+    )
+    backtest.add_argument(
+        "--end", type=_parse_date, default=None, help="Last date, exclusive."
+    )
+    backtest.add_argument("--workers", type=int, default=None)
+    backtest.set_defaults(handler=_backtest)
+
+    cache = commands.add_parser(
+        "cache", help="Inspect or clear the results shared between processes."
+    )
+    cache.add_argument("action", choices=("stats", "clear"))
+    cache.set_defaults(handler=_cache)
+
+    benchmark = commands.add_parser(
+        "benchmark",
+        help="Time the analytics kernels or the repositories on synthetic data.",
+    )
+    benchmark.add_argument(
+        "--suite", choices=("kernels", "repositories"), default="kernels"
+    )
+    benchmark.add_argument("--stocks", type=int, default=2000)
+    benchmark.add_argument("--days", type=int, default=2520)
+    benchmark.add_argument("--seed", type=int, default=42)
+    benchmark.add_argument(
+        "--database-url",
+        default=None,
+        help="SQLAlchemy URL of a throwaway database; defaults to a temporary SQLite file.",
+    )
+    benchmark.add_argument(
+        "--allow-reset",
+        action="store_true",
+        help="Confirm that --database-url may be dropped and reseeded.",
+    )
+    benchmark.add_argument(
+        "--scale",
+        action="append",
+        choices=("small", "medium", "large"),
+        help="Dataset scale; repeatable. Defaults to small and medium.",
+    )
+    benchmark.add_argument("--min-seconds", type=float, default=1.0)
+    benchmark.add_argument("--baseline", type=Path, default=None)
+    benchmark.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Record this run as the baseline instead of comparing against it.",
+    )
+    benchmark.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed ops/sec drop against the baseline, as a fraction.",
+    )
+    benchmark.set_defaults(handler=_benchmark)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == "migrate":
+        return args.handler(args)
+
+    from injector import get_metrics_exporter
+
+    exporter = get_metrics_exporter()
+    if args.metrics_port is not None:
+        exporter.http_port = args.metrics_port
+    if args.metrics_textfile:
+        exporter.textfile = Path(args.metrics_textfile)
+    exporter.start()
+    try:
+        return args.handler(args)
+    finally:
+        exporter.stop()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
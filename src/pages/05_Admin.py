@@ -2,6 +2,8 @@ import streamlit as st
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 from injector import get_admin_repository
+from pages.utils.metrics import start_metrics_exporter
+from pages.utils.perf_panel import show_perf_panel, start_rerun_profiler
 
 
 class SectorManagementUI:
@@ -162,8 +164,13 @@ class SectorManagementUI:
 
 
 def main():
-    ui = SectorManagementUI()
-    ui.run()
+    start_metrics_exporter()
+    profiler = start_rerun_profiler("Admin")
+    with profiler.phase("construct"):
+        ui = SectorManagementUI()
+    with profiler.phase("render"):
+        ui.run()
+    show_perf_panel(profiler)
 
 
 if __name__ == "__main__":
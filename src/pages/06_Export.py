@@ -0,0 +1,103 @@
+import datetime
+
+import streamlit as st
+
+from components.export.table_export import DATASETS, FORMATS, ExportFilter
+from injector import get_admin_repository, get_table_exporter
+from pages.utils.metrics import start_metrics_exporter
+from pages.utils.perf_panel import show_perf_panel, start_rerun_profiler
+
+_MIME_TYPES = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+# st.download_button holds the whole file in server memory, so larger exports
+# are left on disk for the CLI or a copy from the server instead.
+_MAX_DOWNLOAD_BYTES = 50 * 2**20
+
+
+def _clear_summary():
+    st.session_state.pop("export_summary", None)
+
+
+class ExportUI:
+    def __init__(self):
+        self.exporter = get_table_exporter()
+        self.admin_repository = get_admin_repository()
+
+    def _filters(self):
+        tickers = st.text_input("Tickers (comma separated, empty for all)")
+        sectors = st.multiselect("Sectors", self.admin_repository.list_sectors())
+        col1, col2 = st.columns(2)
+        with col1:
+            start = st.date_input("From", value=None)
+        with col2:
+            end = st.date_input("Until (exclusive)", value=None)
+        return ExportFilter(
+            tickers=[t.strip() for t in tickers.split(",") if t.strip()] or None,
+            sectors=sectors or None,
+            start=datetime.datetime.combine(start, datetime.time()) if start else None,
+            end=datetime.datetime.combine(end, datetime.time()) if end else None,
+        )
+
+    def render(self):
+        st.title("MoneyMonkey: Export")
+        with st.form("Export"):
+            dataset = st.selectbox("Dataset", list(DATASETS))
+            file_format = st.selectbox("Format", FORMATS)
+            filters = self._filters()
+            submitted = st.form_submit_button("Export")
+
+        if submitted:
+            try:
+                with st.spinner("Exporting..."):
+                    summary = self.exporter.export(dataset, file_format, filters)
+            except Exception as e:
+                st.error(f"Error exporting {dataset}: {str(e)}")
+                return
+            st.session_state.export_summary = summary
+
+        summary = st.session_state.get("export_summary")
+        if summary and not summary.path.exists():
+            # Removed by a cleanup or another session since it was exported.
+            _clear_summary()
+            summary = None
+        if summary:
+            st.success(f"Exported {summary.rows:,} rows to {summary.path}.")
+            size = summary.path.stat().st_size
+            if size > _MAX_DOWNLOAD_BYTES:
+                st.info(
+                    f"At {size / 2**20:,.0f} MiB this export is too large to "
+                    "download here; copy it from the server, or run "
+                    "`moneymonkey export` where you need the file."
+                )
+                return
+            # Served once: the summary is cleared on download, so later reruns
+            # do not read the file into memory again.
+            with open(summary.path, "rb") as stream:
+                st.download_button(
+                    "Download",
+                    stream,
+                    file_name=summary.path.name,
+                    mime=_MIME_TYPES[summary.file_format],
+                    on_click=_clear_summary,
+                )
+
+    def run(self):
+        self.render()
+
+
+def main():
+    start_metrics_exporter()
+    profiler = start_rerun_profiler("Export")
+    with profiler.phase("construct"):
+        ui = ExportUI()
+    with profiler.phase("render"):
+        ui.run()
+    show_perf_panel(profiler)
+
+
+if __name__ == "__main__":
+    main()
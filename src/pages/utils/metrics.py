@@ -0,0 +1,11 @@
+import streamlit as st
+
+from injector import get_metrics_exporter
+
+
+@st.cache_resource
+def start_metrics_exporter():
+    # Cached per server process, so reruns and sessions share one endpoint.
+    exporter = get_metrics_exporter()
+    exporter.start()
+    return exporter
@@ -0,0 +1,49 @@
+import streamlit as st
+
+from components.profiling.rerun_profiler import RerunProfiler, RerunReport
+from injector import get_config
+
+config = get_config()
+
+
+def start_rerun_profiler(page: str) -> RerunProfiler:
+    return RerunProfiler(page)
+
+
+def show_perf_panel(profiler: RerunProfiler):
+    if not config.perf_panel_enabled:
+        return
+    render_perf_panel(profiler.finish())
+
+
+def render_perf_panel(report: RerunReport):
+    with st.sidebar.expander("Performance (this rerun)", expanded=report.regression):
+        baseline = (
+            f"{report.baseline_ms:.0f} ms" if report.baseline_ms is not None else "n/a"
+        )
+        st.metric(
+            "Wall time",
+            f"{report.total_ms:.0f} ms",
+            delta=(
+                f"{report.total_ms - report.baseline_ms:+.0f} ms"
+                if report.baseline_ms is not None
+                else None
+            ),
+            delta_color="inverse",
+        )
+        st.caption(f"Rolling median baseline: {baseline}")
+        if report.regression:
+            st.warning("This rerun is markedly slower than the baseline.")
+        st.write(f"Queries: {report.query_count} ({report.query_ms:.1f} ms)")
+        st.table(
+            [
+                {
+                    "phase": phase.name,
+                    "wall ms": round(phase.wall_ms, 1),
+                    "queries": phase.query_count,
+                    "db ms": round(phase.query_ms, 1),
+                    "other ms": round(phase.other_ms, 1),
+                }
+                for phase in report.phases
+            ]
+        )
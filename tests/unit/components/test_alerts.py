@@ -0,0 +1,201 @@
+import datetime
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from sqlalchemy import insert
+from components.alerts.alert_engine import AlertEngine
+from components.alerts.alert_service import AlertService
+from components.alerts.interfaces.alert_repository import (
+    ABOVE,
+    BELOW,
+    BELOW_SECTOR_MEDIAN,
+    PRICE,
+    AlertRuleRecord,
+    Observation,
+)
+from components.alerts.sqlAlchemy_alert_repository import SqlalchemyAlertRepository
+from components.benchmark.repository_benchmark import DatasetScale, seed_dataset
+from components.database.models import FinancialMetric, MetricName, StockPriceHistory
+from components.database.url_connector import UrlConnector
+from components.market_data.sqlAlchemy_stock_repository import (
+    SqlalchemyStockRepository,
+)
+from components.metrics.metrics_registry import MetricsRegistry
+
+AT = datetime.datetime(2024, 1, 2, 15)
+
+
+def _prices(*values, stock_id=1):
+    return [Observation(stock_id, PRICE, value, AT) for value in values]
+
+
+def _fired(alerts):
+    return [(alert.rule_id, alert.reference) for alert in alerts]
+
+
+class TestAlertEngine(unittest.TestCase):
+    def test_thresholds_fire_once_per_crossing(self):
+        engine = AlertEngine(
+            {},
+            [
+                AlertRuleRecord(1, 1, PRICE, ABOVE, 100.0),
+                AlertRuleRecord(2, 1, PRICE, ABOVE, 110.0),
+                AlertRuleRecord(3, 1, PRICE, BELOW, 90.0),
+                AlertRuleRecord(4, 2, PRICE, ABOVE, 1.0),
+            ],
+        )
+        engine.seed(_prices(95.0))
+
+        self.assertEqual(engine.process(_prices(99.0)), [])
+        # One jump crosses both upper thresholds; staying above fires nothing.
+        self.assertEqual(
+            _fired(engine.process(_prices(115.0))), [(1, 100.0), (2, 110.0)]
+        )
+        self.assertEqual(engine.process(_prices(120.0, 101.0)), [])
+        self.assertEqual(
+            _fired(engine.process(_prices(90.0, 120.0))),
+            [(3, 90.0), (1, 100.0), (2, 110.0)],
+        )
+        # Another stock's rule only sees its own prices; with no previous
+        # value a condition that already holds fires.
+        self.assertEqual(_fired(engine.process(_prices(5.0, stock_id=2))), [(4, 1.0)])
+
+    def test_sector_median_rules_fire_when_the_median_moves(self):
+        sector_of = {1: "Tech", 2: "Tech", 3: "Tech", 4: "Energy"}
+        engine = AlertEngine(
+            sector_of, [AlertRuleRecord(1, 1, "PE Ratio", BELOW_SECTOR_MEDIAN)]
+        )
+        engine.seed(
+            Observation(stock_id, "PE Ratio", value, AT)
+            for stock_id, value in ((1, 20.0), (2, 10.0), (3, 30.0), (4, 1.0))
+        )
+
+        def pe(stock_id, value):
+            return engine.process([Observation(stock_id, "PE Ratio", value, AT)])
+
+        # Stock 1 is the median; other sectors do not count.
+        self.assertEqual(engine.medians.median("Tech", "PE Ratio"), 20.0)
+        self.assertEqual(pe(4, 100.0), [])
+        # Stock 2 moving up lifts the median past stock 1 without stock 1
+        # reporting anything.
+        self.assertEqual(_fired(pe(2, 25.0)), [(1, 25.0)])
+        self.assertEqual(pe(3, 40.0), [])
+        self.assertEqual(pe(1, 30.0), [])
+        self.assertEqual(_fired(pe(1, 24.0)), [(1, 25.0)])
+
+
+class TestAlertService(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.connector = UrlConnector(f"sqlite:///{self.directory.name}/alerts.db")
+        # Two sectors of three stocks (odd and even ids), five daily prices each.
+        seed_dataset(self.connector, DatasetScale("tiny", 2, 1, 6, 5))
+        with self.connector.engine.begin() as connection:
+            connection.execute(insert(MetricName), [{"id": 1, "name": "PE Ratio"}])
+            self._insert(
+                connection,
+                FinancialMetric,
+                [(stock_id, 10.0 * stock_id) for stock_id in range(1, 7)],
+            )
+        logger = MagicMock()
+        self.repository = SqlalchemyAlertRepository(
+            connector=self.connector, logger=logger
+        )
+        self.service = AlertService(
+            self.repository,
+            SqlalchemyStockRepository(connector=self.connector, logger=logger),
+            batch_rows=2,
+            logger=logger,
+            metrics=MetricsRegistry(),
+        )
+
+    def tearDown(self):
+        self.connector.dispose()
+        self.directory.cleanup()
+
+    @staticmethod
+    def _insert(connection, table, values):
+        column = "price" if table is StockPriceHistory else "metric_value"
+        rows = []
+        for stock_id, value in values:
+            row = {"stock_id": stock_id, column: value, "date_recorded": AT}
+            if table is FinancialMetric:
+                row["metric_name_id"] = 1
+            rows.append(row)
+        connection.execute(insert(table), rows)
+
+    def _add(self, table, values):
+        with self.connector.engine.begin() as connection:
+            self._insert(connection, table, values)
+
+    def test_new_rows_fire_rules_and_are_stored(self):
+        latest = self.repository.latest_observations([1], {PRICE})[0].value
+        self.repository.add_rule(1, PRICE, ABOVE, latest + 10)
+        self.service.start()
+        self.repository.add_rule(2, "PE Ratio", BELOW_SECTOR_MEDIAN)
+
+        self.assertEqual(self.service.poll(), [])
+
+        # Five rows with batch_rows=2 are read over several rounds, in order.
+        self._add(
+            StockPriceHistory,
+            [
+                (1, latest + 5),
+                (1, latest + 20),
+                (1, latest),
+                (1, latest + 30),
+                (3, 1.0),
+            ],
+        )
+        alerts = self.service.poll()
+        self.assertEqual([alert.value for alert in alerts], [latest + 20, latest + 30])
+
+        # Stocks 2, 4 and 6 share a sector with PE 20, 40 and 60. Rows of the
+        # other sector are ignored; stock 2 rising to the median clears its
+        # condition and stock 4 lifting the median sets it again.
+        self._add(FinancialMetric, [(1, 100.0), (3, 5.0), (2, 50.0)])
+        self.assertEqual(self.service.poll(), [])
+        self._add(FinancialMetric, [(4, 55.0)])
+        (alert,) = self.service.poll()
+        self.assertEqual(
+            (alert.stock_id, alert.value, alert.reference), (2, 50.0, 55.0)
+        )
+
+        listed = self.repository.list_alerts()
+        self.assertEqual(len(listed), 3)
+        self.assertEqual(listed[0].condition, BELOW_SECTOR_MEDIAN)
+
+    def test_deactivated_rules_stop_firing_in_a_running_service(self):
+        latest = self.repository.latest_observations([1], {PRICE})[0].value
+        rule = self.repository.add_rule(1, PRICE, ABOVE, latest + 10)
+        self.service.start()
+
+        self.repository.deactivate_rule(rule.id)
+        self._add(StockPriceHistory, [(1, latest + 20)])
+
+        self.assertEqual(self.service.poll(), [])
+        self.assertEqual(self.service.engine.rules, {})
+
+    def test_rules_added_while_running_keep_pending_crossings(self):
+        latest = self.repository.latest_observations([1], {PRICE})[0].value
+        rule = self.repository.add_rule(1, PRICE, ABOVE, latest + 10)
+        self.service.start()
+
+        self._add(StockPriceHistory, [(1, latest + 20)])
+        # The new rule's seed already holds the unprocessed row; it must not
+        # become the existing rule's starting point.
+        self.repository.add_rule(1, PRICE, BELOW, latest - 10)
+
+        self.assertEqual([alert.rule_id for alert in self.service.poll()], [rule.id])
+
+    def test_add_rule_validates_input(self):
+        with self.assertRaises(ValueError):
+            self.repository.add_rule(1, PRICE, "sideways", 1.0)
+        with self.assertRaises(ValueError):
+            self.repository.add_rule(1, PRICE, ABOVE)
+        with self.assertRaises(ValueError):
+            self.repository.add_rule(1, "Shoe Size", ABOVE, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import asyncio
+import tempfile
+import threading
+import unittest
+from logging import Logger as StandardLogger
+from unittest.mock import MagicMock
+from sqlalchemy import create_engine
+from components.admin.sqlAlchemy_admin_repository import SqlalchemyAdminRepository
+from components.database.async_repository import AsyncRepository, pool_capacity
+from components.database.models import Base
+from components.database.url_connector import UrlConnector
+
+
+class BlockingRepository:
+    def __init__(self, connector):
+        self.session = MagicMock()
+        self.release = threading.Event()
+        self.started = threading.Event()
+
+    def wait(self, value):
+        self.started.set()
+        self.release.wait(5)
+        return value
+
+
+class TestAsyncRepository(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.connector = UrlConnector(f"sqlite:///{self.directory.name}/db.sqlite")
+        Base.metadata.create_all(self.connector.engine)
+        self.logger = MagicMock(spec=StandardLogger)
+
+    def tearDown(self):
+        self.connector.dispose()
+        self.directory.cleanup()
+
+    def facade(self, factory, **kwargs):
+        return AsyncRepository(self.connector, factory, logger=self.logger, **kwargs)
+
+    def test_concurrency_defaults_to_pool_capacity(self):
+        sized = create_engine(
+            f"sqlite:///{self.directory.name}/sized.sqlite", pool_size=3, max_overflow=2
+        )
+        repository = self.facade(BlockingRepository)
+
+        self.assertEqual(pool_capacity(sized), 5)
+        self.assertEqual(
+            repository.max_concurrency, pool_capacity(self.connector.engine)
+        )
+        repository.close()
+
+    def test_calls_run_on_worker_threads_with_their_own_repository(self):
+        def factory(connector):
+            return SqlalchemyAdminRepository(connector=connector, logger=self.logger)
+
+        async def scenario():
+            async with self.facade(factory, max_concurrency=2) as repository:
+                await repository.create_sector("Energy")
+                await asyncio.gather(
+                    repository.create_sector("Utilities"),
+                    repository.create_sector("Materials"),
+                )
+                return await repository.list_sectors(), repository._repositories
+
+        sectors, repositories = asyncio.run(scenario())
+
+        self.assertEqual(sorted(sectors), ["Energy", "Materials", "Utilities"])
+        self.assertLessEqual(len(repositories), 2)
+        self.assertEqual(len({id(r.session) for r in repositories}), len(repositories))
+
+    def test_timeout_abandons_the_call_and_rolls_back(self):
+        blocking = BlockingRepository(None)
+        repository = self.facade(lambda connector: blocking, max_concurrency=1)
+
+        async def scenario():
+            with self.assertRaises(TimeoutError):
+                await repository.call("wait", 1, timeout=0.05)
+            blocking.release.set()
+            return await repository.wait(2)
+
+        self.assertEqual(asyncio.run(scenario()), 2)
+        blocking.session.rollback.assert_called_once()
+        self.logger.warning.assert_called_once()
+        repository.close()
+
+    def test_slots_stay_taken_until_the_thread_finishes(self):
+        blocking = BlockingRepository(None)
+        repository = self.facade(lambda connector: blocking, max_concurrency=1)
+
+        async def scenario():
+            first = asyncio.ensure_future(repository.wait(1))
+            await asyncio.get_running_loop().run_in_executor(
+                None, blocking.started.wait, 5
+            )
+            first.cancel()
+            # The cancelled call still holds the only connection, so the next
+            # one times out waiting for the slot instead of running.
+            with self.assertRaises(TimeoutError):
+                await repository.call("wait", 2, timeout=0.05)
+            blocking.release.set()
+            return await repository.wait(3)
+
+        self.assertEqual(asyncio.run(scenario()), 3)
+        repository.close()
+
+    def test_facade_can_be_shared_by_successive_event_loops(self):
+        blocking = BlockingRepository(None)
+        blocking.release.set()
+        repository = self.facade(lambda connector: blocking, max_concurrency=1)
+
+        async def scenario():
+            # Two calls for one slot, so the second waits on the semaphore.
+            return await asyncio.gather(repository.wait(1), repository.wait(2))
+
+        self.assertEqual(asyncio.run(scenario()), [1, 2])
+        self.assertEqual(asyncio.run(scenario()), [1, 2])
+        repository.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+import datetime
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+import numpy as np
+from sqlalchemy import insert
+from components.backtest.backtest_data import BacktestData
+from components.backtest.backtest_engine import (
+    BacktestEngine,
+    BacktestSettings,
+    ScoringRules,
+    score,
+)
+from components.backtest.parameter_sweep import ParameterSweep, settings_grid
+from components.benchmark.repository_benchmark import DatasetScale, seed_dataset
+from components.database.models import DividendYield, FinancialMetric, MetricName
+from components.database.url_connector import UrlConnector
+from components.market_data.interfaces.fundamentals_repository import DIVIDEND_YIELD
+from components.market_data.sqlAlchemy_fundamentals_repository import (
+    SqlalchemyFundamentalsRepository,
+)
+from components.market_data.sqlAlchemy_price_history_repository import (
+    SqlalchemyPriceHistoryRepository,
+)
+
+
+def _data(returns, points):
+    # points: (column, day, value) observations of metric 1, "EPS".
+    days, stocks = returns.shape
+    columns, recorded, values = zip(*points)
+    return BacktestData(
+        dates=np.datetime64("2024-01-01") + np.arange(days),
+        stock_ids=np.arange(1, stocks + 1),
+        returns=returns,
+        tradable=np.ones(returns.shape, dtype=bool),
+        point_columns=np.array(columns),
+        point_metrics=np.ones(len(points), dtype=np.int64),
+        point_days=np.datetime64("2024-01-01") + np.array(recorded),
+        point_values=np.array(values, dtype=np.float64),
+        metric_names={1: "EPS"},
+    )
+
+
+RULES = ScoringRules(weights={"EPS": 1.0}, buy_quantile=0.9, sell_quantile=0.9)
+
+
+class TestBacktestEngine(unittest.TestCase):
+    def test_scores_only_see_values_recorded_by_the_rebalance_day(self):
+        data = _data(np.zeros((10, 3)), [(0, 0, 1.0), (1, 0, 2.0), (2, 0, 3.0)])
+        data.point_columns = np.append(data.point_columns, 0)
+        data.point_metrics = np.append(data.point_metrics, 1)
+        data.point_days = np.append(data.point_days, np.datetime64("2024-01-06"))
+        data.point_values = np.append(data.point_values, 100.0)
+
+        scores = score(data, RULES, np.array([0, 4, 5]))
+
+        np.testing.assert_array_equal(np.nanargmax(scores, axis=1), [2, 2, 0])
+
+    def test_stale_values_are_ignored(self):
+        data = _data(np.zeros((10, 2)), [(0, 0, 1.0), (1, 6, 2.0)])
+        rules = ScoringRules(weights={"EPS": 1.0}, max_staleness_days=3)
+
+        scores = score(data, rules, np.array([2, 6]))
+
+        self.assertFalse(np.isnan(scores[0, 0]))
+        self.assertTrue(np.isnan(scores[1, 0]))
+
+    def test_trades_fill_after_the_rebalance_and_pay_costs(self):
+        returns = np.zeros((10, 2))
+        returns[:, 1] = 0.01
+        returns[1, 1] = 0.5
+        data = _data(returns, [(0, 0, 1.0), (1, 0, 2.0)])
+
+        report = BacktestEngine(data).run(
+            BacktestSettings(rules=RULES, rebalance_every=5, cost_bps=100.0)
+        )
+
+        # The position is bought at the close of day 1, so day 1's jump is
+        # missed; the first held day pays 1% on a full turn into the stock.
+        self.assertEqual(report.dates[0], np.datetime64("2024-01-03"))
+        self.assertAlmostEqual(report.daily_returns[0], 0.99 * 1.01 - 1)
+        np.testing.assert_allclose(report.daily_returns[1:], 0.01)
+        np.testing.assert_array_equal(report.turnover, [0.5, 0.0])
+        np.testing.assert_array_equal(report.positions, [1, 1])
+        self.assertEqual(report.summary()["max_drawdown"], 0.0)
+
+    def test_drawdown_and_drifting_weights(self):
+        returns = np.zeros((6, 2))
+        returns[2:, :] = [[0.1, -0.1], [0.1, -0.1], [-0.5, 0.0], [0.0, 0.0]]
+        data = _data(returns, [(0, 0, 1.0), (1, 0, 1.0)])
+        rules = ScoringRules(weights={"EPS": 1.0}, buy_quantile=0.0)
+
+        report = BacktestEngine(data).run(
+            BacktestSettings(rules=rules, rebalance_every=10, cost_bps=0.0)
+        )
+
+        # Equal weights drift to 0.55 / 0.45 and then 0.605 / 0.405.
+        np.testing.assert_allclose(report.equity, [1.0, 1.01, 0.7075, 0.7075])
+        self.assertAlmostEqual(report.summary()["max_drawdown"], 0.7075 / 1.01 - 1)
+
+
+class TestParameterSweep(unittest.TestCase):
+    def test_sweep_over_saved_data_matches_direct_runs(self):
+        rng = np.random.default_rng(3)
+        returns = rng.normal(0.0, 0.02, (120, 6))
+        points = [
+            (column, day, float(value))
+            for day in range(0, 120, 10)
+            for column, value in enumerate(rng.normal(size=6))
+        ]
+        data = _data(returns, points)
+        grid = settings_grid(
+            BacktestSettings(rules=RULES),
+            rebalance_every=[5, 20],
+            buy_quantile=[0.5, 0.8],
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            data.save(directory)
+            results = ParameterSweep(directory, max_workers=2).run(grid)
+
+        self.assertEqual(len(results), 4)
+        self.assertEqual(
+            [(s.rebalance_every, s.rules.buy_quantile) for s, _ in results],
+            [(5, 0.5), (5, 0.8), (20, 0.5), (20, 0.8)],
+        )
+        engine = BacktestEngine(data)
+        for settings, summary in results:
+            self.assertEqual(summary, engine.run(settings).summary())
+
+
+class TestBacktestData(unittest.TestCase):
+    def test_loads_prices_metrics_and_dividends(self):
+        with tempfile.TemporaryDirectory() as directory:
+            connector = UrlConnector(f"sqlite:///{directory}/backtest.db")
+            seed_dataset(connector, DatasetScale("tiny", 1, 1, 3, 30))
+            with connector.engine.begin() as connection:
+                connection.execute(insert(MetricName), [{"id": 1, "name": "EPS"}])
+                connection.execute(
+                    insert(FinancialMetric),
+                    [
+                        {
+                            "stock_id": stock_id,
+                            "metric_name_id": 1,
+                            "metric_value": stock_id,
+                            "date_recorded": datetime.datetime(2014, 12, 31),
+                        }
+                        for stock_id in (1, 2, 3)
+                    ],
+                )
+                connection.execute(
+                    insert(DividendYield),
+                    [
+                        {
+                            "stock_id": 2,
+                            "yield_value": 0.03,
+                            "date_recorded": datetime.datetime(2015, 1, 20),
+                        }
+                    ],
+                )
+            logger = MagicMock()
+            data = BacktestData.from_repositories(
+                SqlalchemyPriceHistoryRepository(connector=connector, logger=logger),
+                SqlalchemyFundamentalsRepository(connector=connector, logger=logger),
+                start=datetime.datetime(2015, 1, 10),
+            )
+            connector.dispose()
+
+        self.assertEqual(data.returns.shape, (25, 3))
+        self.assertEqual(data.metric_names, {1: "EPS", -1: DIVIDEND_YIELD})
+        self.assertEqual(sorted(data.point_metrics.tolist()), [-1, 1, 1, 1])
+        report = BacktestEngine(data).run(BacktestSettings(rebalance_every=5))
+        self.assertEqual(len(report.rebalance_dates), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+import tempfile
+import unittest
+import logging
+from functools import partial
+from pathlib import Path
+from unittest.mock import MagicMock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from components.batch.batch_runner import BatchCheckpoint, BatchRunner
+from components.batch.interfaces.stock_analysis import StockAnalysis
+from components.batch.shard_planner import Shard, ShardPlanner
+from components.database.interfaces.connector import Connector
+from components.database.models import AnalysisResult, Base, Industry, Sector, Stock
+
+
+class SqliteConnector(Connector):
+    def __init__(self, path):
+        self.path = path
+        self._engine = None
+
+    def get_connection(self):
+        return self.get_session().connection()
+
+    def get_session(self):
+        return sessionmaker(bind=self.get_write_engine())()
+
+    def get_write_engine(self):
+        if self._engine is None:
+            self._engine = create_engine(f"sqlite:///{self.path}")
+        return self._engine
+
+
+class DoublePriceAnalysis(StockAnalysis):
+    name = "double_price"
+
+    def analyze(self, stock_ids, connector):
+        session = connector.get_session()
+        rows = session.query(Stock.id, Stock.price).filter(Stock.id.in_(stock_ids))
+        return {stock_id: {"value": float(price) * 2} for stock_id, price in rows}
+
+
+class FailingAnalysis(DoublePriceAnalysis):
+    def analyze(self, stock_ids, connector):
+        if 3 in stock_ids:
+            raise RuntimeError("model diverged")
+        return super().analyze(stock_ids, connector)
+
+
+class TestShardPlanner(unittest.TestCase):
+    def test_by_id_range(self):
+        repository = MagicMock()
+        repository.list_stock_ids.return_value = [1, 2, 5, 8, 9]
+
+        shards = ShardPlanner(repository, shard_size=2).by_id_range()
+
+        self.assertEqual(
+            shards,
+            [
+                Shard("ids:1-2", (1, 2)),
+                Shard("ids:5-8", (5, 8)),
+                Shard("ids:9-9", (9,)),
+            ],
+        )
+
+    def test_by_sector_splits_large_sectors(self):
+        repository = MagicMock()
+        repository.list_stock_ids_by_sector.return_value = {
+            "Energy": [1, 2, 3],
+            "Utilities": [4],
+        }
+
+        shards = ShardPlanner(repository, shard_size=2).by_sector()
+
+        self.assertEqual(
+            [shard.key for shard in shards],
+            ["sector:Energy:0", "sector:Energy:1", "sector:Utilities:0"],
+        )
+
+
+class TestBatchRunner(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.directory.name)
+        self.connector = SqliteConnector(self.root / "db.sqlite")
+        session = self.connector.get_session()
+        Base.metadata.create_all(session.get_bind())
+        sector = Sector(name="Energy")
+        session.add(sector)
+        session.flush()
+        industry = Industry(name="Oil", sector_id=sector.id)
+        session.add(industry)
+        session.flush()
+        for number in range(1, 6):
+            session.add(
+                Stock(
+                    ticker=f"T{number}",
+                    company_name=f"Company {number}",
+                    industry_id=industry.id,
+                    price=number,
+                )
+            )
+        session.commit()
+        self.shards = [Shard("a", (1, 2)), Shard("b", (3, 4)), Shard("c", (5,))]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def runner(self, analysis, progress=None):
+        return BatchRunner(
+            analysis=analysis,
+            checkpoint_dir=self.root / "batch",
+            connector_factory=partial(SqliteConnector, self.connector.path),
+            logger_factory=logging.getLogger,
+            max_workers=2,
+            logger=MagicMock(spec=logging.Logger),
+            progress=progress,
+        )
+
+    def stored_results(self):
+        session = self.connector.get_session()
+        return {
+            row.stock_id: row.data["value"] for row in session.query(AnalysisResult)
+        }
+
+    def test_run_writes_results_and_reports_progress(self):
+        progress = MagicMock()
+
+        report = self.runner(DoublePriceAnalysis(), progress).run(self.shards, "r1")
+
+        self.assertEqual(report.shards_done, 3)
+        self.assertEqual(report.results_written, 5)
+        self.assertEqual(progress.call_count, 3)
+        self.assertEqual(
+            self.stored_results(), {1: 2.0, 2: 4.0, 3: 6.0, 4: 8.0, 5: 10.0}
+        )
+
+    def test_resume_skips_completed_shards(self):
+        failed = self.runner(FailingAnalysis()).run(self.shards, "r2")
+        self.assertEqual(failed.failed, ["b"])
+        self.assertEqual(sorted(self.stored_results()), [1, 2, 5])
+
+        resumed = self.runner(DoublePriceAnalysis()).run(self.shards, "r2")
+
+        self.assertEqual(resumed.shards_skipped, 2)
+        self.assertEqual(resumed.shards_done, 1)
+        self.assertEqual(sorted(self.stored_results()), [1, 2, 3, 4, 5])
+
+    def test_rerunning_a_shard_does_not_duplicate_results(self):
+        self.runner(DoublePriceAnalysis()).run(self.shards, "r3")
+        (self.root / "batch" / "double_price-r3.json").unlink()
+
+        self.runner(DoublePriceAnalysis()).run(self.shards, "r3")
+
+        session = self.connector.get_session()
+        self.assertEqual(session.query(AnalysisResult).count(), 5)
+
+    def test_checkpoint_round_trip(self):
+        path = self.root / "checkpoint.json"
+        BatchCheckpoint(path).mark_done(Shard("a", (1,)), 1)
+
+        self.assertTrue(BatchCheckpoint(path).is_done(Shard("a", (1,))))
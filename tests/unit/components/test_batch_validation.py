@@ -0,0 +1,83 @@
+import decimal
+import unittest
+from components.database.batch_validation import (
+    BatchValidationError,
+    validate_metric_values,
+    validate_names,
+    validate_rows,
+)
+from components.database.models import FinancialMetric, Sector, Stock
+
+
+def orm_name_error(name):
+    try:
+        Sector(name=name)
+    except ValueError as e:
+        return str(e)
+    return None
+
+
+class TestBatchValidation(unittest.TestCase):
+    def test_names_match_orm_validator(self):
+        names = ["Energy", "x", "Café", "a" * 101, "Tab\there", "R&D (US) #1"]
+
+        issues = {issue.row: issue.message for issue in validate_names(names, Sector)}
+
+        for row, name in enumerate(names):
+            self.assertEqual(issues.get(row), orm_name_error(name), name)
+
+    def test_missing_names_are_reported(self):
+        issues = validate_names(["Energy", None], Sector)
+
+        self.assertEqual(
+            [(issue.row, issue.message) for issue in issues], [(1, "Name is required.")]
+        )
+
+    def test_metric_values_round_like_decimal(self):
+        values = [
+            0.125,
+            2.675,
+            1.005,
+            0.015,
+            "12.345",
+            decimal.Decimal("3.999"),
+            -0.001,
+        ]
+
+        rounded, issues = validate_metric_values(values)
+
+        self.assertEqual(issues, [])
+        self.assertEqual(
+            rounded.tolist(),
+            [
+                float(FinancialMetric().validate_metric_value("metric_value", value))
+                for value in values
+            ],
+        )
+
+    def test_metric_values_report_invalid_and_negative(self):
+        _, issues = validate_metric_values([1.0, "abc", -5, float("nan")])
+
+        self.assertEqual(
+            [issue.message for issue in issues],
+            [
+                "Invalid metric value: abc",
+                "Metric value must be non-negative: -5",
+                "Invalid metric value: nan",
+            ],
+        )
+
+    def test_validate_rows_raises_one_report_per_batch(self):
+        rows = [{"name": "Energy"}, {"name": "x"}, {"name": "Badé"}]
+
+        with self.assertRaises(BatchValidationError) as context:
+            validate_rows(Sector, rows)
+
+        self.assertEqual([issue.row for issue in context.exception.issues], [1, 2])
+        self.assertIn("2 invalid values in batch", str(context.exception))
+
+    def test_validate_rows_normalizes_metric_values(self):
+        rows = validate_rows(FinancialMetric, [{"stock_id": 1, "metric_value": 1.239}])
+
+        self.assertEqual(rows, [{"stock_id": 1, "metric_value": 1.24}])
+        self.assertEqual(validate_rows(Stock, [{"ticker": "x"}]), [{"ticker": "x"}])
@@ -0,0 +1,245 @@
+import datetime
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+import numpy as np
+from sqlalchemy import update
+from components.analytics.price_matrix import PriceMatrix
+from components.analytics.technical_analytics import (
+    AnalyticsSettings,
+    TechnicalAnalytics,
+)
+from components.analytics.technical_analytics_service import (
+    TechnicalAnalyticsService,
+)
+from components.benchmark.repository_benchmark import (
+    FIRST_DAY,
+    DatasetScale,
+    seed_dataset,
+)
+from components.database.models import StockPriceHistory
+from components.database.url_connector import UrlConnector
+from components.market_data.adjusted_price_history_repository import (
+    AdjustedPriceHistoryRepository,
+)
+from components.market_data.interfaces.corporate_action_repository import (
+    DIVIDEND,
+    SPLIT,
+    CorporateActionRecord,
+)
+from components.market_data.interfaces.price_history_repository import PricePoints
+from components.market_data.price_adjuster import PriceAdjuster, action_factor
+from components.market_data.sqlAlchemy_corporate_action_repository import (
+    SqlalchemyCorporateActionRepository,
+)
+from components.market_data.sqlAlchemy_price_history_repository import (
+    SqlalchemyPriceHistoryRepository,
+)
+
+DAY = datetime.date(2024, 1, 1)
+
+
+def action(id, stock_id, action_type, offset, **kwargs):
+    return CorporateActionRecord(
+        id, stock_id, action_type, DAY + datetime.timedelta(days=offset), **kwargs
+    )
+
+
+class FakeActions:
+    def __init__(self, actions=()):
+        self.actions = list(actions)
+
+    def load_actions(self, stock_ids=None, after_id=0):
+        return [
+            a
+            for a in self.actions
+            if a.id > after_id and (stock_ids is None or a.stock_id in stock_ids)
+        ]
+
+
+class FakePrices:
+    def __init__(self, prices_by_stock):
+        self.prices_by_stock = prices_by_stock
+
+    def load_price_points(self, stock_ids=None, start=None, end=None):
+        rows = [
+            (stock_id, np.datetime64(DAY, "D") + offset, price)
+            for stock_id, prices in self.prices_by_stock.items()
+            for offset, price in enumerate(prices)
+            if stock_ids is None or stock_id in stock_ids
+        ]
+        rows = [
+            row
+            for row in rows
+            if start is None or row[1] >= np.datetime64(start.date(), "D")
+        ]
+        return PricePoints(
+            stock_ids=np.array([row[0] for row in rows], dtype=np.int64),
+            recorded_at=np.array([row[1] for row in rows], dtype="datetime64[us]"),
+            prices=np.array([row[2] for row in rows], dtype=np.float64),
+        )
+
+
+class TestPriceAdjuster(unittest.TestCase):
+    def test_action_factor(self):
+        self.assertEqual(action_factor(action(1, 1, SPLIT, 0, ratio=4.0)), 0.25)
+        self.assertAlmostEqual(
+            action_factor(action(2, 1, DIVIDEND, 0, amount=2.0, reference_price=100.0)),
+            0.98,
+        )
+        # Without a price before the ex-date, or with an implausible amount,
+        # a dividend leaves prices alone.
+        self.assertEqual(action_factor(action(3, 1, DIVIDEND, 0, amount=2.0)), 1.0)
+        self.assertEqual(
+            action_factor(
+                action(4, 1, DIVIDEND, 0, amount=200.0, reference_price=100.0)
+            ),
+            1.0,
+        )
+
+    def test_factors_cover_the_days_before_each_ex_date(self):
+        repository = FakeActions(
+            [
+                action(1, 1, SPLIT, 5, ratio=2.0),
+                action(2, 1, DIVIDEND, 3, amount=1.0, reference_price=50.0),
+                action(3, 2, SPLIT, 2, ratio=3.0),
+            ]
+        )
+        adjuster = PriceAdjuster(repository)
+
+        self.assertEqual(adjuster.refresh(), [1, 2])
+        days = np.datetime64(DAY, "D") + np.array([0, 2, 3, 4, 5, 6, 0, 1, 2])
+        stock_ids = np.array([1, 1, 1, 1, 1, 1, 2, 2, 2])
+        np.testing.assert_allclose(
+            adjuster.factors(stock_ids, days),
+            [0.49, 0.49, 0.5, 0.5, 1, 1, 1 / 3, 1 / 3, 1],
+        )
+        np.testing.assert_array_equal(
+            adjuster.factors(np.array([3, 0]), days[:2]), [1, 1]
+        )
+
+    def test_refresh_only_rebuilds_stocks_with_new_actions(self):
+        repository = FakeActions(
+            [action(1, 1, SPLIT, 5, ratio=2.0), action(2, 2, SPLIT, 5, ratio=2.0)]
+        )
+        adjuster = PriceAdjuster(repository)
+        adjuster.refresh()
+        untouched = adjuster._vectors[2]
+
+        repository.actions.append(action(3, 1, SPLIT, 8, ratio=5.0))
+
+        self.assertEqual(adjuster.refresh(), [1])
+        self.assertIs(adjuster._vectors[2], untouched)
+        self.assertEqual(adjuster.refresh(), [])
+        self.assertEqual(adjuster.changed_since(2), [1])
+        self.assertEqual((adjuster.version([2]), adjuster.version([1, 2])), (2, 3))
+        np.testing.assert_allclose(
+            adjuster.factors(np.array([1, 1, 2]), np.full(3, np.datetime64(DAY))),
+            [0.1, 0.1, 0.5],
+        )
+
+
+class TestAdjustedTechnicalAnalytics(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(5)
+        prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (40, 2)), axis=0))
+        prices[20:, 0] /= 2  # a 2-for-1 split, not yet recorded
+        self.prices = FakePrices({1: prices[:, 0], 2: prices[:, 1]})
+        self.actions = FakeActions()
+        self.analytics = TechnicalAnalytics(AnalyticsSettings(sma_windows=(5,)))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def make_service(self):
+        adjuster = PriceAdjuster(self.actions)
+        return TechnicalAnalyticsService(
+            AdjustedPriceHistoryRepository(self.prices, adjuster),
+            Path(self.directory.name) / "technical.npz",
+            analytics=self.analytics,
+            adjuster=adjuster,
+            logger=MagicMock(),
+        )
+
+    def test_new_actions_recompute_only_the_affected_stocks(self):
+        before = self.make_service().get_analytics()
+        self.assertLess(before.column(1)["drawdown"][20], -0.4)
+        stock_2 = before.column(2)["sma_5"].copy()
+
+        self.actions.actions.append(action(1, 1, SPLIT, 20, ratio=2.0))
+        after = self.make_service().get_analytics()
+
+        adjuster = PriceAdjuster(self.actions)
+        adjuster.refresh()
+        expected = self.analytics.compute(
+            PriceMatrix.from_points(adjuster.adjust(self.prices.load_price_points()))
+        )
+        self.assertEqual(after.adjusted_through, 1)
+        for name, values in expected.metrics.items():
+            np.testing.assert_allclose(after.metrics[name], values, err_msg=name)
+        self.assertGreater(after.column(1)["drawdown"][20], -0.2)
+        np.testing.assert_allclose(after.column(2)["sma_5"], stock_2)
+
+
+class TestSqlalchemyCorporateActionRepository(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.connector = UrlConnector(f"sqlite:///{self.directory.name}/actions.db")
+        seed_dataset(self.connector, DatasetScale("tiny", 1, 1, 2, 3))
+        self.repository = SqlalchemyCorporateActionRepository(
+            connector=self.connector, logger=MagicMock()
+        )
+
+    def tearDown(self):
+        self.connector.dispose()
+        self.directory.cleanup()
+
+    def test_actions_carry_the_last_price_before_the_ex_date(self):
+        ex_date = FIRST_DAY.date() + datetime.timedelta(days=2)
+        self.repository.add_action(1, SPLIT, ex_date, ratio=4.0)
+        dividend = self.repository.add_action(2, DIVIDEND, ex_date, amount=0.5)
+
+        prices = SqlalchemyPriceHistoryRepository(
+            connector=self.connector, logger=MagicMock()
+        ).load_price_points(stock_ids=[2])
+        split, stored = self.repository.load_actions()
+        self.assertEqual((split.ratio, split.amount), (4.0, None))
+        self.assertAlmostEqual(stored.reference_price, prices.prices[1], places=4)
+        self.assertEqual(stored.reference_price, dividend.reference_price)
+        self.assertEqual(self.repository.load_actions(after_id=dividend.id), [])
+        self.assertEqual(
+            [a.id for a in self.repository.load_actions(stock_ids=[2])], [dividend.id]
+        )
+
+    def test_dividends_keep_the_reference_price_they_were_added_with(self):
+        ex_date = FIRST_DAY.date() + datetime.timedelta(days=2)
+        dividend = self.repository.add_action(2, DIVIDEND, ex_date, amount=0.5)
+        # A correction to the reference price arriving later must not change
+        # a factor that caches keyed on the action id already used.
+        with self.connector.engine.begin() as connection:
+            connection.execute(
+                update(StockPriceHistory)
+                .where(StockPriceHistory.stock_id == 2)
+                .values(price=StockPriceHistory.price * 2)
+            )
+
+        (stored,) = self.repository.load_actions(stock_ids=[2])
+        self.assertEqual(stored.reference_price, dividend.reference_price)
+
+    def test_invalid_actions_are_rejected(self):
+        tomorrow = datetime.date.today() + datetime.timedelta(days=2)
+        with self.assertRaises(ValueError):
+            self.repository.add_action(1, SPLIT, tomorrow, ratio=2.0)
+        with self.assertRaises(ValueError):
+            self.repository.add_action(1, SPLIT, FIRST_DAY.date())
+        with self.assertRaises(ValueError):
+            self.repository.add_action(1, "merger", FIRST_DAY.date(), ratio=1.0)
+        # No price before the first day to measure a dividend against.
+        with self.assertRaises(ValueError):
+            self.repository.add_action(1, DIVIDEND, FIRST_DAY.date(), amount=0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+import datetime
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+import numpy as np
+from components.analytics.correlation_engine import CorrelationEngine
+from components.analytics.correlation_service import CorrelationService
+from components.analytics.price_matrix import PriceMatrix
+from components.market_data.interfaces.price_history_repository import PricePoints
+
+
+def make_matrix(days=120, stocks=7, seed=11):
+    rng = np.random.default_rng(seed)
+    common = rng.normal(0, 0.01, (days, 1))
+    returns = common + rng.normal(0, 0.01, (days, stocks))
+    values = 100 * np.exp(np.cumsum(returns, axis=0))
+    values[30:40, 2] = np.nan
+    return PriceMatrix(
+        dates=np.arange(days).astype("datetime64[D]"),
+        stock_ids=np.arange(10, 10 + stocks, dtype=np.int64),
+        values=values,
+    )
+
+
+def to_points(matrix):
+    rows, cols = np.nonzero(~np.isnan(matrix.values))
+    return PricePoints(
+        stock_ids=matrix.stock_ids[cols],
+        recorded_at=matrix.dates[rows].astype("datetime64[us]"),
+        prices=matrix.values[rows, cols],
+    )
+
+
+class TestCorrelationEngine(unittest.TestCase):
+    def test_blocked_result_matches_unblocked(self):
+        matrix = make_matrix()
+        blocked = CorrelationEngine(block_size=3, shrinkage=None).compute(matrix)
+        single = CorrelationEngine(block_size=100, shrinkage=None).compute(matrix)
+
+        np.testing.assert_allclose(blocked.values, single.values)
+        np.testing.assert_allclose(blocked.values, blocked.values.T)
+        np.testing.assert_array_equal(np.diag(blocked.values), 1.0)
+
+    def test_matches_pearson_without_gaps(self):
+        matrix = make_matrix()
+        matrix.values[30:40, 2] = 100.0
+        returns = np.diff(np.log(matrix.values), axis=0)
+
+        result = CorrelationEngine(block_size=2, shrinkage=None).compute(matrix)
+
+        np.testing.assert_allclose(
+            result.values, np.corrcoef(returns.T), rtol=1e-5, atol=1e-6
+        )
+
+    def test_fixed_shrinkage_pulls_towards_identity(self):
+        matrix = make_matrix()
+        raw = CorrelationEngine(shrinkage=None).compute(matrix)
+
+        shrunk = CorrelationEngine(shrinkage=0.5).compute(matrix)
+
+        off_diagonal = ~np.eye(7, dtype=bool)
+        np.testing.assert_allclose(
+            shrunk.values[off_diagonal], raw.values[off_diagonal] * 0.5, rtol=1e-6
+        )
+        np.testing.assert_array_equal(np.diag(shrunk.values), 1.0)
+
+    def test_ledoit_wolf_intensity_is_a_fraction(self):
+        matrix = make_matrix(days=30, stocks=40)
+
+        result = CorrelationEngine().compute(matrix)
+
+        self.assertGreater(result.shrinkage, 0.0)
+        self.assertLess(result.shrinkage, 1.0)
+
+    def test_insufficient_overlap_is_nan(self):
+        matrix = make_matrix()
+        matrix.values[:110, 4] = np.nan
+
+        result = CorrelationEngine(min_overlap=20).compute(matrix)
+
+        self.assertTrue(np.isnan(result.pair(10, 14)))
+        self.assertTrue(np.isnan(result.pair(14, 14)))
+
+    def test_cross_matches_full_matrix(self):
+        matrix = make_matrix()
+        engine = CorrelationEngine()
+
+        full = engine.compute(matrix)
+        cross = engine.cross(matrix, [10, 11], [11, 12, 13])
+
+        np.testing.assert_allclose(
+            cross, full.values[np.ix_([0, 1], [1, 2, 3])], rtol=1e-6
+        )
+
+    def test_max_abs_correlation_and_unknown_ids(self):
+        result = CorrelationEngine().compute(make_matrix())
+
+        np.testing.assert_allclose(
+            result.max_abs_correlation([10, 11], [12]),
+            [max(abs(result.pair(10, 12)), abs(result.pair(11, 12)))],
+        )
+        with self.assertRaises(ValueError):
+            result.pair(10, 99)
+
+
+class TestCorrelationService(unittest.TestCase):
+    def test_sector_filter_and_cache(self):
+        matrix = make_matrix()
+        price_repository = MagicMock()
+        price_repository.load_price_points.return_value = to_points(matrix)
+        stock_repository = MagicMock()
+        stock_repository.list_stock_ids.return_value = matrix.stock_ids.tolist()
+        start = datetime.datetime(2024, 1, 1)
+        end = datetime.datetime(2024, 6, 1)
+
+        with tempfile.TemporaryDirectory() as directory:
+            service = CorrelationService(
+                price_repository,
+                stock_repository,
+                Path(directory),
+                logger=MagicMock(),
+            )
+            first = service.get_correlation(start, end, sectors=["Energy"])
+            second = service.get_correlation(start, end, sectors=["Energy"])
+            np.testing.assert_array_equal(first.values, second.values)
+            self.assertIsInstance(second.values, np.memmap)
+
+        stock_repository.list_stock_ids.assert_called_with(
+            sectors=["Energy"], industries=None
+        )
+        price_repository.load_price_points.assert_called_once()
+
+    def test_price_changes_invalidate_cached_matrices(self):
+        matrix = make_matrix()
+        price_repository = MagicMock()
+        price_repository.load_price_points.return_value = to_points(matrix)
+        version_repository = MagicMock()
+        version_repository.data_versions.return_value = {"stock_price_history": "7:0"}
+        start = datetime.datetime(2024, 1, 1)
+        end = datetime.datetime(2024, 6, 1)
+        stock_ids = matrix.stock_ids.tolist()
+
+        with tempfile.TemporaryDirectory() as directory:
+            service = CorrelationService(
+                price_repository,
+                MagicMock(),
+                Path(directory),
+                version_repository=version_repository,
+                logger=MagicMock(),
+            )
+            service.get_correlation(start, end, stock_ids)
+            service.get_correlation(start, end, stock_ids)
+            self.assertEqual(price_repository.load_price_points.call_count, 1)
+
+            # A corrected price bumps the table's version.
+            version_repository.data_versions.return_value = {
+                "stock_price_history": "7:1"
+            }
+            service.get_correlation(start, end, stock_ids)
+            self.assertEqual(price_repository.load_price_points.call_count, 2)
@@ -0,0 +1,124 @@
+import importlib.util
+import tempfile
+import unittest
+from pathlib import Path
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+import sqlalchemy as sa
+from components.database.data_migration import batched_update, bulk_seed
+from components.database.models import Base, DataMigrationProgress, Industry, Sector
+
+VERSIONS_DIR = Path(__file__).resolve().parents[3] / "src" / "alembic" / "versions"
+
+prices = sa.table(
+    "prices",
+    sa.column("id", sa.Integer),
+    sa.column("price", sa.Numeric),
+    sa.column("adjusted", sa.Numeric),
+)
+
+
+class TestDataMigration(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.engine = sa.create_engine(f"sqlite:///{self.directory.name}/test.db")
+        Base.metadata.create_all(self.engine)
+        with self.engine.begin() as connection:
+            connection.execute(
+                sa.text(
+                    "CREATE TABLE prices (id INTEGER PRIMARY KEY, price NUMERIC, adjusted NUMERIC)"
+                )
+            )
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.directory.cleanup()
+
+    def _migrate(self, action):
+        with self.engine.connect() as connection:
+            with Operations.context(MigrationContext.configure(connection)):
+                result = action()
+            connection.commit()
+        return result
+
+    def _adjusted(self):
+        with self.engine.connect() as connection:
+            return dict(
+                connection.execute(sa.select(prices.c.id, prices.c.adjusted)).all()
+            )
+
+    def test_bulk_seed_and_chunked_backfill(self):
+        written = self._migrate(
+            lambda: bulk_seed(
+                prices, ({"id": i, "price": i} for i in range(1, 26)), chunk_size=10
+            )
+        )
+        updated = self._migrate(
+            lambda: batched_update(
+                "double_prices",
+                prices,
+                {"adjusted": prices.c.price * 2},
+                where=prices.c.price > 3,
+                batch_size=7,
+            )
+        )
+
+        self.assertEqual(written, 25)
+        self.assertEqual(updated, 22)
+        adjusted = self._adjusted()
+        self.assertIsNone(adjusted[3])
+        self.assertEqual(adjusted[25], 50)
+        with self.engine.connect() as connection:
+            self.assertEqual(
+                connection.execute(
+                    sa.select(sa.func.count()).select_from(DataMigrationProgress)
+                ).scalar(),
+                0,
+            )
+
+    def test_backfill_resumes_after_last_committed_chunk(self):
+        self._migrate(
+            lambda: bulk_seed(prices, ({"id": i, "price": i} for i in range(1, 11)))
+        )
+        with self.engine.begin() as connection:
+            connection.execute(
+                sa.insert(DataMigrationProgress).values(name="double_prices", last_id=6)
+            )
+
+        updated = self._migrate(
+            lambda: batched_update(
+                "double_prices", prices, {"adjusted": prices.c.price * 2}, batch_size=3
+            )
+        )
+
+        self.assertEqual(updated, 4)
+        self.assertIsNone(self._adjusted()[6])
+        self.assertEqual(self._adjusted()[7], 14)
+
+    def test_initial_seeding_uses_bulk_inserts(self):
+        spec = importlib.util.spec_from_file_location(
+            "initial_seeding", VERSIONS_DIR / "107bf1a9e7c7_initial_seeding.py"
+        )
+        seeding = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(seeding)
+
+        self._migrate(seeding.upgrade)
+
+        with self.engine.connect() as connection:
+            sectors = connection.execute(
+                sa.select(sa.func.count()).select_from(Sector)
+            ).scalar()
+            energy = (
+                connection.execute(
+                    sa.select(Industry.name)
+                    .join(Sector, Industry.sector_id == Sector.id)
+                    .where(Sector.name == "Energy")
+                    .order_by(Industry.name)
+                )
+                .scalars()
+                .all()
+            )
+        self.assertEqual(sectors, 11)
+        self.assertEqual(
+            energy, ["Energy Equipment & Services", "Oil, Gas & Consumable Fuels"]
+        )
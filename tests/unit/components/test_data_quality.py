@@ -0,0 +1,259 @@
+import datetime
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+import numpy as np
+from sqlalchemy import insert
+from components.analytics.price_matrix import PriceMatrix
+from components.benchmark.repository_benchmark import DatasetScale, seed_dataset
+from components.database.models import (
+    DataSource,
+    FinancialMetric,
+    MetricName,
+    StockData,
+    StockPriceHistory,
+)
+from components.database.url_connector import UrlConnector
+from components.market_data.interfaces.fundamentals_repository import MetricPoints
+from components.market_data.interfaces.price_history_repository import PricePoints
+from components.market_data.sqlAlchemy_fundamentals_repository import (
+    SqlalchemyFundamentalsRepository,
+)
+from components.market_data.sqlAlchemy_price_history_repository import (
+    SqlalchemyPriceHistoryRepository,
+)
+from components.market_data.sqlAlchemy_stock_repository import (
+    SqlalchemyStockRepository,
+)
+from components.metrics.metrics_registry import MetricsRegistry
+from components.quality.data_quality_service import DataQualityService
+from components.quality.interfaces.data_quality_repository import (
+    DISAGREEMENT,
+    GAP,
+    METRIC_OUTLIER,
+    OUTLIER,
+    STALE,
+    SourceQuotes,
+)
+from components.quality.quality_checks import (
+    QualitySettings,
+    disagreement_findings,
+    metric_findings,
+    price_findings,
+    trading_days,
+)
+from components.quality.sqlAlchemy_data_quality_repository import (
+    SqlalchemyDataQualityRepository,
+)
+from components.scheduler.market_hours import MarketHours
+
+START = datetime.date(2024, 1, 1)
+END = datetime.date(2024, 3, 29)
+HOURS = MarketHours(
+    holidays=frozenset({datetime.date(2024, 1, 1), datetime.date(2024, 1, 15)})
+)
+DAYS = trading_days(HOURS, START, END)
+
+
+def price_series(stocks: int, seed: int = 7) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (len(DAYS), stocks)), axis=0))
+
+
+def to_points(values: np.ndarray) -> PricePoints:
+    rows, columns = np.nonzero(~np.isnan(values))
+    return PricePoints(
+        stock_ids=columns.astype(np.int64) + 1,
+        recorded_at=(DAYS[rows] + np.timedelta64(20, "h")).astype("datetime64[us]"),
+        prices=values[rows, columns],
+    )
+
+
+def summary(findings):
+    return sorted((f.stock_id, f.check, f.day, f.value) for f in findings)
+
+
+class TestQualityChecks(unittest.TestCase):
+    def test_trading_days_skip_weekends_and_holidays(self):
+        self.assertEqual(DAYS[0], np.datetime64("2024-01-02"))
+        self.assertNotIn(np.datetime64("2024-01-15"), DAYS)
+        self.assertEqual(len(DAYS), 63)
+
+    def test_price_findings(self):
+        values = price_series(5)
+        values[40, 0] *= 10  # a bad tick, reverted the next day
+        values[20:24, 1] = np.nan  # four missing trading days
+        values[-12:, 2] = values[-13, 2]  # thirteen days without a change
+        values[-6:, 3] = np.nan  # no price in the last six days
+        values[:, 4] = np.nan  # never priced: not a series to check
+
+        findings = price_findings(
+            PriceMatrix.from_points(to_points(values)),
+            DAYS,
+            np.arange(1, 6),
+            START,
+            QualitySettings(),
+        )
+
+        def day(row):
+            return DAYS[row].astype(datetime.date)
+
+        outliers = [f for f in findings if f.check == OUTLIER]
+        self.assertEqual(
+            [(f.stock_id, f.day) for f in outliers], [(1, day(40)), (1, day(41))]
+        )
+        self.assertGreater(outliers[0].value, 10)
+        self.assertLess(outliers[1].value, -10)
+        self.assertEqual(
+            summary(f for f in findings if f.check != OUTLIER),
+            [
+                (2, GAP, day(24), 4.0),
+                (3, STALE, day(62), 13.0),
+                (4, STALE, day(62), 6.0),
+            ],
+        )
+        gap = next(f for f in findings if f.check == GAP)
+        self.assertEqual(gap.detail, {"from": day(20).isoformat()})
+
+        # Only what falls on or after `since` is reported.
+        later = price_findings(
+            PriceMatrix.from_points(to_points(values)),
+            DAYS,
+            np.arange(1, 6),
+            day(42),
+            QualitySettings(),
+        )
+        self.assertEqual({f.check for f in later}, {STALE})
+
+    def test_disagreement_findings(self):
+        day = np.datetime64("2024-03-28T20:00", "us")
+        quotes = SourceQuotes(
+            stock_ids=np.array([1, 1, 1, 2, 2, 1]),
+            source_ids=np.array([1, 2, 3, 1, 2, 1]),
+            recorded_at=np.array([day] * 5 + [day - np.timedelta64(1, "D")]),
+            prices=np.array([100.0, 110.0, 100.5, 100.0, 101.0, 50.0]),
+        )
+
+        (finding,) = disagreement_findings(
+            quotes, datetime.date(2024, 3, 27), QualitySettings()
+        )
+
+        self.assertEqual(
+            (finding.stock_id, finding.check, finding.day, finding.value),
+            (1, DISAGREEMENT, datetime.date(2024, 3, 28), 0.0995),
+        )
+        self.assertEqual(finding.detail["low_source_id"], 1)
+        self.assertEqual(finding.detail["high_source_id"], 2)
+
+    def test_metric_findings_use_the_latest_values(self):
+        rng = np.random.default_rng(3)
+        values = rng.lognormal(np.log(15), 0.3, 40)
+        values[7] = 15000.0
+        recorded_at = np.full(40, np.datetime64("2024-03-01", "us"))
+        points = MetricPoints(
+            # Stock 1's absurd value was corrected later on.
+            stock_ids=np.r_[np.arange(1, 41), 1],
+            metric_ids=np.ones(41, dtype=np.int64),
+            recorded_at=np.r_[recorded_at, np.datetime64("2024-03-02", "us")],
+            values=np.r_[np.r_[99999.0, values[1:]], 15.0],
+            metric_names={1: "PE Ratio"},
+        )
+
+        (finding,) = metric_findings(points, QualitySettings())
+
+        self.assertEqual((finding.stock_id, finding.check), (8, METRIC_OUTLIER))
+        self.assertEqual(finding.detail, {"metric": "PE Ratio", "value": 15000.0})
+
+
+class TestDataQualityService(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.connector = UrlConnector(f"sqlite:///{self.directory.name}/quality.db")
+        # One seeded price per stock in 2015, long before the checked window.
+        seed_dataset(self.connector, DatasetScale("tiny", 1, 1, 3, 1))
+        values = price_series(3)
+        values[50, 0] *= 10
+        values[-6:, 2] = np.nan
+        points = to_points(values)
+        recorded_at = points.recorded_at.astype(datetime.datetime)
+        with self.connector.engine.begin() as connection:
+            connection.execute(
+                insert(StockPriceHistory),
+                [
+                    {"stock_id": int(s), "price": float(p), "date_recorded": r}
+                    for s, p, r in zip(points.stock_ids, points.prices, recorded_at)
+                ],
+            )
+            connection.execute(insert(DataSource), [{"id": 2, "name": "Other"}])
+            connection.execute(
+                insert(StockData),
+                [
+                    {
+                        "stock_id": 2,
+                        "source_id": source_id,
+                        "date_recorded": datetime.datetime(2024, 3, 28, 20),
+                        "data": {"price": price, "volume": 1000},
+                    }
+                    for source_id, price in ((1, 100.0), (2, 90.0))
+                ],
+            )
+            connection.execute(insert(MetricName), [{"id": 1, "name": "PE Ratio"}])
+            connection.execute(
+                insert(FinancialMetric),
+                [
+                    {
+                        "stock_id": stock_id,
+                        "metric_name_id": 1,
+                        "metric_value": value,
+                        "date_recorded": datetime.datetime(2024, 3, 1),
+                    }
+                    for stock_id, value in ((1, 15.0), (2, 16.0), (3, 14.0))
+                ],
+            )
+        logger = MagicMock()
+        self.repository = SqlalchemyDataQualityRepository(
+            connector=self.connector, logger=logger
+        )
+        self.service = DataQualityService(
+            SqlalchemyPriceHistoryRepository(connector=self.connector, logger=logger),
+            SqlalchemyFundamentalsRepository(connector=self.connector, logger=logger),
+            self.repository,
+            SqlalchemyStockRepository(connector=self.connector, logger=logger),
+            market_hours=HOURS,
+            chunk_stocks=2,
+            logger=logger,
+            metrics=MetricsRegistry(),
+        )
+
+    def tearDown(self):
+        self.connector.dispose()
+        self.directory.cleanup()
+
+    def test_run_stores_findings_and_rechecks_replace_them(self):
+        counts = self.service.run(since=START, as_of=END)
+
+        self.assertEqual(
+            counts,
+            {GAP: 0, OUTLIER: 2, STALE: 1, DISAGREEMENT: 1, METRIC_OUTLIER: 0},
+        )
+        stored = self.repository.list_findings()
+        self.assertEqual(len(stored), 4)
+        self.assertEqual(
+            {(f.stock_id, f.check) for f in stored},
+            {(1, OUTLIER), (3, STALE), (2, DISAGREEMENT)},
+        )
+
+        # A batch re-check over the last week replaces only what it covers.
+        self.assertEqual(
+            self.service.check_stocks([2, 3], as_of=END),
+            {GAP: 0, OUTLIER: 0, STALE: 1, DISAGREEMENT: 1},
+        )
+        self.assertEqual(len(self.repository.list_findings()), 4)
+        self.assertEqual(
+            [f.value for f in self.repository.list_findings(check=DISAGREEMENT)],
+            [0.1053],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import datetime
+import decimal
+import unittest
+import numpy as np
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import Session
+from components.database.fast_reads import (
+    as_float64,
+    epoch_microseconds,
+    fetch_columns,
+)
+from components.database.models import Base, DividendYield
+
+
+class TestFastReads(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        self.session.execute(
+            insert(DividendYield),
+            [
+                {
+                    "stock_id": 7,
+                    "yield_value": decimal.Decimal("2.4512"),
+                    "date_recorded": datetime.datetime(2024, 3, 1, 21, 0, 0, 250000),
+                },
+                {
+                    "stock_id": 9,
+                    "yield_value": decimal.Decimal("0.0001"),
+                    "date_recorded": datetime.datetime(1970, 1, 1),
+                },
+            ],
+        )
+        self.statement = select(
+            DividendYield.stock_id,
+            epoch_microseconds(DividendYield.date_recorded),
+            as_float64(DividendYield.yield_value),
+        ).order_by(DividendYield.stock_id)
+        self.dtypes = (np.int64, "datetime64[us]", np.float64)
+
+    def tearDown(self):
+        self.session.close()
+
+    def test_fetches_typed_arrays(self):
+        stock_ids, recorded_at, values = fetch_columns(
+            self.session, self.statement, self.dtypes
+        )
+
+        np.testing.assert_array_equal(stock_ids, [7, 9])
+        self.assertEqual(stock_ids.dtype, np.int64)
+        np.testing.assert_array_equal(
+            recorded_at,
+            np.array(["2024-03-01T21:00:00.250", "1970-01-01"], dtype="datetime64[us]"),
+        )
+        np.testing.assert_array_equal(values, [2.4512, 0.0001])
+
+    def test_empty_result_keeps_dtypes(self):
+        columns = fetch_columns(
+            self.session, self.statement.where(DividendYield.stock_id < 0), self.dtypes
+        )
+
+        self.assertEqual([len(column) for column in columns], [0, 0, 0])
+        self.assertEqual(columns[1].dtype, np.dtype("datetime64[us]"))
+
+    def test_mysql_compiles_to_double_and_epoch(self):
+        sql = str(self.statement.compile(dialect=mysql.dialect()))
+
+        self.assertIn(
+            "TIMESTAMPDIFF(MICROSECOND, '1970-01-01 00:00:00', dividend_yields.date_recorded)",
+            sql,
+        )
+        self.assertIn("dividend_yields.yield_value + 0E0", sql)
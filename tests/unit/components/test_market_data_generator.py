@@ -0,0 +1,108 @@
+from logging import Logger as StandardLogger
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from sqlalchemy import func, insert, select
+from components.benchmark.market_data_generator import (
+    GeneratorSettings,
+    MarketDataGenerator,
+)
+from components.database.models import (
+    Base,
+    DividendYield,
+    FinancialMetric,
+    Industry,
+    MetricName,
+    Sector,
+    Stock,
+    StockData,
+    StockPriceHistory,
+)
+from components.database.url_connector import UrlConnector
+
+
+class TestMarketDataGenerator(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.settings = GeneratorSettings(
+            stocks=30, days=130, stock_data_every_days=10, chunk_rows=500
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _database(self, name):
+        connector = UrlConnector(f"sqlite:///{self.directory.name}/{name}.db")
+        Base.metadata.create_all(connector.engine)
+        with connector.engine.begin() as connection:
+            connection.execute(insert(Sector), [{"id": 1, "name": "Energy"}])
+            connection.execute(
+                insert(Industry),
+                [
+                    {"id": 1, "name": "Oil", "sector_id": 1},
+                    {"id": 2, "name": "Gas", "sector_id": 1},
+                ],
+            )
+            connection.execute(
+                insert(MetricName), [{"name": "PE Ratio"}, {"name": "EPS"}]
+            )
+        return connector
+
+    def _generate(self, name, seed=7):
+        connector = self._database(name)
+        counts = MarketDataGenerator(
+            connector, self.settings, seed=seed, logger=MagicMock(spec=StandardLogger)
+        ).generate()
+        with connector.engine.connect() as connection:
+            prices = connection.execute(
+                select(StockPriceHistory.stock_id, StockPriceHistory.price).order_by(
+                    StockPriceHistory.id
+                )
+            ).all()
+            totals = {
+                model.__tablename__: connection.execute(
+                    select(func.count()).select_from(model)
+                ).scalar()
+                for model in (
+                    Stock,
+                    StockPriceHistory,
+                    StockData,
+                    DividendYield,
+                    FinancialMetric,
+                )
+            }
+            negative = connection.execute(
+                select(func.count())
+                .select_from(FinancialMetric)
+                .where(FinancialMetric.metric_value < 0)
+            ).scalar()
+        connector.dispose()
+        return counts, prices, totals, negative
+
+    def test_fills_every_table_with_the_reported_counts(self):
+        counts, _, totals, negative = self._generate("a")
+
+        self.assertEqual(counts, totals)
+        self.assertEqual(counts["stocks"], 30)
+        self.assertEqual(counts["stock_price_history"], 30 * 130)
+        self.assertEqual(counts["stock_data"], 30 * 13)
+        self.assertEqual(counts["financial_metrics"], 2 * 30 * 3)
+        self.assertEqual(negative, 0)
+
+    def test_same_seed_reproduces_the_same_rows(self):
+        _, first, _, _ = self._generate("a")
+        _, second, _, _ = self._generate("b")
+        _, other, _, _ = self._generate("c", seed=8)
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+
+    def test_requires_the_industry_taxonomy(self):
+        connector = UrlConnector(f"sqlite:///{self.directory.name}/empty.db")
+        Base.metadata.create_all(connector.engine)
+
+        with self.assertRaises(ValueError):
+            MarketDataGenerator(
+                connector, self.settings, logger=MagicMock(spec=StandardLogger)
+            ).generate()
+        connector.dispose()
@@ -0,0 +1,84 @@
+import tempfile
+import unittest
+import urllib.request
+from pathlib import Path
+from unittest.mock import MagicMock
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+from components.metrics.database_metrics import collect_pool_state, instrument_engine
+from components.metrics.metrics_exporter import MetricsExporter
+from components.metrics.metrics_registry import MetricsRegistry
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_render_counter_gauge_and_histogram(self):
+        self.registry.counter("jobs", "Jobs run.", ("kind",)).inc(2, kind='a"b')
+        self.registry.gauge("lag_seconds", "Lag.").set(1.5)
+        histogram = self.registry.histogram("latency", "Latency.", buckets=(0.1, 1))
+        for value in (0.05, 0.5, 5):
+            histogram.observe(value)
+
+        lines = self.registry.render().splitlines()
+
+        self.assertIn("# TYPE jobs_total counter", lines)
+        self.assertIn('jobs_total{kind="a\\"b"} 2', lines)
+        self.assertIn("# TYPE lag_seconds gauge", lines)
+        self.assertIn("lag_seconds 1.5", lines)
+        self.assertIn('latency_bucket{le="0.1"} 1', lines)
+        self.assertIn('latency_bucket{le="1"} 2', lines)
+        self.assertIn('latency_bucket{le="+Inf"} 3', lines)
+        self.assertIn("latency_sum 5.55", lines)
+        self.assertIn("latency_count 3", lines)
+
+    def test_rejects_wrong_labels_and_type_clashes(self):
+        counter = self.registry.counter("jobs", "Jobs run.", ("kind",))
+        with self.assertRaises(ValueError):
+            counter.inc(source="x")
+        with self.assertRaises(ValueError):
+            counter.inc(-1, kind="a")
+        with self.assertRaises(ValueError):
+            self.registry.gauge("jobs", "Jobs run.")
+        self.assertIs(self.registry.counter("jobs", "Jobs run.", ("kind",)), counter)
+
+    def test_pool_collector_reports_checkouts_and_saturation(self):
+        engine = create_engine(
+            "sqlite://", poolclass=QueuePool, pool_size=1, max_overflow=1
+        )
+        instrument_engine(engine, self.registry)
+        with engine.connect() as first, engine.connect() as second:
+            first.execute(text("SELECT 1"))
+            second.execute(text("SELECT 1"))
+            collect_pool_state(self.registry)
+            lines = self.registry.render().splitlines()
+        engine.dispose()
+
+        self.assertIn('moneymonkey_db_pool_checkouts_total{pool="sqlite"} 2', lines)
+        self.assertIn('moneymonkey_db_pool_checked_out{pool="sqlite"} 2', lines)
+        self.assertIn('moneymonkey_db_pool_overflow{pool="sqlite"} 1', lines)
+        self.assertIn('moneymonkey_db_pool_saturation{pool="sqlite"} 1', lines)
+
+    def test_exporter_serves_http_and_writes_textfile(self):
+        self.registry.gauge("up", "Process is up.").set(1)
+        with tempfile.TemporaryDirectory() as directory:
+            textfile = Path(directory) / "moneymonkey.prom"
+            exporter = MetricsExporter(
+                self.registry,
+                http_port=0,
+                textfile=textfile,
+                textfile_interval=60,
+                logger=MagicMock(),
+            )
+            exporter.start()
+            try:
+                host, port = exporter.address
+                with urllib.request.urlopen(f"http://{host}:{port}/metrics") as reply:
+                    body = reply.read().decode()
+            finally:
+                exporter.stop()
+
+            self.assertIn("up 1", body.splitlines())
+            self.assertEqual(textfile.read_text(), self.registry.render())
+            self.assertEqual(list(Path(directory).iterdir()), [textfile])
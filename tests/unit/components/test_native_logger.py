@@ -0,0 +1,71 @@
+import logging
+from logging.handlers import QueueHandler
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from components.logger.native_logger import NativeLogger
+from components.logger.queue_logging import BatchedRotatingFileHandler
+
+
+class TestNativeLoggerQueueMode(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.log_file = Path(self.directory.name) / "test.log"
+        self.logger = logging.getLogger(f"moneymonkey.test.{self.id()}")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.DEBUG)
+        handler = logging.FileHandler(self.log_file, "a")
+        handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+        self.logger.addHandler(handler)
+
+    def tearDown(self):
+        NativeLogger.shutdown()
+        self.logger.handlers = []
+        self.directory.cleanup()
+
+    def test_records_are_written_by_background_thread(self):
+        writer_threads = set()
+        original_emit = BatchedRotatingFileHandler.emit
+
+        def recording_emit(handler, record):
+            writer_threads.add(threading.current_thread().name)
+            original_emit(handler, record)
+
+        NativeLogger.enable_queue_mode(self.logger, batch_size=10)
+        self.assertIsInstance(self.logger.handlers[0], QueueHandler)
+        BatchedRotatingFileHandler.emit = recording_emit
+        try:
+            for number in range(25):
+                self.logger.error(f"failure {number}")
+            NativeLogger.shutdown()
+        finally:
+            BatchedRotatingFileHandler.emit = original_emit
+
+        lines = self.log_file.read_text().splitlines()
+        self.assertEqual(len(lines), 25)
+        self.assertEqual(lines[0], "ERROR failure 0")
+        self.assertNotIn(threading.current_thread().name, writer_threads)
+
+    def test_size_based_rotation(self):
+        NativeLogger.enable_queue_mode(
+            self.logger, batch_size=5, max_bytes=200, backup_count=2
+        )
+
+        for number in range(50):
+            self.logger.info(f"message number {number:04d}")
+        NativeLogger.shutdown()
+
+        rotated = sorted(path.name for path in self.log_file.parent.iterdir())
+        self.assertEqual(rotated, ["test.log", "test.log.1", "test.log.2"])
+        self.assertIn("message number 0049", self.log_file.read_text())
+
+    def test_handler_levels_are_respected(self):
+        self.logger.handlers[0].setLevel(logging.ERROR)
+        NativeLogger.enable_queue_mode(self.logger)
+
+        self.logger.info("ignored")
+        self.logger.error("kept")
+        NativeLogger.shutdown()
+
+        self.assertEqual(self.log_file.read_text().splitlines(), ["ERROR kept"])
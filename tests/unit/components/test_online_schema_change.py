@@ -0,0 +1,137 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import pymysql
+import sqlalchemy as sa
+from components.database import online_schema_change
+from components.database.migration import Migration
+from components.database.online_schema_change import ShadowTableCopy, online_alter
+from injector import get_config
+
+
+def unsupported(code):
+    return sa.exc.OperationalError("ALTER", {}, Exception(code, "not supported"))
+
+
+class TestOnlineAlter(unittest.TestCase):
+    def _op(self, dialect="mysql"):
+        op = MagicMock()
+        op.get_bind.return_value.dialect.name = dialect
+        return op
+
+    def test_prefers_instant_then_inplace(self):
+        op = self._op()
+        op.execute.side_effect = [unsupported(1845), None]
+        with patch.object(online_schema_change, "op", op):
+            algorithm = online_alter("stock_data", "ADD INDEX ix (source_id)")
+
+        self.assertEqual(algorithm, "inplace")
+        self.assertEqual(
+            op.execute.call_args.args[0],
+            "ALTER TABLE stock_data ADD INDEX ix (source_id), ALGORITHM=INPLACE, LOCK=NONE",
+        )
+
+    @patch.object(online_schema_change, "ShadowTableCopy")
+    def test_falls_back_to_shadow_copy(self, shadow_copy):
+        op = self._op()
+        op.execute.side_effect = [unsupported(1846), unsupported(1846)]
+        with patch.object(online_schema_change, "op", op):
+            algorithm = online_alter("stock_data", "MODIFY data JSON NULL")
+
+        self.assertEqual(algorithm, "copy")
+        shadow_copy.return_value.run.assert_called_once()
+
+    def test_other_errors_are_raised(self):
+        op = self._op()
+        op.execute.side_effect = unsupported(1062)
+        with patch.object(online_schema_change, "op", op):
+            with self.assertRaises(sa.exc.OperationalError):
+                online_alter("stock_data", "ADD UNIQUE INDEX ix (stock_id)")
+
+    def test_shadow_copy_statements(self):
+        copy = ShadowTableCopy(MagicMock(), "stock_data", "ADD COLUMN x INT")
+
+        triggers = copy.trigger_statements(["id", "price"])
+
+        self.assertEqual(
+            copy.copy_statement(["id", "price"]),
+            "INSERT IGNORE INTO _stock_data_new (id, price) SELECT id, price "
+            "FROM stock_data WHERE id BETWEEN :low AND :high",
+        )
+        self.assertIn(
+            "REPLACE INTO _stock_data_new (id, price) VALUES (NEW.id, NEW.price)",
+            triggers[1],
+        )
+        self.assertTrue(
+            triggers[2].endswith("DELETE FROM _stock_data_new WHERE id = OLD.id")
+        )
+
+
+class TestOnlineMigrationPlanning(unittest.TestCase):
+    def setUp(self):
+        Migration._up_to_date = False
+
+    def tearDown(self):
+        Migration._up_to_date = False
+
+    def _migration(self, current_version, price_rows=0):
+        connection = MagicMock()
+        cursor = connection.cursor.return_value.__enter__.return_value
+        version = {"version_num": current_version}
+        large = {1: 1} if price_rows > Migration.inline_online_max_rows else None
+
+        def fetchone():
+            query = cursor.execute.call_args.args[0]
+            return large if "OFFSET" in query else version
+
+        cursor.fetchone.side_effect = fetchone
+        return Migration(config=get_config(), connection=connection)
+
+    @patch("components.database.migration.command.upgrade")
+    def test_startup_runs_online_revisions_on_small_tables(self, upgrade):
+        self._migration("bee261ae4173", price_rows=5000).check_and_apply_migrations()
+
+        self.assertEqual(upgrade.call_args.args[1], "head")
+
+        # The outcome is kept for the process; reruns do not check again.
+        self._migration("bee261ae4173").check_and_apply_migrations()
+        upgrade.assert_called_once()
+
+    @patch("components.database.migration.command.upgrade")
+    def test_startup_refuses_to_half_migrate_large_tables(self, upgrade):
+        migration = self._migration("bee261ae4173", price_rows=10**7)
+        with self.assertRaises(RuntimeError) as raised:
+            migration.check_and_apply_migrations()
+
+        self.assertIn("2b9b27c0e09f", str(raised.exception))
+        upgrade.assert_not_called()
+
+        # Once `migrate --online` has run elsewhere, the next call goes ahead
+        # without a restart.
+        self._migration(
+            get_config().latest_migration_version
+        ).check_and_apply_migrations()
+        upgrade.assert_not_called()
+        self.assertTrue(Migration._up_to_date)
+
+    def test_only_a_missing_table_counts_as_small(self):
+        revision = MagicMock()
+        revision.module.online_table = "stock_price_history"
+        migration = self._migration("bee261ae4173")
+        cursor = migration.connection.cursor.return_value.__enter__.return_value
+
+        cursor.execute.side_effect = pymysql.err.ProgrammingError(
+            1146, "Table 'moneymonkey.stock_price_history' doesn't exist"
+        )
+        self.assertTrue(migration.is_small_online(revision))
+
+        cursor.execute.side_effect = pymysql.err.OperationalError(
+            2013, "Lost connection to MySQL server during query"
+        )
+        with self.assertRaises(pymysql.err.OperationalError):
+            migration.is_small_online(revision)
+
+    @patch("components.database.migration.command.upgrade")
+    def test_online_flag_applies_everything(self, upgrade):
+        self._migration("bbb8be49cad2").check_and_apply_migrations(include_online=True)
+
+        self.assertEqual(upgrade.call_args.args[1], "head")
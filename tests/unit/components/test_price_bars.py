@@ -0,0 +1,197 @@
+import datetime
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+import numpy as np
+from sqlalchemy import delete, insert
+from components.analytics.price_bar_service import PriceBarService
+from components.analytics.price_bars import PriceBars, lttb, period_start, rollup
+from components.benchmark.repository_benchmark import DatasetScale, seed_dataset
+from components.database.models import PriceBar, StockPriceHistory
+from components.database.url_connector import UrlConnector
+from components.market_data.interfaces.price_history_repository import PricePoints
+from components.market_data.sqlAlchemy_price_bar_repository import (
+    SqlalchemyPriceBarRepository,
+)
+from components.market_data.sqlAlchemy_price_history_repository import (
+    SqlalchemyPriceHistoryRepository,
+)
+from components.market_data.sqlAlchemy_stock_repository import (
+    SqlalchemyStockRepository,
+)
+
+
+class TestPriceBars(unittest.TestCase):
+    def test_ticks_roll_up_into_ohlc_bars(self):
+        points = PricePoints(
+            stock_ids=np.array([1, 1, 1, 2, 1]),
+            recorded_at=np.array(
+                [
+                    "2024-01-01T15:00",
+                    "2024-01-01T09:00",
+                    "2024-01-01T12:00",
+                    "2024-01-01T10:00",
+                    "2024-01-03T10:00",
+                ],
+                dtype="datetime64[us]",
+            ),
+            prices=np.array([11.0, 10.0, 13.0, 50.0, 9.0]),
+        )
+
+        daily = PriceBars.from_points(points)
+        weekly = rollup(daily, "week")
+
+        np.testing.assert_array_equal(daily.stock_ids, [1, 1, 2])
+        np.testing.assert_array_equal(daily.open, [10.0, 9.0, 50.0])
+        np.testing.assert_array_equal(daily.high, [13.0, 9.0, 50.0])
+        np.testing.assert_array_equal(daily.close, [11.0, 9.0, 50.0])
+        np.testing.assert_array_equal(weekly.open, [10.0, 50.0])
+        np.testing.assert_array_equal(weekly.low, [9.0, 50.0])
+        np.testing.assert_array_equal(weekly.close, [9.0, 50.0])
+        np.testing.assert_array_equal(weekly.points, [4, 1])
+
+    def test_periods_start_on_monday_and_first_of_month(self):
+        days = np.array(
+            ["2024-01-01", "2024-01-07", "2024-02-29"], dtype="datetime64[D]"
+        )
+
+        np.testing.assert_array_equal(
+            period_start(days, "week"),
+            np.array(["2024-01-01", "2024-01-01", "2024-02-26"], dtype="datetime64[D]"),
+        )
+        np.testing.assert_array_equal(
+            period_start(days, "month"),
+            np.array(["2024-01-01", "2024-01-01", "2024-02-01"], dtype="datetime64[D]"),
+        )
+
+    def test_lttb_keeps_end_points_and_spikes(self):
+        x = np.arange(1000)
+        y = np.sin(x / 50.0)
+        y[500] = 10.0
+
+        selected = lttb(x, y, 50)
+
+        self.assertEqual(len(selected), 50)
+        self.assertEqual((selected[0], selected[-1]), (0, 999))
+        self.assertIn(500, selected)
+        self.assertTrue(np.all(np.diff(selected) > 0))
+
+
+class TestPriceBarService(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.connector = UrlConnector(f"sqlite:///{self.directory.name}/bars.db")
+        # Four stocks with one price a day for 40 days from Monday 2015-01-05.
+        seed_dataset(self.connector, DatasetScale("tiny", 2, 1, 4, 40))
+        logger = MagicMock()
+        self.bars = SqlalchemyPriceBarRepository(
+            connector=self.connector, logger=logger
+        )
+        self.service = PriceBarService(
+            SqlalchemyPriceHistoryRepository(connector=self.connector, logger=logger),
+            self.bars,
+            SqlalchemyStockRepository(connector=self.connector, logger=logger),
+            chunk_stocks=3,
+        )
+
+    def tearDown(self):
+        self.connector.dispose()
+        self.directory.cleanup()
+
+    def _add_prices(self, day, price):
+        with self.connector.engine.begin() as connection:
+            connection.execute(
+                insert(StockPriceHistory),
+                [
+                    {
+                        "stock_id": stock_id,
+                        "price": price,
+                        "date_recorded": datetime.datetime(2015, 1, 5, 21)
+                        + datetime.timedelta(days=day),
+                    }
+                    for stock_id in range(1, 5)
+                ],
+            )
+
+    def _snapshot(self):
+        return {
+            resolution: self.bars.load_bars(resolution)
+            for resolution in ("day", "week", "month")
+        }
+
+    def test_incremental_refresh_matches_a_full_rebuild(self):
+        written = self.service.refresh()
+        self.assertEqual(written, {"day": 160, "week": 24, "month": 8})
+
+        self._add_prices(45, 500.0)
+        self._add_prices(39, 1.0)
+        written = self.service.refresh()
+        incremental = self._snapshot()
+
+        # Only the last stored day onwards is rebuilt: days 39 and 45, the
+        # two weeks and the month they fall in.
+        self.assertEqual(written, {"day": 8, "week": 8, "month": 4})
+        with self.connector.engine.begin() as connection:
+            connection.execute(delete(PriceBar))
+        self.service.refresh()
+        full = self._snapshot()
+        for resolution in full:
+            for name in (
+                "stock_ids",
+                "period_start",
+                "open",
+                "high",
+                "low",
+                "close",
+                "points",
+            ):
+                np.testing.assert_array_equal(
+                    getattr(incremental[resolution], name),
+                    getattr(full[resolution], name),
+                )
+        self.assertEqual(incremental["week"].high.max(), 500.0)
+        self.assertEqual(incremental["day"].low.min(), 1.0)
+
+    def test_stocks_behind_are_read_from_their_own_latest_bar(self):
+        self.service.refresh()
+        # Stock 1 lost its daily bars after its first week.
+        with self.connector.engine.begin() as connection:
+            connection.execute(
+                delete(PriceBar).where(
+                    PriceBar.stock_id == 1,
+                    PriceBar.resolution == "day",
+                    PriceBar.period_start >= datetime.date(2015, 1, 12),
+                )
+            )
+        behind = self.bars.latest_periods("day", [1])[1]
+        reads = MagicMock(wraps=self.service.price_repository.load_price_points)
+        self.service.price_repository.load_price_points = reads
+
+        self.service.refresh()
+
+        starts = {
+            tuple(call.kwargs["stock_ids"]): call.kwargs["start"].date()
+            for call in reads.call_args_list
+        }
+        last = datetime.date(2015, 2, 13)
+        self.assertEqual(starts, {(1,): behind, (2, 3): last, (4,): last})
+        self.assertEqual(self.bars.latest_periods("day", [1, 2]), {1: last, 2: last})
+
+    def test_chart_series_stays_within_max_points(self):
+        self.service.refresh()
+
+        daily = self.service.chart_series(1, max_points=100)
+        weekly = self.service.chart_series(1, max_points=10)
+        downsampled = self.service.chart_series(1, max_points=3)
+        window = self.service.chart_series(
+            1, start=datetime.date(2015, 1, 12), end=datetime.date(2015, 1, 19)
+        )
+
+        self.assertEqual((daily.resolution, len(daily)), ("day", 40))
+        self.assertEqual((weekly.resolution, len(weekly)), ("week", 6))
+        self.assertEqual((downsampled.resolution, len(downsampled)), ("month", 2))
+        self.assertEqual((window.resolution, len(window)), ("day", 7))
+
+
+if __name__ == "__main__":
+    unittest.main()
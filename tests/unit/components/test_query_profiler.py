@@ -0,0 +1,104 @@
+import unittest
+from unittest.mock import MagicMock
+from logging import Logger as StandardLogger
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from components.admin.sqlAlchemy_admin_repository import SqlalchemyAdminRepository
+from components.database.models import Base
+from components.database.query_profiler import (
+    LATENCY_BUCKETS_MS,
+    QueryProfiler,
+    QueryStats,
+    normalize_statement,
+)
+from components.market_data.sqlAlchemy_price_history_repository import (
+    SqlalchemyPriceHistoryRepository,
+)
+
+
+class TestQueryProfiler(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.mock_logger = MagicMock(spec=StandardLogger)
+        self.profiler = QueryProfiler(slow_query_ms=10_000, logger=self.mock_logger)
+        self.profiler.attach(self.engine)
+        connector = MagicMock()
+        connector.get_session.return_value = sessionmaker(bind=self.engine)()
+        self.repository = SqlalchemyAdminRepository(
+            connector=connector, logger=MagicMock(spec=StandardLogger)
+        )
+
+    def test_records_calling_repository_method(self):
+        self.repository.create_sector("Energy")
+        self.repository.list_sectors()
+        self.repository.list_sectors()
+
+        callers = {
+            caller: stats.count
+            for (caller, _), stats in self.profiler.snapshot().items()
+        }
+
+        self.assertEqual(callers["SqlalchemyAdminRepository.list_sectors"], 2)
+        self.assertEqual(callers["SqlalchemyAdminRepository.sector_exists"], 1)
+        self.assertIn("SqlalchemyAdminRepository.create_sector", callers)
+        self.mock_logger.warning.assert_not_called()
+
+    def test_fast_reads_are_attributed_to_the_repository_method(self):
+        connector = MagicMock()
+        connector.get_session.return_value = sessionmaker(bind=self.engine)()
+        SqlalchemyPriceHistoryRepository(
+            connector=connector, logger=MagicMock(spec=StandardLogger)
+        ).load_price_points()
+
+        callers = {caller for caller, _ in self.profiler.snapshot()}
+
+        self.assertEqual(
+            callers, {"SqlalchemyPriceHistoryRepository.load_price_points"}
+        )
+
+    def test_slow_queries_are_logged(self):
+        self.profiler.slow_query_ms = 0
+
+        self.repository.list_sectors()
+
+        message = self.mock_logger.warning.call_args[0][0]
+        self.assertIn("in SqlalchemyAdminRepository.list_sectors", message)
+        self.assertIn("SELECT sectors.name", message)
+
+    def test_attach_is_idempotent_and_detachable(self):
+        self.profiler.attach(self.engine)
+        self.repository.list_sectors()
+        self.assertEqual(sum(s.count for s in self.profiler.snapshot().values()), 1)
+
+        self.profiler.detach(self.engine)
+        self.profiler.reset()
+        self.repository.list_sectors()
+
+        self.assertEqual(self.profiler.snapshot(), {})
+
+    def test_failed_statements_do_not_leak_start_times(self):
+        with self.engine.connect() as connection:
+            for _ in range(3):
+                with self.assertRaises(Exception):
+                    connection.exec_driver_sql("SELECT * FROM missing_table")
+            connection.exec_driver_sql("SELECT 1")
+
+            self.assertEqual(connection.info["query_start"], [])
+
+    def test_histogram_buckets(self):
+        stats = QueryStats()
+        for elapsed in (0.5, 3, 3, 7000):
+            stats.record(elapsed, 1)
+
+        self.assertEqual(stats.buckets[0], 1)
+        self.assertEqual(stats.buckets[LATENCY_BUCKETS_MS.index(5)], 2)
+        self.assertEqual(stats.buckets[-1], 1)
+        self.assertEqual(stats.rows, 4)
+        self.assertEqual(stats.max_ms, 7000)
+
+    def test_normalize_statement_collapses_in_lists(self):
+        self.assertEqual(
+            normalize_statement("SELECT *\n  FROM t WHERE id IN (%s, %s, %s)"),
+            "SELECT * FROM t WHERE id IN (...)",
+        )
@@ -0,0 +1,162 @@
+import datetime
+import unittest
+from unittest.mock import MagicMock
+from logging import Logger as StandardLogger
+from components.scheduler.interfaces.fetcher import Fetcher
+from components.scheduler.interfaces.refresh_repository import StalenessRecord
+from components.scheduler.market_hours import MarketHours
+from components.scheduler.refresh_scheduler import (
+    RefreshBatch,
+    RefreshScheduler,
+    SourcePolicy,
+    SourceQuota,
+)
+
+UTC = datetime.timezone.utc
+# Wednesday 2024-11-13, 15:00 UTC == 10:00 in New York (market open).
+MARKET_OPEN = datetime.datetime(2024, 11, 13, 15, 0, tzinfo=UTC)
+# Wednesday 2024-11-13, 23:00 UTC == 18:00 in New York (after the close).
+AFTER_CLOSE = datetime.datetime(2024, 11, 13, 23, 0, tzinfo=UTC)
+
+
+def make_fetcher(name):
+    fetcher = MagicMock(spec=Fetcher)
+    fetcher.source_name = name
+    fetcher.fetch.return_value = 0
+    return fetcher
+
+
+class TestMarketHours(unittest.TestCase):
+    def test_is_open(self):
+        hours = MarketHours()
+        self.assertTrue(hours.is_open(MARKET_OPEN))
+        self.assertFalse(hours.is_open(AFTER_CLOSE))
+        saturday = datetime.datetime(2024, 11, 16, 15, 0, tzinfo=UTC)
+        self.assertFalse(hours.is_open(saturday))
+
+    def test_last_close_skips_weekend(self):
+        hours = MarketHours()
+        monday_morning = datetime.datetime(2024, 11, 18, 12, 0, tzinfo=UTC)
+        self.assertEqual(
+            hours.last_close(monday_morning),
+            datetime.datetime(2024, 11, 15, 21, 0, tzinfo=UTC),
+        )
+
+
+class TestSourceQuota(unittest.TestCase):
+    def test_window_expires(self):
+        quota = SourceQuota(10, datetime.timedelta(minutes=1))
+        quota.consume(MARKET_OPEN, 7)
+        self.assertEqual(quota.available(MARKET_OPEN), 3)
+        later = MARKET_OPEN + datetime.timedelta(minutes=1)
+        self.assertEqual(quota.available(later), 10)
+
+
+class TestRefreshScheduler(unittest.TestCase):
+    def setUp(self):
+        self.repository = MagicMock()
+        self.prices = make_fetcher("prices")
+        self.mock_logger = MagicMock(spec=StandardLogger)
+        self.scheduler = RefreshScheduler(
+            repository=self.repository,
+            fetchers=[self.prices],
+            default_policy=SourcePolicy(
+                max_age=datetime.timedelta(minutes=10), quota=100, batch_size=2
+            ),
+            logger=self.mock_logger,
+        )
+
+    def records(self, ages_in_minutes, now=MARKET_OPEN, source="prices"):
+        return [
+            StalenessRecord(
+                stock_id=stock_id,
+                source_id=1,
+                source_name=source,
+                last_refreshed=(
+                    None
+                    if age is None
+                    else (now - datetime.timedelta(minutes=age)).replace(tzinfo=None)
+                ),
+            )
+            for stock_id, age in ages_in_minutes.items()
+        ]
+
+    def test_plan_orders_by_staleness_and_skips_fresh(self):
+        self.repository.list_staleness.return_value = self.records(
+            {1: 5, 2: 30, 3: None, 4: 15}
+        )
+
+        batches = self.scheduler.plan(MARKET_OPEN)
+
+        self.assertEqual([b.stock_ids for b in batches], [(3, 2), (4,)])
+
+    def test_plan_applies_weights(self):
+        self.repository.list_staleness.return_value = self.records({1: 20, 2: 30})
+        self.scheduler.set_stock_weights({1: 3.0, 2: 1.0})
+
+        batches = self.scheduler.plan(MARKET_OPEN)
+
+        self.assertEqual(batches[0].stock_ids, (1, 2))
+
+    def test_plan_respects_quota(self):
+        self.scheduler.default_policy = SourcePolicy(
+            max_age=datetime.timedelta(minutes=10), quota=1
+        )
+        self.repository.list_staleness.return_value = self.records({1: 20, 2: 30})
+
+        batches = self.scheduler.plan(MARKET_OPEN)
+
+        self.assertEqual([b.stock_ids for b in batches], [(2,)])
+
+    def test_plan_ignores_sources_without_fetcher(self):
+        self.repository.list_staleness.return_value = self.records(
+            {1: 30}, source="news"
+        )
+
+        self.assertEqual(self.scheduler.plan(MARKET_OPEN), [])
+
+    def test_after_close_only_refreshes_missed_close(self):
+        self.repository.list_staleness.return_value = self.records(
+            {1: 60, 2: 360}, now=AFTER_CLOSE
+        )
+
+        batches = self.scheduler.plan(AFTER_CLOSE)
+
+        self.assertEqual([b.stock_ids for b in batches], [(2,)])
+
+    def test_run_once_dispatches_and_consumes_quota(self):
+        self.repository.list_staleness.return_value = self.records({1: 30, 2: 40})
+
+        dispatched = self.scheduler.run_once(MARKET_OPEN)
+
+        self.assertEqual(dispatched, 2)
+        self.prices.fetch.assert_called_once_with([2, 1])
+        self.assertEqual(self.scheduler.quota_for("prices").available(MARKET_OPEN), 98)
+        self.assertEqual(self.scheduler.run_once(MARKET_OPEN), 0)
+
+    def test_run_once_logs_fetcher_failure(self):
+        self.repository.list_staleness.return_value = self.records({1: 30})
+        self.prices.fetch.side_effect = Exception("API down")
+
+        dispatched = self.scheduler.run_once(MARKET_OPEN)
+
+        self.assertEqual(dispatched, 0)
+        self.mock_logger.error.assert_called_once_with(
+            "Failed to refresh 1 stocks from 'prices'. Error: API down"
+        )
+
+        self.prices.fetch.side_effect = None
+        self.assertEqual(self.scheduler.run_once(MARKET_OPEN), 1)
+
+    def test_listeners_run_after_stored_batches_only(self):
+        listener = MagicMock()
+        self.scheduler.listeners.append(listener)
+        self.repository.list_staleness.return_value = self.records({1: 30, 2: 40})
+        self.prices.fetch.side_effect = [0, Exception("API down")]
+        self.scheduler.default_policy = SourcePolicy(
+            max_age=datetime.timedelta(minutes=10), quota=100, batch_size=1
+        )
+
+        self.scheduler.run_once(MARKET_OPEN)
+
+        listener.assert_called_once_with(RefreshBatch("prices", (2,)))
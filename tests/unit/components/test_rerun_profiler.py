@@ -0,0 +1,63 @@
+import threading
+import unittest
+from itertools import count
+from components.database.query_profiler import QueryProfiler
+from components.profiling.rerun_profiler import RerunProfiler, RollingBaseline
+
+
+class TestRerunProfiler(unittest.TestCase):
+    def setUp(self):
+        RerunProfiler._baselines.clear()
+        self.query_profiler = QueryProfiler(capture_caller=False)
+        ticks = count()
+        # Every clock read advances 10 ms.
+        self.clock = lambda: next(ticks) / 100
+
+    def test_phases_split_query_time_from_other_work(self):
+        profiler = RerunProfiler("Admin", self.query_profiler, clock=self.clock)
+
+        with profiler.phase("construct"):
+            pass
+        with profiler.phase("render"):
+            self.query_profiler.record("x", "SELECT 1", 4.0, 1)
+            self.query_profiler.record("x", "SELECT 2", 2.0, 1)
+        report = profiler.finish()
+
+        construct, render = report.phases
+        self.assertEqual(construct.query_count, 0)
+        self.assertEqual(render.query_count, 2)
+        self.assertAlmostEqual(render.query_ms, 6.0)
+        self.assertAlmostEqual(render.other_ms, render.wall_ms - 6.0)
+        self.assertEqual(report.query_count, 2)
+        self.assertIsNone(report.baseline_ms)
+        self.assertFalse(report.regression)
+
+    def test_queries_from_other_threads_are_not_counted(self):
+        profiler = RerunProfiler("Admin", self.query_profiler, clock=self.clock)
+        other = threading.Thread(
+            target=self.query_profiler.record, args=("x", "SELECT 1", 5.0, 1)
+        )
+        other.start()
+        other.join()
+
+        self.assertEqual(profiler.finish().query_count, 0)
+
+    def test_rolling_baseline_flags_regressions(self):
+        baseline = RollingBaseline(window=10, min_samples=3, tolerance=1.5)
+        self.assertFalse(baseline.is_regression(1000))
+        for value in (100, 110, 90):
+            baseline.add(value)
+
+        self.assertEqual(baseline.median(), 100)
+        self.assertFalse(baseline.is_regression(140))
+        self.assertTrue(baseline.is_regression(160))
+
+    def test_finish_compares_against_previous_reruns(self):
+        RerunProfiler._baselines["Admin"] = RollingBaseline(min_samples=1)
+        RerunProfiler._baselines["Admin"].add(5.0)
+
+        report = RerunProfiler("Admin", self.query_profiler, clock=self.clock).finish()
+
+        self.assertEqual(report.baseline_ms, 5.0)
+        self.assertTrue(report.regression)
+        self.assertEqual(RerunProfiler.baseline_for("Admin").median(), 7.5)
@@ -0,0 +1,176 @@
+import datetime
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+from sqlalchemy import insert, update
+from components.benchmark.repository_benchmark import DatasetScale, seed_dataset
+from components.cache.result_cache import ResultCache
+from components.cache.sqlAlchemy_data_version_repository import (
+    SqlalchemyDataVersionRepository,
+)
+from components.database.models import StockPriceHistory
+from components.database.url_connector import UrlConnector
+from components.metrics.metrics_registry import MetricsRegistry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = f"{self.directory.name}/cache/results.sqlite3"
+        self.metrics = MetricsRegistry()
+        self.clock = FakeClock()
+        self.caches = []
+
+    def tearDown(self):
+        for cache in self.caches:
+            cache.close()
+        self.directory.cleanup()
+
+    def make_cache(self, **kwargs):
+        kwargs.setdefault("clock", self.clock)
+        cache = ResultCache(
+            self.path, logger=MagicMock(), metrics=self.metrics, **kwargs
+        )
+        self.caches.append(cache)
+        return cache
+
+    def requests(self, result):
+        return self.metrics.counter(
+            "moneymonkey_cache_requests", "", ("cache", "result")
+        ).value(cache="scores", result=result)
+
+    def test_results_are_keyed_by_parameters_and_versions(self):
+        cache = self.make_cache()
+        compute = MagicMock(side_effect=[{"a": 1}, {"a": 2}, {"a": 3}])
+
+        first = cache.get_or_compute("scores", {"days": 5}, compute, {"prices": "7"})
+        again = self.make_cache().get_or_compute(
+            "scores", {"days": 5}, compute, {"prices": "7"}
+        )
+        other_days = cache.get_or_compute(
+            "scores", {"days": 6}, compute, {"prices": "7"}
+        )
+        new_data = cache.get_or_compute("scores", {"days": 5}, compute, {"prices": "8"})
+
+        self.assertEqual((first, again), ({"a": 1}, {"a": 1}))
+        self.assertEqual((other_days, new_data), ({"a": 2}, {"a": 3}))
+        self.assertEqual((self.requests("hit"), self.requests("miss")), (1, 3))
+        self.assertIsNone(cache.get("scores", {"days": 7}))
+        self.assertEqual(cache.stats()[0], 3)
+
+    def test_evicts_least_recently_used_entries_over_the_size_limit(self):
+        cache = self.make_cache(max_bytes=2500, touch_seconds=0)
+        for name in ("a", "b", "c"):
+            self.clock.now += 1
+            cache.put(name, {}, b"x" * 1000)
+        self.assertIsNone(cache.get("a", {}))
+
+        self.clock.now += 1
+        cache.get("b", {})
+        self.clock.now += 1
+        cache.put("d", {}, b"x" * 1000)
+
+        self.assertIsNone(cache.get("c", {}))
+        self.assertIsNotNone(cache.get("b", {}))
+        self.assertEqual(
+            self.metrics.counter("moneymonkey_cache_evictions", "").value(), 2
+        )
+
+    def test_concurrent_callers_compute_once(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return len(calls)
+
+        # Separate caches have their own connections, as processes would.
+        caches = [self.make_cache(clock=time.time, poll_seconds=0.01) for _ in range(4)]
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda cache=cache: results.append(
+                    cache.get_or_compute("scores", {}, compute)
+                )
+            )
+            for cache in caches
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [1, 1, 1, 1])
+        self.assertEqual(len(calls), 1)
+
+    def test_failed_computation_releases_its_lease(self):
+        cache = self.make_cache()
+        with self.assertRaises(RuntimeError):
+            cache.get_or_compute("scores", {}, MagicMock(side_effect=RuntimeError))
+
+        self.assertEqual(self.make_cache().get_or_compute("scores", {}, lambda: 5), 5)
+
+    def test_expired_lease_is_taken_over(self):
+        self.make_cache(lease_seconds=30)._acquire("stuck")
+        self.clock.now += 31
+
+        self.assertTrue(self.make_cache()._acquire("stuck"))
+
+
+class TestSqlalchemyDataVersionRepository(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.connector = UrlConnector(f"sqlite:///{self.directory.name}/versions.db")
+        seed_dataset(self.connector, DatasetScale("tiny", 1, 1, 2, 3))
+        self.repository = SqlalchemyDataVersionRepository(
+            connector=self.connector, logger=MagicMock()
+        )
+
+    def tearDown(self):
+        self.connector.dispose()
+        self.directory.cleanup()
+
+    def test_versions_change_with_new_rows(self):
+        tables = ("stock_price_history", "stocks")
+        before = self.repository.data_versions(tables)
+        with self.connector.engine.begin() as connection:
+            connection.execute(
+                insert(StockPriceHistory),
+                [
+                    {
+                        "stock_id": 1,
+                        "price": 1.0,
+                        "date_recorded": datetime.datetime(2030, 1, 1),
+                    }
+                ],
+            )
+
+        after = self.repository.data_versions(tables)
+        with self.connector.engine.begin() as connection:
+            connection.execute(
+                update(StockPriceHistory)
+                .where(StockPriceHistory.id == 3)
+                .values(price=2.0)
+            )
+        corrected = self.repository.data_versions(tables)
+
+        self.assertEqual(before["stock_price_history"], "6:0")
+        self.assertEqual(after["stock_price_history"], "7:0")
+        self.assertEqual(corrected["stock_price_history"], "7:1")
+        self.assertEqual(before["stocks"], after["stocks"])
+        with self.assertRaises(ValueError):
+            self.repository.data_versions(["price_bars"])
+
+
+if __name__ == "__main__":
+    unittest.main()
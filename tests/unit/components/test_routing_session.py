@@ -0,0 +1,118 @@
+import datetime
+import unittest
+from logging import Logger as StandardLogger
+from unittest.mock import MagicMock
+import numpy as np
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+from components.admin.sqlAlchemy_admin_repository import SqlalchemyAdminRepository
+from components.database.models import Base, Sector, StockPriceHistory
+from components.database.routing_session import RoutingSession, reads_from_replica
+from components.market_data.sqlAlchemy_price_history_repository import (
+    SqlalchemyPriceHistoryRepository,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class RoutingConnector:
+    # Primary and replica are separate in-memory databases, so the rows a
+    # query returns show where it was routed.
+    def __init__(self, clock):
+        self.primary = create_engine("sqlite://")
+        self.replica = create_engine("sqlite://")
+        self.clock = clock
+        for engine, name in ((self.primary, "Primary"), (self.replica, "Replica")):
+            Base.metadata.create_all(engine)
+            with engine.begin() as connection:
+                connection.execute(insert(Sector), [{"name": name}])
+
+    def get_session(self):
+        return RoutingSession(
+            self.primary,
+            lambda: self.replica,
+            sticky_seconds=5.0,
+            clock=self.clock,
+        )
+
+
+class TestRoutingSession(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.connector = RoutingConnector(self.clock)
+        self.repository = SqlalchemyAdminRepository(
+            connector=self.connector, logger=MagicMock(spec=StandardLogger)
+        )
+
+    def test_reads_go_to_primary_unless_marked(self):
+        self.assertTrue(self.repository.sector_exists("Primary"))
+        self.assertEqual(self.repository.list_sectors(), ["Replica"])
+
+    def test_commit_pins_reads_to_primary_until_sticky_window_ends(self):
+        self.repository.create_sector("Energy")
+
+        self.assertEqual(sorted(self.repository.list_sectors()), ["Energy", "Primary"])
+        self.clock.now = 4.9
+        self.assertIn("Energy", self.repository.list_sectors())
+
+        self.clock.now = 5.1
+        self.repository.session.commit()
+        self.assertEqual(self.repository.list_sectors(), ["Replica"])
+
+    def test_pending_writes_pin_reads_to_primary(self):
+        session = self.repository.session
+        session.add(Sector(name="Energy"))
+        session.flush()
+
+        self.assertIn("Energy", self.repository.list_sectors())
+
+        session.rollback()
+        self.assertEqual(self.repository.list_sectors(), ["Replica"])
+
+    def test_core_dml_counts_as_a_write(self):
+        session = self.repository.session
+        session.execute(insert(Sector), [{"name": "Energy"}])
+        session.commit()
+
+        self.assertIn("Energy", self.repository.list_sectors())
+
+    def test_fetch_columns_follows_replica_routing(self):
+        with self.connector.replica.begin() as connection:
+            connection.execute(
+                insert(StockPriceHistory),
+                [
+                    {
+                        "stock_id": 1,
+                        "price": 10,
+                        "date_recorded": datetime.datetime(2024, 1, 2),
+                    }
+                ],
+            )
+        repository = SqlalchemyPriceHistoryRepository(
+            connector=self.connector, logger=MagicMock(spec=StandardLogger)
+        )
+
+        points = repository.load_price_points()
+
+        np.testing.assert_array_equal(points.prices, [10.0])
+
+    def test_plain_sessions_are_left_alone(self):
+        class PlainRepository:
+            def __init__(self, session):
+                self.session = session
+
+            @reads_from_replica
+            def count(self):
+                return self.session.query(Sector).count()
+
+        self.assertEqual(PlainRepository(Session(self.connector.primary)).count(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+from sqlalchemy import delete, insert, update
+from components.benchmark.repository_benchmark import DatasetScale, seed_dataset
+from components.database.models import Stock
+from components.database.url_connector import UrlConnector
+from components.market_data.interfaces.stock_repository import StockName
+from components.market_data.sqlAlchemy_stock_repository import (
+    SqlalchemyStockRepository,
+)
+from components.search.stock_search_index import StockSearchIndex
+from components.search.stock_search_service import StockSearchService
+
+STOCKS = [
+    StockName(1, "AAPL", "Apple Inc."),
+    StockName(2, "AMZN", "Amazon.com, Inc."),
+    StockName(3, "MSFT", "Microsoft Corporation"),
+    StockName(4, "AA", "Alcoa Corporation"),
+    StockName(5, "BRK.B", "Berkshire Hathaway Inc."),
+]
+
+
+def _tickers(matches):
+    return [match.ticker for match in matches]
+
+
+class TestStockSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = StockSearchIndex.build(STOCKS, max_segments=2)
+
+    def test_exact_and_prefix_tickers_rank_first(self):
+        self.assertEqual(_tickers(self.index.search("aapl"))[0], "AAPL")
+        self.assertEqual(_tickers(self.index.search("aa", limit=2)), ["AA", "AAPL"])
+        self.assertEqual(_tickers(self.index.search("brk b", limit=1)), ["BRK.B"])
+
+    def test_names_match_partial_words_and_typos(self):
+        self.assertEqual(_tickers(self.index.search("micro", limit=1)), ["MSFT"])
+        self.assertEqual(_tickers(self.index.search("amazn", limit=1)), ["AMZN"])
+        self.assertEqual(
+            _tickers(self.index.search("berkshir hathway", limit=1)), ["BRK.B"]
+        )
+        self.assertEqual(self.index.search("zzzz"), [])
+        self.assertEqual(self.index.search("  "), [])
+
+    def test_updates_renames_and_removals(self):
+        self.assertEqual(
+            self.index.upsert([StockName(3, "MSFT", "Microsoft Corporation")]), 0
+        )
+        self.assertEqual(len(self.index.segments), 1)
+
+        self.index.upsert([StockName(3, "MSFT", "Macrohard Holdings")])
+        self.assertEqual(len(self.index.segments), 2)
+        # A third segment exceeds max_segments and merges everything.
+        self.index.upsert([StockName(6, "NVDA", "NVIDIA Corporation")])
+        self.assertEqual(len(self.index.segments), 1)
+        self.index.remove([4])
+
+        self.assertEqual(len(self.index), 5)
+        self.assertEqual(_tickers(self.index.search("macrohard", limit=1)), ["MSFT"])
+        self.assertNotIn("MSFT", _tickers(self.index.search("microsoft")))
+        self.assertEqual(_tickers(self.index.search("nvidia", limit=1)), ["NVDA"])
+        self.assertNotIn("AA", _tickers(self.index.search("alcoa")))
+        self.assertEqual([entry.id for entry in self.index.entries()], [1, 2, 3, 5, 6])
+
+    def test_common_grams_only_count_for_rarer_matches(self):
+        expected = self.index.search("microsoft corporation", limit=1)
+        # With a cutoff of one row, every gram shared by two names is common.
+        with patch("components.search.stock_search_index.COMMON_GRAM_ROWS", 1):
+            index = StockSearchIndex.build(STOCKS)
+            self.assertEqual(index.search("microsoft corporation", limit=1), expected)
+            self.assertEqual(len(index.search("corporation")), 1)
+
+    def test_saved_index_is_memory_mapped_back(self):
+        self.index.meta["max_id"] = 5
+        with tempfile.TemporaryDirectory() as directory:
+            self.index.save(f"{directory}/search")
+            loaded = StockSearchIndex.load(f"{directory}/search")
+
+            self.assertEqual(loaded.meta, {"max_id": 5})
+            self.assertEqual(loaded.entries(), self.index.entries())
+            self.assertEqual(loaded.search("amazon"), self.index.search("amazon"))
+
+
+class TestStockSearchService(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.connector = UrlConnector(f"sqlite:///{self.directory.name}/search.db")
+        seed_dataset(self.connector, DatasetScale("tiny", 1, 1, 20, 1))
+
+    def tearDown(self):
+        self.connector.dispose()
+        self.directory.cleanup()
+
+    def _service(self):
+        return StockSearchService(
+            SqlalchemyStockRepository(connector=self.connector, logger=MagicMock()),
+            f"{self.directory.name}/index",
+            logger=MagicMock(),
+        )
+
+    def test_refresh_picks_up_new_renamed_and_deleted_stocks(self):
+        service = self._service()
+        self.assertEqual(_tickers(service.search("T00012", limit=1)), ["T00012"])
+        self.assertEqual(service.refresh(), 0)
+
+        with self.connector.engine.begin() as connection:
+            connection.execute(
+                update(Stock).where(Stock.id == 3).values(company_name="Acme Rockets")
+            )
+            connection.execute(
+                insert(Stock),
+                [
+                    {
+                        "id": 21,
+                        "ticker": "NEW",
+                        "company_name": "Newcomer Ltd",
+                        "industry_id": 1,
+                        "price": 1.0,
+                    }
+                ],
+            )
+        self.assertEqual(service.refresh(), 2)
+        self.assertEqual(_tickers(service.search("acme rockets", limit=1)), ["T00003"])
+        self.assertEqual(_tickers(service.search("newcomer", limit=1)), ["NEW"])
+
+        with self.connector.engine.begin() as connection:
+            connection.execute(delete(Stock).where(Stock.id == 21))
+        service.refresh()
+        self.assertEqual(service.search("newcomer"), [])
+
+        # A new process maps the saved index and catches up from its watermark.
+        self.assertEqual(
+            _tickers(self._service().search("acme rockets", limit=1)), ["T00003"]
+        )
+        self.assertEqual(len(self._service().index), 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
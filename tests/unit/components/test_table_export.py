@@ -0,0 +1,86 @@
+import csv
+import datetime
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+from components.benchmark.repository_benchmark import DatasetScale, seed_dataset
+from components.database.url_connector import UrlConnector
+from components.export.table_export import ExportFilter, TableExporter
+
+
+class TestTableExporter(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.connector = UrlConnector(f"sqlite:///{cls.directory.name}/export.db")
+        # Two sectors, four stocks (T00001..T00004), ten days of prices.
+        seed_dataset(cls.connector, DatasetScale("tiny", 2, 1, 4, 10))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.connector.dispose()
+        cls.directory.cleanup()
+
+    def setUp(self):
+        self.exporter = TableExporter(
+            self.connector,
+            Path(self.directory.name) / "exports",
+            chunk_rows=3,
+            logger=MagicMock(),
+        )
+
+    def test_chunks_are_bounded_and_ordered(self):
+        chunks = list(self.exporter.iter_chunks("prices"))
+
+        self.assertEqual(sum(len(chunk) for chunk in chunks), 40)
+        self.assertTrue(all(len(chunk) <= 3 for chunk in chunks))
+        rows = [row for chunk in chunks for row in chunk]
+        self.assertEqual([row[0] for row in rows[:10]], ["T00001"] * 10)
+        self.assertEqual(rows, sorted(rows, key=lambda row: (row[0], row[1])))
+
+    def test_csv_export_applies_ticker_sector_and_date_filters(self):
+        filters = ExportFilter(
+            tickers=["T00001", "T00002", "T00003"],
+            sectors=["Sector 1"],
+            start=datetime.datetime(2015, 1, 7),
+            end=datetime.datetime(2015, 1, 10),
+        )
+
+        summary = self.exporter.export("prices", "csv", filters)
+
+        with open(summary.path, newline="") as stream:
+            rows = list(csv.reader(stream))
+        self.assertEqual(rows[0], ["ticker", "date_recorded", "price"])
+        # Stocks alternate between the two industries, so Sector 1 holds the
+        # odd tickers; T00001 and T00003 over three days remain.
+        self.assertEqual({row[0] for row in rows[1:]}, {"T00001", "T00003"})
+        self.assertEqual(summary.rows, 6)
+        self.assertEqual(len(rows), 7)
+        self.assertEqual(list(summary.path.parent.glob("*.part")), [])
+
+    def test_jsonl_export_writes_one_object_per_row(self):
+        stream = io.BytesIO()
+
+        summary = self.exporter.write(
+            stream, "prices", "jsonl", ExportFilter(tickers=["T00004"])
+        )
+
+        lines = stream.getvalue().decode().splitlines()
+        self.assertEqual(summary.rows, 10)
+        first = json.loads(lines[0])
+        self.assertEqual(first["ticker"], "T00004")
+        self.assertEqual(first["date_recorded"], "2015-01-05T21:00:00")
+        self.assertIsInstance(first["price"], float)
+
+    def test_rejects_unknown_dataset_and_format(self):
+        with self.assertRaises(ValueError):
+            self.exporter.write(io.BytesIO(), "prices", "xlsx")
+        with self.assertRaises(ValueError):
+            list(self.exporter.iter_chunks("orders"))
+
+
+if __name__ == "__main__":
+    unittest.main()
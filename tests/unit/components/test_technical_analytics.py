@@ -0,0 +1,238 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+import numpy as np
+from components.analytics.price_matrix import PriceMatrix
+from components.analytics.technical_analytics import (
+    AnalyticsResult,
+    AnalyticsSettings,
+    TechnicalAnalytics,
+    drawdown,
+    forward_fill,
+    log_returns,
+    rolling_mean,
+    rolling_std,
+)
+from components.analytics.technical_analytics_service import (
+    TechnicalAnalyticsService,
+)
+from components.cache.result_cache import ResultCache
+from components.market_data.interfaces.price_history_repository import PricePoints
+
+nan = np.nan
+
+
+def make_points(prices_by_stock, start="2024-01-01"):
+    stock_ids, recorded_at, prices = [], [], []
+    first_day = np.datetime64(start, "D")
+    for stock_id, prices_for_stock in prices_by_stock.items():
+        for offset, price in enumerate(prices_for_stock):
+            if np.isnan(price):
+                continue
+            stock_ids.append(stock_id)
+            recorded_at.append(first_day + offset)
+            prices.append(price)
+    return PricePoints(
+        stock_ids=np.array(stock_ids, dtype=np.int64),
+        recorded_at=np.array(recorded_at, dtype="datetime64[us]"),
+        prices=np.array(prices, dtype=np.float64),
+    )
+
+
+class TestKernels(unittest.TestCase):
+    def test_forward_fill_with_limit(self):
+        values = np.array([[1.0], [nan], [nan], [nan], [5.0]])
+
+        filled = forward_fill(values, limit=2)
+
+        np.testing.assert_array_equal(filled[:, 0], [1.0, 1.0, 1.0, nan, 5.0])
+
+    def test_log_returns_span_gaps(self):
+        values = np.array([[100.0], [nan], [110.0], [121.0]])
+
+        returns = log_returns(values)
+
+        np.testing.assert_allclose(returns[:, 0], [nan, nan, np.log(1.1), np.log(1.1)])
+
+    def test_rolling_mean_and_std_match_naive(self):
+        rng = np.random.default_rng(7)
+        values = rng.normal(size=(40, 3))
+        values[5, 1] = nan
+
+        means = rolling_mean(values, 10, min_periods=5)
+        stds = rolling_std(values, 10, min_periods=5)
+
+        for row in range(40):
+            window = values[max(row - 9, 0) : row + 1]
+            for col in range(3):
+                sample = window[:, col][~np.isnan(window[:, col])]
+                if len(sample) < 5:
+                    self.assertTrue(np.isnan(means[row, col]))
+                    continue
+                self.assertAlmostEqual(means[row, col], sample.mean())
+                self.assertAlmostEqual(stds[row, col], sample.std(ddof=1))
+
+    def test_drawdown(self):
+        values = np.array([[100.0], [120.0], [90.0], [nan], [130.0]])
+
+        result = drawdown(values)
+
+        np.testing.assert_allclose(result[:, 0], [0.0, 0.0, -0.25, -0.25, 0.0])
+
+
+class TestPriceMatrix(unittest.TestCase):
+    def test_from_points_keeps_last_tick_of_day(self):
+        points = PricePoints(
+            stock_ids=np.array([2, 1, 1]),
+            recorded_at=np.array(
+                ["2024-01-02T16:00", "2024-01-01T10:00", "2024-01-01T09:00"],
+                dtype="datetime64[us]",
+            ),
+            prices=np.array([20.0, 11.0, 10.0]),
+        )
+
+        matrix = PriceMatrix.from_points(points)
+
+        np.testing.assert_array_equal(matrix.stock_ids, [1, 2])
+        np.testing.assert_array_equal(matrix.values, [[11.0, nan], [nan, 20.0]])
+
+    def test_merge_overlays_newer_values(self):
+        older = PriceMatrix.from_points(make_points({1: [1.0, 2.0]}))
+        newer = PriceMatrix.from_points(
+            make_points({1: [3.0, 4.0], 2: [5.0, 6.0]}, start="2024-01-02")
+        )
+
+        merged = older.merge(newer)
+
+        np.testing.assert_array_equal(
+            merged.values, [[1.0, nan], [3.0, 5.0], [4.0, 6.0]]
+        )
+
+
+class TestTechnicalAnalytics(unittest.TestCase):
+    def setUp(self):
+        self.analytics = TechnicalAnalytics(
+            AnalyticsSettings(
+                sma_windows=(3, 5),
+                volatility_window=4,
+                momentum_lookback=6,
+                momentum_skip=1,
+                fill_limit=2,
+            )
+        )
+        rng = np.random.default_rng(3)
+        self.prices = {
+            stock_id: list(100 * np.exp(np.cumsum(rng.normal(0, 0.02, 60))))
+            for stock_id in (1, 2, 3)
+        }
+        self.prices[2][10:13] = [nan, nan, nan]
+
+    def assert_results_equal(self, first, second):
+        np.testing.assert_array_equal(first.dates, second.dates)
+        np.testing.assert_array_equal(first.stock_ids, second.stock_ids)
+        self.assertEqual(first.metrics.keys(), second.metrics.keys())
+        for name in first.metrics:
+            np.testing.assert_allclose(
+                first.metrics[name], second.metrics[name], err_msg=name
+            )
+
+    def test_compute_shapes(self):
+        matrix = PriceMatrix.from_points(make_points(self.prices))
+
+        result = self.analytics.compute(matrix)
+
+        self.assertEqual(
+            set(result.metrics),
+            {
+                "return_1d",
+                "sma_3",
+                "sma_5",
+                "volatility_4",
+                "drawdown",
+                "max_drawdown",
+                "momentum_6",
+            },
+        )
+        for values in result.metrics.values():
+            self.assertEqual(values.shape, (60, 3))
+
+    def test_extend_matches_full_recompute(self):
+        head = {stock_id: prices[:40] for stock_id, prices in self.prices.items()}
+        # The last cached day is delivered again, as the service does.
+        rest = {stock_id: prices[39:] for stock_id, prices in self.prices.items()}
+        rest[4] = [50.0] * 21
+
+        partial = self.analytics.compute(PriceMatrix.from_points(make_points(head)))
+        extended = self.analytics.extend(
+            partial, PriceMatrix.from_points(make_points(rest, start="2024-02-09"))
+        )
+        expected = self.analytics.compute(
+            PriceMatrix.from_points(
+                make_points({**self.prices, 4: [nan] * 39 + [50.0] * 21})
+            )
+        )
+
+        self.assert_results_equal(extended, expected)
+
+    def test_save_and_load_round_trip(self):
+        result = self.analytics.compute(
+            PriceMatrix.from_points(make_points(self.prices))
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "technical.npz"
+            result.save(path)
+            loaded = AnalyticsResult.load(path)
+
+        self.assert_results_equal(result, loaded)
+        np.testing.assert_array_equal(loaded.tail.values, result.tail.values)
+
+
+class TestTechnicalAnalyticsService(unittest.TestCase):
+    def test_extends_cached_result_with_new_prices_only(self):
+        repository = MagicMock()
+        repository.load_price_points.side_effect = [
+            make_points({1: [10.0, 11.0, 12.0]}),
+            make_points({1: [12.0, 13.0]}, start="2024-01-03"),
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "technical.npz"
+            service = TechnicalAnalyticsService(repository, path, logger=MagicMock())
+            service.get_analytics()
+            service._result = None
+            result = service.get_analytics()
+
+        self.assertEqual(len(result.dates), 4)
+        self.assertEqual(
+            repository.load_price_points.call_args_list[1].kwargs["start"].day, 3
+        )
+
+    def test_processes_share_one_refresh_per_data_version(self):
+        repository = MagicMock()
+        repository.load_price_points.side_effect = [
+            make_points({1: [10.0, 11.0, 12.0]}),
+            make_points({1: [12.0, 13.0]}, start="2024-01-03"),
+        ]
+        versions = MagicMock()
+        versions.data_versions.return_value = {"stock_price_history": "3:0"}
+        with tempfile.TemporaryDirectory() as directory:
+
+            def make_service():
+                # Each service stands in for a process with its own cache handle.
+                cache = ResultCache(Path(directory) / "results.sqlite3")
+                self.addCleanup(cache.close)
+                return TechnicalAnalyticsService(
+                    repository,
+                    Path(directory) / "technical.npz",
+                    result_cache=cache,
+                    version_repository=versions,
+                    logger=MagicMock(),
+                )
+
+            first = make_service().get_analytics()
+            second = make_service().get_analytics()
+            self.assertEqual(repository.load_price_points.call_count, 1)
+            np.testing.assert_array_equal(first.dates, second.dates)
+
+            versions.data_versions.return_value = {"stock_price_history": "5:0"}
+            self.assertEqual(len(make_service().get_analytics().dates), 4)
@@ -0,0 +1,65 @@
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+from moneymonkey import cli
+
+SRC_DIR = Path(__file__).resolve().parents[2] / "src"
+
+
+class TestCli(unittest.TestCase):
+    def test_parser_and_import_are_headless(self):
+        code = (
+            "import sys; from moneymonkey import cli; "
+            "cli.build_parser().parse_args(['score']); "
+            "heavy = {'streamlit', 'PIL', 'sqlalchemy', 'numpy', 'pymysql'}; "
+            "print(sorted(heavy & set(sys.modules)))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=SRC_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        self.assertEqual(result.stdout.strip(), "[]")
+
+    def test_load_class(self):
+        self.assertIs(cli.load_class("pathlib:Path"), Path)
+        with self.assertRaises(ValueError):
+            cli.load_class("pathlib.Path")
+
+    @patch("injector.get_batch_runner")
+    @patch("injector.get_shard_planner")
+    def test_score_runs_sharded_batch(self, get_shard_planner, get_batch_runner):
+        report = MagicMock(failed=[], shards_done=2, shards_skipped=0)
+        get_batch_runner.return_value.run.return_value = report
+
+        exit_code = cli.main(
+            [
+                "score",
+                "--analysis",
+                "unittest.mock:MagicMock",
+                "--shard-by",
+                "sector",
+                "--run-id",
+                "nightly",
+            ]
+        )
+
+        self.assertEqual(exit_code, 0)
+        get_shard_planner.return_value.by_sector.assert_called_once()
+        get_batch_runner.return_value.run.assert_called_once_with(
+            get_shard_planner.return_value.by_sector.return_value, "nightly"
+        )
+
+    @patch("injector.get_refresh_scheduler")
+    def test_ingest_runs_one_round(self, get_refresh_scheduler):
+        get_refresh_scheduler.return_value.run_once.return_value = 3
+
+        exit_code = cli.main(["ingest", "--fetcher", "unittest.mock:MagicMock"])
+
+        self.assertEqual(exit_code, 0)
+        get_refresh_scheduler.return_value.run_once.assert_called_once()